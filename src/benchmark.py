@@ -0,0 +1,181 @@
+"""
+Script to benchmark CPU-based searches (instances of class ``MCTS`` from :doc:`mcts`) on initial states of available games,
+i.e., to measure their throughput (steps, playouts and visited tree nodes per second) and memory footprint (bytes per step and per visited tree node).
+Nodes are counted only if visited (so that both tree representations of ``MCTS`` are measured the same way, regardless of what they allocate for nodes never visited).
+Optionally, the strength of each search is measured too - as its mean score (win: 1, draw: 0.5, loss: 0) in games against a reference AI, 
+both searching within the same time limit per move (so that, e.g., heavy playouts - fewer but more informative per second - are compared fairly with uniform ones).
+Optionally (if CUDA is available), the CPU backend of ``MCTSNC`` from :doc:`mctsnc` is compared with the GPU one: searches with the same seeds and numbers of steps are carried out on both backends 
+and distributions of visits of root actions are compared (for the same seed, the backends are meant to carry out the same playouts, see :doc:`mctsnc_cpu`).
+
+The following variables allow to define the settings of a benchmark:
+
+.. code-block:: python
+
+    # main settings
+    STATE_CLASSES = [C4, Gomoku, UTTT]
+    AIS_SHORTNAMES = ["mcts_1_inf_vanilla", "mcts_1_inf_vanilla_array", "mcts_1_inf_vanilla_heavy", "mcts_1_inf_vanilla_rave"]
+    N_RUNS = 3
+    
+    # strength settings
+    REFERENCE_AI_SHORTNAME = "mcts_1_inf_vanilla"
+    N_STRENGTH_GAMES = 4 # 0 - strength not measured
+    
+    # backends comparison settings (device-side mechanics in mctsnc_game_mechanics must be the ones of BACKENDS_STATE_CLASS)
+    BACKENDS_STATE_CLASS = C4
+    BACKENDS_VARIANTS = ["ocp_thrifty", "ocp_prodigal", "acp_thrifty", "acp_prodigal"]
+    BACKENDS_SEARCH_STEPS_LIMIT = 100
+    BACKENDS_N_SEEDS = 8 # 0 - backends not compared
+
+String names of predefined AI instances can be found in dictionary named ``AIS``.
+
+Link to project repository
+--------------------------
+`https://github.com/pklesk/mcts_numba_cuda <https://github.com/pklesk/mcts_numba_cuda>`_
+"""
+
+import numpy as np
+from mcts import MCTS
+from mctsnc import MCTSNC
+from numba import cuda
+from c4 import C4
+from gomoku import Gomoku
+from ultimate_ttt import UTTT
+from utils import dict_to_str
+import tracemalloc
+import gc
+
+__author__ = "Przemysław Klęsk"
+__email__ = "pklesk@zut.edu.pl"
+
+# main settings
+STATE_CLASSES = [C4, Gomoku, UTTT]
+AIS_SHORTNAMES = ["mcts_1_inf_vanilla", "mcts_1_inf_vanilla_array", "mcts_1_inf_vanilla_heavy", "mcts_1_inf_vanilla_rave"]
+N_RUNS = 3
+
+# strength settings
+REFERENCE_AI_SHORTNAME = "mcts_1_inf_vanilla"
+N_STRENGTH_GAMES = 4 # 0 - strength not measured
+
+# backends comparison settings
+BACKENDS_STATE_CLASS = C4
+BACKENDS_VARIANTS = ["ocp_thrifty", "ocp_prodigal", "acp_thrifty", "acp_prodigal"]
+BACKENDS_SEARCH_STEPS_LIMIT = 100
+BACKENDS_N_SEEDS = 8 # 0 - backends not compared
+
+# dictionary of AIs
+AIS = {
+    "mcts_1_inf_vanilla": MCTS(search_time_limit=1.0, search_steps_limit=np.inf, vanilla=True),
+    "mcts_1_inf_vanilla_array": MCTS(search_time_limit=1.0, search_steps_limit=np.inf, vanilla=True, array_tree=True),
+    "mcts_1_inf_vanilla_heavy": MCTS(search_time_limit=1.0, search_steps_limit=np.inf, vanilla=True, playout_policy="heavy"),
+    "mcts_1_inf_vanilla_rave": MCTS(search_time_limit=1.0, search_steps_limit=np.inf, vanilla=True, rave=True)
+    }
+
+LINE_SEPARATOR = 208 * "="
+
+def visited_nodes(ai):
+    """Returns the number of nodes visited (at least once) in the tree of the last search of ``MCTS`` instance."""
+    if ai.array_tree:
+        return int(np.count_nonzero(ai.tree.ns[:ai.tree.size]))
+    return ai.performance_info["tree"]["size"] # states are materialized only when visited
+
+def benchmark_run(ai, state_class):
+    """
+    Carries out two searches from the initial state of given game and returns a dictionary with measurements: 
+    the first search measures throughput, the second one (traced by ``tracemalloc`` and thus slower) measures memory occupied by the tree.
+    """
+    ai.run(state_class())
+    performance_info = ai.performance_info
+    measurements = {}
+    measurements["steps_per_second"] = performance_info["steps_per_second"]
+    measurements["playouts_per_second"] = performance_info["playouts_per_second"]
+    measurements["nodes_per_second"] = visited_nodes(ai) / ai.time_total
+    gc.collect()
+    tracemalloc.start()
+    ai.run(state_class())
+    gc.collect() # getting rid of garbage (e.g., playout branches), so that only the tree remains
+    tree_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    measurements["bytes_per_step"] = tree_memory / ai.performance_info["steps"]
+    measurements["bytes_per_node"] = tree_memory / visited_nodes(ai)
+    return measurements
+
+def play_game(first_ai, second_ai, state_class):
+    """Plays a game between two AIs (``first_ai`` acting first) from the initial state of given game and returns its outcome from the perspective of ``first_ai`` (-1, 0 or 1)."""
+    state = state_class()
+    first_turn = state.turn
+    while True:
+        outcome = state.compute_outcome()
+        if outcome is not None:
+            return outcome * first_turn
+        ai = first_ai if state.turn == first_turn else second_ai
+        state = state.take_action(ai.run(state))
+
+def benchmark_strength(ai, reference_ai, state_class):
+    """Plays ``N_STRENGTH_GAMES`` games between the AI and the reference AI (alternating the first move) and returns the mean score of the AI."""
+    if ai is reference_ai:
+        return 0.5
+    verbose_infos = (ai.verbose_info, reference_ai.verbose_info)
+    ai.verbose_info = reference_ai.verbose_info = False
+    scores = []
+    for g in range(N_STRENGTH_GAMES):
+        outcome = play_game(ai, reference_ai, state_class) if g % 2 == 0 else -play_game(reference_ai, ai, state_class)
+        scores.append(0.5 * (outcome + 1))
+    ai.verbose_info, reference_ai.verbose_info = verbose_infos
+    return float(np.mean(scores))
+
+def root_visits_distribution(ai, state):
+    """Runs the search of ``MCTSNC`` instance from given state and returns the distribution of visits of root actions (fractions of visits, indexed by actions)."""
+    ai.run(state.get_board(), state.get_extra_info(), state.get_turn())
+    ns = np.zeros(type(state).get_max_actions())
+    for action, entry in ai.actions_info.items():
+        if action != "best":
+            ns[action] = entry["n"]
+    return ns / np.sum(ns)
+
+def benchmark_backends(state_class, variant):
+    """
+    Carries out searches of ``MCTSNC`` with seeds ``0, ..., BACKENDS_N_SEEDS - 1`` on both backends (``BACKENDS_SEARCH_STEPS_LIMIT`` steps each) from the initial state of given game 
+    and returns a dictionary with measurements: total variation distances between distributions of visits of root actions (mean over seeds, maximal one, and the one between mean distributions),
+    fractions of seeds with identical distributions and with the same best action.
+    """
+    distributions = {}
+    best_actions = {}
+    for backend in ["cpu", "cuda"]:
+        distributions[backend] = []
+        best_actions[backend] = []
+        for seed in range(BACKENDS_N_SEEDS):
+            ai = MCTSNC(state_class.get_board_shape(), state_class.get_extra_info_memory(), state_class.get_max_actions(), search_time_limit=np.inf, search_steps_limit=BACKENDS_SEARCH_STEPS_LIMIT, 
+                        variant=variant, seed=seed, backend=backend, game_name=state_class.__name__)
+            ai.init_device_side_arrays()
+            distributions[backend].append(root_visits_distribution(ai, state_class()))
+            best_actions[backend].append(ai.best_action)
+    distances = 0.5 * np.sum(np.abs(np.array(distributions["cpu"]) - np.array(distributions["cuda"])), axis=1)
+    measurements = {}
+    measurements["mean_tv_distance"] = float(np.mean(distances))
+    measurements["max_tv_distance"] = float(np.max(distances))
+    measurements["tv_distance_of_means"] = float(0.5 * np.sum(np.abs(np.mean(distributions["cpu"], axis=0) - np.mean(distributions["cuda"], axis=0))))
+    measurements["identical_fraction"] = float(np.mean(distances == 0.0))
+    measurements["same_best_action_fraction"] = float(np.mean(np.array(best_actions["cpu"]) == np.array(best_actions["cuda"])))
+    return measurements
+
+if __name__ == "__main__":
+    print("MCTS BENCHMARK...", flush=True)
+    results = {}
+    for state_class in STATE_CLASSES:
+        for ai_shortname in AIS_SHORTNAMES:
+            ai = AIS[ai_shortname]
+            runs_measurements = [benchmark_run(ai, state_class) for _ in range(N_RUNS)]
+            results[f"{state_class.class_repr()};{ai_shortname}"] = {key: float(np.mean([m[key] for m in runs_measurements])) for key in runs_measurements[0]}
+            if N_STRENGTH_GAMES > 0:
+                results[f"{state_class.class_repr()};{ai_shortname}"][f"score_vs_{REFERENCE_AI_SHORTNAME}"] = benchmark_strength(ai, AIS[REFERENCE_AI_SHORTNAME], state_class)
+            print(LINE_SEPARATOR)
+    print(f"RESULTS (means over {N_RUNS} runs{f', scores over {N_STRENGTH_GAMES} games' if N_STRENGTH_GAMES > 0 else ''}):\n{dict_to_str(results)}")
+    print("MCTS BENCHMARK DONE.")
+    if BACKENDS_N_SEEDS > 0:
+        if not cuda.is_available():
+            print("[MCTSNC backends comparison skipped: cuda computations not available]")
+        else:
+            print("MCTSNC BACKENDS COMPARISON...", flush=True)
+            results = {f"{BACKENDS_STATE_CLASS.class_repr()};{variant}": benchmark_backends(BACKENDS_STATE_CLASS, variant) for variant in BACKENDS_VARIANTS}
+            print(f"RESULTS (cpu vs cuda, {BACKENDS_N_SEEDS} seeds, {BACKENDS_SEARCH_STEPS_LIMIT} steps each):\n{dict_to_str(results)}")
+            print("MCTSNC BACKENDS COMPARISON DONE.")
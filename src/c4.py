@@ -1,5 +1,6 @@
 import numpy as np
 from mcts import State
+from mctsnj_game_mechanics import playout_c4, playouts_c4, is_winning_action_c4, THREATS_CAPACITY
 from numba import jit
 from numba import int8
 
@@ -22,6 +23,17 @@ class C4(State):
     M = 6 
     N = 7 
     SYMBOLS = ["\u25CB", ".", "\u25CF"] # or: ["O", ".", "X"]    
+    _PLAYOUT_BOARD = np.empty((M, N), dtype=np.int8) # scratch arrays for in-place playouts
+    _PLAYOUT_EXTRA_INFO = np.zeros(N, dtype=np.int8)
+    _PLAYOUT_LEGAL_ACTIONS_WITH_COUNT = np.empty(N + 1, dtype=np.int16)
+    _PLAYOUT_THREATS = np.empty((2, THREATS_CAPACITY + 1), dtype=np.int16)
+    _PLAYOUT_ACTIONS = np.empty((2, M * N + 1), dtype=np.int16)
+    _ZOBRIST_KEYS = np.random.default_rng(0).integers(0, 2**64, size=(2, M, N), dtype=np.uint64).tolist() # random keys for hashing: [player][row][column], player 0: min, 1: max
+    _ZOBRIST_TURN_KEY = int(np.random.default_rng(1).integers(0, 2**64, dtype=np.uint64)) # key XOR-ed at each change of turn
+    _ZOBRIST_KEYS_ARRAY = np.array(_ZOBRIST_KEYS, dtype=np.uint64).reshape(2, M * N)
+    _CELLS_TRANSFORMS = np.array([np.arange(M * N), np.fliplr(np.arange(M * N).reshape(M, N)).ravel()]) # symmetries: identity, mirror (self-inverse)
+    _ACTIONS_TRANSFORMS = np.array([np.arange(N), np.arange(N)[::-1]])
+    __slots__ = ("board", "column_fills")
     
     def __init__(self, parent=None):
         """
@@ -33,11 +45,18 @@ class C4(State):
         """
         super().__init__(parent)
         if self.parent:
-            self.board = np.copy(self.parent.board)
-            self.column_fills = np.copy(self.parent.column_fills)
+            self.board = self.parent.board # shared with parent until mutated (copy-on-write)
+            self.column_fills = self.parent.column_fills
+            self.board_shared = True
         else:
             self.board = np.zeros((C4.M, C4.N), dtype=np.int8)
             self.column_fills = np.zeros(C4.N, dtype=np.int8)
+            self.zobrist_hash = 0 # empty board, maximizing player to act
+
+    def _copy_board(self):
+        """Replaces arrays shared with the parent (copy-on-write) by copies."""
+        self.board = np.copy(self.board)
+        self.column_fills = np.copy(self.column_fills)
 
     @staticmethod
     def class_repr():
@@ -84,12 +103,35 @@ class C4(State):
         j = action_index 
         if self.column_fills[j] == C4.M:
             return False
+        self._own_board()
         i = C4.M - 1 - self.column_fills[j] 
         self.board[i, j] = self.turn
         self.column_fills[j] += 1
+        self.zobrist_hash ^= C4._ZOBRIST_KEYS[(self.turn + 1) // 2][i][j] ^ C4._ZOBRIST_TURN_KEY
         self.turn *= -1
         return True
     
+    def child_hash(self, action_index):
+        """
+        Returns the Zobrist hash of the child reached by dropping a disc into column indicated by the action_index (updated from ``zobrist_hash`` of this state, without taking the action).
+
+        Args:
+            action_index (int): 
+                index of column (not full) where to drop a disc.
+        
+        Returns:
+            child_hash (int):
+                Zobrist hash of the child.
+        """
+        j = action_index
+        i = C4.M - 1 - self.column_fills[j]
+        return self.zobrist_hash ^ C4._ZOBRIST_KEYS[(self.turn + 1) // 2][i][j] ^ C4._ZOBRIST_TURN_KEY
+
+    def _child_canonical_hashes(self, hashes, action_index):
+        """Returns hashes of symmetric variants of the child reached by dropping a disc into column indicated by the action_index, updated from ``hashes`` of variants of this position."""
+        cell = (C4.M - 1 - int(self.column_fills[action_index])) * C4.N + action_index
+        return hashes ^ C4._ZOBRIST_KEYS_ARRAY[(self.turn + 1) // 2, C4._CELLS_TRANSFORMS[:, cell]] ^ np.uint64(C4._ZOBRIST_TURN_KEY)
+    
     def compute_outcome_job(self):
         """        
         Computes and returns the game outcome for this state in compliance with rules of Connect 4 game: 
@@ -217,18 +259,79 @@ class C4(State):
             return last_token        
         return 0
                         
-    def take_random_action_playout(self):
-        """        
-        Picks a uniformly random action from actions available in this state and returns the result of calling ``take_action`` with the action index as argument.
+    def legal_actions(self):
+        """
+        Returns indexes of legal actions in this state, i.e., indexes of columns that are not full yet.
         
         Returns:
-            child (State): 
-                result of ``take_action`` call for the random action.          
-        """        
-        j_indexes = np.where(self.column_fills < C4.M)[0]
-        j = np.random.choice(j_indexes) 
-        child = self.take_action(j)
-        return child
+            legal_actions (ndarray[np.int64, ndim=1]): 
+                one-dimensional array with indexes of legal actions (in ascending order).
+        """
+        return np.flatnonzero(self.column_fills < C4.M)
+
+    def is_winning_action(self, action_index, token):
+        """
+        Checks (directly on the board, without creating any states) whether the given legal action, if played in this state by the player with pieces ``token``, would win the game.
+        
+        Args:
+            action_index (int):
+                index of a legal action.
+            token ({-1, 1}):
+                indicator of the player taking the action.
+        Returns:
+            winning (bool):
+                flag indicating whether the action would win the game for the player.
+        """
+        return bool(is_winning_action_c4(C4.M, C4.N, self.board, self.column_fills, action_index, token))
+
+    def playout(self, policy="uniform", actions=None, rng=None):
+        """
+        Carries out a playout from this state in place and returns its outcome.
+        No states are created along the way - the game is played on reusable scratch arrays (attributes of class ``C4``)
+        by compiled function ``playout_c4`` from :doc:`mctsnj_game_mechanics`.
+        
+        Args:
+            policy (str):
+                playout policy, ``"uniform"`` (uniformly random actions) or ``"heavy"`` (immediate wins played, immediate losses blocked), defaults to ``"uniform"``.
+            actions (ndarray[np.int16, ndim=2]):
+                optional array (two rows) in which the actions taken within the playout (first row) and the turns of players taking them (second row) are recorded 
+                (their count in the last entry of the first row), e.g., for AMAF statistics, defaults to ``None``.
+            rng (np.random.Generator):
+                generator of random numbers (each search passes its own), defaults to ``None`` (a generator shared by states).
+        Returns:
+            outcome ({-1, 0, 1}): 
+                outcome of the playout: -1 (win for minimizing player), 0 (draw), 1 (win for maximizing player).
+        """
+        outcome = self.compute_outcome()
+        if outcome is not None:
+            if actions is not None:
+                actions[0, -1] = 0
+            return outcome
+        return int(playout_c4(C4.M, C4.N, self.board, self.column_fills, self.turn, C4._PLAYOUT_BOARD, C4._PLAYOUT_EXTRA_INFO, C4._PLAYOUT_LEGAL_ACTIONS_WITH_COUNT, C4._PLAYOUT_THREATS, policy == "heavy", C4._PLAYOUT_ACTIONS if actions is None else actions, State._DEFAULT_RNG if rng is None else rng))
+
+    def playouts(self, n_playouts, policy="uniform", rng=None):
+        """
+        Carries out a batch of playouts from this state in place (within a single call of compiled function ``playouts_c4`` from :doc:`mctsnj_game_mechanics`) 
+        and returns counts of their outcomes.
+        
+        Args:
+            n_playouts (int):
+                number of playouts.
+            policy (str):
+                playout policy, ``"uniform"`` or ``"heavy"`` (see ``playout``), defaults to ``"uniform"``.
+            rng (np.random.Generator):
+                generator of random numbers (see ``playout``), defaults to ``None``.
+        Returns:
+            outcomes_counts (ndarray[np.int64, ndim=1]):
+                counts of outcomes -1, 0, 1 (at indexes 0, 1, 2, respectively).
+        """
+        outcomes_counts = np.zeros(3, dtype=np.int64)
+        outcome = self.compute_outcome()
+        if outcome is not None:
+            outcomes_counts[outcome + 1] = n_playouts
+            return outcomes_counts
+        playouts_c4(C4.M, C4.N, self.board, self.column_fills, self.turn, n_playouts, C4._PLAYOUT_BOARD, C4._PLAYOUT_EXTRA_INFO, C4._PLAYOUT_LEGAL_ACTIONS_WITH_COUNT, C4._PLAYOUT_THREATS, outcomes_counts, policy == "heavy", C4._PLAYOUT_ACTIONS, State._DEFAULT_RNG if rng is None else rng)
+        return outcomes_counts
     
     def get_board(self):
         """                
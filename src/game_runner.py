@@ -1,5 +1,8 @@
 import numpy as np
-# from mctsnc import MCTSNC
+import time
+from mcts import MCTS
+from time_manager import TimeManager
+from mctsnc import MCTSNC
 
 __version__ = "1.0.1"
 __author__ = "Przemysław Klęsk"
@@ -42,6 +45,12 @@ class GameRunner:
             total of games in a match (for informative purposes).
         experiment_info_old (dict):
             dictionary allowing to reproduce a former experiment (allows to force the limit of steps rather than time on an AI instance) or ``None`` for a new experiment, , defaults to ``None``.
+        time_control (tuple):
+            pair (total time per game [s], increment per move [s]) for a game-level time control of AIs (``search_time_limit`` allocated per move by ``TimeManager``, one per player) 
+            or ``None`` for fixed ``search_time_limit`` of AIs, defaults to ``None``.
+        ponder (bool):
+            flag indicating whether AIs (instances of ``MCTS`` or ``MCTSNC`` with ``ponder=True``) ponder during their opponents' turns: ``None`` - only when the opponent is human 
+            (an AI opponent would compete for the interpreter and could share states of the game with the pondering AI), ``True`` - always, ``False`` - never, defaults to ``None``.
             
     Attributes:
         OUTCOME_MESSAGES (list):
@@ -50,7 +59,7 @@ class GameRunner:
     
     OUTCOME_MESSAGES = ["WYGRYWA KÓŁKO", "REMIS", "WYGRYWA KRZYŻYK"]
     
-    def __init__(self, game_class, black_ai, white_ai, game_index, n_games, experiment_info_old=None):
+    def __init__(self, game_class, black_ai, white_ai, game_index, n_games, experiment_info_old=None, time_control=None, ponder=None):
         """
         Constructor ``GameRunner`` instances.
          
@@ -67,6 +76,12 @@ class GameRunner:
                 total of games in a match (for informative purposes).
             experiment_info_old (dict):
                 dictionary allowing to reproduce a former experiment (allows to force the limit of steps rather than time on an AI instance) or ``None`` for a new experiment, , defaults to ``None``.
+            time_control (tuple):
+                pair (total time per game [s], increment per move [s]) for a game-level time control of AIs (``search_time_limit`` allocated per move by ``TimeManager``, one per player) 
+                or ``None`` for fixed ``search_time_limit`` of AIs, defaults to ``None``.
+            ponder (bool):
+                flag indicating whether AIs (instances of ``MCTS`` or ``MCTSNC`` with ``ponder=True``) ponder during their opponents' turns: ``None`` - only when the opponent is human 
+                (an AI opponent would compete for the interpreter and could share states of the game with the pondering AI), ``True`` - always, ``False`` - never, defaults to ``None``.
         """        
         self.game_class = game_class
         self.black_ai = black_ai
@@ -74,6 +89,45 @@ class GameRunner:
         self.game_index = game_index
         self.n_games = n_games
         self.experiment_info_old = experiment_info_old
+        self.time_control = time_control
+        self.ponder = ponder
+
+    def _run_ai(self, ai, time_manager, game, forced_search_steps_limit):
+        """Runs the search of an AI from the current state of game (with ``search_time_limit`` allocated by the time manager, if any) and returns the best action together with information on the time of move (or ``None``)."""
+        if time_manager is None:
+            return self._run_search(ai, game, forced_search_steps_limit), None
+        time_manager.apply(ai, game)
+        t1 = time.time()
+        move_index = self._run_search(ai, game, forced_search_steps_limit)
+        return move_index, time_manager.update(time.time() - t1)
+
+    @staticmethod
+    def _run_search(ai, game, forced_search_steps_limit):
+        """Runs the search of an AI from the current state of game - passed as a state object or, to ``MCTSNC``, as its board, extra info and turn - and returns the best action."""
+        if isinstance(ai, MCTSNC):
+            return ai.run(game.get_board(), game.get_extra_info(), game.get_turn(), forced_search_steps_limit)
+        return ai.run(game, forced_search_steps_limit)
+
+    def _reroot(self, game):
+        """Re-roots trees of ``MCTS`` AIs at the current state of game (after a move of either player), so that only the subtree of the move played is kept."""
+        for ai in {id(ai): ai for ai in (self.black_ai, self.white_ai) if isinstance(ai, MCTS)}.values():
+            ai.reroot(game)
+
+    def _start_pondering(self, ai, opponent_ai, game):
+        """Lets an ``MCTS`` or ``MCTSNC`` AI (that has just moved) ponder over the current state of game during its opponent's turn (see ``MCTS.start_pondering``, ``MCTSNC.start_pondering``), if allowed by ``ponder`` against that opponent."""
+        allowed = self.ponder if self.ponder is not None else not opponent_ai
+        if not allowed or game.compute_outcome() is not None:
+            return
+        if isinstance(ai, MCTS):
+            ai.start_pondering(game)
+        elif isinstance(ai, MCTSNC):
+            ai.start_pondering(game.get_board(), game.get_extra_info(), game.get_turn())
+
+    def _stop_pondering(self):
+        """Stops pondering of ``MCTS`` and ``MCTSNC`` AIs (at the end of game)."""
+        for ai in (self.black_ai, self.white_ai):
+            if isinstance(ai, (MCTS, MCTSNC)):
+                ai.stop_pondering()
 
     def run(self):
         """Carries out a game."""
@@ -81,6 +135,8 @@ class GameRunner:
         print(game)
         outcome = 0
         game_info = {"black": str(self.black_ai), "white": str(self.white_ai), "initial_state": str(game), "moves_rounds": {}, "outcome": None, "outcome_message": None}                
+        black_time_manager = TimeManager(*self.time_control) if self.time_control is not None and self.black_ai else None
+        white_time_manager = TimeManager(*self.time_control) if self.time_control is not None and self.white_ai else None
         move_count = 0                       
         while True:
             print(f"\nMOVES ROUND: {move_count + 1} [game: {self.game_index}/{self.n_games}]")
@@ -115,7 +171,7 @@ class GameRunner:
                         move_name = int(move_row * 9 + move_column)
                         move_index = self.game_class.action_name_to_index(move_name)
                         game_old = game
-                        game_moved = game.take_action(move_index)
+                        game_moved = game.take_action(move_index) if move_index in game.legal_actions() else None # illegal moves rejected without creating states
                         if game_moved is not None:
                             game = game_moved
                             move_valid = True
@@ -131,10 +187,7 @@ class GameRunner:
             else:
                 if self.experiment_info_old is not None:
                     forced_search_steps_limit = self.experiment_info_old["games_infos"][str(self.game_index)]["moves_rounds"][str(move_count + 1)]["black_performance_info"]["steps"] 
-                # if isinstance(self.black_ai, MCTSNC):
-                #     move_index = self.black_ai.run(game.get_board(), game.get_extra_info(), game.get_turn(), forced_search_steps_limit)
-                # else:
-                move_index = self.black_ai.run(game, forced_search_steps_limit)
+                move_index, black_time_info = self._run_ai(self.black_ai, black_time_manager, game, forced_search_steps_limit)
                 move_name = self.game_class.action_index_to_name(move_index)
                 print(f"MOVE PLAYED: {move_name}")
                 game_old = game
@@ -142,6 +195,10 @@ class GameRunner:
                 print_if_subboard_won(game_old, game, move_index)
                 moves_round_info["black_best_action_info"] = self.black_ai.actions_info["best"]
                 moves_round_info["black_performance_info"] = self.black_ai.performance_info                
+                if black_time_info is not None:
+                    moves_round_info["black_time_info"] = black_time_info
+            self._reroot(game)
+            self._start_pondering(self.black_ai, self.white_ai, game)
             print(str(game), flush=True)                                                
             outcome = game.compute_outcome()
             if outcome is not None:
@@ -180,7 +237,7 @@ class GameRunner:
                         move_name = int(move_row * 9 + move_column)
                         move_index = self.game_class.action_name_to_index(move_name)
                         game_old = game
-                        game_moved = game.take_action(move_index)
+                        game_moved = game.take_action(move_index) if move_index in game.legal_actions() else None # illegal moves rejected without creating states
                         if game_moved is not None:
                             game = game_moved
                             move_valid = True
@@ -196,10 +253,7 @@ class GameRunner:
             else:
                 if self.experiment_info_old is not None:
                     forced_search_steps_limit = self.experiment_info_old["games_infos"][str(self.game_index)]["moves_rounds"][str(move_count + 1)]["white_performance_info"]["steps"]                
-                # if isinstance(self.white_ai, MCTSNC):
-                #     move_index = self.white_ai.run(game.get_board(), game.get_extra_info(), game.get_turn(), forced_search_steps_limit)
-                # else:
-                move_index = self.white_ai.run(game, forced_search_steps_limit)
+                move_index, white_time_info = self._run_ai(self.white_ai, white_time_manager, game, forced_search_steps_limit)
                 move_name = self.game_class.action_index_to_name(move_index)
                 print(f"MOVE PLAYED: {move_name}")
                 game_old = game
@@ -207,6 +261,10 @@ class GameRunner:
                 print_if_subboard_won(game_old, game, move_index)
                 moves_round_info["white_best_action_info"] = self.white_ai.actions_info["best"]            
                 moves_round_info["white_performance_info"] = self.white_ai.performance_info                
+                if white_time_info is not None:
+                    moves_round_info["white_time_info"] = white_time_info
+            self._reroot(game)
+            self._start_pondering(self.white_ai, self.black_ai, game)
             print(str(game), flush=True)                                        
             game_info["moves_rounds"][str(move_count + 1)] = moves_round_info  
             outcome = game.compute_outcome()
@@ -218,4 +276,5 @@ class GameRunner:
                 game_info["outcome_message"] = outcome_message                                
                 break
             move_count += 1
+        self._stop_pondering()
         return outcome, game_info
\ No newline at end of file
@@ -1,5 +1,6 @@
 import numpy as np
 from mcts import State
+from mctsnj_game_mechanics import playout_gomoku, playouts_gomoku, is_winning_action_gomoku, THREATS_CAPACITY
 from numba import jit
 from numba import int8
 
@@ -23,14 +24,31 @@ class Gomoku(State):
     M = 15
     N = 15
     SYMBOLS = ["\u25CB", "+", "\u25CF"] # or: [['O', '+', 'X']
+    _PLAYOUT_BOARD = np.empty((M, N), dtype=np.int8) # scratch arrays for in-place playouts
+    _PLAYOUT_EXTRA_INFO = np.zeros(1, dtype=np.int8)
+    _PLAYOUT_LEGAL_ACTIONS_WITH_COUNT = np.empty(M * N + 1, dtype=np.int16)
+    _PLAYOUT_THREATS = np.empty((2, THREATS_CAPACITY + 1), dtype=np.int16)
+    _PLAYOUT_ACTIONS = np.empty((2, M * N + 1), dtype=np.int16)
+    _ZOBRIST_KEYS = np.random.default_rng(0).integers(0, 2**64, size=(2, M, N), dtype=np.uint64).tolist() # random keys for hashing: [player][row][column], player 0: min, 1: max
+    _ZOBRIST_TURN_KEY = int(np.random.default_rng(1).integers(0, 2**64, dtype=np.uint64)) # key XOR-ed at each change of turn
+    _ZOBRIST_KEYS_ARRAY = np.array(_ZOBRIST_KEYS, dtype=np.uint64).reshape(2, M * N)
+    _CELLS_TRANSFORMS = State._dihedral_cells_transforms(M, N) # symmetries: 8 dihedral transforms of the square board
+    _ACTIONS_TRANSFORMS = _CELLS_TRANSFORMS
+    __slots__ = ("board",)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         if self.parent:
-            self.board = np.copy(self.parent.board)
+            self.board = self.parent.board # shared with parent until mutated (copy-on-write)
+            self.board_shared = True
         else:
             self.board = np.zeros((Gomoku.M, Gomoku.N), dtype=np.int8)
+            self.zobrist_hash = 0 # empty board, maximizing player to act
     
+    def _copy_board(self):
+        """Replaces arrays shared with the parent (copy-on-write) by copies."""
+        self.board = np.copy(self.board)
+
     @staticmethod
     def class_repr():
         """        
@@ -83,10 +101,30 @@ class Gomoku(State):
             return False
         if self.board[i, j] != 0:
             return False
+        self._own_board()
         self.board[i, j] = self.turn
+        self.zobrist_hash ^= Gomoku._ZOBRIST_KEYS[(self.turn + 1) // 2][i][j] ^ Gomoku._ZOBRIST_TURN_KEY
         self.turn *= -1
         return True
     
+    def child_hash(self, action_index):
+        """
+        Returns the Zobrist hash of the child reached by placing a stone onto the crossing indicated by the action_index (updated from ``zobrist_hash`` of this state, without taking the action).
+
+        Args:
+            action_index (int): 
+                index of unoccupied crossing where to place a stone.
+        
+        Returns:
+            child_hash (int):
+                Zobrist hash of the child.
+        """
+        return self.zobrist_hash ^ Gomoku._ZOBRIST_KEYS[(self.turn + 1) // 2][action_index // Gomoku.N][action_index % Gomoku.N] ^ Gomoku._ZOBRIST_TURN_KEY
+
+    def _child_canonical_hashes(self, hashes, action_index):
+        """Returns hashes of symmetric variants of the child reached by placing a stone onto the crossing indicated by the action_index, updated from ``hashes`` of variants of this position."""
+        return hashes ^ Gomoku._ZOBRIST_KEYS_ARRAY[(self.turn + 1) // 2, Gomoku._CELLS_TRANSFORMS[:, action_index]] ^ np.uint64(Gomoku._ZOBRIST_TURN_KEY)
+    
     def compute_outcome_job(self):
         """        
         Computes and returns the game outcome for this state in compliance with rules of Gomoku game: 
@@ -214,18 +252,100 @@ class Gomoku(State):
             return last_token        
         return 0        
                             
-    def take_random_action_playout(self):
-        """        
-        Picks a uniformly random action from actions available in this state and returns the result of calling ``take_action`` with the action index as argument.
+    def legal_actions(self):
+        """
+        Returns indexes of legal actions in this state, i.e., indexes of crossings that are not occupied.
         
         Returns:
-            child (State): 
-                result of ``take_action`` call for the random action.          
-        """        
-        indexes = np.where(np.ravel(self.board) == 0)[0]
-        action_index = np.random.choice(indexes) 
-        child = self.take_action(action_index)
-        return child    
+            legal_actions (ndarray[np.int64, ndim=1]): 
+                one-dimensional array with indexes of legal actions (in ascending order).
+        """
+        return np.flatnonzero(self.board.ravel() == 0)
+
+    def is_winning_action(self, action_index, token):
+        """
+        Checks (directly on the board, without creating any states) whether the given legal action, if played in this state by the player with pieces ``token``, would win the game.
+        
+        Args:
+            action_index (int):
+                index of a legal action.
+            token ({-1, 1}):
+                indicator of the player taking the action.
+        Returns:
+            winning (bool):
+                flag indicating whether the action would win the game for the player.
+        """
+        return bool(is_winning_action_gomoku(Gomoku.M, Gomoku.N, self.board, Gomoku._PLAYOUT_EXTRA_INFO, action_index, token))
+
+    def threat_candidates(self, action_index):
+        """
+        Returns indexes of empty cells along the four lines through the stone placed by the given (last) action, within four cells from it - the only cells where an immediate win may appear due to that stone.
+        
+        Args:
+            action_index (int):
+                index of the last action taken.
+        Returns:
+            candidates (list(int)):
+                indexes of legal actions to be checked for new immediate wins.
+        """
+        si, sj = divmod(action_index, Gomoku.N)
+        candidates = []
+        for di, dj in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            for k in range(-4, 5):
+                i = si + k * di
+                j = sj + k * dj
+                if k != 0 and 0 <= i < Gomoku.M and 0 <= j < Gomoku.N and self.board[i, j] == 0:
+                    candidates.append(i * Gomoku.N + j)
+        return candidates
+
+    def playout(self, policy="uniform", actions=None, rng=None):
+        """
+        Carries out a playout from this state in place and returns its outcome.
+        No states are created along the way - the game is played on reusable scratch arrays (attributes of class ``Gomoku``)
+        by compiled function ``playout_gomoku`` from :doc:`mctsnj_game_mechanics`.
+        
+        Args:
+            policy (str):
+                playout policy, ``"uniform"`` (uniformly random actions) or ``"heavy"`` (immediate wins played, immediate losses blocked), defaults to ``"uniform"``.
+            actions (ndarray[np.int16, ndim=2]):
+                optional array (two rows) in which the actions taken within the playout (first row) and the turns of players taking them (second row) are recorded 
+                (their count in the last entry of the first row), e.g., for AMAF statistics, defaults to ``None``.
+            rng (np.random.Generator):
+                generator of random numbers (each search passes its own), defaults to ``None`` (a generator shared by states).
+        Returns:
+            outcome ({-1, 0, 1}): 
+                outcome of the playout: -1 (win for minimizing player), 0 (draw), 1 (win for maximizing player).
+        """
+        outcome = self.compute_outcome()
+        if outcome is not None:
+            if actions is not None:
+                actions[0, -1] = 0
+            return outcome
+        return int(playout_gomoku(Gomoku.M, Gomoku.N, self.board, Gomoku._PLAYOUT_EXTRA_INFO, self.turn, Gomoku._PLAYOUT_BOARD, Gomoku._PLAYOUT_EXTRA_INFO, Gomoku._PLAYOUT_LEGAL_ACTIONS_WITH_COUNT, Gomoku._PLAYOUT_THREATS, policy == "heavy", Gomoku._PLAYOUT_ACTIONS if actions is None else actions, State._DEFAULT_RNG if rng is None else rng))
+
+    def playouts(self, n_playouts, policy="uniform", rng=None):
+        """
+        Carries out a batch of playouts from this state in place (within a single call of compiled function ``playouts_gomoku`` from :doc:`mctsnj_game_mechanics`) 
+        and returns counts of their outcomes.
+        
+        Args:
+            n_playouts (int):
+                number of playouts.
+            policy (str):
+                playout policy, ``"uniform"`` or ``"heavy"`` (see ``playout``), defaults to ``"uniform"``.
+            rng (np.random.Generator):
+                generator of random numbers (see ``playout``), defaults to ``None``.
+        Returns:
+            outcomes_counts (ndarray[np.int64, ndim=1]):
+                counts of outcomes -1, 0, 1 (at indexes 0, 1, 2, respectively).
+        """
+        outcomes_counts = np.zeros(3, dtype=np.int64)
+        outcome = self.compute_outcome()
+        if outcome is not None:
+            outcomes_counts[outcome + 1] = n_playouts
+            return outcomes_counts
+        playouts_gomoku(Gomoku.M, Gomoku.N, self.board, Gomoku._PLAYOUT_EXTRA_INFO, self.turn, n_playouts, Gomoku._PLAYOUT_BOARD, Gomoku._PLAYOUT_EXTRA_INFO, Gomoku._PLAYOUT_LEGAL_ACTIONS_WITH_COUNT, Gomoku._PLAYOUT_THREATS, outcomes_counts, policy == "heavy", Gomoku._PLAYOUT_ACTIONS, State._DEFAULT_RNG if rng is None else rng)
+        return outcomes_counts
     
     def get_board(self):
         """                
@@ -5,7 +5,11 @@ The module contains:
 - ``State``: class representing an arbitrary state of some game or sequential decision problem (meant to inherit from when searches using ``MCTS`` class are planned);
     current examples of subclasses are: `C4`` in :doc:`c4` (representation of Connect 4 game), ``Gomoku`` in :doc:`gomoku` (representation of Gomoku game).  
 
-- ``MCTS``: class representing the referential MCTS algorithm.
+- ``ArrayTree``: class representing a search tree as a struct of ``numpy`` arrays (optional, compact alternative to the graph of ``State`` objects used by ``MCTS``).
+
+- ``TranspositionTable``: class representing a bounded table of statistics of positions, indexed by Zobrist hashes of states (optional, used by ``MCTS`` to share statistics between transpositions).
+
+- ``MCTS``: class representing the referential MCTS algorithm (optionally root-parallel, over a pool of worker processes).
 
 
 Link to project repository
@@ -20,7 +24,12 @@ For public methods full docstrings are provided (with arguments and returns desc
 
 import numpy as np
 import time
-from utils import dict_to_str
+import sys
+import os
+import multiprocessing
+import threading
+from numba import njit
+from utils import dict_to_str, remaining_playouts, stop_reason, STOP_RULES, PLAYOUT_POLICIES
 
 __version__ = "1.0.1"
 __author__ = "Przemysław Klęsk"
@@ -37,13 +46,36 @@ class State:
     -  ``Gomoku`` class in :doc:`gomoku` (representation of Gomoku game).
     
     When searches using ``MCTS`` class are planned, the programmer, while inheriting from ``State``, must provide implementations for the following non-static methods: 
-    ``take_action_job``, ``compute_outcome_job``, ``take_random_action_playout``, ``__str__``; 
+    ``take_action_job``, ``compute_outcome_job``, ``__str__``; 
     and one static method ``class_repr``.
+    Method ``legal_actions`` should be overridden by a direct generator of legal actions (its default implementation tries all actions on copies of the state).
+    For the ``"heavy"`` playout policy, methods ``is_winning_action`` and ``threat_candidates`` should be overridden by direct checks on the board.
+    Optionally, method ``playout`` can be overridden to carry out playouts in place, without creating states along the way (as done by ``C4``, ``Gomoku`` and ``UTTT``),
+    and method ``playouts`` - to carry out batches of playouts within a single call (used by ``MCTS`` with ``n_playouts > 1``).
     When searches using ``MCTSNC`` class are planned, the programmer, while inheriting from ``State``, must provide the following non-static methods:    
     ``get_board``, ``get_extra_info``
     and the following static ones:
     ``get_board_shape``, ``get_extra_info_memory``, ``get_max_actions``.
+    
+    States are compact: attributes are declared via ``__slots__`` (subclasses should declare theirs likewise) and a child shares the board of its parent 
+    until its first mutation (copy-on-write) - a subclass should mark the shared arrays by setting ``board_shared = True`` in its copying constructor, 
+    call ``_own_board`` in ``take_action_job`` right before mutating them, and implement ``_copy_board``.
+    
+    For transposition tables (``MCTS`` with ``transposition_table_capacity > 0``) subclasses should maintain attribute ``zobrist_hash`` - a Zobrist hash of the position 
+    (including the player to act), set in the constructor of a root state and updated incrementally in ``take_action_job`` (as done by ``C4``, ``Gomoku`` and ``UTTT``);
+    ``None`` (the default) means hashing is not supported. Hashes of children are best provided without taking actions - by ``child_hash`` 
+    (and ``_child_canonical_hashes`` for games with symmetries), otherwise they are computed on copies of states.
+    Games with symmetries can additionally define class attributes: ``_CELLS_TRANSFORMS`` (for each symmetry transform, the mapping of flat cell indexes), 
+    ``_ACTIONS_TRANSFORMS`` (analogical mapping of action indexes) and ``_ZOBRIST_KEYS_ARRAY`` (Zobrist keys of pieces as an array: [player][flat cell index]),
+    thanks to which method ``canonical_key`` collapses symmetric positions (as done by ``C4``, ``Gomoku`` and ``UTTT``).
     """        
+    
+    __slots__ = ("win_flag", "n", "n_wins", "parent", "children", "outcome_computed", "outcome", "turn", "last_action_index", 
+                 "child_index", "children_actions", "children_ns", "children_ns_wins", "children_ns_amaf", "children_ns_wins_amaf", "board_shared", "zobrist_hash", "children_hashes", "canonical_hash")
+    _CELLS_TRANSFORMS = None # symmetries: [transform index][flat cell index] -> flat cell index in transformed board, None - no symmetries (transform 0 always identity)
+    _ACTIONS_TRANSFORMS = None # symmetries: [transform index][action index] -> action index in transformed position
+    _ZOBRIST_KEYS_ARRAY = None
+    _DEFAULT_RNG = np.random.default_rng() # generator used by playouts when none is given (searches pass their own generators)
             
     def __init__(self, parent=None):
         """
@@ -62,6 +94,16 @@ class State:
         self.outcome = None # None - ongoing, or {-1, 0, 1} - win for min player, draw, win for max player        
         self.turn = 1 if self.parent is None else self.parent.turn
         self.last_action_index = None        
+        self.child_index = None # index of this state among its parent's children (position in parent's arrays of children statistics)
+        self.children_actions = None # arrays of children statistics (legal actions, counts of visits and wins) prepared by expand; children states materialized lazily
+        self.children_ns = None
+        self.children_ns_wins = None
+        self.children_ns_amaf = None # arrays of all-moves-as-first (AMAF) statistics of children, gathered by searches with RAVE
+        self.children_ns_wins_amaf = None
+        self.board_shared = False # are board (and possibly other arrays) shared with parent (copy-on-write)
+        self.zobrist_hash = None if self.parent is None else self.parent.zobrist_hash # to be updated incrementally in take_action_job
+        self.children_hashes = None # Zobrist hashes of children (gathered when needed by a transposition table)
+        self.canonical_hash = None # canonical key (memorized when needed by searches collapsing symmetries)
 
     def __str__(self):
         """
@@ -86,29 +128,84 @@ class State:
         """
         pass
             
-    def _subtree_size(self):
-        """Returns size of the subtree rooted by this state (number of tree nodes including this one)."""
-        size = 1
-        for key in self.children:
-            size += self.children[key]._subtree_size()
-        return size
+    def _subtree_depths_counts(self):
+        """Returns counts of nodes of the subtree rooted by this state per depth (a list, index 0 for this state), gathered in one iterative walk."""
+        depths_counts = []
+        stack = [(self, 0)]
+        while stack:
+            state, d = stack.pop()
+            if d == len(depths_counts):
+                depths_counts.append(0)
+            depths_counts[d] += 1
+            stack.extend((child, d + 1) for child in state.children.values())
+        return depths_counts
     
-    def _subtree_max_depth(self):
-        """Returns (maximum) depth of the subtree rooted by this state."""
-        d = 0
-        for key in self.children:
-            temp_d = self.children[key]._subtree_max_depth()
-            if 1 + temp_d > d:
-                d = 1 + temp_d 
-        return d
+    def _subtree_memory(self):
+        """Returns memory (in bytes) occupied by the subtree rooted by this state: state objects, their children dictionaries, arrays of children statistics and owned (not shared) boards."""
+        memory = 0
+        stack = [self]
+        while stack:
+            state = stack.pop()
+            memory += sys.getsizeof(state) + sys.getsizeof(state.children)
+            if state.children_actions is not None:
+                memory += sys.getsizeof(state.children_actions) + sys.getsizeof(state.children_ns) + sys.getsizeof(state.children_ns_wins)
+            if state.children_ns_amaf is not None:
+                memory += sys.getsizeof(state.children_ns_amaf) + sys.getsizeof(state.children_ns_wins_amaf)
+            if state.children_hashes is not None:
+                memory += sys.getsizeof(state.children_hashes)
+            if not state.board_shared:
+                for array in (state.get_board(), state.get_extra_info()):
+                    if array is not None:
+                        memory += sys.getsizeof(array)
+            stack.extend(state.children.values())
+        return memory
     
-    def _subtree_depths(self, d=0, depths=[]):
-        """Returns a list of depths for nodes in the subtree rooted by this state."""
-        depths.append(d)
-        for key in self.children:
-            self.children[key]._subtree_depths(d + 1, depths)
-        return depths
+    def _own_board(self):
+        """Makes this state the owner of its board (and possibly other arrays) by copying them if they are still shared with the parent; to be called right before mutations (copy-on-write)."""
+        if self.board_shared:
+            self._copy_board()
+            self.board_shared = False
+    
+    def _copy_board(self):
+        """[To be implemented in subclasses using copy-on-write.] Replaces the board (and possibly other arrays) shared with the parent by copies."""
+        pass
+    
+    def _child(self, child_index):
+        """Returns the child implied by the action at given index of the arrays of children statistics (materializing the child state if not present yet, with statistics taken from the arrays - non-zero for an evicted child)."""
+        action_index = int(self.children_actions[child_index])
+        child = self.children.get(action_index)
+        if child is None:
+            child = self.take_action(action_index)
+            child.n = int(self.children_ns[child_index])
+            child.n_wins = int(self.children_ns_wins[child_index])
+        child.child_index = child_index
+        return child
     
+    def _free_subtree(self, depths_counts=None, depth=0):
+        """Frees the subtree rooted by this state eagerly - breaks parent-child reference cycles, so that states are released at once (without waiting for garbage collection) - and returns the number of freed states; 
+        if given, counts of nodes per depth (of a tree containing this state at given depth) are decreased accordingly."""
+        count = 0
+        stack = [(self, depth)]
+        while stack:
+            state, d = stack.pop()
+            stack.extend((child, d + 1) for child in state.children.values())
+            state._clear_children()
+            state.parent = None
+            if depths_counts is not None:
+                depths_counts[d] -= 1
+            count += 1
+        return count
+
+    def _clear_children(self):
+        """Removes all children of this state together with arrays of their statistics."""
+        self.children = {}
+        self.children_actions = None
+        self.children_ns = None
+        self.children_ns_wins = None
+        self.children_ns_amaf = None
+        self.children_ns_wins_amaf = None
+        self.children_hashes = None
+
     def get_turn(self):
         """
         Returns {-1, 1} indicating whose turn it is: -1 for the minimizing player, 1 for the maximizing player.
@@ -226,26 +323,271 @@ class State:
         """        
         return None
             
+    def legal_actions(self):
+        """
+        [To be overridden in subclasses by a direct generator of legal actions.]
+        
+        Returns indexes of actions legal in this state. The default implementation tries all possible action indexes, each on a copy of this state, and is therefore costly.
+        
+        Returns:
+            legal_actions (ndarray[np.int64, ndim=1]): 
+                one-dimensional array with indexes of legal actions (in ascending order).
+        """
+        legal_actions = []
+        for action_index in range(self.__class__.get_max_actions()):
+            if type(self)(self).take_action_job(action_index): # copying constructor
+                legal_actions.append(action_index)
+        return np.array(legal_actions, dtype=np.int64)
+            
     def expand(self):
         """        
-        Expands this state to generate its children by calling ``take_action`` multiple times for all possible action indexes. 
+        Expands this state lazily: records its legal actions (implied by ``legal_actions``) together with arrays of statistics (counts of visits and wins) of children implied by them.
+        Children states themselves are not created here - each of them is materialized (via ``take_action``) only when reached by the search for the first time.
+        Actions with no visits recorded are the untried ones.
         """
-        if len(self.children) == 0 and self.compute_outcome() is None:
-            for action_index in range(self.__class__.get_max_actions()):
-                self.take_action(action_index)
+        if self.children_actions is None and self.compute_outcome() is None:
+            self.children_actions = self.legal_actions().astype(np.int32)
+            self.children_ns = np.zeros(self.children_actions.size, dtype=np.int32)
+            self.children_ns_wins = np.zeros(self.children_actions.size, dtype=np.int32)
+            if len(self.children) > 0: # children materialized prior to expansion (e.g., within a previous search) keep their statistics
+                for i, action_index in enumerate(self.children_actions):
+                    child = self.children.get(int(action_index))
+                    if child is not None:
+                        child.child_index = i
+                        self.children_ns[i] = child.n
+                        self.children_ns_wins[i] = child.n_wins
     
-    def take_random_action_playout(self):
+    def take_random_action_playout(self, rng=None):
         """
-        [To be implemented in subclasses.]
-        
-        Should pick a uniformly random action from actions available in this state and return the result of calling ``take_action`` with the action index as argument.
+        Picks a uniformly random action from legal actions in this state (implied by ``legal_actions``) and returns the result of calling ``take_action`` with the action index as argument.
         
+        Args:
+            rng (np.random.Generator):
+                generator of random numbers, defaults to ``None`` (a generator shared by states).
         Returns:
             child (State): 
                 result of ``take_action`` call for the random action.          
         """
-        pass  
+        rng = State._DEFAULT_RNG if rng is None else rng
+        return self.take_action(int(rng.choice(self.legal_actions())))
+
+    def is_winning_action(self, action_index, token):
+        """
+        [To be overridden in subclasses by a direct check on the board, without creating any states.]
+        
+        Checks whether the given legal action, if played in this state by the player with pieces ``token`` (the one to move or the opponent), would win the game.
+        Used by the ``"heavy"`` playout policy (see ``take_heavy_action_playout``). The default implementation takes the action on a scratch copy of this state 
+        (not linked to the tree) with the turn set to ``token``.
+        
+        Args:
+            action_index (int):
+                index of a legal action.
+            token ({-1, 1}):
+                indicator of the player taking the action.
+        Returns:
+            winning (bool):
+                flag indicating whether the action would win the game for the player.
+        """
+        scratch = type(self)(self) # copying constructor
+        scratch.turn = token
+        if not scratch.take_action_job(action_index):
+            return False
+        scratch.last_action_index = action_index
+        return scratch.compute_outcome() == token
+
+    def threat_candidates(self, action_index):
+        """
+        [To be overridden in subclasses by a local check, e.g., cells along lines through the piece placed.]
+        
+        Returns indexes of legal actions that may have become immediate wins (see ``is_winning_action``) for either player due to the given action, taken last (leading to this state).
+        Used by the ``"heavy"`` playout policy to update threats incrementally (see ``take_heavy_action_playout``). The default implementation returns all legal actions.
+        
+        Args:
+            action_index (int):
+                index of the last action taken.
+        Returns:
+            candidates (iterable(int)):
+                indexes of legal actions to be checked for new immediate wins.
+        """
+        return self.legal_actions()
+
+    def take_heavy_action_playout(self, rng=None, threats=None):
+        """
+        Picks an action according to the ``"heavy"`` playout policy and returns the result of calling ``take_action`` with the action index as argument.
+        The policy plays an immediate win if there is one among legal actions, otherwise blocks an immediate win of the opponent (takes the action the opponent would win with), 
+        otherwise picks a uniformly random action. Immediate wins of both players (threats) are checked by ``is_winning_action`` and can be kept across calls within a playout: 
+        established by checking all legal actions at the first call, then updated after each action - threats no longer valid are dropped and only actions returned by 
+        ``threat_candidates`` (for the last action) are checked for new ones. Only the picked action is taken (materialized).
+        
+        Args:
+            rng (np.random.Generator):
+                generator of random numbers, defaults to ``None`` (a generator shared by states).
+            threats (list):
+                list kept by the caller across calls within a playout - empty at the first call, then containing two sets of actions (immediate wins of players -1 and 1, respectively) 
+                updated by each call; defaults to ``None`` (threats established anew and not kept).
+        Returns:
+            child (State): 
+                result of ``take_action`` call for the picked action.          
+        """
+        legal_actions = self.legal_actions()
+        if threats is None:
+            threats = []
+        if len(threats) == 0:
+            threats.extend({int(a) for a in legal_actions if self.is_winning_action(int(a), 2 * p - 1)} for p in range(2))
+        else:
+            legal = set(legal_actions.tolist())
+            for p in range(2):
+                threats[p] = {a for a in threats[p] if a in legal and self.is_winning_action(a, 2 * p - 1)}
+            for action_index in self.threat_candidates(self.last_action_index):
+                action_index = int(action_index)
+                for p in range(2):
+                    if action_index not in threats[p] and self.is_winning_action(action_index, 2 * p - 1):
+                        threats[p].add(action_index)
+        for token in (self.turn, -self.turn): # own wins first, then blocks
+            if threats[(token + 1) // 2]:
+                return self.take_action(min(threats[(token + 1) // 2]))
+        rng = State._DEFAULT_RNG if rng is None else rng
+        return self.take_action(int(rng.choice(legal_actions)))
+    
+    def playout(self, policy="uniform", actions=None, rng=None):
+        """
+        Carries out a playout from this state and returns its outcome.
+        The default implementation generates a chain of states by calling ``take_random_action_playout`` (or ``take_heavy_action_playout`` for policy ``"heavy"``) 
+        until a terminal state is reached (the chain is left as a branch of this state).
+        Meant to be overridden in subclasses by an implementation carrying out the playout in place, on a reusable scratch board, without creating any states.
+        
+        Args:
+            policy (str):
+                playout policy, ``"uniform"`` (uniformly random actions) or ``"heavy"`` (immediate wins played, immediate losses blocked), defaults to ``"uniform"``.
+            actions (ndarray[np.int16, ndim=2]):
+                optional array (two rows) in which the actions taken within the playout (first row) and the turns of players taking them (second row) are recorded 
+                (their count in the last entry of the first row), e.g., for AMAF statistics, defaults to ``None``.
+            rng (np.random.Generator):
+                generator of random numbers (each search passes its own), defaults to ``None`` (a generator shared by states).
+        Returns:
+            outcome ({-1, 0, 1}): 
+                outcome of the playout: -1 (win for minimizing player), 0 (draw), 1 (win for maximizing player).
+        """
+        state = self
+        threats = [] # immediate wins kept across the playout by the heavy policy
+        if actions is not None:
+            actions[0, -1] = 0
+        while True:
+            outcome = state.compute_outcome()
+            if outcome is not None:
+                return outcome
+            turn = state.turn
+            state = state.take_random_action_playout(rng) if policy == "uniform" else state.take_heavy_action_playout(rng, threats)
+            if actions is not None:
+                actions[0, actions[0, -1]] = state.last_action_index
+                actions[1, actions[0, -1]] = turn
+                actions[0, -1] += 1
+
+    def playouts(self, n_playouts, policy="uniform", rng=None):
+        """
+        Carries out a batch of playouts from this state and returns counts of their outcomes.
+        The default implementation calls ``playout`` in a loop. Meant to be overridden in subclasses by an implementation carrying out the whole batch within a single (compiled) call.
+        
+        Args:
+            n_playouts (int):
+                number of playouts.
+            policy (str):
+                playout policy, ``"uniform"`` or ``"heavy"`` (see ``playout``), defaults to ``"uniform"``.
+            rng (np.random.Generator):
+                generator of random numbers (see ``playout``), defaults to ``None``.
+        Returns:
+            outcomes_counts (ndarray[np.int64, ndim=1]):
+                counts of outcomes -1, 0, 1 (at indexes 0, 1, 2, respectively).
+        """
+        outcomes_counts = np.zeros(3, dtype=np.int64)
+        for _ in range(n_playouts):
+            outcomes_counts[self.playout(policy, None, rng) + 1] += 1
+        return outcomes_counts
     
+    @staticmethod
+    def _dihedral_cells_transforms(m, n):
+        """Returns mappings of flat cell indexes of a square board (``m == n``) under its 8 dihedral symmetries (identity, 3 rotations, 4 reflections)."""
+        cells = np.arange(m * n).reshape(m, n)
+        variants = [np.rot90(cells, k) for k in range(4)] + [np.rot90(np.fliplr(cells), k) for k in range(4)]
+        return np.array([np.argsort(variant.ravel()) for variant in variants]) # variant[p] is the cell moved to position p, hence the inverse
+
+    def _canonical_hashes(self):
+        """Returns Zobrist hashes of all symmetric variants of this position (pieces and player to act); meant to be extended in subclasses with further information (e.g., ``UTTT``)."""
+        cls = type(self)
+        hashes = State._pieces_hashes(self.get_board().ravel(), cls._ZOBRIST_KEYS_ARRAY, cls._CELLS_TRANSFORMS)
+        if self.turn == -1:
+            hashes ^= np.uint64(cls._ZOBRIST_TURN_KEY)
+        return hashes
+
+    @staticmethod
+    @njit(cache=True)
+    def _pieces_hashes(board, zobrist_keys, cells_transforms):
+        """Returns Zobrist hashes of pieces of the (flattened) board under all symmetry transforms (compiled)."""
+        hashes = np.zeros(cells_transforms.shape[0], dtype=np.uint64)
+        for cell in range(board.size):
+            if board[cell] != 0:
+                player = (board[cell] + 1) // 2
+                for t in range(cells_transforms.shape[0]):
+                    hashes[t] ^= zobrist_keys[player, cells_transforms[t, cell]]
+        return hashes
+
+    def canonical_key(self):
+        """
+        Returns the canonical key of this position - the smallest Zobrist hash over all its symmetric variants (equal for all symmetric positions) - 
+        and the index of the transform mapping this position to the canonical one (to map actions via ``action_to_canonical``).
+        For classes without symmetries (``_CELLS_TRANSFORMS`` is ``None``) the key is just ``zobrist_hash`` and the transform is the identity (``0``).
+        
+        Returns:
+            canonical_key (int or ``None``):
+                canonical key of this position (``None`` if hashing is not supported).
+            transform (int):
+                index of transform mapping this position to the canonical one.
+        """
+        if type(self)._CELLS_TRANSFORMS is None:
+            return self.zobrist_hash, 0
+        hashes = self._canonical_hashes()
+        transform = int(np.argmin(hashes))
+        return int(hashes[transform]), transform
+    
+    def child_hash(self, action_index):
+        """
+        [To be implemented in subclasses maintaining ``zobrist_hash``.]
+        
+        Returns the Zobrist hash of the child reached by given legal action, updated from ``zobrist_hash`` of this state as in ``take_action_job`` but without taking the action, 
+        or ``None`` if it cannot be updated locally (then the hash is computed on a copy of this state).
+        
+        Args:
+            action_index (int):
+                index of a legal action.
+        Returns:
+            child_hash (int or ``None``):
+                Zobrist hash of the child.
+        """
+        return None
+    
+    def _child_canonical_hashes(self, hashes, action_index):
+        """[To be implemented in subclasses with symmetries.] Returns hashes of all symmetric variants of the child reached by given legal action, updated from ``hashes`` of variants of this position 
+        (see ``_canonical_hashes``), or ``None`` if they cannot be updated locally."""
+        return None
+
+    @classmethod
+    def action_to_canonical(cls, action_index, transform):
+        """
+        Maps an action index in a position to the corresponding action index in the canonical position (see ``canonical_key``).
+        
+        Args:
+            action_index (int):
+                index of action in the original position.
+            transform (int):
+                index of transform (as returned by ``canonical_key``).
+        Returns:
+            action_index (int):
+                index of the corresponding action in the canonical position.
+        """
+        if cls._ACTIONS_TRANSFORMS is None:
+            return action_index
+        return int(cls._ACTIONS_TRANSFORMS[transform, action_index])
+
     @staticmethod
     def action_name_to_index(action_name):
         """
@@ -316,16 +658,429 @@ class State:
                 maximum number of actions (the largest branching factor) possible in the game represented by this class.
         """        
         pass
-    
-                                 
+
+
+class ArrayTree:
+    """
+    Struct-of-arrays representation of a search tree, applicable by ``MCTS`` (when constructed with ``array_tree=True``) in place of the graph of ``State`` objects.
+    Each node is described by one entry in each of several parallel ``numpy`` arrays (parent, action, depth, turn, terminal flag, outcome, counts, etc.).
+    A node is added only once it is visited for the first time. When a node is expanded, its legal actions are stored in a contiguous segment of a pool of actions
+    (``pool_actions``, with the segment given by ``pool_offsets[i]`` and ``ns_legal[i]``): actions of children already added come first (in the order of additions), untried actions follow.
+    Indexes of children of node ``i`` are stored in the parallel pool ``pool_children`` - they form the slice ``pool_children[pool_offsets[i]: pool_offsets[i] + ns_children[i]]``.
+    Nodes do not keep boards - game rules are still supplied by ``State`` subclasses, whose instances are carried down the path (by taking actions in place) during selection.
+    Outcomes of nodes are computed lazily, i.e., once nodes are reached by selection or picked for playouts.
+
+    Attributes:
+        DEFAULT_INITIAL_CAPACITY (int):
+            initial number of nodes for which memory is allocated, defaults to ``1024`` (arrays grow twice when exhausted).
+        DEFAULT_INITIAL_POOL_CAPACITY (int):
+            initial number of entries of pools of actions and children, defaults to ``16384`` (pools grow twice when exhausted).
+        ARRAYS_NAMES (List):
+            names of parallel arrays describing nodes.
+        POOLS_NAMES (List):
+            names of parallel pools describing actions of expanded nodes.
+    """
+
+    DEFAULT_INITIAL_CAPACITY = 1024
+    DEFAULT_INITIAL_POOL_CAPACITY = 16384
+    ARRAYS_NAMES = ["parents", "pool_offsets", "ns_legal", "ns_children", "actions", "depths", "turns", "outcomes_computed", "terminals", "outcomes", "win_flags", "ns", "ns_wins"]
+    POOLS_NAMES = ["pool_actions", "pool_children"]
+
+    def __init__(self, initial_capacity=DEFAULT_INITIAL_CAPACITY, initial_pool_capacity=DEFAULT_INITIAL_POOL_CAPACITY):
+        """
+        Constructor of ``ArrayTree`` instances (empty trees).
+
+        Args:
+            initial_capacity (int):
+                initial number of nodes for which memory is allocated, defaults to ``1024``.
+            initial_pool_capacity (int):
+                initial number of entries of pools of actions and children, defaults to ``16384``.
+        """
+        self.size = 0
+        self.capacity = initial_capacity
+        self.parents = np.full(self.capacity, -1, dtype=np.int32)
+        self.pool_offsets = np.full(self.capacity, -1, dtype=np.int32) # -1 for a node not expanded yet
+        self.ns_legal = np.zeros(self.capacity, dtype=np.int16)
+        self.ns_children = np.zeros(self.capacity, dtype=np.int16)
+        self.actions = np.full(self.capacity, -1, dtype=np.int16) # actions leading to nodes from their parents
+        self.depths = np.zeros(self.capacity, dtype=np.int16)
+        self.turns = np.zeros(self.capacity, dtype=np.int8)
+        self.outcomes_computed = np.zeros(self.capacity, dtype=bool)
+        self.terminals = np.zeros(self.capacity, dtype=bool)
+        self.outcomes = np.zeros(self.capacity, dtype=np.int8)
+        self.win_flags = np.zeros(self.capacity, dtype=bool)
+        self.ns = np.zeros(self.capacity, dtype=np.int32)
+        self.ns_wins = np.zeros(self.capacity, dtype=np.int32)
+        self.pool_size = 0
+        self.pool_capacity = initial_pool_capacity
+        self.pool_actions = np.zeros(self.pool_capacity, dtype=np.int16)
+        self.pool_children = np.zeros(self.pool_capacity, dtype=np.int32)
+
+    def _grow(self, required_capacity):
+        """Enlarges (at least twice) all the arrays so that they can store the required number of nodes."""
+        new_capacity = max(2 * self.capacity, required_capacity)
+        for name in ArrayTree.ARRAYS_NAMES:
+            old_array = getattr(self, name)
+            new_array = np.zeros(new_capacity, dtype=old_array.dtype)
+            new_array[:self.size] = old_array[:self.size]
+            setattr(self, name, new_array)
+        self.capacity = new_capacity
+
+    def _grow_pool(self, required_capacity):
+        """Enlarges (at least twice) the pools so that they can store the required number of entries."""
+        new_capacity = max(2 * self.pool_capacity, required_capacity)
+        for name in ArrayTree.POOLS_NAMES:
+            old_pool = getattr(self, name)
+            new_pool = np.zeros(new_capacity, dtype=old_pool.dtype)
+            new_pool[:self.pool_size] = old_pool[:self.pool_size]
+            setattr(self, name, new_pool)
+        self.pool_capacity = new_capacity
+
+    def add_root(self, turn, outcome):
+        """
+        Clears the tree and adds to it the root node.
+
+        Args:
+            turn {-1, 1}:
+                indicator of the player to act at the root.
+            outcome ({-1, 0, 1} or ``None``):
+                outcome of the game at the root (``None`` for an ongoing game).
+        Returns:
+            root (int):
+                index of the root node (always ``0``).
+        """
+        self.size = 1
+        self.pool_size = 0
+        self.parents[0] = -1
+        self.pool_offsets[0] = -1
+        self.ns_legal[0] = 0
+        self.ns_children[0] = 0
+        self.actions[0] = -1
+        self.depths[0] = 0
+        self.turns[0] = turn
+        self.set_outcome(0, outcome)
+        self.win_flags[0] = False
+        self.ns[0] = 0
+        self.ns_wins[0] = 0
+        return 0
+
+    def expand(self, node, actions):
+        """
+        Stores legal actions of the given node (as its untried actions), without adding any children.
+
+        Args:
+            node (int):
+                index of the node to be expanded.
+            actions (ndarray[np.int16, ndim=1]):
+                indexes of legal actions in the node.
+        """
+        k = actions.size
+        offset = self.pool_size
+        if offset + k > self.pool_capacity:
+            self._grow_pool(offset + k)
+        self.pool_actions[offset:offset + k] = actions
+        self.pool_offsets[node] = offset
+        self.ns_legal[node] = k
+        self.ns_children[node] = 0
+        self.pool_size = offset + k
+
+    def add_child(self, parent, entry, turn):
+        """
+        Adds the child of the given (expanded) node implied by its untried action at given entry of the pool (the action is moved to the front of untried ones, i.e., becomes tried).
+        The outcome of the child remains not computed.
+
+        Args:
+            parent (int):
+                index of the parent node.
+            entry (int):
+                index of an untried action of the parent in the pool (within the segment of the parent).
+            turn ({-1, 1}):
+                indicator of the player to act at the child.
+        Returns:
+            child (int):
+                index of the child.
+        """
+        if self.size == self.capacity:
+            self._grow(self.size + 1)
+        child = self.size
+        front = self.pool_offsets[parent] + self.ns_children[parent]
+        action = self.pool_actions[entry]
+        self.pool_actions[entry] = self.pool_actions[front]
+        self.pool_actions[front] = action
+        self.pool_children[front] = child
+        self.ns_children[parent] += 1
+        self.parents[child] = parent
+        self.pool_offsets[child] = -1
+        self.ns_legal[child] = 0
+        self.ns_children[child] = 0
+        self.actions[child] = action
+        self.depths[child] = self.depths[parent] + 1
+        self.turns[child] = turn
+        self.outcomes_computed[child] = False
+        self.terminals[child] = False
+        self.outcomes[child] = 0
+        self.win_flags[child] = False
+        self.ns[child] = 0
+        self.ns_wins[child] = 0
+        self.size = child + 1
+        return child
+
+    def set_outcome(self, node, outcome):
+        """
+        Memorizes the outcome computed for the given node (and the implied terminal and win flags).
+
+        Args:
+            node (int):
+                index of a node.
+            outcome ({-1, 0, 1} or ``None``):
+                game outcome at the node (``None`` for an ongoing game).
+        """
+        self.outcomes_computed[node] = True
+        self.terminals[node] = outcome is not None
+        self.outcomes[node] = outcome if outcome is not None else 0
+        self.win_flags[node] = outcome is not None and outcome == -self.turns[node]
+
+    def children(self, node):
+        """
+        Returns indexes of children (added so far) of the given node.
+
+        Args:
+            node (int):
+                index of a node.
+        Returns:
+            children (ndarray[np.int32, ndim=1]):
+                indexes of children (empty for a leaf).
+        """
+        offset = self.pool_offsets[node]
+        if offset < 0:
+            return self.pool_children[:0]
+        return self.pool_children[offset:offset + self.ns_children[node]]
+
+    def memory(self):
+        """
+        Returns the number of bytes used to memorize nodes and entries of pools (up to the current sizes, without the spare capacity).
+
+        Returns:
+            memory (int):
+                number of bytes.
+        """
+        return self.size * ArrayTree.node_memory() + self.pool_size * sum(getattr(self, name).itemsize for name in ArrayTree.POOLS_NAMES)
+
+    @staticmethod
+    def node_memory():
+        """
+        Returns the number of bytes used to memorize one node (summed over all arrays, without entries of pools).
+
+        Returns:
+            node_memory (int):
+                number of bytes per node.
+        """
+        tree = ArrayTree(1, 1)
+        return sum(getattr(tree, name).itemsize for name in ArrayTree.ARRAYS_NAMES)
+
+
+class TranspositionTable:
+    """
+    Bounded table of statistics (counts of visits and wins) of positions, indexed by Zobrist hashes of states, allowing ``MCTS`` to share statistics between transpositions
+    (the same position reached via different sequences of actions).
+    The table consists of buckets with two slots each; a bucket is implied by the lowest bits of a hash.
+    Replacement policy (two-tier): the first slot is visits-preferred (never overwritten), the second one is always-replace (a new position takes it over);
+    whenever the entry in the second slot gathers more visits than the one in the first slot, the two entries are swapped.
+    Counts of hits, misses (lookups) and replacements (overwritten entries) are kept for performance information.
+
+    Attributes:
+        DEFAULT_CAPACITY (int):
+            default number of entries (slots), defaults to ``2**20``.
+    """
+
+    DEFAULT_CAPACITY = 2**20
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Constructor of ``TranspositionTable`` instances (empty tables).
+
+        Args:
+            capacity (int):
+                number of entries (rounded up to a power of two, at least ``2``), defaults to ``2**20``.
+        """
+        n_buckets = 1 << max(int(np.ceil(np.log2(max(capacity, 2)))) - 1, 0)
+        self.mask = n_buckets - 1
+        self.capacity = 2 * n_buckets
+        self.keys = np.zeros((n_buckets, 2), dtype=np.uint64)
+        self.ns = np.zeros((n_buckets, 2), dtype=np.int32) # zero visits imply an empty slot
+        self.ns_wins = np.zeros((n_buckets, 2), dtype=np.int32)
+        self.reset_counters()
+
+    def reset_counters(self):
+        """
+        Zeroes counts of hits, misses and replacements.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+
+    def clear(self):
+        """
+        Removes all entries and zeroes the counters.
+        """
+        self.keys[:] = 0
+        self.ns[:] = 0
+        self.ns_wins[:] = 0
+        self.reset_counters()
+
+    def lookup(self, keys, ns, ns_wins):
+        """
+        Looks up statistics of positions with given hashes and returns them where the table holds more visits than given counts (e.g., of children in a tree), otherwise the given counts.
+
+        Args:
+            keys (ndarray[np.uint64, ndim=1]):
+                Zobrist hashes of positions.
+            ns (ndarray[np.int32, ndim=1]):
+                counts of visits of positions (not modified).
+            ns_wins (ndarray[np.int32, ndim=1]):
+                counts of wins of positions (not modified).
+        Returns:
+            ns (ndarray[np.int32, ndim=1]):
+                greater counts of visits of positions.
+            ns_wins (ndarray[np.int32, ndim=1]):
+                counts of wins of positions accompanying the greater counts of visits.
+            n (int):
+                sum of greater counts of visits.
+        """
+        ns = ns.copy()
+        ns_wins = ns_wins.copy()
+        n_hits, n = TranspositionTable._lookup(keys, np.uint64(self.mask), self.keys, self.ns, self.ns_wins, ns, ns_wins)
+        self.hits += n_hits
+        self.misses += keys.size - n_hits
+        return ns, ns_wins, n
+
+    @staticmethod
+    @njit(cache=True)
+    def _lookup(keys, mask, table_keys, table_ns, table_ns_wins, ns, ns_wins):
+        """Replaces (in place) counts of visits and wins of positions with given hashes by ones from arrays of the table where they are greater (compiled); returns the number of hits and the sum of resulting counts of visits."""
+        n_hits = 0
+        n = 0
+        for i in range(keys.size):
+            bucket = np.int64(keys[i] & mask)
+            for slot in range(2):
+                if table_ns[bucket, slot] > 0 and table_keys[bucket, slot] == keys[i]:
+                    if table_ns[bucket, slot] > ns[i]:
+                        ns[i] = table_ns[bucket, slot]
+                        ns_wins[i] = table_ns_wins[bucket, slot]
+                    n_hits += 1
+                    break
+            n += ns[i]
+        return n_hits, n
+
+    def update(self, keys, n, ns_wins):
+        """
+        Adds counts of visits and wins to entries of positions with given hashes (creating entries if absent, in compliance with the replacement policy), one position after another.
+
+        Args:
+            keys (ndarray[np.uint64, ndim=1]):
+                Zobrist hashes of positions.
+            n (int):
+                count of visits to be added to each position.
+            ns_wins (ndarray[np.int32, ndim=1]):
+                counts of wins to be added.
+        """
+        self.replacements += TranspositionTable._update(keys, n, ns_wins, np.uint64(self.mask), self.keys, self.ns, self.ns_wins)
+
+    @staticmethod
+    @njit(cache=True)
+    def _update(keys, n, ns_wins, mask, table_keys, table_ns, table_ns_wins):
+        """Adds counts of visits and wins to entries of positions with given hashes in arrays of the table (compiled); returns the number of replacements."""
+        n_replacements = 0
+        for i in range(keys.size):
+            key = keys[i]
+            bucket = np.int64(key & mask)
+            if table_ns[bucket, 0] > 0 and table_keys[bucket, 0] == key:
+                table_ns[bucket, 0] += n
+                table_ns_wins[bucket, 0] += ns_wins[i]
+                continue
+            if table_ns[bucket, 0] == 0:
+                table_keys[bucket, 0] = key
+                table_ns[bucket, 0] = n
+                table_ns_wins[bucket, 0] = ns_wins[i]
+                continue
+            if table_ns[bucket, 1] > 0 and table_keys[bucket, 1] == key:
+                table_ns[bucket, 1] += n
+                table_ns_wins[bucket, 1] += ns_wins[i]
+            else:
+                if table_ns[bucket, 1] > 0:
+                    n_replacements += 1
+                table_keys[bucket, 1] = key
+                table_ns[bucket, 1] = n
+                table_ns_wins[bucket, 1] = ns_wins[i]
+            if table_ns[bucket, 1] > table_ns[bucket, 0]: # promoting to the visits-preferred slot
+                table_keys[bucket, 0], table_keys[bucket, 1] = table_keys[bucket, 1], table_keys[bucket, 0]
+                table_ns[bucket, 0], table_ns[bucket, 1] = table_ns[bucket, 1], table_ns[bucket, 0]
+                table_ns_wins[bucket, 0], table_ns_wins[bucket, 1] = table_ns_wins[bucket, 1], table_ns_wins[bucket, 0]
+        return n_replacements
+
+    def size(self):
+        """
+        Returns the number of occupied entries.
+
+        Returns:
+            size (int):
+                number of occupied entries.
+        """
+        return int(np.count_nonzero(self.ns))
+
+    def memory(self):
+        """
+        Returns the number of bytes occupied by the arrays of this table.
+
+        Returns:
+            memory (int):
+                number of bytes.
+        """
+        return self.keys.nbytes + self.ns.nbytes + self.ns_wins.nbytes
+
+
 class MCTS:
     """
     Monte Carlo Tree Search - standard, referential implementation (for CPU, single-threaded).
+    Optionally root-parallel: with ``n_workers > 1`` independent trees are grown from the same root (with different seeds) by this process and by ``n_workers - 1`` worker processes
+    (started once, at the first run, and kept for subsequent runs); statistics of root actions are summed over trees prior to the final decision.
+    Optionally leaf-parallel: with ``n_playouts > 1`` each step carries out a batch of playouts from the expanded child (see ``State.playouts``) 
+    and backs up aggregated counts of visits and wins in one pass.
+    Optionally, with ``transposition_table_capacity > 0``, statistics of positions are additionally gathered in a ``TranspositionTable`` (shared between transpositions)
+    and used in UCB formula (tree of ``State`` objects only): for each child, counts of visits and wins of its position are taken from the table whenever they exceed those of the tree edge,
+    so that both action-value estimates and exploration terms benefit from visits gathered via other transpositions (a child never visited via this edge but known from the table is not treated as unvisited).
+    Optionally, with ``symmetries=True``, symmetric positions are collapsed (see ``State.canonical_key``): the root keeps one action per class of symmetric children 
+    and the transposition table (if any) is indexed by canonical keys.
+    Optionally, with ``stop_rule`` set, a search is stopped before its computational budget is exhausted once the final decision becomes settled (see ``utils.stop_reason``).
+    Between searches, ``reroot`` should be called after each move played in the game (by either player): it promotes the subtree of the new position and frees the rest of the tree.
+    Optionally, with ``max_nodes`` or ``max_memory`` set, the tree is kept within a budget: once exceeded, the lowest-visit subtrees are evicted (down to ``EVICTION_TARGET`` of the budget),
+    while their statistics remain collapsed into arrays of children statistics of their parents (an evicted state reached again is rebuilt as a leaf with those statistics).
+    Optionally, with ``ponder=True`` (and ``vanilla=False``), ``start_pondering`` lets the search go on in a background thread while the opponent is to move; 
+    once the opponent's move arrives (``reroot`` or ``run``), the pondered subtree of the new position is kept and the next search starts warm. 
+    Pondering pays off when the opponent does not compete for the interpreter (a human, a process or a device); within a single process, threads share one interpreter lock.
+    Optionally, with ``playout_policy="heavy"``, playouts play immediate wins and block immediate losses (see ``State.playout``) - fewer but more informative playouts per second.
+    Optionally, with ``rave=True``, all-moves-as-first (AMAF) statistics are gathered from playouts (an action counts for a state if the player to act there took it anywhere later - in the tree or in the playout)
+    and blended into UCB formula at selection (RAVE), with the weight of AMAF estimates decaying as counts of visits grow (see ``rave_k``) - useful for large branching factors, e.g., Gomoku.
     """
     
     DEFAULT_SEARCH_TIME_LIMIT = 5.0 # [s], np.inf possible
     DEFAULT_SEARCH_STEPS_LIMIT = np.inf # integer, np.inf possible
     DEFAULT_VANILLA = True
+    DEFAULT_ARRAY_TREE = False
+    DEFAULT_N_WORKERS = 1
+    DEFAULT_N_PLAYOUTS = 1
+    DEFAULT_TRANSPOSITION_TABLE_CAPACITY = 0
+    DEFAULT_SYMMETRIES = False
+    DEFAULT_STOP_RULE = None
+    STOP_CHECK_INTERVAL = 0.01 # [s]
+    DEFAULT_MAX_NODES = np.inf # integer, np.inf possible
+    DEFAULT_MAX_MEMORY = np.inf # [B], np.inf possible
+    DEFAULT_PONDER = False
+    DEFAULT_PLAYOUT_POLICY = "uniform"
+    DEFAULT_RAVE = False
+    DEFAULT_RAVE_K = 1000.0 # equivalence parameter of RAVE (number of visits for which AMAF and direct estimates are weighted equally)
+    EVICTION_TARGET = 0.75 # fraction of the budget (nodes) left after an eviction
+    MEMORY_CHECK_GROWTH = 1.25 # memory of the tree measured again once its size grows by this factor
     DEFAULT_UCB_C = 2.0
     DEFAULT_SEED = 0
     DEFAULT_VERBOSE_DEBUG = False
@@ -333,8 +1088,10 @@ class MCTS:
     
     def __init__(self, 
                  search_time_limit=DEFAULT_SEARCH_TIME_LIMIT, search_steps_limit=DEFAULT_SEARCH_STEPS_LIMIT,
-                 vanilla=DEFAULT_VANILLA,                  
-                 ucb_c=DEFAULT_UCB_C, seed=DEFAULT_SEED,
+                 vanilla=DEFAULT_VANILLA, array_tree=DEFAULT_ARRAY_TREE, n_workers=DEFAULT_N_WORKERS, n_playouts=DEFAULT_N_PLAYOUTS,
+                 transposition_table_capacity=DEFAULT_TRANSPOSITION_TABLE_CAPACITY, symmetries=DEFAULT_SYMMETRIES, stop_rule=DEFAULT_STOP_RULE, 
+                 max_nodes=DEFAULT_MAX_NODES, max_memory=DEFAULT_MAX_MEMORY, ponder=DEFAULT_PONDER, playout_policy=DEFAULT_PLAYOUT_POLICY, 
+                 rave=DEFAULT_RAVE, rave_k=DEFAULT_RAVE_K, ucb_c=DEFAULT_UCB_C, seed=DEFAULT_SEED,
                  verbose_debug=DEFAULT_VERBOSE_DEBUG, verbose_info=DEFAULT_VERBOSE_INFO):
         """
         Constructor of ``MCTS`` instances.
@@ -346,6 +1103,41 @@ class MCTS:
                 steps limit (computational budget), ``np.inf`` if no limit, defaults to ``np.inf``.
             vanilla (bool):
                 flag indicating whether information (partial tree, action-value estimates, etc.) from previous searches is ignored, defaults to ``True``.
+            array_tree (bool):
+                flag indicating whether the tree is to be stored as an ``ArrayTree`` (struct of arrays) rather than a graph of ``State`` objects, defaults to ``False``;
+                an array tree is built anew in each run (as if ``vanilla=True``).
+            n_workers (int):
+                number of independent trees in root-parallel mode (this process and ``n_workers - 1`` worker processes, each working with seed ``seed + worker index``), defaults to ``1`` (no parallelism);
+                trees of worker processes are built anew in each run (as if ``vanilla=True``).
+            n_playouts (int):
+                number of independent playouts carried out (as one batch) from the expanded child in each step, defaults to ``1``.
+            transposition_table_capacity (int):
+                number of entries of the transposition table, defaults to ``0`` (no table); the table requires states maintaining ``zobrist_hash`` and is ignored with ``array_tree=True``;
+                unless ``vanilla=True``, its contents are kept between runs.
+            symmetries (bool):
+                flag indicating whether symmetric positions are collapsed - at the root (one action searched per class of symmetric children) and in the transposition table (canonical keys), 
+                defaults to ``False``; ignored with ``array_tree=True``.
+            stop_rule (str):
+                opt-in rule of early termination from {``None``, ``"settled"``, ``"confident"``}, defaults to ``None`` (full budget always used); 
+                ``"settled"`` stops once no other root action can overtake the best one within the remaining budget, ``"confident"`` - additionally once that is unlikely
+                (the runner-up would need more than twice its share of visits so far); ignored when ``forced_search_steps_limit`` is given; in root-parallel mode, once the rule stops 
+                the search of this process, worker processes are signalled to stop theirs.
+            max_nodes (int):
+                budget on the number of tree nodes (states), ``np.inf`` if no budget, defaults to ``np.inf``; ignored with ``array_tree=True``.
+            max_memory (int):
+                budget on memory of the tree in bytes (see ``State._subtree_memory``), ``np.inf`` if no budget, defaults to ``np.inf``; ignored with ``array_tree=True``.
+            ponder (bool):
+                flag indicating whether ``start_pondering`` searches in background during the opponent's turn, defaults to ``False``; ignored with ``vanilla=True`` or ``array_tree=True``.
+            playout_policy (str):
+                playout policy from {``"uniform"``, ``"heavy"``} (see ``State.playout``), defaults to ``"uniform"``.
+            rave (bool):
+                flag indicating whether AMAF statistics are gathered and blended into UCB formula (RAVE), defaults to ``False``; not applicable with ``array_tree=True`` or ``n_playouts > 1`` (changed to ``False``).
+            rave_k (float):
+                equivalence parameter of RAVE: the weight of AMAF estimate of an action visited ``n`` times equals ``sqrt(rave_k / (3 * n + rave_k))``, defaults to ``1000.0``.
+            ucb_c (float):
+                value of C constant, influencing exploration tendency, appearing in UCT formula (upper confidence bounds for trees), defaults to ``2.0``.
+            seed (int):
+                seed for the random numbers generator (owned by this instance and passed to playouts, so that instances in one process do not affect each other's random streams), defaults to ``0``.
             verbose_debug (bool):
                 debug verbosity flag, if ``True`` then detailed information about each kernel invocation are printed to console (in each iteration), defaults to ``False``.
             verbose_info (bool): 
@@ -354,9 +1146,39 @@ class MCTS:
         self.search_time_limit = search_time_limit
         self.search_steps_limit = search_steps_limit
         self.vanilla = vanilla # if True, statistics from previous runs (searches) are not reused         
+        self.array_tree = array_tree
+        self.n_workers = n_workers
+        self.n_playouts = n_playouts
+        self.transposition_table_capacity = transposition_table_capacity
+        self.transposition_table = TranspositionTable(transposition_table_capacity) if transposition_table_capacity > 0 else None
+        self.symmetries = symmetries
+        self.stop_rule = stop_rule if stop_rule in STOP_RULES else None
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.ponder = ponder
+        self.playout_policy = playout_policy if playout_policy in PLAYOUT_POLICIES else self.DEFAULT_PLAYOUT_POLICY
+        self.rave = rave
+        if self.rave and (self.array_tree or self.n_playouts > 1):
+            print(f"[rave: {self.rave} not applicable with array_tree: {self.array_tree}, n_playouts: {self.n_playouts}; changed to: False]")
+            self.rave = False
+        self.rave_k = rave_k
+        self.playout_actions = None # actions taken within the last playout (gathered for AMAF statistics)
+        self.ponder_thread = None # background thread searching from ponder_root (a detached copy of ponder_state) during the opponent's turn
+        self.ponder_event = None
+        self.ponder_state = None
+        self.ponder_root = None
+        self.ponder_info = {"steps": 0, "time_[ms]": 0.0, "grafted_visits": 0} # gathered between runs
+        self.own_root = None # last root whose statistics were gathered by this AI (by its search, pondering or carried over by reroot), as opposed to other AIs possibly sharing states
+        self.own_n = 0 # snapshot of visits of own_root
+        self.own_children_ns = None # snapshot of visits of children of own_root (dict: action -> n)
+        self.metrics_root = None # root of the tree whose metrics (tree_size, depths_counts) are maintained incrementally
+        self.reroot_info = {"calls": 0, "carried_nodes": 0, "carried_visits": 0, "freed_nodes": 0} # gathered between runs
+        self.workers = None # pairs (process, connection) started at the first run in root-parallel mode
+        self.stop_connection = None # connection polled for a signal to stop the search early (sent by the main process to its workers in root-parallel mode)
         self.ucb_c = ucb_c                 
         self.seed = seed
-        np.random.seed(self.seed)
+        self.rng = np.random.default_rng(self.seed) # used by expansions and playouts (also compiled ones) of this instance
+        self.ponder_rng = np.random.default_rng(np.random.SeedSequence(self.seed).spawn(1)[0]) # separate generator of the pondering thread
         self.verbose_debug = verbose_debug
         self.verbose_info = verbose_info
 
@@ -367,7 +1189,7 @@ class MCTS:
         Returns:
             str: string representation of this ``MCTS`` instance.
         """           
-        return f"MCTS(search_time_limit={self.search_time_limit}, search_steps_limit={self.search_steps_limit}, vanilla={self.vanilla}, ucb_c={self.ucb_c}, seed: {self.seed})"
+        return f"MCTS(search_time_limit={self.search_time_limit}, search_steps_limit={self.search_steps_limit}, vanilla={self.vanilla}, array_tree={self.array_tree}, n_workers={self.n_workers}, n_playouts={self.n_playouts}, transposition_table_capacity={self.transposition_table_capacity}, symmetries={self.symmetries}, stop_rule={self.stop_rule}, max_nodes={self.max_nodes}, max_memory={self.max_memory}, ponder={self.ponder}, playout_policy={self.playout_policy}, rave={self.rave}, rave_k={self.rave_k}, ucb_c={self.ucb_c}, seed: {self.seed})"
         
     def __repr__(self):
         """
@@ -386,12 +1208,13 @@ class MCTS:
         performance_info = {}
         performance_info["steps"] = self.steps
         performance_info["steps_per_second"] = self.steps / self.time_total                
-        performance_info["playouts"] = self.root.n
+        performance_info["playouts"] = (int(self.tree.ns[0]) if self.array_tree else self.root.n) + self.workers_playouts
         performance_info["playouts_per_second"] = performance_info["playouts"] / self.time_total           
         ms_factor = 10.0**3
         times_info = {}
         times_info["total"] = ms_factor * self.time_total
         times_info["loop"] = ms_factor * self.time_loop
+        times_info["reduce_over_trees"] = ms_factor * self.time_reduce_over_trees
         times_info["reduce_over_actions"] = ms_factor * self.time_reduce_over_actions
         times_info["mean_loop"] = times_info["loop"] / self.steps
         times_info["mean_select"] = ms_factor * self.time_select / self.steps
@@ -399,60 +1222,94 @@ class MCTS:
         times_info["mean_playout"] = ms_factor * self.time_playout / self.steps
         times_info["mean_backup"] = ms_factor * self.time_backup / self.steps
         performance_info["times_[ms]"] = times_info
+        performance_info["stop"] = self.stop_info
+        performance_info["reroot"] = self.last_reroot_info
+        if self.ponder:
+            performance_info["ponder"] = self.last_ponder_info
         tree_info = {}
         tree_info["initial_n_root"] = self.initial_n_root
         tree_info["initial_mean_depth"] = self.initial_mean_depth        
         tree_info["initial_max_depth"] = self.initial_max_depth
         tree_info["initial_size"] = self.initial_size            
-        tree_info["n_root"] = self.root.n
-        tree_info["mean_depth"] = np.mean(self.root._subtree_depths(0, []))
-        tree_info["max_depth"] = self.root._subtree_max_depth()
-        tree_info["size"] = self.root._subtree_size()              
+        if self.array_tree:
+            size = self.tree.size
+            tree_info["n_root"] = int(self.tree.ns[0])
+            tree_info["mean_depth"] = np.mean(self.tree.depths[:size])
+            tree_info["max_depth"] = int(np.max(self.tree.depths[:size]))
+            tree_info["size"] = size
+            tree_info["memory_[B]"] = self.tree.memory()
+            tree_info["node_memory_[B]"] = tree_info["memory_[B]"] / size
+        else:
+            tree_info["n_root"] = self.root.n
+            tree_info["mean_depth"], tree_info["max_depth"] = self._depths_stats(self.depths_counts)
+            tree_info["size"] = self.tree_size
+            tree_info["depths_counts"] = self.depths_counts[:tree_info["max_depth"] + 1]
+            tree_info["memory_[B]"] = self.root._subtree_memory()
+            tree_info["node_memory_[B]"] = tree_info["memory_[B]"] / tree_info["size"]
         performance_info["tree"] = tree_info
+        if self.budget:
+            eviction_info = {}
+            eviction_info["max_nodes"] = self.max_nodes
+            eviction_info["max_memory_[B]"] = self.max_memory
+            eviction_info["evictions"] = self.evictions
+            eviction_info["evicted_subtrees"] = self.evicted_subtrees
+            eviction_info["evicted_nodes"] = self.evicted_nodes
+            eviction_info["evicted_visits"] = self.evicted_visits
+            performance_info["eviction"] = eviction_info
+        if self.symmetries and not self.array_tree and self.root.zobrist_hash is not None:
+            symmetries_info = {}
+            symmetries_info["root_actions"] = self.root_n_actions
+            symmetries_info["root_classes"] = 0 if self.root.children_actions is None else self.root.children_actions.size
+            performance_info["symmetries"] = symmetries_info
+        if self.transpositions:
+            table = self.transposition_table
+            table_info = {}
+            table_info["capacity"] = table.capacity
+            table_info["size"] = table.size()
+            table_info["memory_[B]"] = table.memory()
+            table_info["hits"] = table.hits
+            table_info["misses"] = table.misses
+            table_info["hit_rate"] = table.hits / max(table.hits + table.misses, 1)
+            table_info["replacements"] = table.replacements
+            performance_info["transposition_table"] = table_info
         self.performance_info = performance_info
         return performance_info
 
                 
-    def _make_actions_info(self, children, best_action_entry=False):
+    def _make_actions_info(self, state, best_action_entry=False):
         """
-        Prepares and returns a dictionary with information on root actions implied by the last run, in particular: estimates of action values, their UCBs, counts of times actions were taken, etc.
+        Prepares and returns a dictionary with information on actions of the given state (the root) implied by the last run, in particular: estimates of action values, their UCBs, counts of times actions were taken, etc.
+        Entries are built from arrays of children statistics of the state, hence they cover all its legal actions - also the ones never tried (``n`` equal to ``0``, infinite UCB), whose children states were never materialized.
         After the call, available via ``actions_info`` attribute.
         """
         actions_info = {}
-        for key in children.keys():
-            n_root = children[key].parent.n
-            win_flag = children[key].win_flag
-            n = children[key].n
-            n_wins = children[key].n_wins        
+        n_root = state.n
+        if state.children_actions is not None:
+            actions, ns, ns_wins = state.children_actions, state.children_ns, state.children_ns_wins
+        else: # state not expanded (e.g., no steps carried out)
+            actions = state.legal_actions() if state.compute_outcome() is None else np.zeros(0, dtype=np.int32)
+            ns = ns_wins = np.zeros(actions.size, dtype=np.int32)
+        for i, key in enumerate(actions.tolist()):
+            n = int(ns[i])
+            n_wins = int(ns_wins[i])
+            child = state.children.get(key)
             q = n_wins / n if n > 0 else 0.0 # 2nd case does not affect ucb
             ucb = q + self.ucb_c * np.sqrt(np.log(n_root) / n) if n > 0 else np.inf 
             entry = {}
-            entry["name"] = children[key].__class__.action_index_to_name(key)
+            entry["name"] = type(state).action_index_to_name(key)
             entry["n_root"] = n_root
-            entry["win_flag"] = win_flag
+            entry["win_flag"] = child.win_flag if child is not None else False
             entry["n"] = n
             entry["n_wins"] = n_wins
             entry["q"] = n_wins / n if n > 0 else np.nan
             entry["ucb"] = ucb
             actions_info[key] = entry
         if best_action_entry:
-            best_key = self._best_action(children, actions_info)
-            best_entry = {"index": best_key, **actions_info[best_key]}
-            actions_info["best"] = best_entry
+            best_key = self._best_action(list(actions_info.keys()), actions_info)
+            actions_info["best"] = {"index": best_key, **actions_info[best_key]} if best_key is not None else None
         self.actions_info = actions_info
         return actions_info
     
-    def _best_action_ucb(self, children, actions_info):
-        """Returns the best action for selection stage purposes, i.e. the action with the largest UCB value."""  
-        best_key = None
-        best_ucb = -1.0
-        for key in children.keys():
-            ucb = actions_info[key]["ucb"]
-            if ucb > best_ucb:
-                best_ucb = ucb
-                best_key = key                        
-        return best_key    
-    
     def _best_action(self, root_children, root_actions_info):
         """
         Returns the best action among the root actions for the final decision.
@@ -465,7 +1322,7 @@ class MCTS:
         self.best_win_flag = False
         self.best_n = -1
         self.best_n_wins = -1
-        for key in root_children.keys():            
+        for key in root_children:            
             win_flag = root_actions_info[key]["win_flag"]
             n = root_actions_info[key]["n"]
             n_wins = root_actions_info[key]["n_wins"]
@@ -494,24 +1351,57 @@ class MCTS:
         """
         print("MCTS RUN...")
         t1 = time.time()
+        self._finish_pondering(root)
         self.root = root
         self.root.parent = None
-        if self.vanilla:
-            self.root.n = 0                       
-            self.root.children = {}
+        if self.array_tree:
+            self.tree = ArrayTree()
+            self.tree.add_root(self.root.turn, self.root.compute_outcome())
+            select, expand, playout, backup = self._select_array, self._expand_array, self._playout_array, self._backup_array
+            if self.n_playouts > 1:
+                playout, backup = self._playouts_array, self._backup_batch_array
+        else:
+            if self.vanilla:
+                self.root.n = 0                       
+                self.root._clear_children()
+            select, expand, playout, backup = self._select, self._expand, self._playout, self._backup
+            if self.n_playouts > 1:
+                playout, backup = self._playouts, self._backup_batch
+            if self.vanilla or self.root is not self.metrics_root:
+                self._reset_metrics()
+            if self.symmetries and self.root.zobrist_hash is not None:
+                self._collapse_root_symmetries()
+            self._prepare_playout_actions()
+        self._reset_budget()
+        self.transpositions = self.transposition_table is not None and not self.array_tree and self.root.zobrist_hash is not None
+        if self.transpositions:
+            if self.vanilla:
+                self.transposition_table.clear()
+            self.transposition_table.reset_counters()
         
         if self.verbose_info:
-            self.initial_n_root = self.root.n                    
-            self.initial_mean_depth = np.mean(self.root._subtree_depths(0, []))
-            self.initial_max_depth = self.root._subtree_max_depth()            
-            self.initial_size = self.root._subtree_size()                         
+            if self.array_tree:
+                self.initial_n_root = 0
+                self.initial_mean_depth = 0.0
+                self.initial_max_depth = 0
+                self.initial_size = 1
+            else:
+                self.initial_n_root = self.root.n                    
+                self.initial_mean_depth, self.initial_max_depth = self._depths_stats(self.depths_counts)
+                self.initial_size = self.tree_size
             
         self.time_select = 0.0
         self.time_expand = 0.0        
         self.time_playout = 0.0
         self.time_backup = 0.0    
         self.steps = 0
-                
+        
+        if self.n_workers > 1:
+            self._send_to_workers(forced_search_steps_limit)
+        
+        self.stop_reason = None
+        self.stop_n_root = int(self.tree.ns[0]) if self.array_tree else self.root.n
+        t_stop_check = 0.0
         t1_loop = time.time()
         while True:
             t2_loop = time.time()
@@ -519,14 +1409,21 @@ class MCTS:
                 if self.steps >= forced_search_steps_limit:
                     break
             elif self.steps >= self.search_steps_limit or t2_loop - t1_loop >= self.search_time_limit:
-                break            
-            state = self.root
+                break
+            elif self.stop_rule is not None and t2_loop - t1_loop - t_stop_check >= self.STOP_CHECK_INTERVAL:
+                t_stop_check = t2_loop - t1_loop
+                self.stop_reason = self._stop_reason(t_stop_check)
+                if self.stop_reason is None and self.stop_connection is not None and self.stop_connection.poll():
+                    self.stop_reason = self.stop_connection.recv() # reason of the main process
+                if self.stop_reason is not None:
+                    break
+            state = 0 if self.array_tree else self.root
             
             # selection
             if self.verbose_debug:
                 print(f"[MCTS._select()...]")            
             t1_select = time.time()
-            state = self._select(state)
+            state = select(state)
             t2_select = time.time()
             if self.verbose_debug:
                 print(f"[MCTS._select() done; time: {t2_select - t1_select} s]")            
@@ -536,7 +1433,7 @@ class MCTS:
             if self.verbose_debug:
                 print(f"[MCTS._expand()...]")
             t1_expand = time.time()
-            state = self._expand(state)
+            state = expand(state)
             t2_expand = time.time()
             if self.verbose_debug:
                 print(f"[MCTS._expand() done; time: {t2_expand - t1_expand} s]")            
@@ -546,8 +1443,7 @@ class MCTS:
             if self.verbose_debug:
                 print(f"[MCTS._playout()...]")
             t1_playout = time.time()
-            playout_root = state
-            state = self._playout(state)
+            outcome = playout(state)
             t2_playout = time.time()
             if self.verbose_debug:
                 print(f"[MCTS._playout() done; time: {t2_playout - t1_playout} s]")                        
@@ -557,14 +1453,34 @@ class MCTS:
             if self.verbose_debug:
                 print(f"[MCTS._backup()...]")           
             t1_backup = time.time()
-            self._backup(state, playout_root)
+            backup(outcome, state)
             t2_backup = time.time()
             if self.verbose_debug:
                 print(f"[MCTS._backup() done; time: {t2_backup - t1_backup} s]")            
             self.time_backup += t2_backup - t1_backup                                
             
+            if self.budget and self._over_budget():
+                self._evict()
+            
             self.steps += 1  
         self.time_loop = time.time() - t1_loop
+        if self.n_workers > 1 and self.stop_reason is not None:
+            self._stop_workers()
+        self._snapshot_own_statistics(None if self.array_tree else self.root)
+        self.last_reroot_info = self.reroot_info
+        self.reroot_info = {"calls": 0, "carried_nodes": 0, "carried_visits": 0, "freed_nodes": 0}
+        self.last_ponder_info = self.ponder_info
+        self.ponder_info = {"steps": 0, "time_[ms]": 0.0, "grafted_visits": 0}
+        
+        if self.verbose_debug:
+            print(f"[MCTS._reduce_over_trees()...]")        
+        t1_reduce_over_trees = time.time()
+        self._reduce_over_trees()
+        t2_reduce_over_trees = time.time()
+        if self.verbose_debug:
+            print(f"[MCTS._reduce_over_trees() done; time: {t2_reduce_over_trees - t1_reduce_over_trees} s]")        
+        self.time_reduce_over_trees = t2_reduce_over_trees - t1_reduce_over_trees
+        self.stop_info = self._make_stop_info(t2_reduce_over_trees - t1_loop, forced_search_steps_limit) # time until statistics of all trees (also of workers) are gathered
 
         if self.verbose_debug:
             print(f"[MCTS._reduce_over_actions()...]")        
@@ -587,44 +1503,666 @@ class MCTS:
         print(f"MCTS RUN DONE. [time: {self.time_total} s; best action: {best_action_label}, best win_flag: {self.best_win_flag}, best n: {self.best_n}, best n_wins: {self.best_n_wins}, best q: {self.best_q}]")                      
         return self.best_action
     
+    def reroot(self, state):
+        """
+        Re-roots the tree at the given state - a position reached from the root of the last search by moves played in the game (by any of the players).
+        The subtree of the state is promoted (to be reused by the next search if ``vanilla=False``), while the rest of the tree (ancestors of the state, their other children and subtrees) is freed eagerly.
+        Numbers of nodes and visits carried over (and of freed nodes) are accumulated in ``reroot_info`` and reported in ``performance_info`` of the next search.
+        
+        Args:
+            state (State):
+                new root state.
+        Returns:
+            reroot_info (dict):
+                information on the tree carried over (counts accumulated since the last search).
+        """
+        own_children_ns = self.own_children_ns if state.parent is not None and state.parent is self.own_root else None
+        grafted = self._finish_pondering(state)
+        owned = grafted or (own_children_ns is not None and own_children_ns.get(state.last_action_index, 0) == state.n)
+        freed_nodes = 0
+        child = state
+        ancestor = state.parent
+        while ancestor is not None:
+            next_ancestor = ancestor.parent
+            ancestor.children.pop(child.last_action_index, None)
+            freed_nodes += ancestor._free_subtree()
+            child = ancestor
+            ancestor = next_ancestor
+        state.parent = None
+        state.child_index = None
+        self.reroot_info["calls"] += 1
+        self.metrics_root = self.root = state
+        self._reset_metrics()
+        self.reroot_info["carried_nodes"] = self.tree_size
+        self.reroot_info["carried_visits"] = state.n
+        self.reroot_info["freed_nodes"] += freed_nodes
+        self._snapshot_own_statistics(state if owned else None)
+        return self.reroot_info
+
+    def root_statistics(self, state):
+        """
+        Returns counts of visits of root actions gathered for the given state by this AI (during its own searches or pondering, carried over by ``reroot``), e.g. for time management.
+        Statistics of states possibly searched meanwhile by another AI sharing them (e.g. an opponent rerooting the same states) are not reported.
+
+        Args:
+            state (State):
+                the current position (the root of the next search).
+        Returns:
+            ns (ndarray or None):
+                counts of visits of root actions (ordered as ``state.children_actions``), or ``None`` if this AI has no statistics of its own for the state.
+        """
+        if self.vanilla or self.array_tree or state is not self.own_root or state.n != self.own_n or state.children_ns is None:
+            return None
+        return state.children_ns
+
+    def _snapshot_own_statistics(self, state):
+        """Records the given state (or none) as the root whose statistics are this AI's own, with snapshots of visits of it and of its children."""
+        self.own_root = state
+        self.own_n = 0 if state is None else state.n
+        self.own_children_ns = None if state is None or state.children_actions is None else dict(zip(state.children_actions.tolist(), state.children_ns.tolist()))
+
+    def start_pondering(self, state):
+        """
+        Starts pondering (if ``ponder=True``, ``vanilla=False`` and ``array_tree=False``): a search from the given state - the current position, with the opponent to move - 
+        carried out in a background thread until the opponent's move arrives via ``reroot`` or ``run`` (or until ``stop_pondering``).
+        The search works on a detached copy of the state (starting warm from copies of its statistics and arrays of children statistics), so that states possibly shared 
+        with the opponent are not mutated concurrently; the subtree of the position implied by the opponent's move is grafted back at the end - only onto a state still holding 
+        the statistics this AI had at the start of pondering (a state searched meanwhile by another AI sharing it is left intact).
+        Numbers of steps and time of pondering are accumulated in ``ponder_info`` and reported in ``performance_info`` of the next search.
+        
+        Args:
+            state (State):
+                state to ponder over.
+        """
+        self.stop_pondering()
+        if not self.ponder or self.vanilla or self.array_tree or state.compute_outcome() is not None:
+            return
+        root = type(state)(state) # copying constructor
+        root.parent = None
+        root.last_action_index = state.last_action_index
+        root.n = state.n
+        root.n_wins = state.n_wins
+        if state.children_actions is not None:
+            root.children_actions = state.children_actions.copy()
+            root.children_ns = state.children_ns.copy()
+            root.children_ns_wins = state.children_ns_wins.copy()
+            if state.children_ns_amaf is not None:
+                root.children_ns_amaf = state.children_ns_amaf.copy()
+                root.children_ns_wins_amaf = state.children_ns_wins_amaf.copy()
+        self.ponder_state = state
+        self.ponder_root = root
+        self.ponder_own_n = state.n # own statistics of this AI (snapshot), for grafting only into states not searched meanwhile by others
+        self.ponder_own_ns = None if state.children_actions is None else dict(zip(state.children_actions.tolist(), state.children_ns.tolist()))
+        self.root = root
+        self._reset_metrics()
+        self._reset_budget()
+        self._prepare_playout_actions()
+        self.transpositions = self.transposition_table is not None and root.zobrist_hash is not None
+        self.ponder_event = threading.Event()
+        self.ponder_thread = threading.Thread(target=self._ponder_loop, daemon=True)
+        self.ponder_thread.start()
+        
+    def stop_pondering(self):
+        """
+        Stops pondering (if in progress) and frees the pondering tree.
+        """
+        self._finish_pondering(None)
+
+    def _ponder_loop(self):
+        """Loop of the pondering thread: carries out search steps from the pondering root (with its own generator ``ponder_rng``) until the stopping event is set; 
+        compiled playouts hold the interpreter lock, hence scratch arrays of game classes are never used by two threads at once."""
+        playout, backup = (self._playouts, self._backup_batch) if self.n_playouts > 1 else (self._playout, self._backup)
+        rng = self.ponder_rng
+        t1 = time.time()
+        while not self.ponder_event.is_set():
+            state = self._expand(self._select(self.ponder_root), rng)
+            backup(playout(state, rng), state)
+            if self.budget and self._over_budget():
+                self._evict()
+            self.ponder_info["steps"] += 1
+        self.ponder_info["time_[ms]"] += 10.0**3 * (time.time() - t1)
+
+    def _finish_pondering(self, state):
+        """Stops the pondering thread (if running) and grafts the pondered subtree of the given state (the pondering root or its child) onto the state, if it has more visits than this AI had for it 
+        and the state still holds those statistics (or none, if materialized by the opponent's move); the rest of the pondering tree is freed. Returns whether grafted."""
+        if self.ponder_thread is None:
+            return False
+        self.ponder_event.set()
+        self.ponder_thread.join()
+        self.ponder_thread = None
+        source = None
+        own_n = 0
+        if state is self.ponder_state:
+            source = self.ponder_root
+            own_n = self.ponder_own_n
+        elif state is not None and state.parent is self.ponder_state:
+            source = self.ponder_root.children.get(state.last_action_index)
+            own_n = 0 if self.ponder_own_ns is None else self.ponder_own_ns.get(state.last_action_index, 0)
+        owned = state is not None and (state.n == own_n or (state.n == 0 and state.children_actions is None))
+        grafted = source is not None and owned and source.n > own_n
+        if grafted:
+            self.ponder_info["grafted_visits"] += source.n
+            self._graft(source, state)
+            self.metrics_root = None
+        self.ponder_root._free_subtree()
+        self.ponder_state = None
+        self.ponder_root = None
+        return grafted
+
+    def _graft(self, source, target):
+        """Moves statistics and children (the whole subtree) of the source state onto the target state representing the same position (in another tree)."""
+        target.n = source.n
+        target.n_wins = source.n_wins
+        target.children = source.children
+        target.children_actions = source.children_actions
+        target.children_ns = source.children_ns
+        target.children_ns_wins = source.children_ns_wins
+        target.children_ns_amaf = source.children_ns_amaf
+        target.children_ns_wins_amaf = source.children_ns_wins_amaf
+        target.children_hashes = source.children_hashes
+        for child in target.children.values():
+            child.parent = target
+        source.children = {}
+        source._clear_children()
+
+    def _reset_metrics(self):
+        """Computes metrics of the tree rooted by ``root`` (size and counts of nodes per depth) in one walk; afterwards, they are maintained incrementally by the search (materializations, evictions)."""
+        self.depths_counts = self.root._subtree_depths_counts()
+        self.tree_size = sum(self.depths_counts)
+        self.metrics_root = self.root
+
+    @staticmethod
+    def _depths_stats(depths_counts):
+        """Returns the mean and the maximum depth of nodes implied by counts of nodes per depth."""
+        depths_counts = np.array(depths_counts)
+        max_depth = int(np.flatnonzero(depths_counts)[-1])
+        return np.sum(np.arange(depths_counts.size) * depths_counts) / np.sum(depths_counts), max_depth
+
+    def _reset_budget(self):
+        """Resets the limit implied by the budget on the tree and counters of evictions (prior to a search)."""
+        self.budget = not self.array_tree and (self.max_nodes < np.inf or self.max_memory < np.inf)
+        self.nodes_limit = self.max_nodes
+        self.memory_check_size = 0
+        self.evictions = 0
+        self.evicted_subtrees = 0
+        self.evicted_nodes = 0
+        self.evicted_visits = 0
+
+    def _stop_reason(self, elapsed):
+        """Applies the stopping rule to statistics of root actions and returns the reason for stopping the search (or ``None`` to go on)."""
+        if self.array_tree:
+            children = self.tree.children(0)
+            n_untried = max(int(self.tree.ns_legal[0]) - children.size, 0)
+            ns = np.concatenate((self.tree.ns[children], np.zeros(n_untried, dtype=np.int32))) # untried actions as unvisited
+            win_flags = np.concatenate((self.tree.win_flags[children], np.zeros(n_untried, dtype=bool)))
+            n_root = int(self.tree.ns[0])
+        else:
+            if self.root.children_actions is None:
+                return None
+            ns = self.root.children_ns
+            win_flags = np.array([child.win_flag for child in self.root.children.values()], dtype=bool)
+            n_root = self.root.n
+        n_remaining = remaining_playouts(n_root - self.stop_n_root, self.steps, elapsed, self.search_time_limit, self.search_steps_limit)
+        return stop_reason(win_flags, ns, n_remaining, self.stop_rule)
+
+    def _make_stop_info(self, elapsed, forced_search_steps_limit=np.inf):
+        """Prepares and returns a dictionary with information on how the last search stopped (reason, saved time and steps), given the time elapsed until its statistics were gathered."""
+        stop_info = {}
+        if self.stop_reason is not None:
+            stop_info["reason"] = self.stop_reason
+            stop_info["time_saved_[ms]"] = 10.0**3 * max(self.search_time_limit - elapsed, 0.0) if self.search_time_limit < np.inf else 0.0
+            stop_info["steps_saved"] = int(self.search_steps_limit - self.steps) if self.search_steps_limit < np.inf else 0
+        else:
+            stop_info["reason"] = "steps_limit" if self.steps >= min(self.search_steps_limit, forced_search_steps_limit) else "time_limit"
+            stop_info["time_saved_[ms]"] = 0.0
+            stop_info["steps_saved"] = 0
+        return stop_info
+
     def _select(self, state):
-        """Performs the selection stage and returns the selected state."""
-        while len(state.children) > 0:
-            actions_info = self._make_actions_info(state.children)
-            best_ucb_action = self._best_action_ucb(state.children, actions_info)
-            state = state.children[best_ucb_action]
+        """Performs the selection stage and returns the selected state (UCB values computed at once for all children from arrays of their statistics); its depth is memorized in ``leaf_depth``."""
+        depth = 0
+        while state.children_actions is not None:
+            if self.transpositions:
+                ns, ns_wins, n = self._transposition_stats(state)
+                n = max(state.n, n)
+            else:
+                ns, ns_wins = state.children_ns, state.children_ns_wins
+                n = state.n
+            unvisited = np.flatnonzero(ns == 0)
+            if state.children_ns_amaf is not None: # RAVE: AMAF estimates blended with direct ones
+                ns_amaf = state.children_ns_amaf
+                qs = ns_wins / np.maximum(ns, 1)
+                qs_amaf = np.where(ns_amaf > 0, state.children_ns_wins_amaf / np.maximum(ns_amaf, 1), qs)
+                betas = np.sqrt(self.rave_k / (3 * ns + self.rave_k))
+                ucbs = (1.0 - betas) * qs + betas * qs_amaf + self.ucb_c * np.sqrt(np.log(max(n, 1)) / (ns + 1))
+                ucbs[(ns == 0) & (ns_amaf == 0)] = np.inf
+                best_ucb_index = np.argmax(ucbs)
+            elif unvisited.size > 0:
+                best_ucb_index = unvisited[0] # equivalent to the first infinite UCB
+            else:
+                ucbs = ns_wins / ns + self.ucb_c * np.sqrt(np.log(n) / ns)
+                best_ucb_index = np.argmax(ucbs)
+            depth += 1
+            state = self._child(state, best_ucb_index, depth)
+        self.leaf_depth = depth
         return state     
     
-    def _expand(self, state):
-        """Performs the expansion stage and returns the child (picked on random) on which to carry out the playout."""
+    def _expand(self, state, rng=None):
+        """Performs the expansion stage and returns the child (picked on random, by ``rng`` or by the generator of this instance, and materialized) on which to carry out the playout."""
         state.expand()
-        if len(state.children) > 0:
-            random_child_key = np.random.choice(list(state.children.keys()))
-            state = state.children[random_child_key]
+        if state.children_actions is not None:
+            state = self._child(state, int((self.rng if rng is None else rng).integers(state.children_actions.size)), self.leaf_depth + 1)
         return state
     
-    def _playout(self, state):
-        """Performs the playout stage and returns the reached terminal state."""
-        while True:
-            outcome = state.compute_outcome()
-            if outcome is not None:
-                break        
-            state = state.take_random_action_playout()
-        return state        
+    def _playout(self, state, rng=None):
+        """Performs the playout stage (by calling ``playout`` method of the state with ``playout_policy``) and returns the outcome of the reached terminal state; with RAVE, actions taken are recorded in ``playout_actions``."""
+        return state.playout(self.playout_policy, self.playout_actions if self.rave else None, self.rng if rng is None else rng)
     
-    def _backup(self, state, playout_root):
-        """Calls ``compute_outcome`` method on the terminal state (``state``), and suitably backs up the outcome to ancestors of the playout root."""
-        outcome = state.compute_outcome()
-        state = playout_root
-        del state.children # getting rid of playout branch
-        state.children = {}
+    def _backup(self, outcome, state):
+        """Backs up the outcome to the playout root (``state``) and its ancestors."""
+        del state.children # getting rid of playout branch (if any)
+        state._clear_children()
+        if self.rave:
+            self._backup_amaf(outcome, state)
+        keys = []
+        wins = []
         while state:
             state.n += 1
-            if state.turn == -outcome:
+            win = state.turn == -outcome
+            if win:
                 state.n_wins += 1
-            state = state.parent
+            if self.transpositions:
+                keys.append(self._position_key(state))
+                wins.append(win)
+            parent = state.parent
+            if parent is not None and parent.children_ns is not None:
+                parent.children_ns[state.child_index] += 1
+                if win:
+                    parent.children_ns_wins[state.child_index] += 1
+            state = parent
+        if self.transpositions: # one update of the table along the path
+            self.transposition_table.update(np.array(keys, dtype=np.uint64), 1, np.array(wins, dtype=np.int32))
+
+    def _backup_amaf(self, outcome, state):
+        """Backs up AMAF statistics to arrays of children statistics of ancestors of the playout root (``state``): for each ancestor, the children implied by actions taken later (in the tree or in the playout) by the player to act there."""
+        count = self.playout_actions[0, -1]
+        actions = self.playout_actions[0, :count]
+        turns = self.playout_actions[1, :count]
+        played = np.zeros((2, type(state).get_max_actions()), dtype=bool) # [player index][action index], player index: (turn + 1) // 2
+        played[(turns + 1) // 2, actions] = True # playout actions attributed to players by turns recorded per ply
+        while state.parent is not None:
+            parent = state.parent
+            p = (parent.turn + 1) // 2
+            played[p, state.last_action_index] = True
+            if parent.children_actions is not None:
+                if parent.children_ns_amaf is None:
+                    parent.children_ns_amaf = np.zeros(parent.children_actions.size, dtype=np.int32)
+                    parent.children_ns_wins_amaf = np.zeros(parent.children_actions.size, dtype=np.int32)
+                mask = played[p, parent.children_actions]
+                parent.children_ns_amaf[mask] += 1
+                if outcome == parent.turn:
+                    parent.children_ns_wins_amaf[mask] += 1
+            state = parent
+
+    def _prepare_playout_actions(self):
+        """Allocates the array for actions taken within playouts (``playout_actions``), if needed for RAVE."""
+        if self.rave and self.n_playouts == 1:
+            self.playout_actions = np.zeros((2, int(np.prod(type(self.root).get_board_shape())) + 1), dtype=np.int16) # rows: actions, turns of players taking them
+
+    def _child(self, state, child_index, depth):
+        """Returns the child (at given depth) of given state at given index (see ``State._child``), counting a newly materialized child into metrics of the tree (size, counts of nodes per depth)."""
+        n_children = len(state.children)
+        child = state._child(child_index)
+        if len(state.children) > n_children:
+            if self.symmetries and state.children_hashes is not None:
+                child.canonical_hash = int(state.children_hashes[child_index]) # already known from keys of children
+            self.tree_size += 1
+            if depth == len(self.depths_counts):
+                self.depths_counts.append(0)
+            self.depths_counts[depth] += 1
+        return child
+
+    def _over_budget(self):
+        """Checks whether the tree exceeds its budget; memory is measured whenever the tree grows by ``MEMORY_CHECK_GROWTH`` since the last measurement, so as to turn ``max_memory`` into a limit on nodes."""
+        if self.max_memory < np.inf and self.tree_size >= self.memory_check_size:
+            node_memory = self.root._subtree_memory() / self.tree_size
+            self.nodes_limit = min(self.max_nodes, self.max_memory / node_memory)
+            self.memory_check_size = self.MEMORY_CHECK_GROWTH * self.tree_size
+        return self.tree_size > self.nodes_limit
+
+    def _evict(self):
+        """Evicts the lowest-visit subtrees (below children of the root) until the size of tree drops to ``EVICTION_TARGET`` of the budget; statistics of evicted states remain in arrays of their parents."""
+        candidates = []
+        stack = [(child, 1) for child in self.root.children.values()]
+        while stack:
+            state, d = stack.pop()
+            children = [(child, d + 1) for child in state.children.values()]
+            if state.children_ns is not None: # children without statistics in arrays of their parent are never evicted
+                candidates.extend(children)
+            stack.extend(children)
+        candidates.sort(key=lambda candidate: candidate[0].n)
+        n_excess = self.tree_size - int(self.EVICTION_TARGET * self.nodes_limit)
+        n_evicted = 0
+        for state, d in candidates:
+            if n_evicted >= n_excess:
+                break
+            if state.parent is None: # already freed within an evicted subtree
+                continue
+            del state.parent.children[state.last_action_index]
+            self.evicted_subtrees += 1
+            self.evicted_visits += state.n
+            n_evicted += state._free_subtree(self.depths_counts, d)
+        self.tree_size -= n_evicted
+        self.evictions += 1
+        self.evicted_nodes += n_evicted
+        self.memory_check_size = min(self.memory_check_size, self.MEMORY_CHECK_GROWTH * self.tree_size)
+
+    def _position_key(self, state):
+        """Returns the key of position of given state: its canonical key (memorized in the state) if symmetries are collapsed, otherwise its Zobrist hash."""
+        if not self.symmetries:
+            return state.zobrist_hash
+        if state.canonical_hash is None:
+            state.canonical_hash = state.canonical_key()[0]
+        return state.canonical_hash
+
+    def _collapse_root_symmetries(self):
+        """Expands the root and keeps only one of its actions (the lowest index) per class of actions equivalent under symmetries of the root position (mapped via ``State.action_to_canonical``); 
+        statistics of removed children (non-zero for a root carried over by ``reroot``) are merged into their kept representatives, so that the count of visits of the root stays consistent."""
+        root = self.root
+        root.expand()
+        self.root_n_actions = 0 if root.children_actions is None else root.children_actions.size
+        if root.children_actions is None or type(root)._ACTIONS_TRANSFORMS is None:
+            return
+        hashes = root._canonical_hashes()
+        transforms = np.flatnonzero(hashes == hashes[0]).tolist() # symmetries of the root position (identity included)
+        actions = root.children_actions.tolist()
+        indexes = {action_index: i for i, action_index in enumerate(actions)}
+        representatives = np.array([min(indexes.get(type(root).action_to_canonical(action_index, t), i) for t in transforms) for i, action_index in enumerate(actions)])
+        kept = representatives == np.arange(len(actions))
+        if np.all(kept):
+            return
+        for i in np.flatnonzero(~kept).tolist():
+            r = representatives[i]
+            root.children_ns[r] += root.children_ns[i]
+            root.children_ns_wins[r] += root.children_ns_wins[i]
+            if root.children_ns_amaf is not None:
+                root.children_ns_amaf[r] += root.children_ns_amaf[i]
+                root.children_ns_wins_amaf[r] += root.children_ns_wins_amaf[i]
+            child = root.children.pop(actions[i], None)
+            if child is not None:
+                self.tree_size -= child._free_subtree(self.depths_counts, 1)
+        new_indexes = np.cumsum(kept) - 1
+        for action_index, child in root.children.items():
+            child.child_index = int(new_indexes[indexes[action_index]])
+            child.n = int(root.children_ns[indexes[action_index]])
+            child.n_wins = int(root.children_ns_wins[indexes[action_index]])
+        root.children_actions = root.children_actions[kept]
+        root.children_ns = root.children_ns[kept]
+        root.children_ns_wins = root.children_ns_wins[kept]
+        if root.children_ns_amaf is not None:
+            root.children_ns_amaf = root.children_ns_amaf[kept]
+            root.children_ns_wins_amaf = root.children_ns_wins_amaf[kept]
+        root.children_hashes = None
+
+    def _children_keys(self, state):
+        """Returns keys of positions of children of given state (see ``_position_key``), updated from the hash (or hashes of symmetric variants) of the state by ``State.child_hash`` 
+        (or ``State._child_canonical_hashes``); keys that cannot be updated locally are taken from children or, for ones not materialized yet, evaluated on detached copies (not attached to the tree), 
+        so that materialization stays lazy."""
+        keys = np.empty(state.children_actions.size, dtype=np.uint64)
+        hashes = state._canonical_hashes() if self.symmetries and type(state)._CELLS_TRANSFORMS is not None else None
+        for i, action_index in enumerate(state.children_actions.tolist()):
+            if hashes is None:
+                key = state.child_hash(action_index)
+            else:
+                child_hashes = state._child_canonical_hashes(hashes, action_index)
+                key = None if child_hashes is None else int(child_hashes.min())
+            if key is None:
+                child = state.children.get(action_index)
+                if child is None:
+                    child = type(state)(state) # copying constructor, detached child
+                    child.take_action_job(action_index)
+                key = self._position_key(child)
+            keys[i] = key
+        return keys
+
+    def _transposition_stats(self, state):
+        """Returns counts of visits and wins of children of given state for selection - taken from the transposition table where it holds more visits of a position (gathered via all transpositions), 
+        otherwise from arrays of children statistics - and their sum of visits."""
+        if state.children_hashes is None:
+            state.children_hashes = self._children_keys(state)
+        return self.transposition_table.lookup(state.children_hashes, state.children_ns, state.children_ns_wins)
+
+    def _playouts(self, state, rng=None):
+        """Performs the playout stage as a batch of ``n_playouts`` playouts (by calling ``playouts`` method of the state) and returns counts of outcomes."""
+        return state.playouts(self.n_playouts, self.playout_policy, self.rng if rng is None else rng)
+
+    def _backup_batch(self, outcomes_counts, state):
+        """Backs up counts of outcomes of a batch of playouts to the playout root (``state``) and its ancestors (in one pass)."""
+        del state.children # getting rid of playout branches (if any)
+        state._clear_children()
+        n_playouts = self.n_playouts
+        keys = []
+        wins = []
+        while state:
+            n_wins = int(outcomes_counts[1 - state.turn]) # wins for the player who made the move leading to state, i.e., outcome == -state.turn
+            state.n += n_playouts
+            state.n_wins += n_wins
+            if self.transpositions:
+                keys.append(self._position_key(state))
+                wins.append(n_wins)
+            parent = state.parent
+            if parent is not None and parent.children_ns is not None:
+                parent.children_ns[state.child_index] += n_playouts
+                parent.children_ns_wins[state.child_index] += n_wins
+            state = parent
+        if self.transpositions: # one update of the table along the path
+            self.transposition_table.update(np.array(keys, dtype=np.uint64), n_playouts, np.array(wins, dtype=np.int32))
             
+    def _select_array(self, node):
+        """Performs the selection stage on the array tree and returns the selected node - a node not expanded yet, possibly the first untried child of an expanded node (added on the way); 
+        the state of the node is carried down the path (actions taken in place on a scratch copy of the root)."""
+        tree = self.tree
+        state = type(self.root)(self.root) # copying constructor, scratch state
+        while tree.pool_offsets[node] >= 0:
+            offset = tree.pool_offsets[node]
+            n_children = tree.ns_children[node]
+            if n_children < tree.ns_legal[node]:
+                node = tree.add_child(node, offset + n_children, -state.turn) # first untried action, equivalent to the first infinite UCB
+            else:
+                node = MCTS._best_ucb_child(tree.pool_children[offset:offset + n_children], tree.ns, tree.ns_wins, tree.ns[node], self.ucb_c)
+            action_index = int(tree.actions[node])
+            state.take_action_job(action_index)
+            state.last_action_index = action_index
+        self.scratch_state = state
+        return node
+
+    @staticmethod
+    @njit(cache=True)
+    def _best_ucb_child(children, ns, ns_wins, n, ucb_c):
+        """Returns the child (among given, all visited, children of a node of array tree) with the largest UCB value (compiled, to avoid overheads of small array operations)."""
+        log_n = np.log(n)
+        best_child = children[0]
+        best_ucb = -1.0
+        for child in children:
+            ucb = ns_wins[child] / ns[child] + ucb_c * np.sqrt(log_n / ns[child])
+            if ucb > best_ucb:
+                best_ucb = ucb
+                best_child = child
+        return best_child
+
+    def _expand_array(self, node):
+        """Performs the expansion stage on the array tree and returns the child node (picked on random and added to the tree) on which to carry out the playout; the scratch state is carried on to the child."""
+        tree = self.tree
+        state = self.scratch_state
+        if not tree.outcomes_computed[node]:
+            tree.set_outcome(node, state.compute_outcome())
+        if tree.terminals[node]:
+            return node
+        tree.expand(node, state.legal_actions())
+        node = tree.add_child(node, tree.pool_offsets[node] + int(self.rng.integers(tree.ns_legal[node])), -state.turn) # turns alternate (as assumed also by MCTSNC)
+        action_index = int(tree.actions[node])
+        state.take_action_job(action_index)
+        state.last_action_index = action_index
+        state.outcome_computed = False
+        tree.set_outcome(node, state.compute_outcome())
+        return node
+
+    def _playout_array(self, node):
+        """Performs the playout stage starting from the given node of array tree and returns the outcome of the reached terminal state."""
+        if self.tree.terminals[node]:
+            return self.tree.outcomes[node]
+        outcome = self.scratch_state.playout(self.playout_policy, None, self.rng)
+        self.scratch_state.children = {} # getting rid of playout branch (if any)
+        return outcome
+
+    def _backup_array(self, outcome, node):
+        """Backs up the outcome to the given node of array tree and all its ancestors."""
+        tree = self.tree
+        while node >= 0:
+            tree.ns[node] += 1
+            if tree.turns[node] == -outcome:
+                tree.ns_wins[node] += 1
+            node = tree.parents[node]
+
+    def _playouts_array(self, node):
+        """Performs the playout stage as a batch of ``n_playouts`` playouts starting from the given node of array tree and returns counts of outcomes."""
+        if self.tree.terminals[node]:
+            outcomes_counts = np.zeros(3, dtype=np.int64)
+            outcomes_counts[self.tree.outcomes[node] + 1] = self.n_playouts
+            return outcomes_counts
+        outcomes_counts = self.scratch_state.playouts(self.n_playouts, self.playout_policy, self.rng)
+        self.scratch_state.children = {} # getting rid of playout branches (if any)
+        return outcomes_counts
+
+    def _backup_batch_array(self, outcomes_counts, node):
+        """Backs up counts of outcomes of a batch of playouts to the given node of array tree and all its ancestors (in one pass)."""
+        tree = self.tree
+        while node >= 0:
+            tree.ns[node] += self.n_playouts
+            tree.ns_wins[node] += outcomes_counts[1 - tree.turns[node]]
+            node = tree.parents[node]
+
+    def _make_actions_info_array(self, node, best_action_entry=False):
+        """Equivalent of ``_make_actions_info`` for the given node of array tree; entries cover all legal actions of the node - also untried ones (``n`` equal to ``0``, infinite UCB), whose children were never added."""
+        tree = self.tree
+        actions_info = {}
+        n_root = int(tree.ns[node])
+        offset = tree.pool_offsets[node]
+        n_legal = int(tree.ns_legal[node]) if offset >= 0 else 0
+        n_children = int(tree.ns_children[node]) if offset >= 0 else 0
+        for entry_index in np.argsort(tree.pool_actions[offset:offset + n_legal], kind="stable") if n_legal > 0 else []:
+            key = int(tree.pool_actions[offset + entry_index])
+            child = int(tree.pool_children[offset + entry_index]) if entry_index < n_children else None
+            n = int(tree.ns[child]) if child is not None else 0
+            n_wins = int(tree.ns_wins[child]) if child is not None else 0
+            entry = {}
+            entry["name"] = type(self.root).action_index_to_name(key)
+            entry["n_root"] = n_root
+            entry["win_flag"] = bool(tree.win_flags[child]) if child is not None else False
+            entry["n"] = n
+            entry["n_wins"] = n_wins
+            entry["q"] = n_wins / n if n > 0 else np.nan
+            entry["ucb"] = n_wins / n + self.ucb_c * np.sqrt(np.log(n_root) / n) if n > 0 else np.inf
+            actions_info[key] = entry
+        if best_action_entry:
+            best_key = self._best_action(list(actions_info.keys()), actions_info)
+            actions_info["best"] = {"index": best_key, **actions_info[best_key]} if best_key is not None else None
+        self.actions_info = actions_info
+        return actions_info
+            
+    def _start_workers(self):
+        """Starts ``n_workers - 1`` worker processes for root-parallel mode (each with its own ``MCTS`` instance and seed)."""
+        self.workers = []
+        for i in range(1, self.n_workers):
+            ai_kwargs = {"search_time_limit": self.search_time_limit, "search_steps_limit": self.search_steps_limit, "array_tree": self.array_tree, 
+                         "n_playouts": self.n_playouts, "transposition_table_capacity": self.transposition_table_capacity, "symmetries": self.symmetries, "stop_rule": self.stop_rule, 
+                         "max_nodes": self.max_nodes, "max_memory": self.max_memory, "playout_policy": self.playout_policy, 
+                         "rave": self.rave, "rave_k": self.rave_k, "ucb_c": self.ucb_c, "seed": self.seed + i, "verbose_info": False}
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker_loop, args=(worker_connection, ai_kwargs), daemon=True)
+            process.start()
+            self.workers.append((process, connection))
+    
+    def close_workers(self):
+        """
+        Stops worker processes of root-parallel mode (if started). New ones are started automatically at the next run.
+        """
+        if self.workers is None:
+            return
+        for process, connection in self.workers:
+            connection.send(None)
+            process.join()
+            connection.close()
+        self.workers = None
+    
+    def _send_to_workers(self, forced_search_steps_limit):
+        """Sends a detached copy of the root (without parent and children), together with current search limits (possibly changed since the start, e.g. by a time manager), to worker processes, starting them first if needed."""
+        if self.workers is None:
+            self._start_workers()
+        root = type(self.root)(self.root) # copying constructor
+        root.parent = None
+        root.last_action_index = self.root.last_action_index
+        for _, connection in self.workers:
+            connection.send((root, forced_search_steps_limit, self.search_time_limit, self.search_steps_limit))
+    
+    def _stop_workers(self):
+        """Signals worker processes (in root-parallel mode) to stop their searches early, passing the reason of stopping the search of the main process."""
+        for _, connection in self.workers:
+            connection.send(self.stop_reason)
+
+    def _reduce_over_trees(self):
+        """Receives statistics of root actions from worker processes (in root-parallel mode) and sums them up, per action, into ``workers_actions_stats`` dictionary (action -> [n, n_wins, win_flag])."""
+        self.workers_actions_stats = {}
+        self.workers_playouts = 0
+        if self.n_workers <= 1:
+            return
+        for _, connection in self.workers:
+            playouts, actions_stats = connection.recv()
+            self.workers_playouts += playouts
+            for key, (n, n_wins, win_flag) in actions_stats.items():
+                stats = self.workers_actions_stats.setdefault(key, [0, 0, False])
+                stats[0] += n
+                stats[1] += n_wins
+                stats[2] = stats[2] or win_flag
+    
     def _reduce_over_actions(self):
-        """Calls ``_make_actions_info`` and ``_best_action`` using children states of the root to finds the best available action."""
-        self.root_actions_info = self._make_actions_info(self.root.children, best_action_entry=True)
-        self._best_action(self.root.children, self.root_actions_info)
\ No newline at end of file
+        """Calls ``_make_actions_info`` (including statistics from other trees in root-parallel mode) and ``_best_action`` using children states of the root to finds the best available action."""
+        if self.array_tree:
+            actions_info = self._make_actions_info_array(0)
+        else:
+            actions_info = self._make_actions_info(self.root)
+        if len(self.workers_actions_stats) > 0:
+            n_root = (int(self.tree.ns[0]) if self.array_tree else self.root.n) + self.workers_playouts
+            for key, (n, n_wins, win_flag) in self.workers_actions_stats.items():
+                entry = actions_info.setdefault(key, {"name": type(self.root).action_index_to_name(key), "n_root": 0, "win_flag": False, "n": 0, "n_wins": 0})
+                entry["win_flag"] = entry["win_flag"] or win_flag
+                entry["n"] += n
+                entry["n_wins"] += n_wins
+            for key in actions_info:
+                entry = actions_info[key]
+                entry["n_root"] = n_root
+                entry["q"] = entry["n_wins"] / entry["n"] if entry["n"] > 0 else np.nan
+                entry["ucb"] = entry["n_wins"] / entry["n"] + self.ucb_c * np.sqrt(np.log(n_root) / entry["n"]) if entry["n"] > 0 else np.inf
+            actions_info = {key: actions_info[key] for key in sorted(actions_info.keys())}
+        best_key = self._best_action(list(actions_info.keys()), actions_info)
+        actions_info["best"] = {"index": best_key, **actions_info[best_key]} if best_key is not None else None
+        self.actions_info = actions_info
+        self.root_actions_info = actions_info
+
+def _worker_loop(connection, ai_kwargs):
+    """Loop of a worker process of root-parallel ``MCTS``: runs searches from received roots (under received search limits) and sends back statistics of root actions (until ``None`` is received)."""
+    sys.stdout = open(os.devnull, "w")
+    ai = MCTS(**ai_kwargs)
+    ai.stop_connection = connection
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        if isinstance(message, str): # signal to stop that arrived after the search had finished
+            continue
+        root, forced_search_steps_limit, ai.search_time_limit, ai.search_steps_limit = message
+        ai.run(root, forced_search_steps_limit)
+        playouts = int(ai.tree.ns[0]) if ai.array_tree else ai.root.n
+        actions_stats = {key: (entry["n"], entry["n_wins"], entry["win_flag"]) for key, entry in ai.root_actions_info.items() if key != "best"}
+        connection.send((playouts, actions_stats))
+    connection.close()
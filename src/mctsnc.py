@@ -132,9 +132,11 @@ Dependencies
 
 - ``numba``: required for just-in-time compilation of CUDA kernels (decorated by ``@cuda.jit``).
 
-- ``mctsnc_game_mechanics``: required to define the mechanics of a wanted game or search problem via a set of five device-side functions - ``is_action_legal``, ``take_action``, ``legal_actions_playout``, ``take_action_playout``, ``compute_outcome`` callable by kernel functions of ``MCTSNC`` (see :doc:`mctsnc_game_mechanics`). 
+- ``mctsnc_game_mechanics``: required to define the mechanics of a wanted game or search problem via a set of five device-side functions - ``is_action_legal``, ``take_action``, ``legal_actions_playout``, ``take_action_playout``, ``compute_outcome`` callable by kernel functions of ``MCTSNC``, plus a sixth one - ``choose_action_playout`` - defining the playout policy (see :doc:`mctsnc_game_mechanics`). 
 
-- For usage of ``MCTSNC`` class, NVIDIA CUDA drivers must be present in the operating system. 
+- ``mctsnc_cpu``, ``mctsnj_game_mechanics``: required by the CPU backend (``backend="cpu"``) - functions mirroring kernels of ``MCTSNC`` compiled for CPU (see :doc:`mctsnc_cpu`) and game mechanics for them (see :doc:`mctsnj_game_mechanics`).
+
+- For usage of ``MCTSNC`` class with the default backend (``backend="cuda"``), NVIDIA CUDA drivers must be present in the operating system. 
 
 Link to project repository
 --------------------------
@@ -144,7 +146,7 @@ Notes
 -----
 Private functions of ``MCTSNC`` class are named with a single leading underscore (e.g.: ``_set_cuda_constants``, 
 ``_make_performance_info``, ``_playout_acp_prodigal``, etc.). Among them, the kernel functions are additionally 
-described by ``@cuda.jit`` decorators coming from ``numba`` module. Exact specifications of types come along with the decorators.
+described by ``@cuda.jit`` decorators coming from ``numba`` module (applied via ``_kernel``). Exact specifications of types come along with the decorators.
 For public methods full docstrings are provided (with arguments and returns described). For private functions short docstrings are provided.    
 
 """
@@ -152,14 +154,22 @@ For public methods full docstrings are provided (with arguments and returns desc
 import numpy as np
 from numpy import inf
 from numba import cuda
-from numba import void, int8, int16, int32, int64, float32, boolean
+from numba import void, int8, int16, int32, int64, uint64, float32, boolean
+from numba import types
+from numba.core import config
+from numba.core.extending import intrinsic
+from llvmlite import ir
 from numba.cuda.random import create_xoroshiro128p_states, xoroshiro128p_uniform_float32, xoroshiro128p_type 
 import time
 import math
+import sys
+import threading
 from numba.core.errors import NumbaPerformanceWarning
 import warnings
-from mctsnc_game_mechanics import is_action_legal, take_action, legal_actions_playout, take_action_playout, compute_outcome
-from utils import dict_to_str
+from mctsnc_game_mechanics import is_action_legal, take_action, legal_actions_playout, take_action_playout, compute_outcome, choose_action_playout
+from mctsnj_game_mechanics import GAME_MECHANICS, PLAYOUT_POLICIES
+import mctsnc_cpu
+from utils import dict_to_str, remaining_playouts, stop_reason, STOP_RULES, PLAYOUT_POLICIES as PLAYOUT_POLICIES_NAMES
 import json
 
 __version__ = "1.0.1"
@@ -168,13 +178,45 @@ __email__ = "pklesk@zut.edu.pl"
 
 warnings.simplefilter("ignore", category=NumbaPerformanceWarning)
 
+def _kernel(signature):
+    """Returns the decorator of a kernel: ``cuda.jit`` compiling eagerly for the given signature if CUDA is available, or lazily (at first launch) otherwise - so that the module can be imported without CUDA (e.g., for the CPU backend)."""
+    return cuda.jit(signature) if cuda.is_available() else cuda.jit
+
+@intrinsic
+def _globaltimer(typingctx):
+    """Device-side intrinsic returning the value of GPU global timer (PTX special register ``%globaltimer``, in nanoseconds, common for all multiprocessors)."""
+    def codegen(context, builder, signature, args):
+        return builder.asm(ir.FunctionType(ir.IntType(64), []), "mov.u64 $0, %globaltimer;", "=l", [], True)
+    return types.uint64(), codegen
+
+if config.ENABLE_CUDASIM: # kernels executed as Python functions by CUDA simulator
+    def _globaltimer():
+        """Host-side counterpart of the ``_globaltimer`` intrinsic, used by CUDA simulator."""
+        return np.uint64(time.time_ns())
+
 # the class
 class MCTSNC:
     """
     Monte Carlo Tree Search implemented via ``numba.cuda`` meant for multi-threaded executions on GPU involving multiple concurrent trees and playouts (four algorithmic variants available). 
+    Optionally, with ``stop_rule`` set, a search is stopped before its computational budget is exhausted once the final decision becomes settled (see ``utils.stop_reason``).
+    Optionally, with ``rave=True``, all-moves-as-first (AMAF) statistics are gathered during playouts and blended into UCB formula at selection stage (RAVE),
+    so that estimates of actions separate after fewer playouts (useful for large branching factors, e.g., Gomoku). AMAF statistics of an action are kept in the node implied by it 
+    (``dev_trees_ns_amaf``, ``dev_trees_ns_wins_amaf``): for each node on the selected path, the action counts as played in a playout if the player to act at that node took it 
+    anywhere later - in the tree or in the playout.
+    Optionally, with ``backend="cpu"``, the same computations are carried out on CPU cores by compiled functions mirroring the kernels (see :doc:`mctsnc_cpu`), on arrays of the same layout in host memory.
+    Optionally, with ``fused=True`` (ocp variants), each step of the search - selection, expansion, playouts and backup - is carried out by a single kernel launch (one block per tree, stages separated by block-level synchronizations), 
+    which saves the overhead of several launches and synchronizations per step (significant for small boards, where kernels are short). 
+    Additionally, with ``device_loop=True``, steps are looped on device in batches - each launch carries out as many steps as fit (according to mean time per step so far) into ``DEVICE_LOOP_BATCH_TIME`` and into the remaining time, 
+    and is ended at the latest by a device-side deadline implied by ``search_time_limit`` - so that the host only waits for batches to complete.
+    Kernels of consecutive stages are queued on device without intermediate synchronizations (the host runs ahead of the device by at most one step). With ``profile=True``, stages are timed by CUDA events 
+    recorded asynchronously and read once at the end of a run; with ``profile=False``, no events are recorded and only total times of the search are reported.
+    Optionally, with ``ponder=True``, ``start_pondering`` lets the search go on (in a background thread launching the kernels) from the position after this AI's move, while the opponent is to move;
+    once the opponent's move arrives (``run``), statistics of the pondered subtree of the new position - counts of visits and wins of its children summed over trees - are carried over 
+    and added to statistics of root actions of the next search (prior to the final decision).
     """    
     
     # constants
+    BACKENDS = ["cuda", "cpu"]
     VARIANTS = ["ocp_thrifty", "ocp_prodigal", "acp_thrifty", "acp_prodigal"] # ocp - one child playouts, acp - all children playouts; thrifty/prodigal - accurate/overhead usage of cuda blocks (pertains to expanded actions)          
     DEFAULT_SEARCH_TIME_LIMIT = 5.0 # [s], np.inf possible
     DEFAULT_SEARCH_STEPS_LIMIT = np.inf # integer, np.inf possible
@@ -184,6 +226,21 @@ class MCTSNC:
     DEFAULT_DEVICE_MEMORY = 2.0 
     DEFAULT_UCB_C = 2.0
     DEFAULT_SEED = 0 
+    DEFAULT_STOP_RULE = None
+    DEFAULT_RAVE = False
+    DEFAULT_RAVE_K = 1000.0 # equivalence parameter of RAVE (number of visits for which AMAF and direct estimates are weighted equally)
+    DEFAULT_PLAYOUT_POLICY = PLAYOUT_POLICIES_NAMES[0]
+    DEFAULT_BACKEND = BACKENDS[0]
+    DEFAULT_FUSED = False
+    DEFAULT_DEVICE_LOOP = False
+    DEFAULT_PROFILE = True
+    DEFAULT_PONDER = False
+    DEFAULT_GAME_NAME = "C4" # game of device-side mechanics (see mctsnc_game_mechanics), for the CPU backend - key of GAME_MECHANICS from mctsnj_game_mechanics
+    CPU_TPB_DEFAULT = 512 # emulated default tpb for the CPU backend (as on a typical GPU, so that computations, e.g., indexing of random generators, follow the ones on GPU)
+    STOP_CHECK_INTERVAL = 0.05 # [s], each check costs a reduction over trees and a device-to-host transfer
+    STEP_SYNCHRONIZE_INTERVAL = 4 # number of steps the host may queue ahead of the device (time limits exceeded by at most that many steps)
+    PROFILE_EVENTS_PER_STAGE = 8 # pairs of CUDA events reused cyclically per stage (with profile=True), elapsed times read when a pair comes round again
+    DEVICE_LOOP_BATCH_TIME = 0.05 # [s], target duration of a batch of steps looped on device (with device_loop=True), host regains control (e.g., for stop checks) that often
     DEFAULT_VERBOSE_DEBUG = False
     DEFAULT_VERBOSE_INFO = True
     MAX_STATE_BOARD_SHAPE = (32, 32)
@@ -197,7 +254,8 @@ class MCTSNC:
     def __init__(self, state_board_shape, state_extra_info_memory, state_max_actions, 
                  search_time_limit=DEFAULT_SEARCH_TIME_LIMIT, search_steps_limit=DEFAULT_SEARCH_STEPS_LIMIT,
                  n_trees=DEFAULT_N_TREES, n_playouts=DEFAULT_N_PLAYOUTS, variant=DEFAULT_VARIANT, device_memory=DEFAULT_DEVICE_MEMORY,                   
-                 ucb_c=DEFAULT_UCB_C, seed=DEFAULT_SEED,
+                 ucb_c=DEFAULT_UCB_C, seed=DEFAULT_SEED, stop_rule=DEFAULT_STOP_RULE, rave=DEFAULT_RAVE, rave_k=DEFAULT_RAVE_K, playout_policy=DEFAULT_PLAYOUT_POLICY,
+                 backend=DEFAULT_BACKEND, game_name=DEFAULT_GAME_NAME, fused=DEFAULT_FUSED, device_loop=DEFAULT_DEVICE_LOOP, profile=DEFAULT_PROFILE, ponder=DEFAULT_PONDER,
                  verbose_debug=DEFAULT_VERBOSE_DEBUG, verbose_info=DEFAULT_VERBOSE_INFO,
                  action_index_to_name_function=None):
         """
@@ -221,9 +279,35 @@ class MCTSNC:
             variant (str):
                 choice of algorithmic variant from {``"ocp_thrifty"``, ``"ocp_prodigal"``, ``"acp_thrifty``, ``"acp_prodigal``}, defaults to ``"acp_prodigal"``.        
             device_memory (float): 
-                GPU memory in GiBs (gibibytes) to be available for this instance, defaults to ``2.0``.
+                GPU memory (RAM for the CPU backend) in GiBs (gibibytes) to be available for this instance, defaults to ``2.0``.
             ucb_c (float):
                 value of C constant, influencing exploration tendency, appearing in UCT formula (upper confidence bounds for trees), defaults to ``2.0``. 
+            seed (int):
+                seed for the random numbers generators, defaults to ``0``.
+            stop_rule (str):
+                opt-in rule of early termination from {``None``, ``"settled"``, ``"confident"``}, defaults to ``None`` (full budget always used); 
+                ``"settled"`` stops once no other root action can overtake the best one within the remaining budget, ``"confident"`` - additionally once that is unlikely
+                (the runner-up would need more than twice its share of visits so far); checked every ``STOP_CHECK_INTERVAL`` seconds, ignored when ``forced_search_steps_limit`` is given.
+            rave (bool):
+                flag indicating whether AMAF statistics are gathered and blended into UCB formula (RAVE), defaults to ``False``.
+            rave_k (float):
+                equivalence parameter of RAVE: the weight of AMAF estimate of an action visited ``n`` times equals ``sqrt(rave_k / (3 * n + rave_k))``, defaults to ``1000.0``.
+            playout_policy (str):
+                playout policy from {``"uniform"``, ``"heavy"``}: uniformly random actions or immediate wins played and immediate losses blocked (device-side function ``choose_action_playout`` 
+                from :doc:`mctsnc_game_mechanics`, or the policy of the game from ``PLAYOUT_POLICIES`` of :doc:`mctsnj_game_mechanics` with the CPU backend), defaults to ``"uniform"``.
+            backend (str):
+                computational backend from {``"cuda"``, ``"cpu"``}: kernels on GPU or compiled functions mirroring them, parallel over CPU cores (see :doc:`mctsnc_cpu`), defaults to ``"cuda"``.
+            game_name (str):
+                name of game (key of ``GAME_MECHANICS`` from :doc:`mctsnj_game_mechanics`, e.g. ``"Gomoku"``) whose mechanics are used by the CPU backend (as device-side functions), defaults to ``"C4"``.
+            fused (bool):
+                flag indicating whether each step of the search is to be carried out by a single kernel launch (applicable to ocp variants with ``backend="cuda"``, otherwise changed to ``False``), defaults to ``False``.
+            device_loop (bool):
+                flag indicating whether steps are to be looped on device, in batches of adaptively chosen sizes ended at the latest by a device-side deadline (requires ``fused=True``, otherwise changed to ``False``), defaults to ``False``.
+            profile (bool):
+                flag indicating whether times of stages are to be measured (by CUDA events, or by host clock with the CPU backend) and reported in ``performance_info``, defaults to ``True``;
+                with ``False`` no events are recorded, but timed searches on GPU still synchronize host with device every ``STEP_SYNCHRONIZE_INTERVAL`` steps (so that time limits remain accurate).
+            ponder (bool):
+                flag indicating whether ``start_pondering`` searches in background during the opponent's turn (statistics of the subtree implied by the opponent's move carried over to the next run), defaults to ``False``.
             verbose_debug (bool):
                 debug verbosity flag, if ``True`` then detailed information about each kernel invocation are printed to console (in each iteration), defaults to ``False``.
             verbose_info (bool): 
@@ -231,8 +315,15 @@ class MCTSNC:
             action_index_to_name_function (callable):
                 pointer to user-provided function converting action indexes to a human-friendly names (e.g. ``"e2:e4"`` for chess), defaults to ``None``.            
         """
+        if not backend in self.BACKENDS:
+            invalid_backend = backend
+            backend = self.DEFAULT_BACKEND
+            print(f"[invalid backend: '{invalid_backend}' changed to default: '{backend}'; possible backends: {self.BACKENDS}]")
+        self.backend = backend
         self._set_cuda_constants()
-        if not self.cuda_available:
+        if self.backend == "cpu":
+            self.cuda_tpb_default = self.CPU_TPB_DEFAULT
+        elif not self.cuda_available:
             sys.exit(f"[MCTSNC.__init__(): exiting due to cuda computations not available]")        
         self.state_board_shape = state_board_shape
         if self.state_board_shape[0] > self.MAX_STATE_BOARD_SHAPE[0] or self.state_board_shape[1] > self.MAX_STATE_BOARD_SHAPE[1]:
@@ -267,6 +358,43 @@ class MCTSNC:
         self.device_memory = device_memory * 1024**3 # gibibytes (GiB) to bytes (B)
         self._validate_param("device_memory", float, True, 0.0, False, np.inf, self.DEFAULT_DEVICE_MEMORY)    
         self.seed = seed
+        if stop_rule is not None and not stop_rule in STOP_RULES:
+            print(f"[invalid stop_rule: '{stop_rule}' changed to default: {self.DEFAULT_STOP_RULE}; possible stop rules: {STOP_RULES}]")
+            stop_rule = self.DEFAULT_STOP_RULE
+        self.stop_rule = stop_rule
+        self.rave = rave
+        self._validate_param("rave", bool, False, False, False, True, self.DEFAULT_RAVE)
+        self.rave_k = rave_k
+        self._validate_param("rave_k", float, True, 0.0, False, np.inf, self.DEFAULT_RAVE_K)
+        if not playout_policy in PLAYOUT_POLICIES_NAMES:
+            print(f"[invalid playout_policy: '{playout_policy}' changed to default: '{self.DEFAULT_PLAYOUT_POLICY}'; possible playout policies: {PLAYOUT_POLICIES_NAMES}]")
+            playout_policy = self.DEFAULT_PLAYOUT_POLICY
+        self.playout_policy = playout_policy
+        if not game_name in GAME_MECHANICS:
+            invalid_game_name = game_name
+            game_name = self.DEFAULT_GAME_NAME
+            print(f"[invalid game_name: '{invalid_game_name}' changed to default: '{game_name}'; possible game names: {list(GAME_MECHANICS.keys())}]")
+        self.game_name = game_name
+        self.fused = fused
+        self._validate_param("fused", bool, False, False, False, True, self.DEFAULT_FUSED)
+        if self.fused and (self.backend != "cuda" or "acp" in self.variant):
+            print(f"[fused: {self.fused} not applicable to variant: '{self.variant}' with backend: '{self.backend}'; changed to: False]")
+            self.fused = False
+        self.device_loop = device_loop
+        self._validate_param("device_loop", bool, False, False, False, True, self.DEFAULT_DEVICE_LOOP)
+        if self.device_loop and not self.fused:
+            print(f"[device_loop: {self.device_loop} requires fused: True; changed to: False]")
+            self.device_loop = False
+        self.profile = profile
+        self._validate_param("profile", bool, False, False, False, True, self.DEFAULT_PROFILE)
+        self.ponder = ponder
+        self._validate_param("ponder", bool, False, False, False, True, self.DEFAULT_PONDER)
+        self.pondering = False # is the search of the pondering thread in progress
+        self.ponder_thread = None
+        self.ponder_event = None
+        self.ponder_statistics = None # (count of visits of the new root, counts of visits and wins of its children per action) carried over from pondering to the next run
+        self.ponder_info = {"steps": 0, "time_[ms]": 0.0, "carried_visits": 0} # gathered between runs
+        self.last_ponder_info = self.ponder_info
         self.verbose_debug = verbose_debug 
         self._validate_param("verbose_debug", bool, False, False, False, True, self.DEFAULT_VERBOSE_DEBUG)
         self.verbose_info = verbose_info 
@@ -300,7 +428,7 @@ class MCTSNC:
         Returns:
             str: string representation of this ``MCTSNC`` instance.
         """   
-        return f"MCTSNC(search_time_limit={self.search_time_limit}, search_steps_limit={self.search_steps_limit}, n_trees={self.n_trees}, n_playouts={self.n_playouts}, variant='{self.variant}', device_memory={np.round(self.device_memory / 1024**3, 2)}, ucb_c={self.ucb_c}, seed: {self.seed})"
+        return f"MCTSNC(search_time_limit={self.search_time_limit}, search_steps_limit={self.search_steps_limit}, n_trees={self.n_trees}, n_playouts={self.n_playouts}, variant='{self.variant}', device_memory={np.round(self.device_memory / 1024**3, 2)}, ucb_c={self.ucb_c}, seed: {self.seed}" + (f", stop_rule='{self.stop_rule}'" if self.stop_rule is not None else "") + (f", rave_k={self.rave_k}" if self.rave else "") + (f", playout_policy='{self.playout_policy}'" if self.playout_policy != self.DEFAULT_PLAYOUT_POLICY else "") + (", fused=True" if self.fused else "") + (", device_loop=True" if self.device_loop else "") + (", profile=False" if not self.profile else "") + (", ponder=True" if self.ponder else "") + (f", backend='{self.backend}', game_name='{self.game_name}')" if self.backend == "cpu" else ")")
         
     def __repr__(self):
         """
@@ -350,6 +478,9 @@ class MCTSNC:
                                         + node_index_bytes * (self.MAX_TREE_DEPTH + 2) # tree size, tree node selected, tree actions expanded * (self.state_max_actions + 2), playout outcomes * 2, selected path          
         if "acp" in self.variant: # playout all children
             per_tree_additional_memory += playout_outcomes_bytes * self.state_max_actions * 2  # playout children outcomes            
+        if self.rave:
+            per_state_additional_memory += 2 * ns_bytes # ns_amaf, ns_wins_amaf
+            per_tree_additional_memory += playout_outcomes_bytes * 2 * self.state_max_actions * 2 # playout AMAF counts (per player and action: playouts, wins)
         per_state_memory = board_element_bytes * np.prod(self.state_board_shape) + extra_info_element_bytes * self.state_extra_info_memory \
                             + node_index_bytes * (1 + self.state_max_actions) + per_state_additional_memory # board, extra info, tree array entry (parent, children nodes), additional memory
         self.max_tree_size = (int(self.device_memory) - self.n_trees * per_tree_additional_memory) // (per_state_memory * self.n_trees)
@@ -366,40 +497,63 @@ class MCTSNC:
         self.tpb_b2 = self.cuda_tpb_default
         self.tpb_rot = int(2**np.ceil(np.log2(self.n_trees))) # rot - reduce over trees 
         self.tpb_roa = tpb_max_actions # roa - reduce over actions
+        self.tpb_f = max(self.tpb_e1, self.n_playouts) # f - fused step (all stages in one block per tree)
+        self.tpb_c = self.tpb_rot # c - compaction of expanded actions (thrifty variants), thread index == tree index in prefix sum
         # device arrays
-        self.dev_trees = cuda.device_array((self.n_trees, self.max_tree_size, 1 + self.state_max_actions), dtype=node_index_dtype) # each row of a tree represents a node consisting of: parent indexes and indexes of all children (associated with actions), -1 index for none parent or child 
-        self.dev_trees_sizes = cuda.device_array(self.n_trees, dtype=size_dtype)
-        self.dev_trees_depths = cuda.device_array((self.n_trees, self.max_tree_size), dtype=depth_dtype)
-        self.dev_trees_turns = cuda.device_array((self.n_trees, self.max_tree_size), dtype=turn_dtype)
-        self.dev_trees_leaves = cuda.device_array((self.n_trees, self.max_tree_size), dtype=flag_dtype)
-        self.dev_trees_terminals = cuda.device_array((self.n_trees, self.max_tree_size), dtype=flag_dtype)
-        self.dev_trees_outcomes = cuda.device_array((self.n_trees, self.max_tree_size), dtype=outcome_dtype)        
-        self.dev_trees_ns = cuda.device_array((self.n_trees, self.max_tree_size), dtype=ns_dtype)
-        self.dev_trees_ns_wins = cuda.device_array((self.n_trees, self.max_tree_size), dtype=ns_dtype)
-        self.dev_trees_boards = cuda.device_array((self.n_trees, self.max_tree_size, self.state_board_shape[0], self.state_board_shape[1]), dtype=board_element_dtype)
-        self.dev_trees_extra_infos = cuda.device_array((self.n_trees, self.max_tree_size, self.state_extra_info_memory), dtype=extra_info_element_dtype)
-        self.dev_trees_nodes_selected = cuda.device_array(self.n_trees, dtype=node_index_dtype)
-        self.dev_trees_selected_paths = cuda.device_array((self.n_trees, self.MAX_TREE_DEPTH + 2), dtype=node_index_dtype)
-        self.dev_trees_actions_expanded = cuda.device_array((self.n_trees, self.state_max_actions + 2), dtype=action_index_dtype) # +2 because 2 last entries inform about: child picked randomly for playouts, number of actions (children) expanded            
-        self.dev_trees_playout_outcomes = cuda.device_array((self.n_trees, 2), dtype=playout_outcomes_dtype) # each row stores counts of: -1 wins and +1 wins, respectively (for given tree) 
+        if self.backend == "cuda":
+            device_array, to_device, create_random_generators = cuda.device_array, cuda.to_device, create_xoroshiro128p_states
+        else: # "cpu" - arrays of the same layout in host memory
+            device_array, to_device, create_random_generators = np.empty, np.array, mctsnc_cpu.create_xoroshiro128p_states
+            self.game_mechanics = GAME_MECHANICS[self.game_name] + (PLAYOUT_POLICIES[self.game_name][self.playout_policy],)
+        self.dev_trees = device_array((self.n_trees, self.max_tree_size, 1 + self.state_max_actions), dtype=node_index_dtype) # each row of a tree represents a node consisting of: parent indexes and indexes of all children (associated with actions), -1 index for none parent or child 
+        self.dev_trees_sizes = device_array(self.n_trees, dtype=size_dtype)
+        self.dev_trees_depths = device_array((self.n_trees, self.max_tree_size), dtype=depth_dtype)
+        self.dev_trees_turns = device_array((self.n_trees, self.max_tree_size), dtype=turn_dtype)
+        self.dev_trees_leaves = device_array((self.n_trees, self.max_tree_size), dtype=flag_dtype)
+        self.dev_trees_terminals = device_array((self.n_trees, self.max_tree_size), dtype=flag_dtype)
+        self.dev_trees_outcomes = device_array((self.n_trees, self.max_tree_size), dtype=outcome_dtype)        
+        self.dev_trees_ns = device_array((self.n_trees, self.max_tree_size), dtype=ns_dtype)
+        self.dev_trees_ns_wins = device_array((self.n_trees, self.max_tree_size), dtype=ns_dtype)
+        if self.rave:
+            self.dev_trees_ns_amaf = device_array((self.n_trees, self.max_tree_size), dtype=ns_dtype)
+            self.dev_trees_ns_wins_amaf = device_array((self.n_trees, self.max_tree_size), dtype=ns_dtype)
+            self.dev_trees_playout_amaf = to_device(np.zeros((self.n_trees, 2, self.state_max_actions, 2), dtype=playout_outcomes_dtype)) # for each player (-1, +1) and action: counts of playouts with the action played by the player and of wins of the player among them (zeroed after each backup)
+        else: # fake arrays (not accessed by kernels)
+            self.dev_trees_ns_amaf = device_array((1, 1), dtype=ns_dtype)
+            self.dev_trees_ns_wins_amaf = device_array((1, 1), dtype=ns_dtype)
+            self.dev_trees_playout_amaf = device_array((1, 1, 1, 2), dtype=playout_outcomes_dtype)
+        if self.backend == "cpu": # AMAF counts per (tree, action) pair gathered by playouts on CPU, for the maximal number of pairs (fake if not rave)
+            n_pairs = self.n_trees * (self.state_max_actions if self.variant.startswith("acp") else 1)
+            self.pairs_amaf = np.empty((n_pairs, 2, self.state_max_actions, 2) if self.rave else (1, 1, 1, 2), dtype=playout_outcomes_dtype)
+        self.dev_trees_boards = device_array((self.n_trees, self.max_tree_size, self.state_board_shape[0], self.state_board_shape[1]), dtype=board_element_dtype)
+        self.dev_trees_extra_infos = device_array((self.n_trees, self.max_tree_size, self.state_extra_info_memory), dtype=extra_info_element_dtype)
+        self.dev_trees_nodes_selected = device_array(self.n_trees, dtype=node_index_dtype)
+        self.dev_trees_selected_paths = device_array((self.n_trees, self.MAX_TREE_DEPTH + 2), dtype=node_index_dtype)
+        self.dev_trees_steps = device_array(self.n_trees, dtype=np.int32) # numbers of steps carried out by trees (counted by fused kernel)
+        self.dev_globaltimer = device_array(1, dtype=np.uint64) # reading of GPU global timer (to relate device-side deadlines to host time)
+        self.dev_trees_actions_expanded = device_array((self.n_trees, self.state_max_actions + 2), dtype=action_index_dtype) # +2 because 2 last entries inform about: child picked randomly for playouts, number of actions (children) expanded            
+        self.dev_trees_playout_outcomes = device_array((self.n_trees, 2), dtype=playout_outcomes_dtype) # each row stores counts of: -1 wins and +1 wins, respectively (for given tree) 
+        self.dev_trees_actions_expanded_flat = None
+        if self.variant.endswith("thrifty"): # rows of pairs (tree index, action index) compacted on device, sized by upper bound on total of expanded actions (rows beyond the total kept at -1)
+            self.dev_trees_actions_expanded_flat = to_device(-np.ones((self.n_trees * self.state_max_actions, 2), dtype=action_index_dtype))
         self.dev_trees_playout_outcomes_children = None
         self.dev_random_generators_expand_1 = None         
         self.dev_random_generators_playout = None
         if "ocp" in self.variant:
-            self.dev_random_generators_expand_1 = create_xoroshiro128p_states(self.n_trees * self.tpb_e1, seed=self.seed)
-            self.dev_random_generators_playout = create_xoroshiro128p_states(self.n_trees * self.n_playouts, seed=self.seed)
+            self.dev_random_generators_expand_1 = create_random_generators(self.n_trees * self.tpb_e1, seed=self.seed)
+            self.dev_random_generators_playout = create_random_generators(self.n_trees * self.n_playouts, seed=self.seed)
         else: # "acp"
-            self.dev_random_generators_playout = create_xoroshiro128p_states(self.n_trees * self.state_max_actions * self.n_playouts, seed=self.seed)                    
-            self.dev_trees_playout_outcomes_children = cuda.device_array((self.n_trees, self.state_max_actions, 2), dtype=playout_outcomes_dtype) # for each (playable) action, each row stores counts of: -1 wins and +1 wins, respectively (for given tree)
-        self.dev_root_actions_expanded = cuda.device_array(self.state_max_actions + 2, dtype=action_index_dtype)                    
-        self.dev_root_ns = cuda.device_array(self.state_max_actions, dtype=ns_extended_dtype) # all entries the same regardless of root action (overhead for convenience)
-        self.dev_actions_win_flags = cuda.device_array(self.state_max_actions, dtype=flag_dtype)
-        self.dev_actions_ns = cuda.device_array(self.state_max_actions, dtype=ns_extended_dtype)
-        self.dev_actions_ns_wins = cuda.device_array(self.state_max_actions, dtype=ns_extended_dtype)        
-        self.dev_best_action = cuda.device_array(1, dtype=action_index_dtype) 
-        self.dev_best_win_flag = cuda.device_array(1, dtype=flag_dtype)                
-        self.dev_best_n = cuda.device_array(1, dtype=ns_extended_dtype)
-        self.dev_best_n_wins = cuda.device_array(1, dtype=ns_extended_dtype)                 
+            self.dev_random_generators_playout = create_random_generators(self.n_trees * self.state_max_actions * self.n_playouts, seed=self.seed)                    
+            self.dev_trees_playout_outcomes_children = device_array((self.n_trees, self.state_max_actions, 2), dtype=playout_outcomes_dtype) # for each (playable) action, each row stores counts of: -1 wins and +1 wins, respectively (for given tree)
+        self.dev_root_actions_expanded = device_array(self.state_max_actions + 2, dtype=action_index_dtype)                    
+        self.dev_root_ns = device_array(self.state_max_actions, dtype=ns_extended_dtype) # all entries the same regardless of root action (overhead for convenience)
+        self.dev_actions_win_flags = device_array(self.state_max_actions, dtype=flag_dtype)
+        self.dev_actions_ns = device_array(self.state_max_actions, dtype=ns_extended_dtype)
+        self.dev_actions_ns_wins = device_array(self.state_max_actions, dtype=ns_extended_dtype)        
+        self.dev_best_action = device_array(1, dtype=action_index_dtype) 
+        self.dev_best_win_flag = device_array(1, dtype=flag_dtype)                
+        self.dev_best_n = device_array(1, dtype=ns_extended_dtype)
+        self.dev_best_n_wins = device_array(1, dtype=ns_extended_dtype)                 
         t2_dev_arrays = time.time()
         if self.verbose_info:
             print(f"[MCTSNC._init_device_side_arrays() done; time: {t2_dev_arrays - t1_dev_arrays} s, per_state_memory: {per_state_memory} B,  calculated max_tree_size: {self.max_tree_size}]")
@@ -423,25 +577,250 @@ class MCTSNC:
                 best action resulting from search.
         """
         print(f"MCTSNC RUN... [{self}]")        
-        run_method = getattr(self, "_run_" + self.variant)
-        run_method(root_board, root_extra_info, root_turn, forced_search_steps_limit)
+        self._finish_pondering(root_board, root_extra_info)
+        self.last_ponder_info = self.ponder_info
+        self.ponder_info = {"steps": 0, "time_[ms]": 0.0, "carried_visits": 0}
+        self._run_method()(root_board, root_extra_info, root_turn, forced_search_steps_limit)
         best_action_label = str(self.best_action)
         if self.action_index_to_name_function is not None:
             best_action_label += f" ({self.action_index_to_name_function(self.best_action)})"
         print(f"MCTSNC RUN DONE. [time: {self.time_total} s; best action: {best_action_label}, best win_flag: {self.best_win_flag}, best n: {self.best_n}, best n_wins: {self.best_n_wins}, best q: {self.best_q}]")
         return self.best_action
     
-    def _flatten_trees_actions_expanded_thrifty(self, trees_actions_expanded):
-        """Uses information from array ``trees_actions_expanded`` of shape ``(self.n_trees, self.state_max_actions + 2)`` and converts it to another array where the number of rows corresponds to the total of expanded legal actions in all trees. Each row contains a pair of indexes for: action and tree. The approach allows to allocate exact number of needed CUDA blocks for further operations."""            
-        actions_expanded_cumsum = np.cumsum(trees_actions_expanded[:, -1])
-        trees_actions_expanded_flat = -np.ones((actions_expanded_cumsum[-1], 2), dtype=np.int16)
-        shift = 0
-        for ti in range(self.n_trees):
-            s = slice(shift, actions_expanded_cumsum[ti])
-            trees_actions_expanded_flat[s, 0] = ti
-            trees_actions_expanded_flat[s, 1] = trees_actions_expanded[ti, :trees_actions_expanded[ti, -1]]
-            shift = actions_expanded_cumsum[ti]                                        
-        return trees_actions_expanded_flat
+    def _run_method(self):
+        """Returns the method carrying out computations for the chosen backend and algorithmic variant."""
+        if self.backend == "cpu":
+            return self._run_cpu
+        if self.fused:
+            return self._run_ocp_fused
+        return getattr(self, "_run_" + self.variant)
+
+    def start_pondering(self, root_board, root_extra_info, root_turn):
+        """
+        Starts pondering (if ``ponder=True``): a search from the given position - the current one, with the opponent to move - carried out in a background thread 
+        (on device-side arrays of this instance) until the opponent's move arrives via ``run`` (or until ``stop_pondering``); device-side arrays must have been initialized 
+        and, with the CPU backend, at least one run must have been carried out (otherwise pondering is skipped).
+        Numbers of steps, time of pondering and counts of visits carried over are accumulated in ``ponder_info`` and reported in ``performance_info`` of the next run.
+        
+        Args:
+            root_board (ndarray): 
+                two-dimensional array with board of the position to ponder over.
+            root_extra_info (ndarray): 
+                additional information of the position to ponder over (see ``run``).
+            root_turn {-1, 1}:
+                indicator of the player to act in the position to ponder over (the opponent).
+        """
+        self.stop_pondering()
+        if not self.ponder or (self.backend == "cpu" and not hasattr(self, "best_action")): # functions of the CPU backend are compiled lazily - by the first run, in the main thread
+            return
+        self.ponder_statistics = None
+        self.pondering = True
+        self.ponder_event = threading.Event()
+        self.ponder_thread = threading.Thread(target=self._ponder_loop, args=(np.array(root_board), None if root_extra_info is None else np.array(root_extra_info), root_turn), daemon=True)
+        self.ponder_thread.start()
+
+    def stop_pondering(self):
+        """
+        Stops pondering (if in progress), discarding its statistics.
+        """
+        self._finish_pondering()
+
+    def _ponder_loop(self, root_board, root_extra_info, root_turn):
+        """Body of the pondering thread: runs the search from the pondered position (quietly, without limits) until the stopping event is set (checked in loops of run methods)."""
+        t1 = time.time()
+        self._run_method()(root_board, root_extra_info, root_turn)
+        self.ponder_info["steps"] += int(self.steps)
+        self.ponder_info["time_[ms]"] += 10.0**3 * (time.time() - t1)
+
+    def _finish_pondering(self, root_board=None, root_extra_info=None):
+        """Stops the pondering thread (if running) and, if the new root is given, carries over statistics of its pondered subtree (see ``_carry_over_pondering``)."""
+        if self.ponder_thread is None:
+            return
+        self.ponder_event.set()
+        self.ponder_thread.join()
+        self.ponder_thread = None
+        self.pondering = False
+        if root_board is not None:
+            self._carry_over_pondering(root_board, root_extra_info)
+
+    def _carry_over_pondering(self, root_board, root_extra_info):
+        """
+        Finds the child of the pondered root whose board (and extra info) match the new root - the position implied by the opponent's move - and memorizes in ``ponder_statistics``
+        its count of visits and counts of visits and wins of its children per action, summed over trees (transferring only rows of the trees involved).
+        """
+        self.ponder_statistics = None
+        if self.steps == 0:
+            return
+        root_board = np.asarray(root_board, dtype=np.int8)
+        root_extra_info = None if root_extra_info is None else np.asarray(root_extra_info, dtype=np.int8).ravel()
+        root_children = self._copy_to_host(self.dev_trees[0, 0])[1:]
+        matching_action = -1
+        for action in np.flatnonzero(root_children != -1):
+            child = root_children[action]
+            if not np.array_equal(self._copy_to_host(self.dev_trees_boards[0, child]), root_board):
+                continue
+            if root_extra_info is not None and not np.array_equal(self._copy_to_host(self.dev_trees_extra_infos[0, child])[:root_extra_info.size], root_extra_info):
+                continue
+            matching_action = action
+            break
+        if matching_action == -1:
+            return
+        n_root = 0
+        ns = np.zeros(self.state_max_actions, dtype=np.int64)
+        ns_wins = np.zeros(self.state_max_actions, dtype=np.int64)
+        for t in range(self.n_trees):
+            child = int(self._copy_to_host(self.dev_trees[t, 0])[1 + matching_action])
+            if child == -1:
+                continue
+            n_root += int(self._copy_to_host(self.dev_trees_ns[t, child:child + 1])[0])
+            grandchildren = self._copy_to_host(self.dev_trees[t, child])[1:]
+            actions = np.flatnonzero(grandchildren != -1)
+            if actions.size == 0:
+                continue
+            nodes = grandchildren[actions]
+            low, high = int(np.min(nodes)), int(np.max(nodes)) + 1 # children of a node are allocated together (one transfer per tree)
+            ns[actions] += self._copy_to_host(self.dev_trees_ns[t, low:high])[nodes - low]
+            ns_wins[actions] += self._copy_to_host(self.dev_trees_ns_wins[t, low:high])[nodes - low]
+        self.ponder_statistics = (n_root, ns, ns_wins)
+        self.ponder_info["carried_visits"] += n_root
+
+    def _merge_ponder_statistics(self, prodigal):
+        """Adds statistics carried over from pondering (if any) to statistics of root actions summed over trees (prior to the reduction over actions); ``prodigal`` indicates the indexing of root actions."""
+        if self.ponder_statistics is None:
+            return
+        n_root, ns, ns_wins = self.ponder_statistics
+        self.ponder_statistics = None
+        root_ns = self._copy_to_host(self.dev_root_ns)
+        actions_ns = self._copy_to_host(self.dev_actions_ns)
+        actions_ns_wins = self._copy_to_host(self.dev_actions_ns_wins)
+        if prodigal:
+            indexes = np.flatnonzero(root_ns > 0)
+            actions = indexes
+        else:
+            root_actions_expanded = self._copy_to_host(self.dev_root_actions_expanded)
+            indexes = np.arange(int(root_actions_expanded[-1]))
+            actions = root_actions_expanded[indexes].astype(np.int64)
+        root_ns[indexes] += n_root
+        actions_ns[indexes] += ns[actions]
+        actions_ns_wins[indexes] += ns_wins[actions]
+        self._copy_to_device(root_ns, self.dev_root_ns)
+        self._copy_to_device(actions_ns, self.dev_actions_ns)
+        self._copy_to_device(actions_ns_wins, self.dev_actions_ns_wins)
+
+    @staticmethod
+    def _copy_to_device(ary, dev_array):
+        """Copies a host array to a device-side array (or to a host array standing for it, with the CPU backend)."""
+        if isinstance(dev_array, np.ndarray):
+            dev_array[...] = ary
+        else:
+            dev_array.copy_to_device(ary)
+
+    @staticmethod
+    def _copy_to_host(dev_array, ary=None):
+        """Copies a device-side array (or a host array standing for it, with the CPU backend) to host memory - into ``ary`` if given - and returns the copy."""
+        if isinstance(dev_array, np.ndarray):
+            if ary is None:
+                return dev_array.copy()
+            ary[...] = dev_array
+            return ary
+        return dev_array.copy_to_host(ary=ary)
+
+    def _synchronize(self):
+        """Synchronizes host with device between kernels only in verbose debug mode (so that printed host-side times of kernels are valid), otherwise kernels are queued without waiting."""
+        if self.verbose_debug:
+            cuda.synchronize()
+    
+    def _reset_stage_events(self, stages):
+        """Zeroes times of given stages and (if ``profile=True``) prepares, per stage, ``PROFILE_EVENTS_PER_STAGE`` pairs of CUDA events reused cyclically to mark beginnings and ends of the stage in consecutive steps."""
+        self.stage_events = {}
+        self.stage_events_counts = {}
+        for stage in stages:
+            setattr(self, f"time_{stage}", 0.0)
+            if self.profile:
+                self.stage_events[stage] = [(cuda.event(), cuda.event()) for _ in range(self.PROFILE_EVENTS_PER_STAGE)]
+                self.stage_events_counts[stage] = 0
+        self.steps_unsynchronized = 0
+    
+    def _accumulate_stage_time(self, stage, index):
+        """Adds the elapsed time between given pair of events of given stage to attribute ``time_<stage>`` [s] (waiting for the end event, recorded at least ``PROFILE_EVENTS_PER_STAGE - 1`` steps ago unless read after the loop)."""
+        event_begin, event_end = self.stage_events[stage][index]
+        event_end.synchronize()
+        setattr(self, f"time_{stage}", getattr(self, f"time_{stage}") + event_begin.elapsed_time(event_end) * 10.0**-3)
+    
+    def _begin_stage(self, stage):
+        """Records (if ``profile=True``) the beginning of given stage by the next pair of events in the cycle, first reading the elapsed time from that pair if it is being reused."""
+        if not self.profile:
+            return
+        count = self.stage_events_counts[stage]
+        index = count % self.PROFILE_EVENTS_PER_STAGE
+        if count >= self.PROFILE_EVENTS_PER_STAGE:
+            self._accumulate_stage_time(stage, index)
+        self.stage_events[stage][index][0].record()
+    
+    def _end_stage(self, stage):
+        """Records (if ``profile=True``) the end of given stage by the current pair of events in the cycle."""
+        if not self.profile:
+            return
+        count = self.stage_events_counts[stage]
+        self.stage_events[stage][count % self.PROFILE_EVENTS_PER_STAGE][1].record()
+        self.stage_events_counts[stage] = count + 1
+    
+    def _read_stage_times(self):
+        """Reads elapsed times from pairs of events not read yet (once, after all steps have been completed) and adds them up into attributes ``time_<stage>`` [s]."""
+        for stage, count in self.stage_events_counts.items():
+            for i in range(max(count - self.PROFILE_EVENTS_PER_STAGE, 0), count):
+                self._accumulate_stage_time(stage, i % self.PROFILE_EVENTS_PER_STAGE)
+    
+    def _steps_synchronized(self):
+        """Returns ``True`` if the host is to synchronize with the device every ``STEP_SYNCHRONIZE_INTERVAL`` steps (regardless of ``profile``), i.e. with the CUDA backend whenever the search is timed (finite ``search_time_limit`` or pondering)."""
+        return self.backend == "cuda" and (self.search_time_limit < np.inf or self.pondering)
+    
+    def _step_done(self):
+        """Lets the host run ahead of the device (queueing launches that overlap with computations) by at most ``STEP_SYNCHRONIZE_INTERVAL`` steps, synchronizing once per that many steps, so that time limits remain accurate (no synchronization if the search is not timed)."""
+        if not self._steps_synchronized():
+            return
+        self.steps_unsynchronized += 1
+        if self.steps_unsynchronized >= self.STEP_SYNCHRONIZE_INTERVAL:
+            cuda.synchronize()
+            self.steps_unsynchronized = 0
+    
+    def _backup_amaf_stage(self, all_children):
+        """Launches the kernel backing up AMAF statistics along selected paths (with ``rave=True``); ``all_children`` indicates an acp variant (playouts made on all children of selected nodes)."""
+        bpg = self.n_trees
+        tpb = self.tpb_b1
+        if self.verbose_debug:
+            print(f"[MCTSNC._backup_amaf()...; bpg: {bpg}, tpb: {tpb}]")
+        MCTSNC._backup_amaf[bpg, tpb](self.n_playouts, all_children,
+                                      self.dev_trees, self.dev_trees_turns, self.dev_trees_ns_amaf, self.dev_trees_ns_wins_amaf,
+                                      self.dev_trees_selected_paths, self.dev_trees_actions_expanded, self.dev_trees_playout_outcomes, self.dev_trees_playout_amaf)
+        self._synchronize()
+        if self.verbose_debug:
+            print("[MCTSNC._backup_amaf() done]")
+
+    def _device_deadline(self, host_deadline):
+        """Returns the device-side deadline (in nanoseconds of GPU global timer) corresponding to given host time (in seconds since the epoch), relating the two timers by a single reading of the device one."""
+        t1 = time.time()
+        MCTSNC._read_globaltimer[1, 1](self.dev_globaltimer)
+        device_now = int(self.dev_globaltimer.copy_to_host()[0])
+        t2 = time.time()
+        return device_now + int((host_deadline - 0.5 * (t1 + t2)) * 10.0**9)
+    
+    def _device_loop_n_steps(self, elapsed, forced_search_steps_limit=np.inf):
+        """
+        Returns the number of steps for the next batch looped on device (with ``device_loop=True``): one step initially, 
+        then as many steps as fit - according to mean time per step so far - into ``DEVICE_LOOP_BATCH_TIME`` and into the remaining time, not exceeding the remaining steps (at least one step).
+        """
+        if self.steps == 0 or self.time_batches <= 0.0: # no timed steps yet (e.g., batches cut to no steps by the deadline)
+            return 1
+        time_per_step = self.time_batches / self.steps
+        if self.pondering: # no limits, until the opponent's move arrives
+            return max(int(self.DEVICE_LOOP_BATCH_TIME / time_per_step), 1)
+        steps_limit = forced_search_steps_limit if forced_search_steps_limit < np.inf else self.search_steps_limit
+        batch_time = self.DEVICE_LOOP_BATCH_TIME if forced_search_steps_limit < np.inf else min(self.DEVICE_LOOP_BATCH_TIME, self.search_time_limit - elapsed)
+        n_steps = max(int(batch_time / time_per_step), 1)
+        if steps_limit < np.inf:
+            n_steps = max(min(n_steps, int(steps_limit - self.steps)), 1)
+        return n_steps
     
     def _make_performance_info(self):
         """
@@ -449,9 +828,13 @@ class MCTSNC:
         After the call, available via ``performance_info`` attribute.
         """
         performance_info = {}
+        performance_info["timing"] = ("cuda_events" if self.backend == "cuda" else "host_clock") if self.profile else "none" # source of stage times
+        performance_info["step_synchronize_interval"] = self.STEP_SYNCHRONIZE_INTERVAL if self._steps_synchronized() else None # host-device synchronizations (in steps) also with profile=False
         performance_info["steps"] = int(self.steps)
         performance_info["steps_per_second"] = self.steps / self.time_total                
-        root_ns = self.dev_root_ns.copy_to_host()
+        if self.device_loop:
+            performance_info["batches"] = int(self.batches)
+        root_ns = self._copy_to_host(self.dev_root_ns)
         playouts = root_ns[root_ns > 0][0]
         performance_info["playouts"] = int(playouts) 
         performance_info["playouts_per_second"] = performance_info["playouts"] / self.time_total           
@@ -462,15 +845,22 @@ class MCTSNC:
         times_info["reduce_over_trees"] = ms_factor * self.time_reduce_over_trees
         times_info["reduce_over_actions"] = ms_factor * self.time_reduce_over_actions
         times_info["mean_loop"] = times_info["loop"] / self.steps
-        times_info["mean_select"] = ms_factor * self.time_select / self.steps
-        times_info["mean_expand"] = ms_factor * self.time_expand / self.steps
-        times_info["mean_playout"] = ms_factor * self.time_playout / self.steps
-        times_info["mean_backup"] = ms_factor * self.time_backup / self.steps
+        if self.profile: # stages timed
+            if self.fused: # stages not separable in time
+                times_info["mean_step_fused"] = ms_factor * self.time_step_fused / self.steps
+            else:
+                times_info["mean_select"] = ms_factor * self.time_select / self.steps
+                times_info["mean_expand"] = ms_factor * self.time_expand / self.steps
+                times_info["mean_playout"] = ms_factor * self.time_playout / self.steps
+                times_info["mean_backup"] = ms_factor * self.time_backup / self.steps
         performance_info["times_[ms]"] = times_info                                                              
+        performance_info["stop"] = self.stop_info
+        if self.ponder:
+            performance_info["ponder"] = self.last_ponder_info
         trees_depths = np.empty_like(self.dev_trees_depths)
         trees_sizes = np.empty_like(self.dev_trees_sizes)
-        self.dev_trees_depths.copy_to_host(ary=trees_depths)
-        self.dev_trees_sizes.copy_to_host(ary=trees_sizes)        
+        self._copy_to_host(self.dev_trees_depths, trees_depths)
+        self._copy_to_host(self.dev_trees_sizes, trees_sizes)        
         mean_depth = 0
         max_depth = -1        
         for i in range(self.n_trees):
@@ -491,6 +881,61 @@ class MCTSNC:
         self.performance_info = performance_info
         return performance_info
     
+    def _stop_search(self, elapsed, root_turn):
+        """
+        Applies the stopping rule (at most once per ``STOP_CHECK_INTERVAL`` seconds) to statistics of root actions summed over trees (by the reduction kernel of the current variant, invoked in the middle of the loop); 
+        memorizes the reason in ``stop_reason`` and returns ``True`` if the search is to be stopped.
+        """
+        if self.stop_rule is None or self.steps == 0 or elapsed - self.time_stop_check < self.STOP_CHECK_INTERVAL:
+            return False
+        self.time_stop_check = elapsed
+        if self.backend == "cpu":
+            n_root_actions = self.state_max_actions if self.variant.endswith("prodigal") else int(self.dev_root_actions_expanded[-1])
+            mctsnc_cpu.reduce_over_trees(self.variant.endswith("prodigal"), self.dev_trees, self.dev_trees_terminals, self.dev_trees_outcomes,
+                                         self.dev_trees_ns, self.dev_trees_ns_wins,
+                                         self.dev_root_actions_expanded, root_turn,
+                                         self.dev_root_ns, self.dev_actions_win_flags, self.dev_actions_ns, self.dev_actions_ns_wins)
+            root_actions = None if self.variant.endswith("prodigal") else np.arange(n_root_actions)
+        elif self.variant.endswith("thrifty"):
+            n_root_actions = int(self._copy_to_host(self.dev_root_actions_expanded)[-1])
+            MCTSNC._reduce_over_trees_thrifty[n_root_actions, self.tpb_rot](self.dev_trees, self.dev_trees_terminals, self.dev_trees_outcomes,
+                                                                             self.dev_trees_ns, self.dev_trees_ns_wins, 
+                                                                             self.dev_root_actions_expanded, root_turn,
+                                                                             self.dev_root_ns, self.dev_actions_win_flags, self.dev_actions_ns, self.dev_actions_ns_wins)
+            root_actions = np.arange(n_root_actions)
+            cuda.synchronize()
+        else:
+            MCTSNC._reduce_over_trees_prodigal[self.state_max_actions, self.tpb_rot](self.dev_trees, self.dev_trees_terminals, self.dev_trees_outcomes,
+                                                                                     self.dev_trees_ns, self.dev_trees_ns_wins, 
+                                                                                     self.dev_root_actions_expanded, root_turn,
+                                                                                     self.dev_root_ns, self.dev_actions_win_flags, self.dev_actions_ns, self.dev_actions_ns_wins)
+            root_actions = None
+            cuda.synchronize()
+        root_ns = self._copy_to_host(self.dev_root_ns)
+        if root_actions is None:
+            root_actions = np.flatnonzero(root_ns > 0)
+        if root_actions.size == 0:
+            return False
+        win_flags = self._copy_to_host(self.dev_actions_win_flags)[root_actions]
+        ns = self._copy_to_host(self.dev_actions_ns)[root_actions]
+        n_remaining = remaining_playouts(int(root_ns[root_actions[0]]), self.steps, elapsed, self.search_time_limit, self.search_steps_limit)
+        self.stop_reason = stop_reason(win_flags, ns, n_remaining, self.stop_rule)
+        return self.stop_reason is not None
+
+    def _make_stop_info(self, forced_search_steps_limit=np.inf):
+        """Prepares and returns a dictionary with information on how the last search stopped (reason, saved time and steps)."""
+        stop_info = {}
+        if self.stop_reason is not None:
+            stop_info["reason"] = self.stop_reason
+            stop_info["time_saved_[ms]"] = 10.0**3 * (self.search_time_limit - self.time_loop) if self.search_time_limit < np.inf else 0.0
+            stop_info["steps_saved"] = int(self.search_steps_limit - self.steps) if self.search_steps_limit < np.inf else 0
+        else:
+            stop_info["reason"] = "steps_limit" if self.steps >= min(self.search_steps_limit, forced_search_steps_limit) else "time_limit"
+            stop_info["time_saved_[ms]"] = 0.0
+            stop_info["steps_saved"] = 0
+        self.stop_info = stop_info
+        return stop_info
+
     def _make_actions_info_thrifty(self):
         """
         Prepares and returns a dictionary with information on root actions (using thrifty indexing) implied by the last run, in particular: estimates of action values, their UCBs, counts of times actions were taken, etc.
@@ -501,11 +946,11 @@ class MCTSNC:
         actions_win_flags_thrifty = np.empty_like(self.dev_actions_win_flags)
         actions_ns_thrifty = np.empty_like(self.dev_actions_ns)
         actions_ns_wins_thrifty = np.empty_like(self.dev_actions_ns_wins)
-        self.dev_root_actions_expanded.copy_to_host(ary=root_actions_expanded)
-        self.dev_root_ns.copy_to_host(ary=root_ns_thrifty)               
-        self.dev_actions_win_flags.copy_to_host(ary=actions_win_flags_thrifty)
-        self.dev_actions_ns.copy_to_host(ary=actions_ns_thrifty)
-        self.dev_actions_ns_wins.copy_to_host(ary=actions_ns_wins_thrifty)
+        self._copy_to_host(self.dev_root_actions_expanded, root_actions_expanded)
+        self._copy_to_host(self.dev_root_ns, root_ns_thrifty)               
+        self._copy_to_host(self.dev_actions_win_flags, actions_win_flags_thrifty)
+        self._copy_to_host(self.dev_actions_ns, actions_ns_thrifty)
+        self._copy_to_host(self.dev_actions_ns_wins, actions_ns_wins_thrifty)
         actions_info = {}
         best_entry = None 
         n_root_actions = root_actions_expanded[-1]
@@ -535,10 +980,10 @@ class MCTSNC:
         actions_win_flags_prodigal = np.empty_like(self.dev_actions_win_flags)
         actions_ns_prodigal = np.empty_like(self.dev_actions_ns)
         actions_ns_wins_prodigal = np.empty_like(self.dev_actions_ns_wins)
-        self.dev_root_ns.copy_to_host(ary=root_ns_prodigal)               
-        self.dev_actions_win_flags.copy_to_host(ary=actions_win_flags_prodigal)
-        self.dev_actions_ns.copy_to_host(ary=actions_ns_prodigal)
-        self.dev_actions_ns_wins.copy_to_host(ary=actions_ns_wins_prodigal)
+        self._copy_to_host(self.dev_root_ns, root_ns_prodigal)               
+        self._copy_to_host(self.dev_actions_win_flags, actions_win_flags_prodigal)
+        self._copy_to_host(self.dev_actions_ns, actions_ns_prodigal)
+        self._copy_to_host(self.dev_actions_ns_wins, actions_ns_wins_prodigal)
         actions_info = {}
         best_entry = None 
         for i in range(self.state_max_actions):
@@ -582,41 +1027,45 @@ class MCTSNC:
         if self.verbose_debug:
             print(f"[MCTSNC._reset() done; time: {t2_reset - t1_reset} s]")
             
-        self.time_select = 0.0
-        self.time_expand = 0.0        
-        self.time_playout = 0.0
-        self.time_backup = 0.0    
+        self._reset_stage_events(["select", "expand", "playout", "backup"])
         self.steps = 0
-        trees_actions_expanded = np.empty((self.n_trees, self.state_max_actions + 2), dtype=np.int16) # needed at host side for thrifty variants
+        self.stop_reason = None
+        self.time_stop_check = 0.0
         
         t1_loop = time.time()
         while True:
             t2_loop = time.time()            
-            if forced_search_steps_limit < np.inf: 
+            if self.pondering:
+                if self.ponder_event.is_set():
+                    break
+            elif forced_search_steps_limit < np.inf: 
                 if self.steps >= forced_search_steps_limit:
                     break
             elif self.steps >= self.search_steps_limit or t2_loop - t1_loop >= self.search_time_limit:
                 break
+            elif self._stop_search(t2_loop - t1_loop, root_turn):
+                break
             if self.verbose_debug:
                 print(f"[step: {self.steps + 1} starting, time used so far: {t2_loop - t1_loop} s]")     
             
             # selections
             t1_select = time.time()
+            self._begin_stage("select")
             bpg = self.n_trees
             tpb = self.tpb_s
             if self.verbose_debug:
                 print(f"[MCTSNC._select()...; bpg: {bpg}, tpb: {tpb}]")
-            MCTSNC._select[bpg, tpb](self.ucb_c, 
-                                     self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, 
+            MCTSNC._select[bpg, tpb](self.ucb_c, self.rave, self.rave_k, 
+                                     self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, self.dev_trees_ns_amaf, self.dev_trees_ns_wins_amaf, 
                                      self.dev_trees_nodes_selected, self.dev_trees_selected_paths)
-            cuda.synchronize()
+            self._synchronize()
             t2_select = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._select() done; time: {t2_select - t1_select} s]")
-            self.time_select += t2_select - t1_select
+            self._end_stage("select")
             
             # expansions            
-            t1_expand = time.time()
+            self._begin_stage("expand")
             t1_expand_1 = time.time()
             bpg = self.n_trees
             tpb = self.tpb_e1
@@ -626,33 +1075,35 @@ class MCTSNC:
                                                    self.dev_trees, self.dev_trees_sizes, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals,
                                                    self.dev_trees_boards, self.dev_trees_extra_infos, 
                                                    self.dev_trees_nodes_selected, self.dev_random_generators_expand_1, self.dev_trees_actions_expanded)                                                    
-            self.dev_trees_actions_expanded.copy_to_host(ary=trees_actions_expanded)
-            cuda.synchronize()
+            self._synchronize()
             if self.steps == 0:                
                 MCTSNC._memorize_root_actions_expanded[1, self.state_max_actions + 2](self.dev_trees_actions_expanded, self.dev_root_actions_expanded)                            
-                cuda.synchronize()
+                self._synchronize()
             t2_expand_1 = time.time()            
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_1_ocp_thrifty() done; time: {t2_expand_1 - t1_expand_1} s]")
             t1_expand_2 = time.time()            
-            trees_actions_expanded_flat = self._flatten_trees_actions_expanded_thrifty(trees_actions_expanded)
-            bpg = trees_actions_expanded_flat.shape[0] # thrifty number of blocks
+            bpg = self.n_trees
+            tpb = self.tpb_c
+            if self.verbose_debug:
+                print(f"[MCTSNC._flatten_trees_actions_expanded_thrifty()...; bpg: {bpg}, tpb: {tpb}]")
+            MCTSNC._flatten_trees_actions_expanded_thrifty[bpg, tpb](self.dev_trees_actions_expanded, self.dev_trees_actions_expanded_flat)
+            bpg = self.dev_trees_actions_expanded_flat.shape[0] # upper bound on thrifty number of blocks (blocks beyond actual total return at once)
             tpb = self.tpb_e2
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_2_thrifty()...; bpg: {bpg}, tpb: {tpb}]")
-            dev_trees_actions_expanded_flat = cuda.to_device(trees_actions_expanded_flat)
             MCTSNC._expand_2_thrifty[bpg, tpb](self.dev_trees, self.dev_trees_depths, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals, self.dev_trees_outcomes, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                                self.dev_trees_boards, self.dev_trees_extra_infos,                                               
-                                               self.dev_trees_nodes_selected, dev_trees_actions_expanded_flat)
-            cuda.synchronize()
+                                               self.dev_trees_nodes_selected, self.dev_trees_actions_expanded_flat)
+            self._synchronize()
             t2_expand_2 = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_2_thrifty() done; time: {t2_expand_2 - t1_expand_2} s]")
-            t2_expand = time.time()
-            self.time_expand += t2_expand - t1_expand
+            self._end_stage("expand")
             
             # playouts
             t1_playout = time.time()
+            self._begin_stage("playout")
             bpg = self.n_trees
             tpb = self.n_playouts
             if self.verbose_debug:
@@ -660,15 +1111,16 @@ class MCTSNC:
             MCTSNC._playout_ocp[bpg, tpb](self.dev_trees, self.dev_trees_turns, self.dev_trees_terminals, self.dev_trees_outcomes, 
                                           self.dev_trees_boards, self.dev_trees_extra_infos, 
                                           self.dev_trees_nodes_selected, self.dev_trees_actions_expanded, 
-                                          self.dev_random_generators_playout, self.dev_trees_playout_outcomes)
-            cuda.synchronize()
+                                          self.dev_random_generators_playout, self.dev_trees_playout_outcomes, self.rave, self.dev_trees_playout_amaf, self.playout_policy == "heavy")
+            self._synchronize()
             t2_playout = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._playout_ocp() done; time: {t2_playout - t1_playout} s]")
-            self.time_playout += t2_playout - t1_playout
+            self._end_stage("playout")
             
             # backups
             t1_backup = time.time()  
+            self._begin_stage("backup")
             bpg = self.n_trees            
             tpb = self.tpb_b2                     
             if self.verbose_debug:
@@ -676,13 +1128,19 @@ class MCTSNC:
             MCTSNC._backup_ocp[bpg, tpb](self.n_playouts,
                                          self.dev_trees, self.dev_trees_turns, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                          self.dev_trees_nodes_selected, self.dev_trees_selected_paths, self.dev_trees_actions_expanded, self.dev_trees_playout_outcomes)                                
-            cuda.synchronize()            
+            self._synchronize()
+            if self.rave:
+                self._backup_amaf_stage(False)
             t2_backup = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._backup() done; time: {t2_backup - t1_backup} s]")
-            self.time_backup += t2_backup - t1_backup                                        
+            self._end_stage("backup")                                        
+            self._step_done()
             self.steps += 1
+        cuda.synchronize() # steps queued on device completed
         self.time_loop = time.time() - t1_loop
+        self._read_stage_times()
+        self._make_stop_info(forced_search_steps_limit)
             
         # sum reduction over trees for each root action        
         t1_reduce_over_trees = time.time()
@@ -703,6 +1161,9 @@ class MCTSNC:
         if self.verbose_debug:
             print(f"[MCTSNC._reduce_over_trees_thrifty() done; time: {self.time_reduce_over_trees} s]")
             
+        # statistics carried over from pondering (if any)
+        self._merge_ponder_statistics(False)
+
         # max-argmax reduction over root actions
         t1_reduce_over_actions = time.time() 
         bpg = 1
@@ -726,7 +1187,7 @@ class MCTSNC:
         t2 = time.time()
         self.time_total = t2 - t1
         
-        if self.verbose_info:
+        if self.verbose_info and not self.pondering:
             print(f"[actions info:\n{dict_to_str(self._make_actions_info_thrifty())}]")
             print(f"[performance info:\n{dict_to_str(self._make_performance_info())}]")
                          
@@ -752,40 +1213,45 @@ class MCTSNC:
         if self.verbose_debug:
             print(f"[MCTSNC._reset() done; time: {t2_reset - t1_reset} s]")
             
-        self.time_select = 0.0
-        self.time_expand = 0.0        
-        self.time_playout = 0.0
-        self.time_backup = 0.0    
+        self._reset_stage_events(["select", "expand", "playout", "backup"])
         self.steps = 0
+        self.stop_reason = None
+        self.time_stop_check = 0.0
         
         t1_loop = time.time()
         while True:
             t2_loop = time.time()
-            if forced_search_steps_limit < np.inf: 
+            if self.pondering:
+                if self.ponder_event.is_set():
+                    break
+            elif forced_search_steps_limit < np.inf: 
                 if self.steps >= forced_search_steps_limit:
                     break                        
             elif self.steps >= self.search_steps_limit or t2_loop - t1_loop >= self.search_time_limit:
                 break
+            elif self._stop_search(t2_loop - t1_loop, root_turn):
+                break
             if self.verbose_debug:
                 print(f"[step: {self.steps + 1} starting, time used so far: {t2_loop - t1_loop} s]")     
             
             # selections
             t1_select = time.time()
+            self._begin_stage("select")
             bpg = self.n_trees
             tpb = self.tpb_s
             if self.verbose_debug:
                 print(f"[MCTSNC._select()...; bpg: {bpg}, tpb: {tpb}]")
-            MCTSNC._select[bpg, tpb](self.ucb_c, 
-                                     self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, 
+            MCTSNC._select[bpg, tpb](self.ucb_c, self.rave, self.rave_k, 
+                                     self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, self.dev_trees_ns_amaf, self.dev_trees_ns_wins_amaf, 
                                      self.dev_trees_nodes_selected, self.dev_trees_selected_paths)
-            cuda.synchronize()
+            self._synchronize()
             t2_select = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._select() done; time: {t2_select - t1_select} s]")
-            self.time_select += t2_select - t1_select
+            self._end_stage("select")
             
             # expansions             
-            t1_expand = time.time()
+            self._begin_stage("expand")
             t1_expand_1 = time.time()
             bpg = self.n_trees
             tpb = self.tpb_e1
@@ -795,10 +1261,10 @@ class MCTSNC:
                                                     self.dev_trees, self.dev_trees_sizes, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals,
                                                     self.dev_trees_boards, self.dev_trees_extra_infos, 
                                                     self.dev_trees_nodes_selected, self.dev_random_generators_expand_1, self.dev_trees_actions_expanded)                                                    
-            cuda.synchronize()
+            self._synchronize()
             if self.steps == 0:                
                 MCTSNC._memorize_root_actions_expanded[1, self.state_max_actions + 2](self.dev_trees_actions_expanded, self.dev_root_actions_expanded)
-                cuda.synchronize()
+                self._synchronize()
             t2_expand_1 = time.time()            
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_1_ocp_progial() done; time: {t2_expand_1 - t1_expand_1} s]")
@@ -810,15 +1276,15 @@ class MCTSNC:
             MCTSNC._expand_2_prodigal[bpg, tpb](self.dev_trees, self.dev_trees_depths, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals, self.dev_trees_outcomes, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                                 self.dev_trees_boards, self.dev_trees_extra_infos,                                               
                                                 self.dev_trees_nodes_selected, self.dev_trees_actions_expanded)
-            cuda.synchronize()
+            self._synchronize()
             t2_expand_2 = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_2_prodigal() done; time: {t2_expand_2 - t1_expand_2} s]")
-            t2_expand = time.time()
-            self.time_expand += t2_expand - t1_expand
+            self._end_stage("expand")
             
             # playouts
             t1_playout = time.time()
+            self._begin_stage("playout")
             bpg = self.n_trees 
             tpb = self.n_playouts
             if self.verbose_debug:
@@ -826,15 +1292,16 @@ class MCTSNC:
             MCTSNC._playout_ocp[bpg, tpb](self.dev_trees, self.dev_trees_turns, self.dev_trees_terminals, self.dev_trees_outcomes, 
                                             self.dev_trees_boards, self.dev_trees_extra_infos, 
                                             self.dev_trees_nodes_selected, self.dev_trees_actions_expanded, 
-                                            self.dev_random_generators_playout, self.dev_trees_playout_outcomes)
-            cuda.synchronize()
+                                            self.dev_random_generators_playout, self.dev_trees_playout_outcomes, self.rave, self.dev_trees_playout_amaf, self.playout_policy == "heavy")
+            self._synchronize()
             t2_playout = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._playout_ocp() done; time: {t2_playout - t1_playout} s]")
-            self.time_playout += t2_playout - t1_playout
+            self._end_stage("playout")
             
             # backups
             t1_backup = time.time()
+            self._begin_stage("backup")
             bpg = self.n_trees            
             tpb = self.tpb_b2                     
             if self.verbose_debug:
@@ -842,13 +1309,19 @@ class MCTSNC:
             MCTSNC._backup_ocp[bpg, tpb](self.n_playouts,
                                          self.dev_trees, self.dev_trees_turns, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                          self.dev_trees_nodes_selected, self.dev_trees_selected_paths, self.dev_trees_actions_expanded, self.dev_trees_playout_outcomes)                                
-            cuda.synchronize()            
+            self._synchronize()
+            if self.rave:
+                self._backup_amaf_stage(False)
             t2_backup = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._backup() done; time: {t2_backup - t1_backup} s]")
-            self.time_backup += t2_backup - t1_backup                                        
+            self._end_stage("backup")                                        
+            self._step_done()
             self.steps += 1
+        cuda.synchronize() # steps queued on device completed
         self.time_loop = time.time() - t1_loop
+        self._read_stage_times()
+        self._make_stop_info(forced_search_steps_limit)
             
         # sum reduction over trees for each root action        
         t1_reduce_over_trees = time.time() 
@@ -866,6 +1339,9 @@ class MCTSNC:
         if self.verbose_debug:
             print(f"[MCTSNC._reduce_over_trees_prodigal() done; time: {self.time_reduce_over_trees} s]")
             
+        # statistics carried over from pondering (if any)
+        self._merge_ponder_statistics(True)
+
         # max-argmax reduction over root actions
         t1_reduce_over_actions = time.time() 
         bpg = 1
@@ -887,10 +1363,147 @@ class MCTSNC:
         t2 = time.time()
         self.time_total = t2 - t1
         
-        if self.verbose_info:
+        if self.verbose_info and not self.pondering:
             print(f"[actions info:\n{dict_to_str(self._make_actions_info_prodigal())}]")
             print(f"[performance info:\n{dict_to_str(self._make_performance_info())}]")
                                                   
+    def _run_ocp_fused(self, root_board, root_extra_info, root_turn, forced_search_steps_limit=np.inf):
+        """Runs computations for algorithmic variant: ``"ocp_thrifty"`` or ``"ocp_prodigal"``, with ``fused=True`` (one kernel launch per step)."""
+        t1 = time.time()
+        prodigal = self.variant.endswith("prodigal")
+        
+        # reset
+        t1_reset = time.time()
+        bpg = self.n_trees
+        tpb = self.tpb_r
+        dev_root_board = cuda.to_device(root_board)
+        if root_extra_info is None:
+            root_extra_info = np.zeros(1, dtype=np.int8) # fake extra info array
+        dev_root_extra_info = cuda.to_device(root_extra_info)
+        if self.verbose_debug:
+            print(f"[MCTSNC._reset()...; bpg: {bpg}, tpb: {tpb}]")                
+        MCTSNC._reset[bpg, tpb](dev_root_board, dev_root_extra_info, root_turn, 
+                                self.dev_trees, self.dev_trees_sizes, self.dev_trees_depths, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals, self.dev_trees_ns, self.dev_trees_ns_wins, 
+                                self.dev_trees_boards, self.dev_trees_extra_infos)
+        cuda.synchronize()    
+        t2_reset = time.time()
+        if self.verbose_debug:
+            print(f"[MCTSNC._reset() done; time: {t2_reset - t1_reset} s]")
+            
+        self._reset_stage_events(["step_fused"])
+        self.time_batches = 0.0
+        self.steps = 0
+        self.batches = 0
+        self.stop_reason = None
+        self.time_stop_check = 0.0
+        self.dev_trees_steps.copy_to_device(np.zeros(self.n_trees, dtype=np.int32))
+        
+        t1_loop = time.time()
+        deadline = 0 # none
+        if self.device_loop and forced_search_steps_limit == np.inf and self.search_time_limit < np.inf and not self.pondering:
+            deadline = self._device_deadline(t1_loop + self.search_time_limit)
+        while True:
+            t2_loop = time.time()            
+            if self.pondering:
+                if self.ponder_event.is_set():
+                    break
+            elif forced_search_steps_limit < np.inf: 
+                if self.steps >= forced_search_steps_limit:
+                    break
+            elif self.steps >= self.search_steps_limit or t2_loop - t1_loop >= self.search_time_limit:
+                break
+            elif self._stop_search(t2_loop - t1_loop, root_turn):
+                break
+            if self.verbose_debug:
+                print(f"[step: {self.steps + 1} starting, time used so far: {t2_loop - t1_loop} s]")     
+            
+            # fused step(s): selections, expansions, playouts, backups
+            t1_step_fused = time.time()
+            self._begin_stage("step_fused")
+            n_steps = self._device_loop_n_steps(t2_loop - t1_loop, forced_search_steps_limit) if self.device_loop else 1
+            bpg = self.n_trees
+            tpb = self.tpb_f
+            if self.verbose_debug:
+                print(f"[MCTSNC._step_fused_ocp()...; bpg: {bpg}, tpb: {tpb}, n_steps: {n_steps}]")
+            MCTSNC._step_fused_ocp[bpg, tpb](self.max_tree_size, self.ucb_c, self.rave, self.rave_k, prodigal, self.steps == 0, self.n_playouts, self.tpb_e1, n_steps, deadline, 
+                                             self.dev_trees, self.dev_trees_sizes, self.dev_trees_depths, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals, self.dev_trees_outcomes, 
+                                             self.dev_trees_ns, self.dev_trees_ns_wins, self.dev_trees_ns_amaf, self.dev_trees_ns_wins_amaf, 
+                                             self.dev_trees_boards, self.dev_trees_extra_infos, self.dev_trees_nodes_selected, self.dev_trees_selected_paths, 
+                                             self.dev_random_generators_expand_1, self.dev_random_generators_playout, 
+                                             self.dev_trees_actions_expanded, self.dev_trees_playout_outcomes, self.dev_trees_playout_amaf, self.dev_root_actions_expanded, self.dev_trees_steps, 
+                                             self.playout_policy == "heavy")
+            self._synchronize()
+            if self.device_loop: # possibly fewer steps than n_steps due to deadline (trees may stop at different steps, counted are ones completed by all trees)
+                n_steps = int(np.min(self.dev_trees_steps.copy_to_host())) - self.steps
+            t2_step_fused = time.time()
+            if self.verbose_debug:
+                print(f"[MCTSNC._step_fused_ocp() done; time: {t2_step_fused - t1_step_fused} s, steps: {n_steps}]")
+            self._end_stage("step_fused")
+            self.time_batches += t2_step_fused - t1_step_fused # valid with device_loop=True (host synchronized by reading steps of trees)
+            self.steps += n_steps
+            self.batches += 1
+            self._step_done()
+        cuda.synchronize() # steps queued on device completed
+        self.time_loop = time.time() - t1_loop
+        self._read_stage_times()
+        self._make_stop_info(forced_search_steps_limit)
+            
+        # sum reduction over trees for each root action        
+        t1_reduce_over_trees = time.time()
+        root_actions_expanded = np.empty_like(self.dev_root_actions_expanded)
+        self.dev_root_actions_expanded.copy_to_host(ary=root_actions_expanded)
+        n_root_actions = int(root_actions_expanded[-1])
+        reduce_over_trees = MCTSNC._reduce_over_trees_prodigal if prodigal else MCTSNC._reduce_over_trees_thrifty 
+        bpg = self.state_max_actions if prodigal else n_root_actions
+        tpb = self.tpb_rot
+        if self.verbose_debug:
+            print(f"[MCTSNC._reduce_over_trees_{'prodigal' if prodigal else 'thrifty'}()...; bpg: {bpg}, tpb: {tpb}]")
+        reduce_over_trees[bpg, tpb](self.dev_trees, self.dev_trees_terminals, self.dev_trees_outcomes,
+                                    self.dev_trees_ns, self.dev_trees_ns_wins, 
+                                    self.dev_root_actions_expanded, root_turn,
+                                    self.dev_root_ns, self.dev_actions_win_flags, self.dev_actions_ns, self.dev_actions_ns_wins)
+        cuda.synchronize()
+        t2_reduce_over_trees = time.time()
+        self.time_reduce_over_trees = t2_reduce_over_trees - t1_reduce_over_trees
+        if self.verbose_debug:
+            print(f"[MCTSNC._reduce_over_trees_{'prodigal' if prodigal else 'thrifty'}() done; time: {self.time_reduce_over_trees} s]")
+            
+        # statistics carried over from pondering (if any)
+        self._merge_ponder_statistics(prodigal)
+
+        # max-argmax reduction over root actions
+        t1_reduce_over_actions = time.time() 
+        bpg = 1
+        tpb = self.tpb_roa
+        if self.verbose_debug:
+            print(f"[MCTSNC._reduce_over_actions_{'prodigal' if prodigal else 'thrifty'}()...; bpg: {bpg}, tpb: {tpb}]")
+        if prodigal:
+            MCTSNC._reduce_over_actions_prodigal[bpg, tpb](self.dev_actions_win_flags, self.dev_actions_ns, self.dev_actions_ns_wins, 
+                                                           self.dev_best_action, self.dev_best_win_flag, self.dev_best_n, self.dev_best_n_wins)
+        else:
+            MCTSNC._reduce_over_actions_thrifty[bpg, tpb](n_root_actions, 
+                                                          self.dev_actions_win_flags, self.dev_actions_ns, self.dev_actions_ns_wins, 
+                                                          self.dev_best_action, self.dev_best_win_flag, self.dev_best_n, self.dev_best_n_wins)
+        self.best_action = self.dev_best_action.copy_to_host()[0]
+        self.best_win_flag = self.dev_best_win_flag.copy_to_host()[0]                
+        self.best_n = self.dev_best_n.copy_to_host()[0]
+        self.best_n_wins = self.dev_best_n_wins.copy_to_host()[0]
+        self.best_q = self.best_n_wins / self.best_n if self.best_n > 0 else np.nan        
+        cuda.synchronize()
+        if not prodigal:
+            self.best_action = root_actions_expanded[self.best_action]
+        t2_reduce_over_actions = time.time()
+        self.time_reduce_over_actions = t2_reduce_over_actions - t1_reduce_over_actions 
+        if self.verbose_debug:
+            print(f"[MCTSNC._reduce_over_actions_{'prodigal' if prodigal else 'thrifty'}() done; time: {self.time_reduce_over_actions} s]")                
+        t2 = time.time()
+        self.time_total = t2 - t1
+        
+        if self.verbose_info and not self.pondering:
+            actions_info = self._make_actions_info_prodigal() if prodigal else self._make_actions_info_thrifty()
+            print(f"[actions info:\n{dict_to_str(actions_info)}]")
+            print(f"[performance info:\n{dict_to_str(self._make_performance_info())}]")
+                                                  
     def _run_acp_thrifty(self, root_board, root_extra_info, root_turn, forced_search_steps_limit=np.inf):
         """Runs computations for algorithmic variant: ``"acp_thrifty"``."""
         t1 = time.time()
@@ -913,41 +1526,45 @@ class MCTSNC:
         if self.verbose_debug:
             print(f"[MCTSNC._reset() done; time: {t2_reset - t1_reset} s]")
             
-        self.time_select = 0.0
-        self.time_expand = 0.0        
-        self.time_playout = 0.0
-        self.time_backup = 0.0        
-        self.steps = 0        
-        trees_actions_expanded = np.empty((self.n_trees, self.state_max_actions + 2), dtype=np.int16)
+        self._reset_stage_events(["select", "expand", "playout", "backup"])
+        self.steps = 0
+        self.stop_reason = None
+        self.time_stop_check = 0.0
         
         t1_loop = time.time()
         while True:
             t2_loop = time.time()
-            if forced_search_steps_limit < np.inf: 
+            if self.pondering:
+                if self.ponder_event.is_set():
+                    break
+            elif forced_search_steps_limit < np.inf: 
                 if self.steps >= forced_search_steps_limit:
                     break            
             elif self.steps >= self.search_steps_limit or t2_loop - t1_loop >= self.search_time_limit:
                 break
+            elif self._stop_search(t2_loop - t1_loop, root_turn):
+                break
             if self.verbose_debug:
                 print(f"[step: {self.steps + 1} starting, time used so far: {t2_loop - t1_loop} s]")     
             
             # selections
             t1_select = time.time()
+            self._begin_stage("select")
             bpg = self.n_trees
             tpb = self.tpb_s
             if self.verbose_debug:
                 print(f"[MCTSNC._select()...; bpg: {bpg}, tpb: {tpb}]")
-            MCTSNC._select[bpg, tpb](self.ucb_c, 
-                                     self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, 
+            MCTSNC._select[bpg, tpb](self.ucb_c, self.rave, self.rave_k, 
+                                     self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, self.dev_trees_ns_amaf, self.dev_trees_ns_wins_amaf, 
                                      self.dev_trees_nodes_selected, self.dev_trees_selected_paths)
-            cuda.synchronize()
+            self._synchronize()
             t2_select = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._select() done; time: {t2_select - t1_select} s]")
-            self.time_select += t2_select - t1_select
+            self._end_stage("select")
                                         
             # expansions
-            t1_expand = time.time()           
+            self._begin_stage("expand")
             t1_expand_1 = time.time()
             bpg = self.n_trees
             tpb = self.tpb_e1
@@ -957,49 +1574,51 @@ class MCTSNC:
                                                    self.dev_trees, self.dev_trees_sizes, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals,
                                                    self.dev_trees_boards, self.dev_trees_extra_infos, 
                                                    self.dev_trees_nodes_selected, self.dev_trees_actions_expanded)                                             
-            self.dev_trees_actions_expanded.copy_to_host(ary=trees_actions_expanded)
-            cuda.synchronize()            
+            self._synchronize()
             if self.steps == 0:            
                 MCTSNC._memorize_root_actions_expanded[1, self.state_max_actions + 2](self.dev_trees_actions_expanded, self.dev_root_actions_expanded)                            
-                cuda.synchronize()
+                self._synchronize()
             t2_expand_1 = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_1_acp_thrifty() done; time: {t2_expand_1 - t1_expand_1} s]")
             t1_expand_2 = time.time()            
-            trees_actions_expanded_flat = self._flatten_trees_actions_expanded_thrifty(trees_actions_expanded)
-            bpg = trees_actions_expanded_flat.shape[0] # thrifty number of blocks                                
+            bpg = self.n_trees
+            tpb = self.tpb_c
+            if self.verbose_debug:
+                print(f"[MCTSNC._flatten_trees_actions_expanded_thrifty()...; bpg: {bpg}, tpb: {tpb}]")
+            MCTSNC._flatten_trees_actions_expanded_thrifty[bpg, tpb](self.dev_trees_actions_expanded, self.dev_trees_actions_expanded_flat)
+            bpg = self.dev_trees_actions_expanded_flat.shape[0] # upper bound on thrifty number of blocks (blocks beyond actual total return at once)
             tpb = self.tpb_e2
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_2_thrifty()...; bpg: {bpg}, tpb: {tpb}]")
-            dev_trees_actions_expanded_flat = cuda.to_device(trees_actions_expanded_flat)
             MCTSNC._expand_2_thrifty[bpg, tpb](self.dev_trees, self.dev_trees_depths, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals, self.dev_trees_outcomes, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                                self.dev_trees_boards, self.dev_trees_extra_infos,                                               
-                                               self.dev_trees_nodes_selected, dev_trees_actions_expanded_flat)
-            cuda.synchronize()
+                                               self.dev_trees_nodes_selected, self.dev_trees_actions_expanded_flat)
+            self._synchronize()
             t2_expand_2 = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_2_thrifty() done; time: {t2_expand_2 - t1_expand_2} s]")
-            t2_expand = time.time()
-            self.time_expand += t2_expand - t1_expand
+            self._end_stage("expand")
             
             # playouts
             t1_playout = time.time()
-            bpg = trees_actions_expanded_flat.shape[0] # thrifty number of blocks
+            self._begin_stage("playout")
+            bpg = self.dev_trees_actions_expanded_flat.shape[0] # upper bound on thrifty number of blocks (blocks beyond actual total return at once)
             tpb = self.n_playouts
             if self.verbose_debug:
                 print(f"[MCTSNC._playout_acp_thrifty()...; bpg: {bpg}, tpb: {tpb}]")
             MCTSNC._playout_acp_thrifty[bpg, tpb](self.dev_trees, self.dev_trees_turns, self.dev_trees_terminals, self.dev_trees_outcomes, 
                                                   self.dev_trees_boards, self.dev_trees_extra_infos, 
-                                                  self.dev_trees_nodes_selected, self.dev_trees_actions_expanded, dev_trees_actions_expanded_flat,
-                                                  self.dev_random_generators_playout, self.dev_trees_playout_outcomes, self.dev_trees_playout_outcomes_children)
-            cuda.synchronize()
+                                                  self.dev_trees_nodes_selected, self.dev_trees_actions_expanded, self.dev_trees_actions_expanded_flat,
+                                                  self.dev_random_generators_playout, self.dev_trees_playout_outcomes, self.dev_trees_playout_outcomes_children, self.rave, self.dev_trees_playout_amaf, self.playout_policy == "heavy")
+            self._synchronize()
             t2_playout = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._playout_acp_thrifty() done; time: {t2_playout - t1_playout} s]")
-            self.time_playout += t2_playout - t1_playout
+            self._end_stage("playout")
             
             # backups
-            t1_backup = time.time()
+            self._begin_stage("backup")
             t1_backup_1 = time.time()
             bpg = self.n_trees
             tpb = self.tpb_b1                     
@@ -1008,7 +1627,7 @@ class MCTSNC:
             MCTSNC._backup_1_acp_thrifty[bpg, tpb](self.n_playouts, 
                                                    self.dev_trees, self.dev_trees_turns, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                                    self.dev_trees_nodes_selected, self.dev_trees_actions_expanded, self.dev_trees_playout_outcomes, self.dev_trees_playout_outcomes_children)
-            cuda.synchronize()            
+            self._synchronize()
             t2_backup_1 = time.time()            
             if self.verbose_debug:
                 print(f"[MCTSNC._backup_1_acp_thrifty() done; time: {t2_backup_1 - t1_backup_1} s]")            
@@ -1021,14 +1640,19 @@ class MCTSNC:
                                            self.dev_trees_turns, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                            self.dev_trees_selected_paths, self.dev_trees_actions_expanded, 
                                            self.dev_trees_playout_outcomes)
-            cuda.synchronize()                                    
+            self._synchronize()
             t2_backup_2 = time.time()        
             if self.verbose_debug:
                 print(f"[MCTSNC._backup_2_acp() done; time: {t2_backup_2 - t1_backup_2} s]")
-            t2_backup = time.time()
-            self.time_backup += t2_backup - t1_backup
+            if self.rave:
+                self._backup_amaf_stage(True)
+            self._end_stage("backup")
+            self._step_done()
             self.steps += 1
+        cuda.synchronize() # steps queued on device completed
         self.time_loop = time.time() - t1_loop
+        self._read_stage_times()
+        self._make_stop_info(forced_search_steps_limit)
                     
         # sum reduction over trees for each root action        
         t1_reduce_over_trees = time.time()
@@ -1049,6 +1673,9 @@ class MCTSNC:
         if self.verbose_debug:
             print(f"[MCTSNC._reduce_over_trees_thrifty() done; time: {self.time_reduce_over_trees} s]")
             
+        # statistics carried over from pondering (if any)
+        self._merge_ponder_statistics(False)
+
         # max-argmax reduction over root actions
         t1_reduce_over_actions = time.time() 
         bpg = 1
@@ -1072,7 +1699,7 @@ class MCTSNC:
         t2 = time.time()
         self.time_total = t2 - t1
         
-        if self.verbose_info:
+        if self.verbose_info and not self.pondering:
             print(f"[actions info:\n{dict_to_str(self._make_actions_info_thrifty())}]")
             print(f"[performance info:\n{dict_to_str(self._make_performance_info())}]")
             
@@ -1098,40 +1725,45 @@ class MCTSNC:
         if self.verbose_debug:
             print(f"[MCTSNC._reset() done; time: {t2_reset - t1_reset} s]")
         
-        self.time_select = 0.0
-        self.time_expand = 0.0
-        self.time_playout = 0.0
-        self.time_backup = 0.0
+        self._reset_stage_events(["select", "expand", "playout", "backup"])
         self.steps = 0
+        self.stop_reason = None
+        self.time_stop_check = 0.0
         
         t1_loop = time.time()
         while True:
             t2_loop = time.time()
-            if forced_search_steps_limit < np.inf: 
+            if self.pondering:
+                if self.ponder_event.is_set():
+                    break
+            elif forced_search_steps_limit < np.inf: 
                 if self.steps >= forced_search_steps_limit:
                     break            
             elif self.steps >= self.search_steps_limit or t2_loop - t1_loop >= self.search_time_limit:
                 break
+            elif self._stop_search(t2_loop - t1_loop, root_turn):
+                break
             if self.verbose_debug:
                 print(f"[step: {self.steps + 1} starting, time used so far: {t2_loop - t1_loop} s]")     
         
             # selections
             t1_select = time.time()
+            self._begin_stage("select")
             bpg = self.n_trees
             tpb = self.tpb_s
             if self.verbose_debug:
                 print(f"[MCTSNC._select()...; bpg: {bpg}, tpb: {tpb}]")
-            MCTSNC._select[bpg, tpb](self.ucb_c, 
-                                     self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, 
+            MCTSNC._select[bpg, tpb](self.ucb_c, self.rave, self.rave_k, 
+                                     self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, self.dev_trees_ns_amaf, self.dev_trees_ns_wins_amaf, 
                                      self.dev_trees_nodes_selected, self.dev_trees_selected_paths)
-            cuda.synchronize()                     
+            self._synchronize()
             t2_select = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._select() done; time: {t2_select - t1_select} s]")
-            self.time_select += t2_select - t1_select                                    
+            self._end_stage("select")                                    
             
             # expansions
-            t1_expand = time.time()                        
+            self._begin_stage("expand")
             t1_expand_1 = time.time()
             bpg = self.n_trees
             tpb = self.tpb_e1
@@ -1141,10 +1773,10 @@ class MCTSNC:
                                                     self.dev_trees, self.dev_trees_sizes, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals,
                                                     self.dev_trees_boards, self.dev_trees_extra_infos, 
                                                     self.dev_trees_nodes_selected, self.dev_trees_actions_expanded)                 
-            cuda.synchronize()
+            self._synchronize()
             if self.steps == 0:                
                 MCTSNC._memorize_root_actions_expanded[1, self.state_max_actions + 2](self.dev_trees_actions_expanded, self.dev_root_actions_expanded)                            
-                cuda.synchronize()
+                self._synchronize()
             t2_expand_1 = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_1_acp_prodigal() done; time: {t2_expand_1 - t1_expand_1} s]")                                
@@ -1156,15 +1788,15 @@ class MCTSNC:
             MCTSNC._expand_2_prodigal[bpg, tpb](self.dev_trees, self.dev_trees_depths, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals, self.dev_trees_outcomes, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                                 self.dev_trees_boards, self.dev_trees_extra_infos,                                               
                                                 self.dev_trees_nodes_selected, self.dev_trees_actions_expanded)
-            cuda.synchronize()            
+            self._synchronize()
             t2_expand_2 = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._expand_2_prodigal() done; time: {t2_expand_2 - t1_expand_2} s]")
-            t2_expand = time.time()
-            self.time_expand += t2_expand - t1_expand
+            self._end_stage("expand")
                         
             # playouts
             t1_playout = time.time()
+            self._begin_stage("playout")
             bpg = (self.n_trees, self.state_max_actions) # prodigal number of blocks
             tpb = self.n_playouts
             if self.verbose_debug:
@@ -1172,15 +1804,15 @@ class MCTSNC:
             MCTSNC._playout_acp_prodigal[bpg, tpb](self.dev_trees, self.dev_trees_turns, self.dev_trees_terminals, self.dev_trees_outcomes, 
                                                    self.dev_trees_boards, self.dev_trees_extra_infos, 
                                                    self.dev_trees_nodes_selected, self.dev_trees_actions_expanded, 
-                                                   self.dev_random_generators_playout, self.dev_trees_playout_outcomes, self.dev_trees_playout_outcomes_children)
-            cuda.synchronize()
+                                                   self.dev_random_generators_playout, self.dev_trees_playout_outcomes, self.dev_trees_playout_outcomes_children, self.rave, self.dev_trees_playout_amaf, self.playout_policy == "heavy")
+            self._synchronize()
             t2_playout = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._playout_acp_prodigal() done; time: {t2_playout - t1_playout} s]")
-            self.time_playout += t2_playout - t1_playout
+            self._end_stage("playout")
             
             # backups
-            t1_backup = time.time()
+            self._begin_stage("backup")
             t1_backup_1 = time.time()
             bpg = self.n_trees
             tpb = self.tpb_b1                    
@@ -1190,7 +1822,7 @@ class MCTSNC:
                                                     self.dev_trees, self.dev_trees_turns, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                                     self.dev_trees_nodes_selected, self.dev_trees_actions_expanded, 
                                                     self.dev_trees_playout_outcomes, self.dev_trees_playout_outcomes_children)
-            cuda.synchronize()            
+            self._synchronize()
             t2_backup_1 = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._backup_1_acp_prodigal() done; time: {t2_backup_1 - t1_backup_1} s]")            
@@ -1203,15 +1835,20 @@ class MCTSNC:
                                            self.dev_trees_turns, self.dev_trees_ns, self.dev_trees_ns_wins, 
                                            self.dev_trees_selected_paths, self.dev_trees_actions_expanded, 
                                            self.dev_trees_playout_outcomes)
-            cuda.synchronize()                                    
+            self._synchronize()
             t2_backup_2 = time.time()
             if self.verbose_debug:
                 print(f"[MCTSNC._backup_2_acp() done; time: {t2_backup_2 - t1_backup_2} s]")
-            t2_backup = time.time()
-            self.time_backup += t2_backup - t1_backup
+            if self.rave:
+                self._backup_amaf_stage(True)
+            self._end_stage("backup")
                                                     
+            self._step_done()
             self.steps += 1
+        cuda.synchronize() # steps queued on device completed
         self.time_loop = time.time() - t1_loop
+        self._read_stage_times()
+        self._make_stop_info(forced_search_steps_limit)
                                                         
         # sum reduction over trees
         t1_reduce_over_trees = time.time()
@@ -1229,6 +1866,9 @@ class MCTSNC:
         if self.verbose_debug:
             print(f"[MCTSNC._reduce_over_trees_prodigal() done; time: {self.time_reduce_over_trees} s]")                
                     
+        # statistics carried over from pondering (if any)
+        self._merge_ponder_statistics(True)
+
         # max-argmax reduction over root actions
         t1_reduce_over_actions = time.time() 
         bpg = 1
@@ -1250,12 +1890,143 @@ class MCTSNC:
         t2 = time.time()
         self.time_total = t2 - t1                            
                  
-        if self.verbose_info:
+        if self.verbose_info and not self.pondering:
             print(f"[actions info:\n{dict_to_str(self._make_actions_info_prodigal())}]")
             print(f"[performance info:\n{dict_to_str(self._make_performance_info())}]")                             
 
+    def _cpu_stage_done(self, stage, t1):
+        """Adds the time of given stage on CPU (by host clock, since ``t1``) to attribute ``time_<stage>`` [s] if ``profile=True``, and prints debug information."""
+        if self.profile:
+            elapsed = time.time() - t1
+            setattr(self, f"time_{stage}", getattr(self, f"time_{stage}") + elapsed)
+        if self.verbose_debug:
+            print(f"[mctsnc_cpu.{stage}() done" + (f"; time: {elapsed} s]" if self.profile else "]"))
+
+    def _run_cpu(self, root_board, root_extra_info, root_turn, forced_search_steps_limit=np.inf):
+        """Runs computations for the chosen algorithmic variant on CPU (backend ``"cpu"``), by compiled functions from :doc:`mctsnc_cpu` mirroring the kernels."""
+        t1 = time.time()
+        all_children = self.variant.startswith("acp")
+        prodigal = self.variant.endswith("prodigal")
+        is_action_legal_cpu, take_action_cpu, legal_actions_playout_cpu, take_action_playout_cpu, compute_outcome_cpu, choose_action_playout_cpu = self.game_mechanics
+        random_generators_expand_1 = self.dev_random_generators_playout if all_children else self.dev_random_generators_expand_1 # the former fake (not accessed)
+        trees_playout_outcomes_children = self.dev_trees_playout_outcomes_children if all_children else np.empty((1, 1, 2), dtype=np.int32) # the latter fake (not accessed)
+
+        # reset
+        t1_reset = time.time()
+        if root_extra_info is None:
+            root_extra_info = np.zeros(1, dtype=np.int8) # fake extra info array
+        if self.verbose_debug:
+            print(f"[mctsnc_cpu.reset()...]")
+        mctsnc_cpu.reset(np.asarray(root_board, dtype=np.int8), np.asarray(root_extra_info, dtype=np.int8), root_turn,
+                         self.dev_trees, self.dev_trees_sizes, self.dev_trees_depths, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals, self.dev_trees_ns, self.dev_trees_ns_wins,
+                         self.dev_trees_boards, self.dev_trees_extra_infos)
+        t2_reset = time.time()
+        if self.verbose_debug:
+            print(f"[mctsnc_cpu.reset() done; time: {t2_reset - t1_reset} s]")
+
+        self.time_select = 0.0
+        self.time_expand = 0.0
+        self.time_playout = 0.0
+        self.time_backup = 0.0
+        self.steps = 0
+        self.stop_reason = None
+        self.time_stop_check = 0.0
+
+        t1_loop = time.time()
+        while True:
+            t2_loop = time.time()
+            if self.pondering:
+                if self.ponder_event.is_set():
+                    break
+            elif forced_search_steps_limit < np.inf:
+                if self.steps >= forced_search_steps_limit:
+                    break
+            elif self.steps >= self.search_steps_limit or t2_loop - t1_loop >= self.search_time_limit:
+                break
+            elif self._stop_search(t2_loop - t1_loop, root_turn):
+                break
+            if self.verbose_debug:
+                print(f"[step: {self.steps + 1} starting, time used so far: {t2_loop - t1_loop} s]")
+
+            # selections
+            t1_select = time.time() if self.profile else None
+            mctsnc_cpu.select(self.ucb_c, self.rave, self.rave_k,
+                              self.dev_trees, self.dev_trees_leaves, self.dev_trees_ns, self.dev_trees_ns_wins, self.dev_trees_ns_amaf, self.dev_trees_ns_wins_amaf,
+                              self.dev_trees_nodes_selected, self.dev_trees_selected_paths)
+            self._cpu_stage_done("select", t1_select)
+
+            # expansions
+            t1_expand = time.time() if self.profile else None
+            mctsnc_cpu.expand(self.max_tree_size, all_children, prodigal, self.tpb_e1,
+                              self.dev_trees, self.dev_trees_sizes, self.dev_trees_depths, self.dev_trees_turns, self.dev_trees_leaves, self.dev_trees_terminals, self.dev_trees_outcomes,
+                              self.dev_trees_ns, self.dev_trees_ns_wins, self.dev_trees_boards, self.dev_trees_extra_infos,
+                              self.dev_trees_nodes_selected, random_generators_expand_1, self.dev_trees_actions_expanded,
+                              is_action_legal_cpu, take_action_cpu, compute_outcome_cpu)
+            if self.steps == 0:
+                self.dev_root_actions_expanded[:] = self.dev_trees_actions_expanded[0]
+            self._cpu_stage_done("expand", t1_expand)
+
+            # playouts
+            t1_playout = time.time() if self.profile else None
+            mctsnc_cpu.playout(self.n_playouts, all_children, prodigal,
+                               self.dev_trees, self.dev_trees_turns, self.dev_trees_terminals, self.dev_trees_outcomes, self.dev_trees_boards, self.dev_trees_extra_infos,
+                               self.dev_trees_nodes_selected, self.dev_trees_actions_expanded, self.dev_random_generators_playout,
+                               self.dev_trees_playout_outcomes, trees_playout_outcomes_children, self.rave, self.dev_trees_playout_amaf, self.pairs_amaf,
+                               legal_actions_playout_cpu, take_action_playout_cpu, compute_outcome_cpu, choose_action_playout_cpu)
+            self._cpu_stage_done("playout", t1_playout)
+
+            # backups
+            t1_backup = time.time() if self.profile else None
+            mctsnc_cpu.backup(self.n_playouts, all_children, prodigal,
+                              self.dev_trees, self.dev_trees_turns, self.dev_trees_ns, self.dev_trees_ns_wins,
+                              self.dev_trees_nodes_selected, self.dev_trees_selected_paths, self.dev_trees_actions_expanded,
+                              self.dev_trees_playout_outcomes, trees_playout_outcomes_children)
+            if self.rave:
+                mctsnc_cpu.backup_amaf(self.n_playouts, all_children,
+                                       self.dev_trees, self.dev_trees_turns, self.dev_trees_ns_amaf, self.dev_trees_ns_wins_amaf,
+                                       self.dev_trees_selected_paths, self.dev_trees_actions_expanded, self.dev_trees_playout_outcomes, self.dev_trees_playout_amaf)
+            self._cpu_stage_done("backup", t1_backup)
+            self.steps += 1
+        self.time_loop = time.time() - t1_loop
+        self._make_stop_info(forced_search_steps_limit)
+
+        # sum reduction over trees for each root action
+        t1_reduce_over_trees = time.time()
+        n_root_actions = self.state_max_actions if prodigal else int(self.dev_root_actions_expanded[-1])
+        mctsnc_cpu.reduce_over_trees(prodigal, self.dev_trees, self.dev_trees_terminals, self.dev_trees_outcomes,
+                                     self.dev_trees_ns, self.dev_trees_ns_wins,
+                                     self.dev_root_actions_expanded, root_turn,
+                                     self.dev_root_ns, self.dev_actions_win_flags, self.dev_actions_ns, self.dev_actions_ns_wins)
+        t2_reduce_over_trees = time.time()
+        self.time_reduce_over_trees = t2_reduce_over_trees - t1_reduce_over_trees
+
+        # statistics carried over from pondering (if any)
+        self._merge_ponder_statistics(prodigal)
+
+        # max-argmax reduction over root actions
+        t1_reduce_over_actions = time.time()
+        mctsnc_cpu.reduce_over_actions(n_root_actions,
+                                       self.dev_actions_win_flags, self.dev_actions_ns, self.dev_actions_ns_wins,
+                                       self.dev_best_action, self.dev_best_win_flag, self.dev_best_n, self.dev_best_n_wins)
+        self.best_action = self.dev_best_action[0] if prodigal else self.dev_root_actions_expanded[self.dev_best_action[0]]
+        self.best_win_flag = self.dev_best_win_flag[0]
+        self.best_n = self.dev_best_n[0]
+        self.best_n_wins = self.dev_best_n_wins[0]
+        self.best_q = self.best_n_wins / self.best_n if self.best_n > 0 else np.nan
+        t2_reduce_over_actions = time.time()
+        self.time_reduce_over_actions = t2_reduce_over_actions - t1_reduce_over_actions
+        if self.verbose_debug:
+            print(f"[mctsnc_cpu.reduce_over_trees(), mctsnc_cpu.reduce_over_actions() done; time: {self.time_reduce_over_trees + self.time_reduce_over_actions} s]")
+        t2 = time.time()
+        self.time_total = t2 - t1
+
+        if self.verbose_info and not self.pondering:
+            actions_info = self._make_actions_info_prodigal() if prodigal else self._make_actions_info_thrifty()
+            print(f"[actions info:\n{dict_to_str(actions_info)}]")
+            print(f"[performance info:\n{dict_to_str(self._make_performance_info())}]")
+
     @staticmethod
-    @cuda.jit(void(int8[:, :], int8[:], int8, int32[:, :, :], int32[:], int16[:, :], int8[:, :], boolean[:, :], boolean[:, :], int32[:, :], int32[:, :], int8[:, :, :, :], int8[:, :, :]))
+    @_kernel(void(int8[:, :], int8[:], int8, int32[:, :, :], int32[:], int16[:, :], int8[:, :], boolean[:, :], boolean[:, :], int32[:, :], int32[:, :], int8[:, :, :, :], int8[:, :, :]))
     def _reset(root_board, root_extra_info, root_turn, trees, trees_sizes, trees_depths, trees_turns, trees_leaves, trees_terminals, trees_ns, trees_ns_wins, trees_boards, trees_extra_infos):
         """CUDA kernel responsible for reseting root nodes of trees to new root state."""         
         ti = cuda.blockIdx.x # tree index 
@@ -1288,8 +2059,8 @@ class MCTSNC:
                 trees_extra_infos[ti, 0, e] = root_extra_info[e] 
 
     @staticmethod
-    @cuda.jit(void(float32, int32[:, :, :], boolean[:, :], int32[:, :], int32[:, :], int32[:], int32[:, :]))        
-    def _select(ucb_c, trees, trees_leaves, trees_ns, trees_ns_wins, trees_nodes_selected, trees_selected_paths):
+    @_kernel(void(float32, boolean, float32, int32[:, :, :], boolean[:, :], int32[:, :], int32[:, :], int32[:, :], int32[:, :], int32[:], int32[:, :]))        
+    def _select(ucb_c, rave, rave_k, trees, trees_leaves, trees_ns, trees_ns_wins, trees_ns_amaf, trees_ns_wins_amaf, trees_nodes_selected, trees_selected_paths):
         """CUDA kernel responsible for computations of stage: selections."""
         shared_ucbs = cuda.shared.array(512, dtype=float32) # 512 - assumed limit on max actions
         shared_best_child = cuda.shared.array(512, dtype=int32) # 512 - assumed limit on max actions (array instead of one index due to max-argmax reduction pattern)
@@ -1310,7 +2081,16 @@ class MCTSNC:
                     shared_ucbs[t] = -float32(inf)
                 else:
                     child_n = trees_ns[ti, child]             
-                    if child_n == int32(0):
+                    if rave: # AMAF estimate blended with direct one
+                        child_n_amaf = trees_ns_amaf[ti, child]
+                        if child_n == int32(0) and child_n_amaf == int32(0):
+                            shared_ucbs[t] = float32(inf)
+                        else:
+                            q = trees_ns_wins[ti, child] / float32(child_n) if child_n > int32(0) else float32(0.0)
+                            q_amaf = trees_ns_wins_amaf[ti, child] / float32(child_n_amaf) if child_n_amaf > int32(0) else q
+                            beta = math.sqrt(rave_k / (float32(3.0) * child_n + rave_k))
+                            shared_ucbs[t] = (float32(1.0) - beta) * q + beta * q_amaf + ucb_c * math.sqrt(math.log(trees_ns[ti, node]) / (child_n + int32(1)))
+                    elif child_n == int32(0):
                         shared_ucbs[t] = float32(inf)
                     else:                        
                         shared_ucbs[t] = trees_ns_wins[ti, child] / float32(child_n) + ucb_c * math.sqrt(math.log(trees_ns[ti, node]) / child_n)
@@ -1342,7 +2122,7 @@ class MCTSNC:
             trees_selected_paths[ti, -1] = path_length      
             
     @staticmethod
-    @cuda.jit(void(int32, int32[:, :, :], int32[:], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], xoroshiro128p_type[:], int16[:, :]))
+    @_kernel(void(int32, int32[:, :, :], int32[:], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], xoroshiro128p_type[:], int16[:, :]))
     def _expand_1_ocp_thrifty(max_tree_size, trees, trees_sizes, trees_turns, trees_leaves, trees_terminals, trees_boards, trees_extra_infos, 
                                    trees_nodes_selected, random_generators_expand_1, trees_actions_expanded):
         """CUDA kernel responsible for computations of stage: expansions (substage 1, variant ``"ocp_thrifty"``)."""
@@ -1414,7 +2194,7 @@ class MCTSNC:
             trees_sizes[ti] += shared_legal_actions_child_shifts[state_max_actions - 1] + 1 # updating tree size
         
     @staticmethod
-    @cuda.jit(void(int32, int32[:, :, :], int32[:], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], xoroshiro128p_type[:], int16[:, :]))
+    @_kernel(void(int32, int32[:, :, :], int32[:], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], xoroshiro128p_type[:], int16[:, :]))
     def _expand_1_ocp_prodigal(max_tree_size, trees, trees_sizes, trees_turns, trees_leaves, trees_terminals, trees_boards, trees_extra_infos, 
                                    trees_nodes_selected, random_generators_expand_1, trees_actions_expanded):
         """CUDA kernel responsible for computations of stage: expansions (substage 1, variant ``"ocp_prodigal"``)."""        
@@ -1491,7 +2271,7 @@ class MCTSNC:
             trees_sizes[ti] += shared_legal_actions_child_shifts[state_max_actions - 1] + 1 # updating tree size
         
     @staticmethod
-    @cuda.jit(void(int32, int32[:, :, :], int32[:], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :]))
+    @_kernel(void(int32, int32[:, :, :], int32[:], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :]))
     def _expand_1_acp_thrifty(max_tree_size, trees, trees_sizes, trees_turns, trees_leaves, trees_terminals, trees_boards, trees_extra_infos, 
                            trees_nodes_selected, trees_actions_expanded):
         """CUDA kernel responsible for computations of stage: expansions (substage 1, variant ``"acp_thrifty"``)."""
@@ -1564,7 +2344,7 @@ class MCTSNC:
                 trees_actions_expanded[ti, 0] = int16(0) # fake legal action for playout (so that exactly one block becomes executed in full body)
 
     @staticmethod
-    @cuda.jit(void(int32, int32[:, :, :], int32[:], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :]))
+    @_kernel(void(int32, int32[:, :, :], int32[:], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :]))
     def _expand_1_acp_prodigal(max_tree_size, trees, trees_sizes, trees_turns, trees_leaves, trees_terminals, trees_boards, trees_extra_infos, 
                                     trees_nodes_selected, trees_actions_expanded):
         """CUDA kernel responsible for computations of stage: expansions (substage 1, variant ``"acp_prodigal"``)."""
@@ -1641,14 +2421,48 @@ class MCTSNC:
                 trees_actions_expanded[ti, 0] = int16(0) # fake legal action for playout (so that exactly one block becomes executed in full body)
                 
     @staticmethod
-    @cuda.jit(void(int16[:, :], int16[:]))
+    @_kernel(void(int16[:, :], int16[:]))
     def _memorize_root_actions_expanded(dev_trees_actions_expanded, dev_root_actions_expanded):
         """CUDA kernel responsible for memorizing actions expanded at root node(s)."""
         t = cuda.threadIdx.x
         dev_root_actions_expanded[t] = dev_trees_actions_expanded[0, t]                
         
     @staticmethod
-    @cuda.jit(void(int32[:, :, :], int16[:, :], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :]))
+    @_kernel(void(int16[:, :], int16[:, :]))
+    def _flatten_trees_actions_expanded_thrifty(trees_actions_expanded, trees_actions_expanded_flat):
+        """
+        CUDA kernel converting array ``trees_actions_expanded`` into array ``trees_actions_expanded_flat``, whose leading rows - as many as the total of expanded actions in all trees - contain pairs of indexes: tree and action (remaining rows are set to -1). 
+        Each block, associated with a tree, computes the prefix sum of numbers of expanded actions over trees (to find its shift) and scatters actions of its tree. The approach allows to allocate thrifty number of CUDA blocks for further operations without device-host round-trips.
+        """
+        shared_cumsum = cuda.shared.array(512, dtype=int32) # 512 - assumed max of n_trees
+        ti = cuda.blockIdx.x # tree index
+        n_trees = trees_actions_expanded.shape[0]
+        tpb = cuda.blockDim.x
+        t = cuda.threadIdx.x # thread index == tree index (in prefix sum)
+        shared_cumsum[t] = int32(trees_actions_expanded[t, -1]) if t < n_trees else int32(0)
+        cuda.syncthreads()
+        stride = 1
+        while stride < tpb: # inclusive prefix sum pattern (Hillis-Steele)
+            value = shared_cumsum[t - stride] if t >= stride else int32(0)
+            cuda.syncthreads()
+            shared_cumsum[t] += value
+            cuda.syncthreads()
+            stride <<= 1
+        count = int32(trees_actions_expanded[ti, -1])
+        shift = shared_cumsum[ti] - count
+        i = t
+        while i < count:
+            trees_actions_expanded_flat[shift + i, 0] = int16(ti)
+            trees_actions_expanded_flat[shift + i, 1] = trees_actions_expanded[ti, i]
+            i += tpb
+        r = shared_cumsum[n_trees - 1] + ti * tpb + t # rows beyond total (left after previous steps) reset by all blocks
+        while r < trees_actions_expanded_flat.shape[0]:
+            trees_actions_expanded_flat[r, 0] = int16(-1)
+            trees_actions_expanded_flat[r, 1] = int16(-1)
+            r += n_trees * tpb
+        
+    @staticmethod
+    @_kernel(void(int32[:, :, :], int16[:, :], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :]))
     def _expand_2_thrifty(trees, trees_depths, trees_turns, trees_leaves, trees_terminals, trees_outcomes, trees_ns, trees_ns_wins, trees_boards, trees_extra_infos, trees_nodes_selected, trees_actions_expanded_flat):
         """CUDA kernel responsible for computations of stage: expansions (substage 2, thrifty number of blocks - variant ``"ocp_thrifty"`` or ``"acp_thrifty"``)."""
         shared_board = cuda.shared.array((32, 32), dtype=int8) # assumed max board size (for selected node in tree associated with block)
@@ -1656,8 +2470,8 @@ class MCTSNC:
         tai = cuda.blockIdx.x # tree-action pair index
         ti = trees_actions_expanded_flat[tai, 0]
         action = trees_actions_expanded_flat[tai, 1]
-        if action < int16(0):
-            return # selected is terminal or tree not grown due to memory exhausted          
+        if ti < int16(0) or action < int16(0):
+            return # block beyond total of expanded actions, or selected is terminal or tree not grown due to memory exhausted          
         tpb = cuda.blockDim.x
         t = cuda.threadIdx.x
         _, _, m, n = trees_boards.shape
@@ -1714,7 +2528,7 @@ class MCTSNC:
             trees_depths[ti, child] = trees_depths[ti, selected] + 1
             
     @staticmethod
-    @cuda.jit(void(int32[:, :, :], int16[:, :], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :]))
+    @_kernel(void(int32[:, :, :], int16[:, :], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :]))
     def _expand_2_prodigal(trees, trees_depths, trees_turns, trees_leaves, trees_terminals, trees_outcomes, trees_ns, trees_ns_wins, trees_boards, trees_extra_infos, trees_nodes_selected, trees_actions_expanded):
         """CUDA kernel responsible for computations of stage: expansions (substage 2, prodigal number of blocks - variant ``"ocp_prodigal"`` or ``"acp_prodigal"``)."""
         shared_board = cuda.shared.array((32, 32), dtype=int8) # assumed max board size (for selected node in tree associated with block)
@@ -1781,8 +2595,9 @@ class MCTSNC:
             trees_depths[ti, child] = trees_depths[ti, selected] + 1                                                
                             
     @staticmethod
-    @cuda.jit(void(int32[:, :, :], int8[:, :], boolean[:, :], int8[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :], xoroshiro128p_type[:], int32[:, :]))
-    def _playout_ocp(trees, trees_turns, trees_terminals, trees_outcomes, trees_boards, trees_extra_infos, trees_nodes_selected, trees_actions_expanded, random_generators_playout, trees_playout_outcomes):
+    @_kernel(void(int32[:, :, :], int8[:, :], boolean[:, :], int8[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :], xoroshiro128p_type[:], int32[:, :], boolean, int32[:, :, :, :], boolean))
+    def _playout_ocp(trees, trees_turns, trees_terminals, trees_outcomes, trees_boards, trees_extra_infos, trees_nodes_selected, trees_actions_expanded, random_generators_playout, trees_playout_outcomes, 
+                     rave, trees_playout_amaf, heavy):
         """CUDA kernel responsible for computations of stage: playouts (variant ``"ocp_thrifty"`` or ``"ocp_prodigal"``)."""
         shared_board = cuda.shared.array((32, 32), dtype=int8) # assumed max board size (for selected node in tree associated with block)
         shared_extra_info = cuda.shared.array(4096, dtype=int8) # 4096 - assumed limit on max extra info
@@ -1790,6 +2605,8 @@ class MCTSNC:
         local_board = cuda.local.array((32, 32), dtype=int8)
         local_extra_info = cuda.local.array(4096, dtype=int8)
         local_legal_actions_with_count = cuda.local.array(512 + 1, dtype=int16) # 512 - assumed limit on max actions
+        local_played = cuda.local.array((2, 512), dtype=boolean) # 512 - assumed limit on max actions (AMAF flags of actions played by -1 and +1)
+        local_threats = cuda.local.array((2, 16 + 1), dtype=int16) # 16 - THREATS_CAPACITY of mctsnj_game_mechanics
         ti = cuda.blockIdx.x # tree index
         tpb = cuda.blockDim.x
         t = cuda.threadIdx.x
@@ -1804,6 +2621,11 @@ class MCTSNC:
                 outcome = trees_outcomes[ti, to_be_played_out]
                 trees_playout_outcomes[ti, 0] = int32(tpb) if outcome == int8(-1) else int32(0) # wins of -1
                 trees_playout_outcomes[ti, 1] = int32(tpb) if outcome == int8(1) else int32(0) # wins of +1
+                if rave and last_action != int16(-1): # AMAF: action leading to terminal counted as played in all playouts
+                    p = (int8(1) - trees_turns[ti, to_be_played_out]) // int8(2)
+                    cuda.atomic.add(trees_playout_amaf, (ti, p, last_action, 0), int32(tpb))
+                    if outcome == int8(2 * p - 1):
+                        cuda.atomic.add(trees_playout_amaf, (ti, p, last_action, 1), int32(tpb))
         else:
             t = cuda.threadIdx.x
             t_global = cuda.grid(1)
@@ -1835,12 +2657,22 @@ class MCTSNC:
             local_legal_actions_with_count[-1] = 0
             turn = trees_turns[ti, to_be_played_out]
             outcome = compute_outcome(m, n, local_board, local_extra_info, turn, last_action) if last_action != int16(-1) else int8(2) # else case only when trees not grown due to memory limit (then selected played out)
+            local_threats[0, -1] = int16(-1) # threats not established yet
+            if rave:
+                for a in range(trees.shape[2] - 1):
+                    local_played[0, a] = False
+                    local_played[1, a] = False
+                if last_action != int16(-1):
+                    local_played[(int8(1) - turn) // int8(2), last_action] = True # action leading from selected to its child played out
             while True: # playout loop                
                 if not (outcome == int8(-1) or outcome == int8(0) or outcome == int8(1)): # indecisive, game ongoing
                     legal_actions_playout(m, n, local_board, local_extra_info, turn, local_legal_actions_with_count)
                     count = local_legal_actions_with_count[-1]
                     action_ord = int16(xoroshiro128p_uniform_float32(random_generators_playout, t_global) * count)
+                    action_ord = choose_action_playout(m, n, local_board, local_extra_info, turn, local_legal_actions_with_count, action_ord, last_action, local_threats, heavy)
                     last_action = local_legal_actions_with_count[action_ord]
+                    if rave:
+                        local_played[(turn + int8(1)) // int8(2), last_action] = True
                     take_action_playout(m, n, local_board, local_extra_info, turn, last_action, action_ord, local_legal_actions_with_count)                    
                     turn = -turn
                 else:
@@ -1848,6 +2680,13 @@ class MCTSNC:
                         shared_playout_outcomes[t, (outcome + 1) // 2] = int8(1)
                     break
                 outcome = compute_outcome(m, n, local_board, local_extra_info, turn, last_action)
+            if rave:
+                for p in range(2):
+                    for a in range(trees.shape[2] - 1):
+                        if local_played[p, a]:
+                            cuda.atomic.add(trees_playout_amaf, (ti, p, a, 0), int32(1))
+                            if outcome == int8(2 * p - 1):
+                                cuda.atomic.add(trees_playout_amaf, (ti, p, a, 1), int32(1))
             cuda.syncthreads()
             stride = tpb >> 1 # half of tpb
             while stride > 0: # sum reduction pattern
@@ -1862,9 +2701,9 @@ class MCTSNC:
                 trees_playout_outcomes[ti, 1] = shared_playout_outcomes[0, 1]
         
     @staticmethod
-    @cuda.jit(void(int32[:, :, :], int8[:, :], boolean[:, :], int8[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :], int16[:, :], xoroshiro128p_type[:], int32[:, :], int32[:, :, :]))
+    @_kernel(void(int32[:, :, :], int8[:, :], boolean[:, :], int8[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :], int16[:, :], xoroshiro128p_type[:], int32[:, :], int32[:, :, :], boolean, int32[:, :, :, :], boolean))
     def _playout_acp_thrifty(trees, trees_turns, trees_terminals, trees_outcomes, trees_boards, trees_extra_infos, trees_nodes_selected, trees_actions_expanded, trees_actions_expanded_flat, random_generators_playout, trees_playout_outcomes, 
-                             trees_playout_outcomes_children):
+                             trees_playout_outcomes_children, rave, trees_playout_amaf, heavy):
         """CUDA kernel responsible for computations of stage: playouts (variant ``"acp_thrifty"``)."""
         shared_board = cuda.shared.array((32, 32), dtype=int8) # assumed max board size (for selected node in tree associated with block)
         shared_extra_info = cuda.shared.array(4096, dtype=int8) # 4096 - assumed limit on max extra info
@@ -1872,9 +2711,13 @@ class MCTSNC:
         local_board = cuda.local.array((32, 32), dtype=int8)
         local_extra_info = cuda.local.array(4096, dtype=int8)
         local_legal_actions_with_count = cuda.local.array(512 + 1, dtype=int16) # 512 - assumed limit on max actions        
+        local_played = cuda.local.array((2, 512), dtype=boolean) # 512 - assumed limit on max actions (AMAF flags of actions played by -1 and +1)
+        local_threats = cuda.local.array((2, 16 + 1), dtype=int16) # 16 - THREATS_CAPACITY of mctsnj_game_mechanics
         tai = cuda.blockIdx.x # tree-action pair index
         ti = trees_actions_expanded_flat[tai, 0]
         action = trees_actions_expanded_flat[tai, 1]  
+        if ti < int16(0):
+            return # block beyond total of expanded actions
         tpb = cuda.blockDim.x
         t = cuda.threadIdx.x
         to_be_played_out = trees_nodes_selected[ti] # temporarily to_be_played_out equals selected
@@ -1892,6 +2735,11 @@ class MCTSNC:
                 else: # case where terminal was selected
                     trees_playout_outcomes[ti, 0] = int32(tpb) if outcome == int8(-1) else int32(0) # wins of -1
                     trees_playout_outcomes[ti, 1] = int32(tpb) if outcome == int8(1) else int32(0) # wins of +1
+                if rave and last_action != int16(-1): # AMAF: action leading to terminal counted as played in all playouts
+                    p = (int8(1) - trees_turns[ti, to_be_played_out]) // int8(2)
+                    cuda.atomic.add(trees_playout_amaf, (ti, p, last_action, 0), int32(tpb))
+                    if outcome == int8(2 * p - 1):
+                        cuda.atomic.add(trees_playout_amaf, (ti, p, last_action, 1), int32(tpb))
         else:
             t = cuda.threadIdx.x
             state_max_actions = trees.shape[2] - 1
@@ -1924,12 +2772,22 @@ class MCTSNC:
             local_legal_actions_with_count[-1] = 0            
             turn = trees_turns[ti, to_be_played_out]
             outcome = compute_outcome(m, n, local_board, local_extra_info, turn, last_action) if last_action != int16(-1) else int8(2) # else case only when trees not grown due to memory limit (then selected played out)
+            local_threats[0, -1] = int16(-1) # threats not established yet
+            if rave:
+                for a in range(trees.shape[2] - 1):
+                    local_played[0, a] = False
+                    local_played[1, a] = False
+                if last_action != int16(-1):
+                    local_played[(int8(1) - turn) // int8(2), last_action] = True # action leading from selected to its child played out
             while True: # playout loop                
                 if not (outcome == int8(-1) or outcome == int8(0) or outcome == int8(1)): # indecisive, game ongoing
                     legal_actions_playout(m, n, local_board, local_extra_info, turn, local_legal_actions_with_count)
                     count = local_legal_actions_with_count[-1]
                     action_ord = int16(xoroshiro128p_uniform_float32(random_generators_playout, t_global) * count)
+                    action_ord = choose_action_playout(m, n, local_board, local_extra_info, turn, local_legal_actions_with_count, action_ord, last_action, local_threats, heavy)
                     last_action = local_legal_actions_with_count[action_ord]
+                    if rave:
+                        local_played[(turn + int8(1)) // int8(2), last_action] = True
                     take_action_playout(m, n, local_board, local_extra_info, turn, last_action, action_ord, local_legal_actions_with_count)
                     turn = -turn
                 else:
@@ -1937,6 +2795,13 @@ class MCTSNC:
                         shared_playout_outcomes[t, (outcome + 1) // 2] = int8(1)
                     break
                 outcome = compute_outcome(m, n, local_board, local_extra_info, turn, last_action)
+            if rave:
+                for p in range(2):
+                    for a in range(trees.shape[2] - 1):
+                        if local_played[p, a]:
+                            cuda.atomic.add(trees_playout_amaf, (ti, p, a, 0), int32(1))
+                            if outcome == int8(2 * p - 1):
+                                cuda.atomic.add(trees_playout_amaf, (ti, p, a, 1), int32(1))
             cuda.syncthreads()
             stride = tpb >> 1 # half of tpb
             while stride > 0: # sum reduction pattern
@@ -1951,9 +2816,9 @@ class MCTSNC:
                 trees_playout_outcomes_children[ti, action, 1] = shared_playout_outcomes[0, 1]                            
                 
     @staticmethod
-    @cuda.jit(void(int32[:, :, :], int8[:, :], boolean[:, :], int8[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :], xoroshiro128p_type[:], int32[:, :], int32[:, :, :]))
+    @_kernel(void(int32[:, :, :], int8[:, :], boolean[:, :], int8[:, :], int8[:, :, :, :], int8[:, :, :], int32[:], int16[:, :], xoroshiro128p_type[:], int32[:, :], int32[:, :, :], boolean, int32[:, :, :, :], boolean))
     def _playout_acp_prodigal(trees, trees_turns, trees_terminals, trees_outcomes, trees_boards, trees_extra_infos, trees_nodes_selected, trees_actions_expanded,  random_generators_playout, trees_playout_outcomes, 
-                              trees_playout_outcomes_children):
+                              trees_playout_outcomes_children, rave, trees_playout_amaf, heavy):
         """CUDA kernel responsible for computations of stage: playouts (variant ``"acp_prodigal"``)."""
         shared_board = cuda.shared.array((32, 32), dtype=int8) # assumed max board size (for selected node in tree associated with block)
         shared_extra_info = cuda.shared.array(4096, dtype=int8) # 4096 - assumed limit on max extra info
@@ -1965,6 +2830,8 @@ class MCTSNC:
         local_board = cuda.local.array((32, 32), dtype=int8)
         local_extra_info = cuda.local.array(4096, dtype=int8)
         local_legal_actions_with_count = cuda.local.array(512 + 1, dtype=int16) # 512 - assumed limit on max actions          
+        local_played = cuda.local.array((2, 512), dtype=boolean) # 512 - assumed limit on max actions (AMAF flags of actions played by -1 and +1)
+        local_threats = cuda.local.array((2, 16 + 1), dtype=int16) # 16 - THREATS_CAPACITY of mctsnj_game_mechanics
         tpb = cuda.blockDim.x
         t = cuda.threadIdx.x
         to_be_played_out = trees_nodes_selected[ti] # temporarily to_be_played_out equals selected  
@@ -1981,7 +2848,12 @@ class MCTSNC:
                     trees_playout_outcomes_children[ti, action, 1] = int32(tpb) if outcome == int8(1) else int32(0) # wins of +1
                 else: # case where terminal was selected
                     trees_playout_outcomes[ti, 0] = int32(tpb) if outcome == int8(-1) else int32(0) # wins of -1
-                    trees_playout_outcomes[ti, 1] = int32(tpb) if outcome == int8(1) else int32(0) # wins of +1                                
+                    trees_playout_outcomes[ti, 1] = int32(tpb) if outcome == int8(1) else int32(0) # wins of +1
+                if rave and last_action != int16(-1): # AMAF: action leading to terminal counted as played in all playouts
+                    p = (int8(1) - trees_turns[ti, to_be_played_out]) // int8(2)
+                    cuda.atomic.add(trees_playout_amaf, (ti, p, last_action, 0), int32(tpb))
+                    if outcome == int8(2 * p - 1):
+                        cuda.atomic.add(trees_playout_amaf, (ti, p, last_action, 1), int32(tpb))                                
         else: # playouts for non-terminal
             t = cuda.threadIdx.x
             state_max_actions = trees.shape[2] - 1
@@ -2014,12 +2886,22 @@ class MCTSNC:
             local_legal_actions_with_count[-1] = 0
             turn = trees_turns[ti, to_be_played_out]
             outcome = compute_outcome(m, n, local_board, local_extra_info, turn, last_action) if last_action != int16(-1) else int8(2) # else case only when trees not grown due to memory limit (then selected played out)
+            local_threats[0, -1] = int16(-1) # threats not established yet
+            if rave:
+                for a in range(trees.shape[2] - 1):
+                    local_played[0, a] = False
+                    local_played[1, a] = False
+                if last_action != int16(-1):
+                    local_played[(int8(1) - turn) // int8(2), last_action] = True # action leading from selected to its child played out
             while True: # playout loop                
                 if not (outcome == int8(-1) or outcome == int8(0) or outcome == int8(1)): # indecisive, game ongoing
                     legal_actions_playout(m, n, local_board, local_extra_info, turn, local_legal_actions_with_count)
                     count = local_legal_actions_with_count[-1]
                     action_ord = int16(xoroshiro128p_uniform_float32(random_generators_playout, t_global) * count)
+                    action_ord = choose_action_playout(m, n, local_board, local_extra_info, turn, local_legal_actions_with_count, action_ord, last_action, local_threats, heavy)
                     last_action = local_legal_actions_with_count[action_ord]
+                    if rave:
+                        local_played[(turn + int8(1)) // int8(2), last_action] = True
                     take_action_playout(m, n, local_board, local_extra_info, turn, last_action, action_ord, local_legal_actions_with_count)
                     turn = -turn
                 else:                                                
@@ -2027,6 +2909,13 @@ class MCTSNC:
                         shared_playout_outcomes[t, (outcome + 1) // 2] = int8(1)
                     break
                 outcome = compute_outcome(m, n, local_board, local_extra_info, turn, last_action)
+            if rave:
+                for p in range(2):
+                    for a in range(trees.shape[2] - 1):
+                        if local_played[p, a]:
+                            cuda.atomic.add(trees_playout_amaf, (ti, p, a, 0), int32(1))
+                            if outcome == int8(2 * p - 1):
+                                cuda.atomic.add(trees_playout_amaf, (ti, p, a, 1), int32(1))
             cuda.syncthreads()
             stride = tpb >> 1 # half of tpb
             while stride > 0: # sum reduction pattern
@@ -2041,7 +2930,7 @@ class MCTSNC:
                 trees_playout_outcomes_children[ti, action, 1] = shared_playout_outcomes[0, 1]                    
     
     @staticmethod
-    @cuda.jit(void(int16, int32[:, :, :], int8[:, :], int32[:, :], int32[:, :], int32[:], int32[:, :], int16[:, :], int32[:, :]))
+    @_kernel(void(int16, int32[:, :, :], int8[:, :], int32[:, :], int32[:, :], int32[:], int32[:, :], int16[:, :], int32[:, :]))
     def _backup_ocp(n_playouts, trees, trees_turns, trees_ns, trees_ns_wins, trees_nodes_selected, trees_selected_paths, trees_actions_expanded, trees_playout_outcomes):
         """CUDA kernel responsible for computations of stage: backups (variant ``"ocp_thrifty"`` or ``"ocp_prodigal"``)."""        
         ti = cuda.blockIdx.x
@@ -2074,7 +2963,7 @@ class MCTSNC:
                     trees_ns_wins[ti, node] += n_positive_wins
                     
     @staticmethod
-    @cuda.jit(void(int16, int32[:, :, :], int8[:, :], int32[:, :], int32[:, :], int32[:], int16[:, :], int32[:, :], int32[:, :, :]))
+    @_kernel(void(int16, int32[:, :, :], int8[:, :], int32[:, :], int32[:, :], int32[:], int16[:, :], int32[:, :], int32[:, :, :]))
     def _backup_1_acp_thrifty(n_playouts, trees, trees_turns, trees_ns, trees_ns_wins, trees_nodes_selected, trees_actions_expanded, trees_playout_outcomes, trees_playout_outcomes_children):
         """CUDA kernel responsible for computations of stage: backups (substage 1, variant ``"acp_thrifty"``)."""
         shared_playout_outcomes_children = cuda.shared.array((512, 2), dtype=int32) # 512 - assumed limit on max actions, two cells for a row (-1 win, +1 win), each flagged by 0 or 1 after playout 
@@ -2114,7 +3003,7 @@ class MCTSNC:
                 trees_playout_outcomes[ti, 1] = shared_playout_outcomes_children[0, 1]
 
     @staticmethod
-    @cuda.jit(void(int16, int32[:, :, :], int8[:, :], int32[:, :], int32[:, :], int32[:], int16[:, :], int32[:, :], int32[:, :, :]))
+    @_kernel(void(int16, int32[:, :, :], int8[:, :], int32[:, :], int32[:, :], int32[:], int16[:, :], int32[:, :], int32[:, :, :]))
     def _backup_1_acp_prodigal(n_playouts, trees, trees_turns, trees_ns, trees_ns_wins, trees_nodes_selected, trees_actions_expanded, trees_playout_outcomes, trees_playout_outcomes_children):
         """CUDA kernel responsible for computations of stage: backups (substage 1, variant ``"acp_prodigal"``)."""
         shared_playout_outcomes_children = cuda.shared.array((512, 2), dtype=int32) # 512 - assumed limit on max actions, two cells for a row (-1 win, +1 win), each flagged by 0 or 1 after playout 
@@ -2154,7 +3043,7 @@ class MCTSNC:
                 trees_playout_outcomes[ti, 1] = shared_playout_outcomes_children[0, 1]
 
     @staticmethod
-    @cuda.jit(void(int16, int8[:, :], int32[:, :], int32[:, :], int32[:, :], int16[:, :], int32[:, :]))
+    @_kernel(void(int16, int8[:, :], int32[:, :], int32[:, :], int32[:, :], int16[:, :], int32[:, :]))
     def _backup_2_acp(n_playouts, trees_turns, trees_ns, trees_ns_wins, trees_selected_paths, trees_actions_expanded, trees_playout_outcomes):
         """CUDA kernel responsible for computations of stage: backups (substage 2, variant ``"acp_thrifty"`` or ``"acp_prodigal"``)."""
         ti = cuda.blockIdx.x
@@ -2180,7 +3069,392 @@ class MCTSNC:
             e += tpb
                 
     @staticmethod
-    @cuda.jit(void(int32[:, :, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int16[:], int8, int64[:], boolean[:], int64[:], int64[:]))
+    @_kernel(void(int16, boolean, int32[:, :, :], int8[:, :], int32[:, :], int32[:, :], int32[:, :], int16[:, :], int32[:, :], int32[:, :, :, :]))
+    def _backup_amaf(n_playouts, all_children, trees, trees_turns, trees_ns_amaf, trees_ns_wins_amaf, trees_selected_paths, trees_actions_expanded, trees_playout_outcomes, trees_playout_amaf):
+        """CUDA kernel responsible for computations of stage: backups of AMAF statistics (all variants, with ``rave=True``)."""
+        shared_path_played = cuda.shared.array((2, 512), dtype=boolean) # 512 - assumed limit on max actions (flags of actions taken by -1 and +1 along selected path below current node)
+        ti = cuda.blockIdx.x
+        t = cuda.threadIdx.x
+        state_max_actions = int16(trees.shape[2] - 1)
+        n_playouts_total = int32(n_playouts)
+        if all_children:
+            n_expanded_actions = trees_actions_expanded[ti, -1]
+            if n_expanded_actions == int16(0): # terminal was being "played out"
+                n_expanded_actions = int16(1)
+            n_playouts_total = int32(n_playouts) * n_expanded_actions
+        if t < state_max_actions:
+            shared_path_played[0, t] = False
+            shared_path_played[1, t] = False
+        cuda.syncthreads()
+        path_length = trees_selected_paths[ti, -1]
+        for e in range(path_length - 1, -1, -1): # bottom-up
+            node = trees_selected_paths[ti, e]
+            p = (trees_turns[ti, node] + int8(1)) // int8(2) # index of player to act at node (wins of its children)
+            if t < state_max_actions:
+                child = trees[ti, node, 1 + t]
+                if child != int32(-1):
+                    if shared_path_played[p, t]: # action taken by the player further along selected path -> played in all playouts
+                        n_amaf = n_playouts_total
+                        n_wins_amaf = trees_playout_outcomes[ti, p]
+                    else:
+                        n_amaf = trees_playout_amaf[ti, p, t, 0]
+                        n_wins_amaf = trees_playout_amaf[ti, p, t, 1]
+                    if e == path_length - 1: # children of selected node created in this step
+                        trees_ns_amaf[ti, child] = n_amaf
+                        trees_ns_wins_amaf[ti, child] = n_wins_amaf
+                    else:
+                        trees_ns_amaf[ti, child] += n_amaf
+                        trees_ns_wins_amaf[ti, child] += n_wins_amaf
+            cuda.syncthreads()
+            if e > 0 and t < state_max_actions:
+                parent = trees_selected_paths[ti, e - 1]
+                if trees[ti, parent, 1 + t] == node:
+                    shared_path_played[(trees_turns[ti, parent] + int8(1)) // int8(2), t] = True
+            cuda.syncthreads()
+        if t < state_max_actions:
+            for p in range(2):
+                trees_playout_amaf[ti, p, t, 0] = int32(0)
+                trees_playout_amaf[ti, p, t, 1] = int32(0)
+
+    @staticmethod
+    @_kernel(void(uint64[:]))
+    def _read_globaltimer(globaltimer):
+        """CUDA kernel reading the GPU global timer (to relate device-side deadlines to host time)."""
+        globaltimer[0] = _globaltimer()
+
+    @staticmethod
+    @_kernel(void(int32, float32, boolean, float32, boolean, boolean, int16, int16, int32, uint64, 
+                  int32[:, :, :], int32[:], int16[:, :], int8[:, :], boolean[:, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int32[:, :], int32[:, :], 
+                  int8[:, :, :, :], int8[:, :, :], int32[:], int32[:, :], xoroshiro128p_type[:], xoroshiro128p_type[:], int16[:, :], int32[:, :], int32[:, :, :, :], int16[:], int32[:], boolean))
+    def _step_fused_ocp(max_tree_size, ucb_c, rave, rave_k, prodigal, memorize_root, n_playouts, tpb_e1, n_steps, deadline, 
+                        trees, trees_sizes, trees_depths, trees_turns, trees_leaves, trees_terminals, trees_outcomes, trees_ns, trees_ns_wins, trees_ns_amaf, trees_ns_wins_amaf, 
+                        trees_boards, trees_extra_infos, trees_nodes_selected, trees_selected_paths, random_generators_expand_1, random_generators_playout, 
+                        trees_actions_expanded, trees_playout_outcomes, trees_playout_amaf, root_actions_expanded, trees_steps, heavy):
+        """
+        CUDA kernel responsible for computations of whole steps: selections, expansions, playouts and backups (variant ``"ocp_thrifty"`` or ``"ocp_prodigal"`` with ``fused=True``). 
+        One block per tree, stages separated by block-level synchronizations; random generators indexed as in separate kernels (so that results are the same).
+        Up to ``n_steps`` steps are looped on device, the loop is broken once ``deadline`` (in nanoseconds of GPU global timer, ``0`` - none) is reached; steps carried out are counted in ``trees_steps``.
+        """
+        shared_ucbs = cuda.shared.array(512, dtype=float32) # 512 - assumed limit on max actions
+        shared_best_child = cuda.shared.array(512, dtype=int32) # 512 - assumed limit on max actions (array instead of one index due to max-argmax reduction pattern)
+        shared_selected_path = cuda.shared.array(2048 + 2, dtype=int32) # 2048 - assumed equal to MAX_TREE_DEPTH
+        shared_board = cuda.shared.array((32, 32), dtype=int8) # assumed max board size (for selected node or node to be played out)
+        shared_extra_info = cuda.shared.array(4096, dtype=int8) # 4096 - assumed limit on max extra info
+        shared_legal_actions = cuda.shared.array(512, dtype=boolean) # 512 - assumed limit on max actions
+        shared_legal_actions_child_shifts = cuda.shared.array(512, dtype=int16) # 512 - assumed limit on max actions
+        shared_map_child_shifts_to_action = cuda.shared.array(512, dtype=int16) # 512 - assumed limit on max actions
+        shared_playout_outcomes = cuda.shared.array((512, 2), dtype=int16) # 512 - assumed max tpb, two cells for a row (-1 win, +1 win), each flagged by 0 or 1 after playout
+        shared_path_played = cuda.shared.array((2, 512), dtype=boolean) # 512 - assumed limit on max actions (flags of actions taken by -1 and +1 along selected path below current node)
+        shared_deadline_reached = cuda.shared.array(1, dtype=boolean)
+        local_board = cuda.local.array((32, 32), dtype=int8)
+        local_extra_info = cuda.local.array(4096, dtype=int8)
+        local_legal_actions_with_count = cuda.local.array(512 + 1, dtype=int16) # 512 - assumed limit on max actions
+        local_played = cuda.local.array((2, 512), dtype=boolean) # 512 - assumed limit on max actions (AMAF flags of actions played by -1 and +1)
+        local_threats = cuda.local.array((2, 16 + 1), dtype=int16) # 16 - THREATS_CAPACITY of mctsnj_game_mechanics
+        ti = cuda.blockIdx.x # tree index
+        tpb = cuda.blockDim.x
+        t = cuda.threadIdx.x
+        state_max_actions = int16(trees.shape[2] - 1)
+        _, _, m, n = trees_boards.shape
+        m_n = m * n
+        bept = (m_n + tpb - 1) // tpb # board elements per thread
+        _, _, extra_info_memory = trees_extra_infos.shape
+        eipt = (extra_info_memory + tpb - 1) // tpb
+        
+        for step in range(n_steps):
+            if t == 0:
+                shared_deadline_reached[0] = deadline > uint64(0) and _globaltimer() >= deadline
+            cuda.syncthreads()
+            if shared_deadline_reached[0]:
+                break
+            
+            # selection
+            node = int32(0)
+            depth = int16(0)
+            if t == 0:
+                shared_selected_path[0] = int32(0) # path always starting from root
+            while not trees_leaves[ti, node]:
+                if t < state_max_actions:
+                    child = trees[ti, node, 1 + t]
+                    shared_best_child[t] = child                
+                    if child == int32(-1):
+                        shared_ucbs[t] = -float32(inf)
+                    else:
+                        child_n = trees_ns[ti, child]             
+                        if rave: # AMAF estimate blended with direct one
+                            child_n_amaf = trees_ns_amaf[ti, child]
+                            if child_n == int32(0) and child_n_amaf == int32(0):
+                                shared_ucbs[t] = float32(inf)
+                            else:
+                                q = trees_ns_wins[ti, child] / float32(child_n) if child_n > int32(0) else float32(0.0)
+                                q_amaf = trees_ns_wins_amaf[ti, child] / float32(child_n_amaf) if child_n_amaf > int32(0) else q
+                                beta = math.sqrt(rave_k / (float32(3.0) * child_n + rave_k))
+                                shared_ucbs[t] = (float32(1.0) - beta) * q + beta * q_amaf + ucb_c * math.sqrt(math.log(trees_ns[ti, node]) / (child_n + int32(1)))
+                        elif child_n == int32(0):
+                            shared_ucbs[t] = float32(inf)
+                        else:                        
+                            shared_ucbs[t] = trees_ns_wins[ti, child] / float32(child_n) + ucb_c * math.sqrt(math.log(trees_ns[ti, node]) / child_n)
+                else:
+                    shared_ucbs[t] = -float32(inf)
+                cuda.syncthreads()
+                stride = tpb >> 1 # half of tpb
+                while stride > 0: # max-argmax reduction pattern
+                    if t < stride:
+                        t_stride = t + stride
+                        if shared_ucbs[t] < shared_ucbs[t_stride]:
+                            shared_ucbs[t] = shared_ucbs[t_stride]
+                            shared_best_child[t] = shared_best_child[t_stride]    
+                    cuda.syncthreads()
+                    stride >>= 1
+                node = shared_best_child[0]
+                depth += int16(1)
+                if t == 0:
+                    shared_selected_path[depth] = node
+                cuda.syncthreads() # best child read by all threads before next level overwrites it
+            selected = node
+            path_length = depth + 1
+            pept = (path_length + tpb - 1) // tpb # path elements per thread
+            e = t
+            for _ in range(pept):
+                if e < path_length:
+                    trees_selected_paths[ti, e] = shared_selected_path[e]
+                e += tpb
+            if t == 0:
+                trees_nodes_selected[ti] = selected
+                trees_selected_paths[ti, -1] = path_length
+        
+            # expansion
+            e = t # board element flat index
+            for _ in range(bept):
+                if e < m_n:
+                    i = e // n
+                    j = e % n
+                    shared_board[i, j] = trees_boards[ti, selected, i, j]
+                e += tpb        
+            e = t
+            for _ in range(eipt):
+                if e < extra_info_memory:
+                    shared_extra_info[e] = trees_extra_infos[ti, selected, e]
+                e += tpb
+            cuda.syncthreads()
+            selected_is_terminal = trees_terminals[ti, selected]
+            turn = trees_turns[ti, selected]
+            if t < state_max_actions:
+                if selected_is_terminal:
+                    shared_legal_actions[t] = False
+                else:
+                    is_action_legal(m, n, shared_board, shared_extra_info, turn, t, shared_legal_actions)
+                shared_legal_actions_child_shifts[t] = int16(-1)
+            cuda.syncthreads()
+            size_so_far = trees_sizes[ti]
+            if t == 0:
+                child_shift = int16(-1)
+                rand_child_for_playout = int16(-3) # remains like this when tree cannot grow due to memory exhausted
+                if not selected_is_terminal:
+                    for i in range(state_max_actions):
+                        if shared_legal_actions[i] and size_so_far + child_shift + 1 < max_tree_size:
+                            child_shift += 1
+                            shared_map_child_shifts_to_action[child_shift] = i
+                        shared_legal_actions_child_shifts[i] = child_shift
+                    if child_shift >= int16(0):
+                        trees_actions_expanded[ti, -1] = child_shift + 1 # information how many children expanded (as last entry)
+                        trees_leaves[ti, selected] = False
+                        rand_child_for_playout = int16(xoroshiro128p_uniform_float32(random_generators_expand_1, ti * tpb_e1) * (child_shift + 1))
+                        if prodigal:
+                            rand_child_for_playout = shared_map_child_shifts_to_action[rand_child_for_playout]
+                    else:
+                        trees_actions_expanded[ti, -1] = int16(1) # tree not grown due to memory exhausted, but selected shall be played out (hence 1 needed)
+                    trees_actions_expanded[ti, -2] = rand_child_for_playout
+                else:
+                    trees_actions_expanded[ti, -1] = int16(1) # terminal in fact not expanded, but shall be played out (hence 1 needed)
+                    trees_actions_expanded[ti, -2] = int16(-1) # fake child for playouts indicating that selected is terminal (and playouts computed from outcome)
+            cuda.syncthreads()
+            if t < state_max_actions: # one thread per child (substage 2 of expansion carried out by the same thread)
+                child_index = int32(-1)
+                child_shift = shared_legal_actions_child_shifts[t]
+                if shared_legal_actions[t] and child_shift >= int16(0):
+                    child_index = size_so_far + child_shift
+                    if prodigal:
+                        trees_actions_expanded[ti, t] = t
+                    else:
+                        trees_actions_expanded[ti, child_shift] = t
+                    for i in range(m):
+                        for j in range(n):
+                            local_board[i, j] = shared_board[i, j]
+                    for i in range(extra_info_memory):
+                        local_extra_info[i] = shared_extra_info[i]
+                    take_action(m, n, local_board, local_extra_info, turn, t)
+                    for i in range(m):
+                        for j in range(n):
+                            trees_boards[ti, child_index, i, j] = local_board[i, j]
+                    for i in range(extra_info_memory):
+                        trees_extra_infos[ti, child_index, i] = local_extra_info[i]
+                    trees[ti, child_index, 0] = selected
+                    trees_turns[ti, child_index] = -turn
+                    trees_leaves[ti, child_index] = True
+                    outcome = compute_outcome(m, n, local_board, local_extra_info, -turn, t)
+                    trees_terminals[ti, child_index] = outcome == int8(-1) or outcome == int8(0) or outcome == int8(1)
+                    trees_outcomes[ti, child_index] = outcome
+                    trees_ns[ti, child_index] = int32(0)
+                    trees_ns_wins[ti, child_index] = int32(0)
+                    trees_depths[ti, child_index] = trees_depths[ti, selected] + 1
+                elif prodigal:
+                    trees_actions_expanded[ti, t] = int16(-1)
+                trees[ti, selected, 1 + t] = child_index # parent gets to know where child is
+            cuda.syncthreads()
+            if t == 0:
+                trees_sizes[ti] += shared_legal_actions_child_shifts[state_max_actions - 1] + 1 # updating tree size
+            if memorize_root and step == 0 and ti == 0:
+                e = t
+                while e < state_max_actions + 2:
+                    root_actions_expanded[e] = trees_actions_expanded[0, e]
+                    e += tpb
+        
+            # playouts
+            to_be_played_out = selected
+            rand_child_for_playout = trees_actions_expanded[ti, -2]
+            last_action = int16(-1) # none yet
+            if rand_child_for_playout >= int16(0): # check if some child picked on random for playouts
+                last_action = trees_actions_expanded[ti, rand_child_for_playout]
+                to_be_played_out = trees[ti, selected, 1 + last_action]
+            if trees_terminals[ti, to_be_played_out]: # root for playouts has been discovered terminal before (by game rules) -> taking stored outcome ("multiplied" by n_playouts)
+                if t == 0:            
+                    outcome = trees_outcomes[ti, to_be_played_out]
+                    trees_playout_outcomes[ti, 0] = int32(n_playouts) if outcome == int8(-1) else int32(0) # wins of -1
+                    trees_playout_outcomes[ti, 1] = int32(n_playouts) if outcome == int8(1) else int32(0) # wins of +1
+                    if rave and last_action != int16(-1): # AMAF: action leading to terminal counted as played in all playouts
+                        p = (int8(1) - trees_turns[ti, to_be_played_out]) // int8(2)
+                        cuda.atomic.add(trees_playout_amaf, (ti, p, last_action, 0), int32(n_playouts))
+                        if outcome == int8(2 * p - 1):
+                            cuda.atomic.add(trees_playout_amaf, (ti, p, last_action, 1), int32(n_playouts))
+            else:
+                shared_playout_outcomes[t, 0] = np.int16(0)
+                shared_playout_outcomes[t, 1] = np.int16(0)
+                e = t
+                for _ in range(bept):
+                    if e < m_n:
+                        i = e // n
+                        j = e % n
+                        shared_board[i, j] = trees_boards[ti, to_be_played_out, i, j]
+                    e += tpb        
+                e = t
+                for _ in range(eipt):
+                    if e < extra_info_memory:
+                        shared_extra_info[e] = trees_extra_infos[ti, to_be_played_out, e]
+                    e += tpb
+                cuda.syncthreads()
+                if t < n_playouts:
+                    t_global = ti * n_playouts + t # as in separate playouts kernel (tpb equal to n_playouts)
+                    for i in range(m):
+                        for j in range(n):
+                            local_board[i, j] = shared_board[i, j]
+                    for i in range(extra_info_memory):
+                        local_extra_info[i] = shared_extra_info[i]                
+                    local_legal_actions_with_count[-1] = 0
+                    turn = trees_turns[ti, to_be_played_out]
+                    outcome = compute_outcome(m, n, local_board, local_extra_info, turn, last_action) if last_action != int16(-1) else int8(2) # else case only when trees not grown due to memory limit (then selected played out)
+                    local_threats[0, -1] = int16(-1) # threats not established yet
+                    if rave:
+                        for a in range(state_max_actions):
+                            local_played[0, a] = False
+                            local_played[1, a] = False
+                        if last_action != int16(-1):
+                            local_played[(int8(1) - turn) // int8(2), last_action] = True # action leading from selected to its child played out
+                    while True: # playout loop                
+                        if not (outcome == int8(-1) or outcome == int8(0) or outcome == int8(1)): # indecisive, game ongoing
+                            legal_actions_playout(m, n, local_board, local_extra_info, turn, local_legal_actions_with_count)
+                            count = local_legal_actions_with_count[-1]
+                            action_ord = int16(xoroshiro128p_uniform_float32(random_generators_playout, t_global) * count)
+                            action_ord = choose_action_playout(m, n, local_board, local_extra_info, turn, local_legal_actions_with_count, action_ord, last_action, local_threats, heavy)
+                            last_action = local_legal_actions_with_count[action_ord]
+                            if rave:
+                                local_played[(turn + int8(1)) // int8(2), last_action] = True
+                            take_action_playout(m, n, local_board, local_extra_info, turn, last_action, action_ord, local_legal_actions_with_count)                    
+                            turn = -turn
+                        else:
+                            if outcome != int8(0):
+                                shared_playout_outcomes[t, (outcome + 1) // 2] = int8(1)
+                            break
+                        outcome = compute_outcome(m, n, local_board, local_extra_info, turn, last_action)
+                    if rave:
+                        for p in range(2):
+                            for a in range(state_max_actions):
+                                if local_played[p, a]:
+                                    cuda.atomic.add(trees_playout_amaf, (ti, p, a, 0), int32(1))
+                                    if outcome == int8(2 * p - 1):
+                                        cuda.atomic.add(trees_playout_amaf, (ti, p, a, 1), int32(1))
+                cuda.syncthreads()
+                stride = tpb >> 1 # half of tpb
+                while stride > 0: # sum reduction pattern
+                    if t < stride:
+                        t_stride = t + stride
+                        shared_playout_outcomes[t, 0] += shared_playout_outcomes[t_stride, 0]
+                        shared_playout_outcomes[t, 1] += shared_playout_outcomes[t_stride, 1]
+                    cuda.syncthreads()
+                    stride >>= 1
+                if t == 0:
+                    trees_playout_outcomes[ti, 0] = shared_playout_outcomes[0, 0]
+                    trees_playout_outcomes[ti, 1] = shared_playout_outcomes[0, 1]
+            cuda.syncthreads()
+        
+            # backup
+            n_negative_wins = trees_playout_outcomes[ti, 0]
+            n_positive_wins = trees_playout_outcomes[ti, 1]   
+            e = t
+            for _ in range(pept):
+                if e < path_length:                
+                    node = trees_selected_paths[ti, e]
+                    trees_ns[ti, node] += n_playouts
+                    if trees_turns[ti, node] == int8(1):
+                        trees_ns_wins[ti, node] += n_negative_wins 
+                    else:
+                        trees_ns_wins[ti, node] += n_positive_wins                
+                e += tpb
+            if t == 0 and rand_child_for_playout >= int16(0): # child picked on random for playouts
+                trees_ns[ti, to_be_played_out] += n_playouts
+                if trees_turns[ti, to_be_played_out] == int8(1):
+                    trees_ns_wins[ti, to_be_played_out] += n_negative_wins 
+                else:
+                    trees_ns_wins[ti, to_be_played_out] += n_positive_wins
+            if rave: # backup of AMAF statistics (as in separate kernel)
+                if t < state_max_actions:
+                    shared_path_played[0, t] = False
+                    shared_path_played[1, t] = False
+                cuda.syncthreads()
+                for e in range(path_length - 1, -1, -1): # bottom-up
+                    node = trees_selected_paths[ti, e]
+                    p = (trees_turns[ti, node] + int8(1)) // int8(2) # index of player to act at node (wins of its children)
+                    if t < state_max_actions:
+                        child = trees[ti, node, 1 + t]
+                        if child != int32(-1):
+                            if shared_path_played[p, t]: # action taken by the player further along selected path -> played in all playouts
+                                n_amaf = int32(n_playouts)
+                                n_wins_amaf = trees_playout_outcomes[ti, p]
+                            else:
+                                n_amaf = trees_playout_amaf[ti, p, t, 0]
+                                n_wins_amaf = trees_playout_amaf[ti, p, t, 1]
+                            if e == path_length - 1: # children of selected node created in this step
+                                trees_ns_amaf[ti, child] = n_amaf
+                                trees_ns_wins_amaf[ti, child] = n_wins_amaf
+                            else:
+                                trees_ns_amaf[ti, child] += n_amaf
+                                trees_ns_wins_amaf[ti, child] += n_wins_amaf
+                    cuda.syncthreads()
+                    if e > 0 and t < state_max_actions:
+                        parent = trees_selected_paths[ti, e - 1]
+                        if trees[ti, parent, 1 + t] == node:
+                            shared_path_played[(trees_turns[ti, parent] + int8(1)) // int8(2), t] = True
+                    cuda.syncthreads()
+                if t < state_max_actions:
+                    for p in range(2):
+                        trees_playout_amaf[ti, p, t, 0] = int32(0)
+                        trees_playout_amaf[ti, p, t, 1] = int32(0)
+            if t == 0:
+                trees_steps[ti] += int32(1)
+            cuda.syncthreads() # step completed by all threads before shared arrays are reused
+
+    @staticmethod
+    @_kernel(void(int32[:, :, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int16[:], int8, int64[:], boolean[:], int64[:], int64[:]))
     def _reduce_over_trees_thrifty(trees, trees_terminals, trees_outcomes, trees_ns, trees_ns_wins, root_actions_expanded, root_turn, root_ns, actions_win_flags, actions_ns, actions_ns_wins):
         """CUDA kernel responsible for sum-reduction over trees (thrifty number of blocks, variant ``ocp_thrifty`` or ``acp_thrifty``)."""
         shared_root_ns = cuda.shared.array(512, dtype=int64) # 512 - assumed max of n_trees
@@ -2218,7 +3492,7 @@ class MCTSNC:
             actions_win_flags[b] = action_node != int32(-1) and trees_terminals[0, action_node] and trees_outcomes[0, action_node] == root_turn            
             
     @staticmethod
-    @cuda.jit(void(int32[:, :, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int16[:], int8, int64[:], boolean[:], int64[:], int64[:]))
+    @_kernel(void(int32[:, :, :], boolean[:, :], int8[:, :], int32[:, :], int32[:, :], int16[:], int8, int64[:], boolean[:], int64[:], int64[:]))
     def _reduce_over_trees_prodigal(trees, trees_terminals, trees_outcomes, trees_ns, trees_ns_wins, root_actions_expanded, root_turn, root_ns, actions_win_flags, actions_ns, actions_ns_wins):
         """CUDA kernel responsible for sum-reduction over trees (prodigal number of blocks, variant ``ocp_prodigal`` or ``acp_prodigal``)."""
         shared_root_ns = cuda.shared.array(512, dtype=int64) # 512 - assumed max of n_trees
@@ -2256,7 +3530,7 @@ class MCTSNC:
             actions_win_flags[b] = action_node != int32(-1) and trees_terminals[0, action_node] and trees_outcomes[0, action_node] == root_turn            
             
     @staticmethod
-    @cuda.jit(void(int16, boolean[:], int64[:], int64[:], int16[:], boolean[:], int64[:], int64[:]))
+    @_kernel(void(int16, boolean[:], int64[:], int64[:], int16[:], boolean[:], int64[:], int64[:]))
     def _reduce_over_actions_thrifty(n_root_actions, actions_win_flags, actions_ns, actions_ns_wins, best_action, best_win_flag, best_n, best_n_wins):
         """CUDA kernel responsible for max/argmax-reduction over actions (thrifty number of blocks, variant ``ocp_thrifty`` or ``acp_thrifty``)."""
         shared_actions = cuda.shared.array(512, dtype=int16) # 512 - assumed max state actions
@@ -2295,7 +3569,7 @@ class MCTSNC:
             best_n_wins[0] = shared_actions_ns_wins[0]
 
     @staticmethod
-    @cuda.jit(void(boolean[:], int64[:], int64[:], int16[:], boolean[:], int64[:], int64[:]))
+    @_kernel(void(boolean[:], int64[:], int64[:], int16[:], boolean[:], int64[:], int64[:]))
     def _reduce_over_actions_prodigal(actions_win_flags, actions_ns, actions_ns_wins, best_action, best_win_flag, best_n, best_n_wins):
         """CUDA kernel responsible for max/argmax-reduction over actions (prodigal number of blocks, variant ``ocp_prodigal`` or ``acp_prodigal``)."""
         shared_actions = cuda.shared.array(512, dtype=int16) # 512 - assumed max state actions
@@ -2348,54 +3622,61 @@ class MCTSNC:
         d["search_steps_limit"] = self.search_steps_limit if self.search_steps_limit < np.inf else "inf"
         d["ucb_c"] = self.ucb_c
         d["seed"] = self.seed
+        d["rave"] = self.rave
+        d["rave_k"] = self.rave_k
+        d["playout_policy"] = self.playout_policy
+        d["backend"] = self.backend
+        d["fused"] = self.fused
+        d["device_loop"] = self.device_loop
+        d["profile"] = self.profile
         d["device_memory"] = self.device_memory
         
         trees_sizes = np.empty_like(self.dev_trees_sizes)
-        self.dev_trees_sizes.copy_to_host(ary=trees_sizes)
+        self._copy_to_host(self.dev_trees_sizes, trees_sizes)
         tree_size_max = np.max(trees_sizes)                        
         
         trees = np.empty_like(self.dev_trees)        
-        self.dev_trees.copy_to_host(ary=trees)
+        self._copy_to_host(self.dev_trees, trees)
         trees = trees[:, :tree_size_max, :]        
         
         trees_depths = np.empty_like(self.dev_trees_depths)
-        self.dev_trees_depths.copy_to_host(ary=trees_depths)
+        self._copy_to_host(self.dev_trees_depths, trees_depths)
         trees_depths = trees_depths[:, :tree_size_max]
         depth_max = -np.inf
         for i in range(self.n_trees):
             depth_max = max(depth_max, np.max(trees_depths[i, :trees_sizes[i]]))
 
         trees_turns = np.empty_like(self.dev_trees_turns)        
-        self.dev_trees_turns.copy_to_host(ary=trees_turns)
+        self._copy_to_host(self.dev_trees_turns, trees_turns)
         trees_turns = trees_turns[:, :tree_size_max]
 
         trees_ns = np.empty_like(self.dev_trees_ns)        
-        self.dev_trees_ns.copy_to_host(ary=trees_ns)
+        self._copy_to_host(self.dev_trees_ns, trees_ns)
         trees_ns = trees_ns[:, :tree_size_max]
 
         trees_ns_wins = np.empty_like(self.dev_trees_ns_wins)        
-        self.dev_trees_ns_wins.copy_to_host(ary=trees_ns_wins)
+        self._copy_to_host(self.dev_trees_ns_wins, trees_ns_wins)
         trees_ns_wins = trees_ns_wins[:, :tree_size_max]
         
         trees_nodes_selected = np.empty_like(self.dev_trees_nodes_selected)
-        self.dev_trees_nodes_selected.copy_to_host(ary=trees_nodes_selected)    
+        self._copy_to_host(self.dev_trees_nodes_selected, trees_nodes_selected)    
 
         trees_selected_paths = np.empty_like(self.dev_trees_selected_paths)
-        self.dev_trees_selected_paths.copy_to_host(ary=trees_selected_paths)
+        self._copy_to_host(self.dev_trees_selected_paths, trees_selected_paths)
         tmp_trees_selected_paths = trees_selected_paths[:, :depth_max + 2];
         tmp_trees_selected_paths[:, -1] = trees_selected_paths[:, -1]
         trees_selected_paths = tmp_trees_selected_paths
         
         trees_actions_expanded = np.empty_like(self.dev_trees_actions_expanded)
-        self.dev_trees_actions_expanded.copy_to_host(ary=trees_actions_expanded)
+        self._copy_to_host(self.dev_trees_actions_expanded, trees_actions_expanded)
         
         trees_playout_outcomes = np.empty_like(self.dev_trees_playout_outcomes)
-        self.dev_trees_playout_outcomes.copy_to_host(ary=trees_playout_outcomes)
+        self._copy_to_host(self.dev_trees_playout_outcomes, trees_playout_outcomes)
         
         trees_playout_outcomes_children = None
         if self.dev_trees_playout_outcomes_children is not None:
             trees_playout_outcomes_children = np.empty_like(self.dev_trees_playout_outcomes_children)
-            self.dev_trees_playout_outcomes_children.copy_to_host(ary=trees_playout_outcomes_children)
+            self._copy_to_host(self.dev_trees_playout_outcomes_children, trees_playout_outcomes_children)
         
         d["trees"] = trees.tolist()
         d["trees"] = trees.tolist()
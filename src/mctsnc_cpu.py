@@ -0,0 +1,406 @@
+"""
+Module with the CPU backend of class ``MCTSNC`` from :doc:`mctsnc` (used with ``backend="cpu"``), i.e., functions compiled by `Numba <https://numba.pydata.org>`_ (``numba.njit`` with ``parallel=True``)
+that mirror, stage by stage, the CUDA kernels of ``MCTSNC`` and operate on the same arrays (the same layout, only allocated in host memory).
+Thus, the same multi-tree, multi-playout algorithm in all four variants (``"ocp_thrifty"``, ``"ocp_prodigal"``, ``"acp_thrifty"``, ``"acp_prodigal"``) can be run on machines without CUDA.
+
+Work is distributed over CPU cores via ``numba.prange``: selections, expansions and backups are parallel over trees, playouts - over all (tree, action, playout) triples
+(so that the backend scales with the number of cores also for a single tree). Random numbers are drawn from xoroshiro128p generators of ``numba.cuda.random`` (callable from CPU code),
+seeded and indexed in the same way as global thread indexes in kernels, and max-argmax reductions follow the same pairwise pattern as in kernels (ties resolved alike).
+Hence, for a fixed seed, a search carries out the same playouts as on GPU (given the same game mechanics) and its results match the GPU ones in distribution.
+Mechanics of games are passed to functions as compiled functions from :doc:`mctsnj_game_mechanics` (as in ``MCTSNJ`` from :doc:`mctsnj`).
+
+Link to project repository
+--------------------------
+`https://github.com/pklesk/mcts_numba_cuda <https://github.com/pklesk/mcts_numba_cuda>`_
+
+Notes
+-----
+Functions of this module are meant to be called by ``MCTSNC`` only; docstrings point to the kernels mirrored by them.
+With ``rave=True``, playouts of one (tree, action) pair are carried out by a single thread (AMAF counts gathered without atomic operations), hence parallelism is coarser.
+"""
+
+import numpy as np
+from numba import njit, prange
+from numba.cuda.random import xoroshiro128p_uniform_float32, init_xoroshiro128p_states_cpu, xoroshiro128p_dtype
+from mctsnj_game_mechanics import THREATS_CAPACITY
+
+__version__ = "1.0.1"
+__author__ = "Przemysław Klęsk"
+__email__ = "pklesk@zut.edu.pl"
+
+def create_xoroshiro128p_states(n, seed):
+    """Returns an array of ``n`` xoroshiro128p generators in host memory, initialized as by ``numba.cuda.random.create_xoroshiro128p_states`` (the same streams for the same seed)."""
+    states = np.empty(n, dtype=xoroshiro128p_dtype)
+    init_xoroshiro128p_states_cpu(states, seed, 0)
+    return states
+
+@njit
+def _pow2_ceil(x):
+    """Returns the least power of 2 not less than ``x``."""
+    p = 1
+    while p < x:
+        p <<= 1
+    return p
+
+@njit
+def _argmax_pairwise(values, indexes):
+    """Max-argmax reduction following the pairwise pattern of kernels (size of arrays being a power of 2), hence resolving ties alike; returns the winning entry of ``indexes``."""
+    stride = values.size >> 1
+    while stride > 0:
+        for t in range(stride):
+            if values[t] < values[t + stride]:
+                values[t] = values[t + stride]
+                indexes[t] = indexes[t + stride]
+        stride >>= 1
+    return indexes[0]
+
+@njit(parallel=True)
+def reset(root_board, root_extra_info, root_turn, trees, trees_sizes, trees_depths, trees_turns, trees_leaves, trees_terminals, trees_ns, trees_ns_wins, trees_boards, trees_extra_infos):
+    """Mirrors kernel ``MCTSNC._reset`` (parallel over trees)."""
+    for ti in prange(trees.shape[0]):
+        trees[ti, 0, 0] = -1
+        trees_sizes[ti] = 1
+        trees_depths[ti, 0] = 0
+        trees_turns[ti, 0] = root_turn
+        trees_leaves[ti, 0] = True
+        trees_terminals[ti, 0] = False
+        trees_ns[ti, 0] = 0
+        trees_ns_wins[ti, 0] = 0
+        trees_boards[ti, 0, :, :] = root_board
+        trees_extra_infos[ti, 0, :root_extra_info.size] = root_extra_info
+
+@njit(parallel=True)
+def select(ucb_c, rave, rave_k, trees, trees_leaves, trees_ns, trees_ns_wins, trees_ns_amaf, trees_ns_wins_amaf, trees_nodes_selected, trees_selected_paths):
+    """Mirrors kernel ``MCTSNC._select`` (parallel over trees), with the same types of arithmetic (``float32`` constants, UCBs stored as ``float32``), hence ties among UCBs resolved alike."""
+    ucb_c = np.float32(ucb_c) # as in the signature of kernel
+    rave_k = np.float32(rave_k)
+    state_max_actions = trees.shape[2] - 1
+    size = _pow2_ceil(state_max_actions) # entries beyond max actions (-inf) never win in the pairwise pattern, hence omitted
+    for ti in prange(trees.shape[0]):
+        ucbs = np.empty(size, dtype=np.float32)
+        best_child = np.empty(size, dtype=np.int32)
+        node = 0
+        depth = 0
+        trees_selected_paths[ti, 0] = 0 # path always starting from root
+        while not trees_leaves[ti, node]:
+            log_n = np.log(trees_ns[ti, node])
+            for t in range(size):
+                child = trees[ti, node, 1 + t] if t < state_max_actions else -1
+                best_child[t] = child
+                if child == -1:
+                    ucbs[t] = -np.inf
+                else:
+                    child_n = trees_ns[ti, child]
+                    if rave: # AMAF estimate blended with direct one
+                        child_n_amaf = trees_ns_amaf[ti, child]
+                        if child_n == 0 and child_n_amaf == 0:
+                            ucbs[t] = np.inf
+                        else:
+                            q = trees_ns_wins[ti, child] / np.float32(child_n) if child_n > 0 else np.float32(0.0)
+                            q_amaf = trees_ns_wins_amaf[ti, child] / np.float32(child_n_amaf) if child_n_amaf > 0 else q
+                            beta = np.sqrt(rave_k / (np.float32(3.0) * child_n + rave_k))
+                            ucbs[t] = (np.float32(1.0) - beta) * q + beta * q_amaf + ucb_c * np.sqrt(log_n / (child_n + np.int32(1)))
+                    elif child_n == 0:
+                        ucbs[t] = np.inf
+                    else:
+                        ucbs[t] = trees_ns_wins[ti, child] / np.float32(child_n) + ucb_c * np.sqrt(log_n / child_n)
+            node = _argmax_pairwise(ucbs, best_child)
+            depth += 1
+            trees_selected_paths[ti, depth] = node
+        trees_nodes_selected[ti] = node
+        trees_selected_paths[ti, -1] = depth + 1
+
+@njit(parallel=True)
+def expand(max_tree_size, all_children, prodigal, tpb_e1, trees, trees_sizes, trees_depths, trees_turns, trees_leaves, trees_terminals, trees_outcomes, trees_ns, trees_ns_wins,
+           trees_boards, trees_extra_infos, trees_nodes_selected, random_generators_expand_1, trees_actions_expanded, is_action_legal, take_action, compute_outcome):
+    """
+    Mirrors kernels ``MCTSNC._expand_1_*`` and ``MCTSNC._expand_2_*`` of the given variant, i.e., both substages of expansions (parallel over trees).
+    Once ``max_tree_size`` is reached within an expansion, legal actions that do not fit get no children (index ``-1``), whereas in kernels such actions are assigned 
+    the index of the last child that fitted; hence, trees on CPU and GPU may differ (and results may no longer match in distribution) only after memory gets exhausted.
+    """
+    n_trees, _, m, n = trees_boards.shape
+    state_max_actions = trees.shape[2] - 1
+    for ti in prange(n_trees):
+        selected = trees_nodes_selected[ti]
+        selected_is_terminal = trees_terminals[ti, selected]
+        turn = trees_turns[ti, selected]
+        legal_actions = np.zeros(state_max_actions, dtype=np.bool_)
+        if not selected_is_terminal:
+            for a in range(state_max_actions):
+                is_action_legal(m, n, trees_boards[ti, selected], trees_extra_infos[ti, selected], turn, a, legal_actions)
+        actions = np.empty(state_max_actions, dtype=np.int16) # expanded actions in order of children
+        size_so_far = trees_sizes[ti]
+        child_shift = -1
+        for a in range(state_max_actions):
+            child_index = -1
+            if legal_actions[a] and size_so_far + child_shift + 1 < max_tree_size:
+                child_shift += 1
+                child_index = size_so_far + child_shift
+                actions[child_shift] = a
+                trees_actions_expanded[ti, a if prodigal else child_shift] = a
+            elif prodigal:
+                trees_actions_expanded[ti, a] = -1
+            trees[ti, selected, 1 + a] = child_index # parent gets to know where child is
+        n_expanded = child_shift + 1
+        if selected_is_terminal:
+            trees_actions_expanded[ti, -1] = 1 # terminal in fact not expanded, but shall be played out (hence 1 needed)
+            trees_actions_expanded[ti, -2] = -1 # fake child for playouts indicating that selected is terminal (and playouts computed from outcome)
+        elif n_expanded > 0:
+            trees_actions_expanded[ti, -1] = n_expanded
+            trees_leaves[ti, selected] = False
+            if all_children:
+                trees_actions_expanded[ti, -2] = -2 # indicates all children for playouts (acp)
+            else:
+                rand_child_for_playout = np.int16(xoroshiro128p_uniform_float32(random_generators_expand_1, ti * tpb_e1) * n_expanded)
+                trees_actions_expanded[ti, -2] = actions[rand_child_for_playout] if prodigal else rand_child_for_playout
+        else:
+            trees_actions_expanded[ti, -1] = 1 # tree not grown due to memory exhausted, but selected shall be played out (hence 1 needed)
+            trees_actions_expanded[ti, -2] = -3
+        if all_children and n_expanded == 0:
+            trees_actions_expanded[ti, 0] = 0 # fake legal action for playout (as in kernels)
+        trees_sizes[ti] += n_expanded
+        for k in range(n_expanded):
+            action = actions[k]
+            child = size_so_far + k
+            trees_boards[ti, child, :, :] = trees_boards[ti, selected]
+            trees_extra_infos[ti, child, :] = trees_extra_infos[ti, selected]
+            take_action(m, n, trees_boards[ti, child], trees_extra_infos[ti, child], turn, action)
+            trees[ti, child, 0] = selected
+            trees_turns[ti, child] = -turn
+            trees_leaves[ti, child] = True
+            outcome = compute_outcome(m, n, trees_boards[ti, child], trees_extra_infos[ti, child], -turn, action)
+            trees_terminals[ti, child] = outcome == -1 or outcome == 0 or outcome == 1
+            trees_outcomes[ti, child] = outcome
+            trees_ns[ti, child] = 0
+            trees_ns_wins[ti, child] = 0
+            trees_depths[ti, child] = trees_depths[ti, selected] + 1
+
+@njit
+def _playout(pair, t, trees, trees_turns, trees_terminals, trees_outcomes, trees_boards, trees_extra_infos, trees_nodes_selected, random_generators_playout,
+             playout_board, playout_extra_info, legal_actions_with_count, threats, rave, played, legal_actions_playout, take_action_playout, compute_outcome, choose_action_playout):
+    """
+    Carries out the ``t``-th playout for the given (tree index, action index, index of first random generator) pair as the thread ``t`` of a block of playout kernels does, and returns its outcome;
+    action index ``-1`` means that the selected node itself is played out. With ``rave`` set, flags of actions taken by -1 and +1 are left in ``played``.
+    """
+    ti = pair[0]
+    last_action = pair[1]
+    to_be_played_out = trees_nodes_selected[ti]
+    if last_action != -1:
+        to_be_played_out = trees[ti, to_be_played_out, 1 + last_action]
+    turn = trees_turns[ti, to_be_played_out]
+    if rave:
+        played[:, :] = False
+        if last_action != -1:
+            played[(1 - turn) // 2, last_action] = True # action leading from selected to its child played out
+    if trees_terminals[ti, to_be_played_out]: # root for playouts discovered terminal before (by game rules) -> taking stored outcome
+        return trees_outcomes[ti, to_be_played_out]
+    _, _, m, n = trees_boards.shape
+    playout_board[:, :] = trees_boards[ti, to_be_played_out]
+    playout_extra_info[:] = trees_extra_infos[ti, to_be_played_out]
+    legal_actions_with_count[-1] = 0
+    threats[0, -1] = -1 # threats not established yet
+    outcome = compute_outcome(m, n, playout_board, playout_extra_info, turn, last_action) if last_action != -1 else 2 # else case only when trees not grown due to memory limit (then selected played out)
+    rng_index = pair[2] + t
+    while not (outcome == -1 or outcome == 0 or outcome == 1): # playout loop
+        legal_actions_playout(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count)
+        count = legal_actions_with_count[-1]
+        action_ord = np.int16(xoroshiro128p_uniform_float32(random_generators_playout, rng_index) * count)
+        action_ord = choose_action_playout(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count, action_ord, last_action, threats)
+        last_action = legal_actions_with_count[action_ord]
+        if rave:
+            played[(turn + 1) // 2, last_action] = True
+        take_action_playout(m, n, playout_board, playout_extra_info, turn, last_action, action_ord, legal_actions_with_count)
+        turn = -turn
+        outcome = compute_outcome(m, n, playout_board, playout_extra_info, turn, last_action)
+    return outcome
+
+@njit(parallel=True)
+def playout(n_playouts, all_children, prodigal, trees, trees_turns, trees_terminals, trees_outcomes, trees_boards, trees_extra_infos, trees_nodes_selected, trees_actions_expanded,
+            random_generators_playout, trees_playout_outcomes, trees_playout_outcomes_children, rave, trees_playout_amaf, pairs_amaf,
+            legal_actions_playout, take_action_playout, compute_outcome, choose_action_playout):
+    """
+    Mirrors kernels ``MCTSNC._playout_ocp``, ``MCTSNC._playout_acp_thrifty``, ``MCTSNC._playout_acp_prodigal`` (parallel over all playouts, or over (tree, action) pairs with ``rave=True``).
+    With ``rave=True``, AMAF counts of pairs are gathered in ``pairs_amaf`` (preallocated for the maximal number of pairs, rows of pairs zeroed here).
+    """
+    n_trees, _, m, n = trees_boards.shape
+    state_max_actions = trees.shape[2] - 1
+    extra_info_memory = trees_extra_infos.shape[2]
+    pairs = np.empty((n_trees * (state_max_actions if all_children else 1), 3), dtype=np.int64) # rows: tree index, action index (-1 for selected itself), index of first random generator
+    n_pairs = 0
+    for ti in range(n_trees):
+        child_for_playout = trees_actions_expanded[ti, -2]
+        if all_children and child_for_playout == -2:
+            for k in range(state_max_actions if prodigal else trees_actions_expanded[ti, -1]):
+                a = k if prodigal else trees_actions_expanded[ti, k]
+                if trees_actions_expanded[ti, a] < 0 and prodigal: # prodigality
+                    continue
+                pairs[n_pairs, 0] = ti
+                pairs[n_pairs, 1] = a
+                pairs[n_pairs, 2] = (ti * state_max_actions + a) * n_playouts
+                n_pairs += 1
+        else:
+            pairs[n_pairs, 0] = ti
+            pairs[n_pairs, 1] = trees_actions_expanded[ti, child_for_playout] if child_for_playout >= 0 else -1
+            pairs[n_pairs, 2] = ti * state_max_actions * n_playouts if all_children else ti * n_playouts # fake action 0 in acp variants
+            n_pairs += 1
+    outcomes = np.empty(n_pairs * n_playouts, dtype=np.int8)
+    if rave:
+        for pi in prange(n_pairs):
+            pairs_amaf[pi] = 0
+            playout_board = np.empty((m, n), dtype=np.int8)
+            playout_extra_info = np.empty(extra_info_memory, dtype=np.int8)
+            legal_actions_with_count = np.empty(state_max_actions + 1, dtype=np.int16)
+            threats = np.empty((2, THREATS_CAPACITY + 1), dtype=np.int16)
+            played = np.empty((2, state_max_actions), dtype=np.bool_)
+            for t in range(n_playouts):
+                outcome = _playout(pairs[pi], t, trees, trees_turns, trees_terminals, trees_outcomes, trees_boards, trees_extra_infos, trees_nodes_selected, random_generators_playout,
+                                   playout_board, playout_extra_info, legal_actions_with_count, threats, True, played, legal_actions_playout, take_action_playout, compute_outcome, choose_action_playout)
+                outcomes[pi * n_playouts + t] = outcome
+                for p in range(2):
+                    for a in range(state_max_actions):
+                        if played[p, a]:
+                            pairs_amaf[pi, p, a, 0] += 1
+                            if outcome == 2 * p - 1:
+                                pairs_amaf[pi, p, a, 1] += 1
+        for pi in range(n_pairs):
+            trees_playout_amaf[pairs[pi, 0]] += pairs_amaf[pi]
+    else:
+        for j in prange(n_pairs * n_playouts):
+            playout_board = np.empty((m, n), dtype=np.int8)
+            playout_extra_info = np.empty(extra_info_memory, dtype=np.int8)
+            legal_actions_with_count = np.empty(state_max_actions + 1, dtype=np.int16)
+            threats = np.empty((2, THREATS_CAPACITY + 1), dtype=np.int16)
+            played = np.empty((2, 1), dtype=np.bool_) # fake (not accessed)
+            outcomes[j] = _playout(pairs[j // n_playouts], j % n_playouts, trees, trees_turns, trees_terminals, trees_outcomes, trees_boards, trees_extra_infos, trees_nodes_selected, random_generators_playout,
+                                   playout_board, playout_extra_info, legal_actions_with_count, threats, False, played, legal_actions_playout, take_action_playout, compute_outcome, choose_action_playout)
+    for pi in prange(n_pairs): # sum reduction over playouts of each pair
+        n_negative_wins = 0
+        n_positive_wins = 0
+        for j in range(pi * n_playouts, (pi + 1) * n_playouts):
+            if outcomes[j] == -1:
+                n_negative_wins += 1
+            elif outcomes[j] == 1:
+                n_positive_wins += 1
+        ti = pairs[pi, 0]
+        a = pairs[pi, 1]
+        if all_children and a != -1:
+            trees_playout_outcomes_children[ti, a, 0] = n_negative_wins
+            trees_playout_outcomes_children[ti, a, 1] = n_positive_wins
+        else:
+            trees_playout_outcomes[ti, 0] = n_negative_wins
+            trees_playout_outcomes[ti, 1] = n_positive_wins
+
+@njit(parallel=True)
+def backup(n_playouts, all_children, prodigal, trees, trees_turns, trees_ns, trees_ns_wins, trees_nodes_selected, trees_selected_paths, trees_actions_expanded,
+           trees_playout_outcomes, trees_playout_outcomes_children):
+    """Mirrors kernel ``MCTSNC._backup_ocp`` or kernels ``MCTSNC._backup_1_acp_*`` and ``MCTSNC._backup_2_acp`` (parallel over trees)."""
+    state_max_actions = trees.shape[2] - 1
+    for ti in prange(trees.shape[0]):
+        selected = trees_nodes_selected[ti]
+        child_for_playout = trees_actions_expanded[ti, -2]
+        n_playouts_total = n_playouts
+        if all_children:
+            if child_for_playout == -2: # actual children of selected were played out
+                n_negative_wins = 0
+                n_positive_wins = 0
+                for k in range(state_max_actions if prodigal else trees_actions_expanded[ti, -1]):
+                    a = k if prodigal else trees_actions_expanded[ti, k]
+                    if trees_actions_expanded[ti, a] < 0 and prodigal: # prodigality
+                        continue
+                    child = trees[ti, selected, 1 + a]
+                    trees_ns[ti, child] += n_playouts
+                    trees_ns_wins[ti, child] += trees_playout_outcomes_children[ti, a, 0] if trees_turns[ti, child] == 1 else trees_playout_outcomes_children[ti, a, 1]
+                    n_negative_wins += trees_playout_outcomes_children[ti, a, 0]
+                    n_positive_wins += trees_playout_outcomes_children[ti, a, 1]
+                trees_playout_outcomes[ti, 0] = n_negative_wins
+                trees_playout_outcomes[ti, 1] = n_positive_wins
+            n_playouts_total = n_playouts * max(trees_actions_expanded[ti, -1], 1)
+        elif child_for_playout >= 0: # child picked on random for playouts
+            child = trees[ti, selected, 1 + trees_actions_expanded[ti, child_for_playout]]
+            trees_ns[ti, child] += n_playouts
+            trees_ns_wins[ti, child] += trees_playout_outcomes[ti, 0] if trees_turns[ti, child] == 1 else trees_playout_outcomes[ti, 1]
+        for e in range(trees_selected_paths[ti, -1]):
+            node = trees_selected_paths[ti, e]
+            trees_ns[ti, node] += n_playouts_total
+            trees_ns_wins[ti, node] += trees_playout_outcomes[ti, 0] if trees_turns[ti, node] == 1 else trees_playout_outcomes[ti, 1]
+
+@njit(parallel=True)
+def backup_amaf(n_playouts, all_children, trees, trees_turns, trees_ns_amaf, trees_ns_wins_amaf, trees_selected_paths, trees_actions_expanded, trees_playout_outcomes, trees_playout_amaf):
+    """Mirrors kernel ``MCTSNC._backup_amaf`` (parallel over trees)."""
+    state_max_actions = trees.shape[2] - 1
+    for ti in prange(trees.shape[0]):
+        n_playouts_total = n_playouts * max(trees_actions_expanded[ti, -1], 1) if all_children else n_playouts
+        path_played = np.zeros((2, state_max_actions), dtype=np.bool_) # flags of actions taken by -1 and +1 along selected path below current node
+        path_length = trees_selected_paths[ti, -1]
+        for e in range(path_length - 1, -1, -1): # bottom-up
+            node = trees_selected_paths[ti, e]
+            p = (trees_turns[ti, node] + 1) // 2 # index of player to act at node (wins of its children)
+            for a in range(state_max_actions):
+                child = trees[ti, node, 1 + a]
+                if child == -1:
+                    continue
+                if path_played[p, a]: # action taken by the player further along selected path -> played in all playouts
+                    n_amaf = n_playouts_total
+                    n_wins_amaf = trees_playout_outcomes[ti, p]
+                else:
+                    n_amaf = trees_playout_amaf[ti, p, a, 0]
+                    n_wins_amaf = trees_playout_amaf[ti, p, a, 1]
+                if e == path_length - 1: # children of selected node created in this step
+                    trees_ns_amaf[ti, child] = n_amaf
+                    trees_ns_wins_amaf[ti, child] = n_wins_amaf
+                else:
+                    trees_ns_amaf[ti, child] += n_amaf
+                    trees_ns_wins_amaf[ti, child] += n_wins_amaf
+            if e > 0:
+                parent = trees_selected_paths[ti, e - 1]
+                for a in range(state_max_actions):
+                    if trees[ti, parent, 1 + a] == node:
+                        path_played[(trees_turns[ti, parent] + 1) // 2, a] = True
+        trees_playout_amaf[ti, :, :, :] = 0
+
+@njit
+def reduce_over_trees(prodigal, trees, trees_terminals, trees_outcomes, trees_ns, trees_ns_wins, root_actions_expanded, root_turn, root_ns, actions_win_flags, actions_ns, actions_ns_wins):
+    """Mirrors kernels ``MCTSNC._reduce_over_trees_thrifty`` and ``MCTSNC._reduce_over_trees_prodigal``."""
+    state_max_actions = trees.shape[2] - 1
+    for b in range(state_max_actions if prodigal else root_actions_expanded[-1]):
+        action = b if prodigal else root_actions_expanded[b]
+        root_ns[b] = 0
+        actions_ns[b] = 0
+        actions_ns_wins[b] = 0
+        if not prodigal or root_actions_expanded[action] != -1:
+            for ti in range(trees.shape[0]):
+                root_ns[b] += trees_ns[ti, 0]
+                action_node = trees[ti, 0, 1 + action]
+                if action_node != -1:
+                    actions_ns[b] += trees_ns[ti, action_node]
+                    actions_ns_wins[b] += trees_ns_wins[ti, action_node]
+        action_node = trees[0, 0, 1 + action]
+        actions_win_flags[b] = action_node != -1 and trees_terminals[0, action_node] and trees_outcomes[0, action_node] == root_turn
+
+@njit
+def reduce_over_actions(n_root_actions, actions_win_flags, actions_ns, actions_ns_wins, best_action, best_win_flag, best_n, best_n_wins):
+    """Mirrors kernels ``MCTSNC._reduce_over_actions_thrifty`` and ``MCTSNC._reduce_over_actions_prodigal`` (lexicographic order of: win flag, n, n_wins)."""
+    size = _pow2_ceil(n_root_actions) # entries beyond root actions (zeros) never win in the pairwise pattern, hence omitted
+    actions = np.arange(size).astype(np.int16)
+    win_flags = np.zeros(size, dtype=np.bool_)
+    ns = np.zeros(size, dtype=np.int64)
+    ns_wins = np.zeros(size, dtype=np.int64)
+    win_flags[:n_root_actions] = actions_win_flags[:n_root_actions]
+    ns[:n_root_actions] = actions_ns[:n_root_actions]
+    ns_wins[:n_root_actions] = actions_ns_wins[:n_root_actions]
+    stride = size >> 1
+    while stride > 0: # max-argmax reduction pattern
+        for a in range(stride):
+            a_stride = a + stride
+            if (win_flags[a] < win_flags[a_stride]) or\
+             ((win_flags[a] == win_flags[a_stride]) and (ns[a] < ns[a_stride])) or\
+             ((win_flags[a] == win_flags[a_stride]) and (ns[a] == ns[a_stride]) and (ns_wins[a] < ns_wins[a_stride])):
+                actions[a] = actions[a_stride]
+                win_flags[a] = win_flags[a_stride]
+                ns[a] = ns[a_stride]
+                ns_wins[a] = ns_wins[a_stride]
+        stride >>= 1
+    best_action[0] = actions[0]
+    best_win_flag[0] = win_flags[0]
+    best_n[0] = ns[0]
+    best_n_wins[0] = ns_wins[0]
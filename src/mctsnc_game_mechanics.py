@@ -5,11 +5,16 @@ The five functions are: ``is_action_legal``, ``take_action``, ``legal_actions_pl
 To define a new custom game or a search problem the user should provide his implementations either directly as bodies of the aforementioned functions, 
 or write his own device functions and forward the calls.
 Currently, the module contains examples of how those functions are implemented for the games of Connect 4 and Gomoku.
+A sixth function, ``choose_action_playout``, defines the playout policy: it is called by each of ``_playout_*`` kernel functions after an action has been picked on random 
+(with flag ``heavy`` implied by ``playout_policy`` of ``MCTSNC``) and returns the ordinal index of the action to be actually taken - the same one for the uniform policy (``choose_action_playout_uniform``) or, for the heavy policy 
+(``choose_action_playout_heavy_c4``, ``choose_action_playout_heavy_gomoku``), an immediate win if there is one, otherwise a block of the opponent's immediate win 
+(as functions with the same names in :doc:`mctsnj_game_mechanics`; for Gomoku, threats found by one scan of the board at the first call of a playout are then updated along the four lines through each stone placed).
 
 Function ``is_action_legal`` is called by each of ``_expand_1_*`` kernel functions from ``MCTSNC`` class;
 function ``take_action`` is called by each of ``_expand_2_*`` kernel functions; 
 functions ``legal_actions_playout`` and ``take_action_playout`` are called interchangeably by each of ``_playout_*`` kernel functions;
 function ``compute_outcome`` is called by each of ``_expand_2_*`` and ``_playout_*`` kernel functions.
+With ``fused=True``, all the functions are called by the single kernel function ``_step_fused_ocp`` (carrying out whole steps of the search).
 
 The following arguments are common for all the functions:
 
@@ -40,6 +45,12 @@ The following arguments are function-specific:
         this entry defines the index of action to be currently taken during a playout, i.e., ``legal_actions_with_count[action_ord] == action``;
         can be used (but does not have to) within calls of ``take_action_playout`` to avoid future costs of legal moves regeneration during ``legal_actions_playout`` calls
         by placing the last available legal action (rightmost) under ``action_ord`` index just after the current action is taken.  
+    last_action (int16):
+        index of the last action taken (by the opponent of the player to act now), ``-1`` if none.
+    threats (array[int16, ndim=2] local):
+        array storing, for each player (row ``(token + 1) // 2``), cells (action indexes) where his piece would win at once, with their count in the last entry of the row;
+        ``threats[0, -1]`` equal to ``-1`` means that threats are not established yet - set so by a ``_playout_*`` kernel function at the start of each playout; 
+        becomes established and then updated within calls of ``choose_action_playout`` (if the policy requires threats).
                             
 
 Link to project repository
@@ -86,6 +97,37 @@ def compute_outcome(m, n, board, extra_info, turn, last_action): # any outcome o
     return compute_outcome_c4(m, n, board, extra_info, turn, last_action)
     #return compute_outcome_gomoku(m, n, board, extra_info, turn, last_action)    
 
+@cuda.jit(device=True)
+def choose_action_playout(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats, heavy):
+    """Returns the ordinal index (in array ``legal_actions_with_count``) of the action to be taken within a playout, given the one picked on random (``action_ord``); heavy policy if ``heavy`` is ``True``, uniform otherwise."""
+    if heavy:
+        return choose_action_playout_heavy_c4(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats)
+        #return choose_action_playout_heavy_gomoku(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats)
+    return choose_action_playout_uniform(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats)
+
+@cuda.jit(device=True)
+def count_in_line(m, n, board, i, j, di, dj, token, max_k):
+    """Returns the number of consecutive pieces ``token`` adjacent to cell ``(i, j)`` along the line of direction ``(di, dj)`` (both ways, at most ``max_k - 1`` each way, the cell itself not counted)."""
+    total = 0
+    for k in range(1, max_k):
+        ii = i + k * di
+        jj = j + k * dj
+        if ii < 0 or ii >= m or jj < 0 or jj >= n or board[ii, jj] != token:
+            break
+        total += 1
+    for k in range(1, max_k):
+        ii = i - k * di
+        jj = j - k * dj
+        if ii < 0 or ii >= m or jj < 0 or jj >= n or board[ii, jj] != token:
+            break
+        total += 1
+    return total
+
+@cuda.jit(device=True)
+def choose_action_playout_uniform(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats):
+    """Functionality of function ``choose_action_playout`` for the uniform policy (any game): keeps the action picked on random."""
+    return action_ord
+
 @cuda.jit(device=True)
 def is_action_legal_c4(m, n, board, extra_info, turn, action, legal_actions):
     """Functionality of function ``is_action_legal`` for the game of Connect 4.""" 
@@ -178,6 +220,25 @@ def compute_outcome_c4(m, n, board, extra_info, turn, last_action):
         return 0
     return 2 # anything other than {-1, 0, 1} implies 'game ongoing'
 
+@cuda.jit(device=True)
+def is_winning_action_c4(m, n, board, extra_info, action, token):
+    """Checks whether the (legal) action would win the game of Connect 4 for the player with pieces ``token``."""
+    i = m - 1 - extra_info[action]
+    j = action
+    return (count_in_line(m, n, board, i, j, 1, 0, token, 4) >= 3 or count_in_line(m, n, board, i, j, 0, 1, token, 4) >= 3 or
+            count_in_line(m, n, board, i, j, 1, 1, token, 4) >= 3 or count_in_line(m, n, board, i, j, 1, -1, token, 4) >= 3)
+
+@cuda.jit(device=True)
+def choose_action_playout_heavy_c4(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats):
+    """Functionality of function ``choose_action_playout`` for the heavy policy and the game of Connect 4 (all legal actions checked)."""
+    count = legal_actions_with_count[-1]
+    for p in range(2):
+        token = turn if p == 0 else -turn # own wins first, then blocks
+        for o in range(count):
+            if is_winning_action_c4(m, n, board, extra_info, legal_actions_with_count[o], token):
+                return o
+    return action_ord
+
 @cuda.jit(device=True)
 def is_action_legal_gomoku(m, n, board, extra_info, turn, action, legal_actions):
     """Functionality of function ``is_action_legal`` for the game of Gomoku."""
@@ -278,4 +339,100 @@ def compute_outcome_gomoku(m, n, board, extra_info, turn, last_action):
                 break
     if draw:
         return 0
-    return 2 # anything other than {-1, 0, 1} implies 'game ongoing'
\ No newline at end of file
+    return 2 # anything other than {-1, 0, 1} implies 'game ongoing'
+
+@cuda.jit(device=True)
+def is_winning_action_gomoku(m, n, board, extra_info, action, token):
+    """Checks whether the (legal) action would win the game of Gomoku for the player with pieces ``token`` (exactly five in a line, as in ``compute_outcome``)."""
+    i = action // n
+    j = action % n
+    return (count_in_line(m, n, board, i, j, 1, 0, token, 6) == 4 or count_in_line(m, n, board, i, j, 0, 1, token, 6) == 4 or
+            count_in_line(m, n, board, i, j, 1, 1, token, 6) == 4 or count_in_line(m, n, board, i, j, 1, -1, token, 6) == 4)
+
+@cuda.jit(device=True)
+def add_threat(threats, token, action):
+    """Adds the action to threats of the player with pieces ``token`` (unless already present or no room left)."""
+    p = (token + 1) // 2
+    count = threats[p, -1]
+    for t in range(count):
+        if threats[p, t] == action:
+            return
+    if count < threats.shape[1] - 1:
+        threats[p, count] = action
+        threats[p, -1] = count + 1
+
+@cuda.jit(device=True)
+def scan_threats_gomoku(m, n, board, extra_info, threats):
+    """Establishes threats of both players in the game of Gomoku by one scan of the board (called once per playout): for each run of stones along each of the four directions, 
+    the empty cells just beyond both its ends are checked (a cell completing a five is adjacent to a run along the line concerned)."""
+    threats[0, -1] = 0
+    threats[1, -1] = 0
+    for si in range(m):
+        for sj in range(n):
+            token = board[si, sj]
+            if token == 0:
+                continue
+            for d in range(4):
+                di = 0 if d == 1 else 1
+                dj = 0 if d == 0 else (-1 if d == 3 else 1)
+                i = si - di
+                j = sj - dj
+                if i >= 0 and i < m and j >= 0 and j < n and board[i, j] == token:
+                    continue # not the start of a run
+                if i >= 0 and i < m and j >= 0 and j < n and board[i, j] == 0 and count_in_line(m, n, board, i, j, di, dj, token, 6) == 4:
+                    add_threat(threats, token, i * n + j)
+                i = si + di
+                j = sj + dj
+                while i >= 0 and i < m and j >= 0 and j < n and board[i, j] == token:
+                    i += di
+                    j += dj
+                if i >= 0 and i < m and j >= 0 and j < n and board[i, j] == 0 and count_in_line(m, n, board, i, j, di, dj, token, 6) == 4:
+                    add_threat(threats, token, i * n + j)
+
+@cuda.jit(device=True)
+def update_threats_gomoku(m, n, board, extra_info, last_action, threats):
+    """Updates threats of both players in the game of Gomoku after a stone has been placed at ``last_action`` (threats no longer valid removed, new ones of the owner of the stone searched at the first empty cells beyond the runs through it along the four lines)."""
+    for p in range(2):
+        token = 2 * p - 1
+        count = threats[p, -1]
+        t = 0
+        while t < count:
+            action = threats[p, t]
+            if board[action // n, action % n] != 0 or not is_winning_action_gomoku(m, n, board, extra_info, action, token):
+                count -= 1
+                threats[p, t] = threats[p, count]
+            else:
+                t += 1
+        threats[p, -1] = count
+    si = last_action // n
+    sj = last_action % n
+    token = board[si, sj]
+    for d in range(4):
+        di = 0 if d == 1 else 1
+        dj = 0 if d == 0 else (-1 if d == 3 else 1)
+        for s in range(2): # both ways along the line, up to the first cell beyond the run of stones through the last one
+            sign = 1 - 2 * s
+            i = si + sign * di
+            j = sj + sign * dj
+            while i >= 0 and i < m and j >= 0 and j < n and board[i, j] == token:
+                i += sign * di
+                j += sign * dj
+            if i >= 0 and i < m and j >= 0 and j < n and board[i, j] == 0 and count_in_line(m, n, board, i, j, di, dj, token, 6) == 4:
+                add_threat(threats, token, i * n + j)
+
+@cuda.jit(device=True)
+def choose_action_playout_heavy_gomoku(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats):
+    """Functionality of function ``choose_action_playout`` for the heavy policy and the game of Gomoku (threats established by one scan of the board, then updated along lines through the last action; own wins first, then blocks)."""
+    if threats[0, -1] < 0:
+        scan_threats_gomoku(m, n, board, extra_info, threats)
+    else:
+        update_threats_gomoku(m, n, board, extra_info, last_action, threats)
+    count = legal_actions_with_count[-1]
+    for q in range(2):
+        p = (turn + 1) // 2 if q == 0 else (1 - turn) // 2 # own wins first, then blocks
+        if threats[p, -1] > 0:
+            action = threats[p, 0]
+            for o in range(count):
+                if legal_actions_with_count[o] == action:
+                    return o
+    return action_ord
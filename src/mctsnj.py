@@ -0,0 +1,426 @@
+"""
+Module with a CPU implementation of MCTS algorithm compiled in its entirety by `Numba <https://numba.pydata.org>`_ (hence the "NJ" suffix in the name - ``numba.njit``), embodied by the class ``MCTSNJ``.
+The class is meant as a fast CPU baseline (e.g., for machines without CUDA) and as a drop-in replacement for ``MCTS`` from :doc:`mcts` -
+the same algorithm (selection, expansion, one playout, backup) is carried out, but all its iterations take place within compiled code operating on an array-based tree
+(layout of arrays as in ``MCTSNC`` from :doc:`mctsnc`, for a single tree). Mechanics of games are defined by compiled functions from :doc:`mctsnj_game_mechanics`.
+Outputs of searches: ``best_action``, ``actions_info`` and ``performance_info`` have the same form as outputs of ``MCTS``.
+Optionally, the search is tree-parallel: several threads carry out steps on one shared tree, with the compiled loop releasing the GIL (``nogil=True``).
+Threads diversify their paths by virtual losses (a visit is counted already during selection, the win - if any - at backup),
+allocate new nodes from separate pools (no contention on the tree size) and publish children in a lock-free manner (a node stops being a leaf only after its children are complete);
+occasional lost updates of statistics due to races are tolerated, as usual in lock-free parallel MCTS.
+Optionally, with ``playout_policy="heavy"``, playouts play immediate wins and block immediate losses (see ``PLAYOUT_POLICIES`` in :doc:`mctsnj_game_mechanics`).
+
+Example usage
+-------------
+
+.. code-block:: python
+
+    ai = MCTSNJ(search_time_limit=5.0)
+    best_action = ai.run(C4())
+
+Link to project repository
+--------------------------
+`https://github.com/pklesk/mcts_numba_cuda <https://github.com/pklesk/mcts_numba_cuda>`_
+
+Notes
+-----
+Private functions of ``MCTSNJ`` class are named with a single leading underscore. Among them, the compiled ones are additionally decorated by ``@njit``.
+For public methods full docstrings are provided (with arguments and returns described). For private functions short docstrings are provided.
+"""
+
+import numpy as np
+from numba import njit
+import time
+import threading
+from mctsnj_game_mechanics import GAME_MECHANICS, PLAYOUT_POLICIES, THREATS_CAPACITY, playout
+from utils import dict_to_str, PLAYOUT_POLICIES as PLAYOUT_POLICIES_NAMES
+
+__version__ = "1.0.1"
+__author__ = "Przemysław Klęsk"
+__email__ = "pklesk@zut.edu.pl"
+
+class MCTSNJ:
+    """
+    Monte Carlo Tree Search compiled via ``numba.njit`` (for CPU, single-threaded or tree-parallel multithreaded), operating on an array-based tree.
+    """
+
+    DEFAULT_SEARCH_TIME_LIMIT = 5.0 # [s], np.inf possible
+    DEFAULT_SEARCH_STEPS_LIMIT = np.inf # integer, np.inf possible
+    DEFAULT_MEMORY = 1.0
+    DEFAULT_N_THREADS = 1
+    DEFAULT_PLAYOUT_POLICY = "uniform"
+    DEFAULT_UCB_C = 2.0
+    DEFAULT_SEED = 0
+    DEFAULT_VERBOSE_DEBUG = False
+    DEFAULT_VERBOSE_INFO = True
+    MAX_TREE_SIZE = 2**24
+    STEPS_CHUNK_TIME = 0.01 # [s], approximate duration of a single call of the compiled search loop (time limit is checked between calls)
+
+    def __init__(self,
+                 search_time_limit=DEFAULT_SEARCH_TIME_LIMIT, search_steps_limit=DEFAULT_SEARCH_STEPS_LIMIT,
+                 memory=DEFAULT_MEMORY, n_threads=DEFAULT_N_THREADS, playout_policy=DEFAULT_PLAYOUT_POLICY,
+                 ucb_c=DEFAULT_UCB_C, seed=DEFAULT_SEED,
+                 verbose_debug=DEFAULT_VERBOSE_DEBUG, verbose_info=DEFAULT_VERBOSE_INFO):
+        """
+        Constructor of ``MCTSNJ`` instances.
+
+        Args:
+            search_time_limit (float):
+                time limit in seconds (computational budget), ``np.inf`` if no limit, defaults to ``5.0``.
+            search_steps_limit (float):
+                steps limit (computational budget), ``np.inf`` if no limit, defaults to ``np.inf``.
+            memory (float):
+                RAM in GiBs (gibibytes) to be available for the tree, defaults to ``1.0``.
+            n_threads (int):
+                number of threads working on the shared tree (tree-parallel mode with virtual loss if greater than ``1``; thread ``t`` draws from its own generator seeded with ``seed + t``), defaults to ``1``.
+            playout_policy (str):
+                playout policy from {``"uniform"``, ``"heavy"``} (see ``PLAYOUT_POLICIES`` in :doc:`mctsnj_game_mechanics`), defaults to ``"uniform"``.
+            ucb_c (float):
+                value of C constant, influencing exploration tendency, appearing in UCT formula (upper confidence bounds for trees), defaults to ``2.0``.
+            seed (int):
+                seed for the random numbers generators (owned by this instance, one per thread, passed to compiled code and reseeded at each run), defaults to ``0``.
+            verbose_debug (bool):
+                debug verbosity flag, if ``True`` then detailed information about each call of the compiled search loop is printed to console, defaults to ``False``.
+            verbose_info (bool):
+                verbosity flag, if ``True`` then standard information on actions and performance are printed to console (after a full run), defaults to ``True``.
+        """
+        self.search_time_limit = search_time_limit
+        self.search_steps_limit = search_steps_limit
+        self.memory = memory * 1024**3 # gibibytes (GiB) to bytes (B)
+        self.n_threads = n_threads
+        self.playout_policy = playout_policy if playout_policy in PLAYOUT_POLICIES_NAMES else self.DEFAULT_PLAYOUT_POLICY
+        self.ucb_c = ucb_c
+        self.seed = seed
+        self.verbose_debug = verbose_debug
+        self.verbose_info = verbose_info
+        self.state_class = None
+
+    def __str__(self):
+        """
+        Returns a string representation of this ``MCTSNJ`` instance.
+
+        Returns:
+            str: string representation of this ``MCTSNJ`` instance.
+        """
+        return f"MCTSNJ(search_time_limit={self.search_time_limit}, search_steps_limit={self.search_steps_limit}, memory={np.round(self.memory / 1024**3, 2)}, n_threads={self.n_threads}, playout_policy={self.playout_policy}, ucb_c={self.ucb_c}, seed: {self.seed})"
+
+    def __repr__(self):
+        """
+        Returns a string representation of this ``MCTSNJ`` instance (equivalent to ``__str__`` method).
+
+        Returns:
+            str: string representation of this ``MCTSNJ`` instance.
+        """
+        return self.__str__()
+
+    def _init_arrays(self, state_class):
+        """Allocates all the arrays of the tree (for the given class of states) based on relevant constants and available memory."""
+        self.state_class = state_class
+        self.state_board_shape = state_class.get_board_shape()
+        self.state_extra_info_memory = max(state_class.get_extra_info_memory(), 1)
+        self.state_max_actions = state_class.get_max_actions()
+        self.game_mechanics = GAME_MECHANICS[state_class.__name__] + (PLAYOUT_POLICIES[state_class.__name__][self.playout_policy],)
+        per_state_memory = np.prod(self.state_board_shape) + self.state_extra_info_memory + 4 * (1 + self.state_max_actions) + 2 + 1 + 2 + 1 + 2 * 4 # board, extra info, tree array entry (parent, children nodes), depth, turn, leaf, terminal, outcome, ns, ns_wins
+        self.max_tree_size = min(int(self.memory) // int(per_state_memory), self.MAX_TREE_SIZE)
+        self.tree = np.empty((self.max_tree_size, 1 + self.state_max_actions), dtype=np.int32) # each row represents a node consisting of: parent index and indexes of all children (associated with actions), -1 index for none parent or child
+        self.tree_depths = np.empty(self.max_tree_size, dtype=np.int16)
+        self.tree_turns = np.empty(self.max_tree_size, dtype=np.int8)
+        self.tree_leaves = np.empty(self.max_tree_size, dtype=bool)
+        self.tree_terminals = np.empty(self.max_tree_size, dtype=bool)
+        self.tree_outcomes = np.empty(self.max_tree_size, dtype=np.int8)
+        self.tree_ns = np.empty(self.max_tree_size, dtype=np.int32)
+        self.tree_ns_wins = np.empty(self.max_tree_size, dtype=np.int32)
+        self.tree_boards = np.empty((self.max_tree_size, self.state_board_shape[0], self.state_board_shape[1]), dtype=np.int8)
+        self.tree_extra_infos = np.empty((self.max_tree_size, self.state_extra_info_memory), dtype=np.int8)
+        pool_capacity = (self.max_tree_size - 1) // self.n_threads # nodes (other than root) allocated by each thread from its own pool
+        self.tree_pools_starts = 1 + pool_capacity * np.arange(self.n_threads, dtype=np.int32)
+        self.tree_pools = np.empty((self.n_threads, 2), dtype=np.int32) # rows: index of next free node, end of pool (exclusive)
+        self.tree_pools[:, 0] = self.tree_pools_starts
+        self.tree_pools[:, 1] = self.tree_pools_starts + pool_capacity
+        MCTSNJ._search(0, self.ucb_c, False, self.tree_pools[0], np.random.default_rng(self.seed), *self.game_mechanics,
+                       self.tree, self.tree_depths, self.tree_turns, self.tree_leaves, self.tree_terminals, self.tree_outcomes, self.tree_ns, self.tree_ns_wins,
+                       self.tree_boards, self.tree_extra_infos) # compilation for the given game mechanics (call with no steps)
+        if self.verbose_info:
+            print(f"[MCTSNJ._init_arrays() done for {state_class.class_repr()}; per_state_memory: {per_state_memory} B, calculated max_tree_size: {self.max_tree_size}]")
+
+    def _make_performance_info(self):
+        """
+        Prepares and returns a dictionary with information on performance during the last run.
+        After the call, available via ``performance_info`` attribute.
+        """
+        performance_info = {}
+        performance_info["steps"] = self.steps
+        performance_info["steps_per_second"] = self.steps / self.time_total
+        performance_info["playouts"] = int(self.tree_ns[0])
+        performance_info["playouts_per_second"] = performance_info["playouts"] / self.time_total
+        ms_factor = 10.0**3
+        times_info = {}
+        times_info["total"] = ms_factor * self.time_total
+        times_info["loop"] = ms_factor * self.time_loop
+        times_info["reduce_over_actions"] = ms_factor * self.time_reduce_over_actions
+        times_info["mean_loop"] = times_info["loop"] / self.steps if self.steps > 0 else np.nan
+        performance_info["times_[ms]"] = times_info
+        performance_info["n_threads"] = self.n_threads
+        depths = np.concatenate([self.tree_depths[:1]] + [self.tree_depths[start:end] for start, end in zip(self.tree_pools_starts, self.tree_pools[:, 0])])
+        tree_info = {}
+        tree_info["n_root"] = int(self.tree_ns[0])
+        tree_info["mean_depth"] = float(np.mean(depths))
+        tree_info["max_depth"] = int(np.max(depths))
+        tree_info["size"] = depths.size
+        tree_info["max_size"] = self.max_tree_size
+        performance_info["tree"] = tree_info
+        self.performance_info = performance_info
+        return performance_info
+
+    def _make_actions_info(self, best_action_entry=False):
+        """
+        Prepares and returns a dictionary with information on root actions implied by the last run, in particular: estimates of action values, their UCBs, counts of times actions were taken, etc.
+        After the call, available via ``actions_info`` attribute.
+        """
+        actions_info = {}
+        n_root = int(self.tree_ns[0])
+        for action in range(self.state_max_actions):
+            child = self.tree[0, 1 + action]
+            if child < 0:
+                continue
+            n = int(self.tree_ns[child])
+            n_wins = int(self.tree_ns_wins[child])
+            entry = {}
+            entry["name"] = self.state_class.action_index_to_name(action)
+            entry["n_root"] = n_root
+            entry["win_flag"] = bool(self.tree_terminals[child] and self.tree_outcomes[child] == -self.tree_turns[child])
+            entry["n"] = n
+            entry["n_wins"] = n_wins
+            entry["q"] = n_wins / n if n > 0 else np.nan
+            entry["ucb"] = n_wins / n + self.ucb_c * np.sqrt(np.log(n_root) / n) if n > 0 else np.inf
+            actions_info[action] = entry
+        if best_action_entry:
+            best_key = self._best_action(actions_info)
+            best_entry = {"index": best_key, **actions_info[best_key]}
+            actions_info["best"] = best_entry
+        self.actions_info = actions_info
+        return actions_info
+
+    def _best_action(self, root_actions_info):
+        """
+        Returns the best action among the root actions for the final decision.
+        Actions' comparison is a three-step process (as in ``MCTS``):
+        (1) in the first order, the win flag is decisive,
+        (2) if there is a tie (win flags equal), the number of times an action was taken becomes decisive,
+        (3) if there still is a tie (both win flags and action execution counts equal), the number of wins becomes decisive.
+        """
+        self.best_action = None
+        self.best_win_flag = False
+        self.best_n = -1
+        self.best_n_wins = -1
+        for key in root_actions_info:
+            win_flag = root_actions_info[key]["win_flag"]
+            n = root_actions_info[key]["n"]
+            n_wins = root_actions_info[key]["n_wins"]
+            if (win_flag > self.best_win_flag) or\
+             ((win_flag == self.best_win_flag) and (n > self.best_n)) or\
+             ((win_flag == self.best_win_flag) and (n == self.best_n) and (n_wins > self.best_n_wins)):
+                self.best_win_flag = win_flag
+                self.best_n = n
+                self.best_n_wins = n_wins
+                self.best_action = key
+        self.best_q = self.best_n_wins / self.best_n if self.best_n > 0 else np.nan
+        return self.best_action
+
+    def run(self, root, forced_search_steps_limit=np.inf):
+        """
+        Runs the compiled Monte Carlo Tree Search on CPU.
+
+        Args:
+            root (State):
+                root state from which the search starts (its class must have game mechanics registered in ``GAME_MECHANICS`` dictionary from :doc:`mctsnj_game_mechanics`).
+            forced_search_steps_limit (int):
+                steps limit used only when reproducing results of a previous experiment; if less than ``np.inf`` then has a priority over the standard computational budget given by ``search_time_limit`` and ``search_steps_limit``.
+        Returns:
+            self.best_action (int):
+                best action resulting from search.
+        """
+        print("MCTSNJ RUN...")
+        if self.state_class is not type(root):
+            self._init_arrays(type(root)) # prior to time measurement, includes compilation of the search loop
+        t1 = time.time()
+        root_outcome = root.compute_outcome()
+        MCTSNJ._reset(root.get_board(), root.get_extra_info() if root.get_extra_info() is not None else np.zeros(1, dtype=np.int8), root.get_turn(),
+                      root_outcome is not None, root_outcome if root_outcome is not None else 0,
+                      self.tree, self.tree_depths, self.tree_turns, self.tree_leaves, self.tree_terminals, self.tree_outcomes, self.tree_ns, self.tree_ns_wins,
+                      self.tree_boards, self.tree_extra_infos)
+        self.tree_pools[:, 0] = self.tree_pools_starts
+        self.rngs = [np.random.default_rng(self.seed + t) for t in range(self.n_threads)] # per-instance generators (not shared with other instances in the process)
+        steps_limit = forced_search_steps_limit if forced_search_steps_limit < np.inf else self.search_steps_limit
+        time_limit = np.inf if forced_search_steps_limit < np.inf else self.search_time_limit
+        self.threads_steps = np.zeros(self.n_threads, dtype=np.int64)
+        t1_loop = time.time()
+        if self.n_threads == 1:
+            self._search_loop(0, steps_limit, time_limit, t1_loop)
+        else:
+            threads = [threading.Thread(target=self._search_loop, args=(t, steps_limit, time_limit, t1_loop)) for t in range(self.n_threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.steps = int(np.sum(self.threads_steps))
+        self.time_loop = time.time() - t1_loop
+
+        t1_reduce_over_actions = time.time()
+        self.root_actions_info = self._make_actions_info(best_action_entry=True)
+        best_action_label = str(self.best_action)
+        best_action_label += f" ({self.state_class.action_index_to_name(self.best_action)})"
+        t2_reduce_over_actions = time.time()
+        self.time_reduce_over_actions = t2_reduce_over_actions - t1_reduce_over_actions
+
+        t2 = time.time()
+        self.time_total = t2 - t1
+
+        self._make_performance_info()
+        if self.verbose_info:
+            print(f"[actions info:\n{dict_to_str(self.root_actions_info)}]")
+            print(f"[performance info:\n{dict_to_str(self.performance_info)}]")
+
+        print(f"MCTSNJ RUN DONE. [time: {self.time_total} s; best action: {best_action_label}, best win_flag: {self.best_win_flag}, best n: {self.best_n}, best n_wins: {self.best_n_wins}, best q: {self.best_q}]")
+        return self.best_action
+
+    def _search_loop(self, thread_index, steps_limit, time_limit, t1_loop):
+        """
+        Calls the compiled search loop (on behalf of the given thread) in chunks of steps until the computational budget is exhausted; 
+        numbers of steps in chunks are adjusted so that each call lasts approximately ``STEPS_CHUNK_TIME``.
+        """
+        virtual_loss = self.n_threads > 1
+        rng = self.rngs[thread_index]
+        pool = self.tree_pools[thread_index]
+        steps_chunk = 1
+        while True:
+            t2_loop = time.time()
+            steps_remaining = steps_limit - np.sum(self.threads_steps)
+            if steps_remaining <= 0 or t2_loop - t1_loop >= time_limit:
+                break
+            steps_chunk = int(min(steps_chunk, steps_remaining))
+            if self.verbose_debug:
+                print(f"[MCTSNJ._search()...; thread: {thread_index}, steps: {steps_chunk}]")
+            t1_chunk = time.time()
+            self.threads_steps[thread_index] += MCTSNJ._search(steps_chunk, self.ucb_c, virtual_loss, pool, rng, *self.game_mechanics,
+                                                                self.tree, self.tree_depths, self.tree_turns, self.tree_leaves, self.tree_terminals, self.tree_outcomes, self.tree_ns, self.tree_ns_wins,
+                                                                self.tree_boards, self.tree_extra_infos)
+            t2_chunk = time.time()
+            if self.verbose_debug:
+                print(f"[MCTSNJ._search() done; thread: {thread_index}, time: {t2_chunk - t1_chunk} s]")
+            # adjusting the number of steps in next chunk so that it lasts approximately STEPS_CHUNK_TIME (without exceeding the remaining time)
+            chunk_time = max(t2_chunk - t1_chunk, 1e-6)
+            remaining_time = time_limit - (t2_chunk - t1_loop)
+            steps_chunk = max(1, int(steps_chunk * min(self.STEPS_CHUNK_TIME, remaining_time) / chunk_time))
+
+    @staticmethod
+    @njit(cache=True)
+    def _reset(root_board, root_extra_info, root_turn, root_terminal, root_outcome,
+               tree, tree_depths, tree_turns, tree_leaves, tree_terminals, tree_outcomes, tree_ns, tree_ns_wins, tree_boards, tree_extra_infos):
+        """Resets the tree so that it consists of the root only."""
+        tree[0, :] = -1
+        tree_depths[0] = 0
+        tree_turns[0] = root_turn
+        tree_leaves[0] = True
+        tree_terminals[0] = root_terminal
+        tree_outcomes[0] = root_outcome
+        tree_ns[0] = 0
+        tree_ns_wins[0] = 0
+        tree_boards[0] = root_board
+        tree_extra_infos[0, :root_extra_info.size] = root_extra_info
+
+    @staticmethod
+    @njit(nogil=True)
+    def _search(n_steps, ucb_c, virtual_loss, pool, rng, is_action_legal, take_action, legal_actions_playout, take_action_playout, compute_outcome, choose_action_playout,
+                tree, tree_depths, tree_turns, tree_leaves, tree_terminals, tree_outcomes, tree_ns, tree_ns_wins, tree_boards, tree_extra_infos):
+        """
+        Carries out the given number of MCTS steps (selection, expansion, playout, backup) and returns that number. 
+        New nodes are allocated from the given pool (``[next free, end]``), random numbers are drawn from the given generator ``rng``. With ``virtual_loss`` visits are counted on the way down 
+        (so that concurrent threads are discouraged from following the same path) and backup adds only wins.
+        """
+        _, n_columns = tree.shape
+        max_actions = n_columns - 1
+        _, m, n = tree_boards.shape
+        legal_actions = np.empty(max_actions, dtype=np.bool_)
+        legal_actions_with_count = np.empty(max_actions + 1, dtype=np.int16)
+        threats = np.empty((2, THREATS_CAPACITY + 1), dtype=np.int16)
+        playout_board = np.empty((m, n), dtype=np.int8)
+        playout_extra_info = np.empty(tree_extra_infos.shape[1], dtype=np.int8)
+        for _ in range(n_steps):
+            # selection
+            node = 0
+            if virtual_loss:
+                tree_ns[node] += 1
+            while not tree_leaves[node]:
+                best_ucb = -1.0
+                best_child = -1
+                log_n = np.log(tree_ns[node])
+                for action in range(max_actions):
+                    child = tree[node, 1 + action]
+                    if child < 0:
+                        continue
+                    child_n = tree_ns[child]
+                    if child_n == 0:
+                        best_child = child
+                        break
+                    ucb = tree_ns_wins[child] / child_n + ucb_c * np.sqrt(log_n / child_n)
+                    if ucb > best_ucb:
+                        best_ucb = ucb
+                        best_child = child
+                if best_child < 0: # children not published yet by another thread
+                    break
+                node = best_child
+                if virtual_loss:
+                    tree_ns[node] += 1
+            # expansion
+            if tree_leaves[node] and not tree_terminals[node]:
+                count = 0
+                for action in range(max_actions):
+                    legal_actions[action] = False
+                    is_action_legal(m, n, tree_boards[node], tree_extra_infos[node], tree_turns[node], action, legal_actions)
+                    if legal_actions[action]:
+                        count += 1
+                if pool[0] + count <= pool[1]: # otherwise (pool full) playout carried out from the selected node
+                    rand_child_ord = rng.integers(0, count)
+                    child_ord = 0
+                    turn = tree_turns[node]
+                    for action in range(max_actions):
+                        if not legal_actions[action]:
+                            continue
+                        child = pool[0]
+                        pool[0] += 1
+                        tree[child, :] = -1
+                        tree[child, 0] = node
+                        tree_depths[child] = tree_depths[node] + 1
+                        tree_turns[child] = -turn
+                        tree_leaves[child] = True
+                        tree_ns[child] = 0
+                        tree_ns_wins[child] = 0
+                        tree_boards[child] = tree_boards[node]
+                        tree_extra_infos[child] = tree_extra_infos[node]
+                        take_action(m, n, tree_boards[child], tree_extra_infos[child], turn, action)
+                        outcome = compute_outcome(m, n, tree_boards[child], tree_extra_infos[child], -turn, action)
+                        tree_terminals[child] = outcome == -1 or outcome == 0 or outcome == 1
+                        tree_outcomes[child] = outcome
+                        tree[node, 1 + action] = child # publishing child after it is complete
+                        if child_ord == rand_child_ord:
+                            rand_child = child
+                        child_ord += 1
+                    tree_leaves[node] = False # publishing children as a whole
+                    node = rand_child
+                    if virtual_loss:
+                        tree_ns[node] += 1
+            # playout
+            if tree_terminals[node]:
+                outcome = tree_outcomes[node]
+            else:
+                outcome = playout(m, n, tree_boards[node], tree_extra_infos[node], tree_turns[node], playout_board, playout_extra_info, legal_actions_with_count, threats,
+                                  legal_actions_playout, take_action_playout, compute_outcome, choose_action_playout, rng)
+            # backup
+            while node >= 0:
+                if not virtual_loss:
+                    tree_ns[node] += 1
+                if tree_turns[node] == -outcome:
+                    tree_ns_wins[node] += 1
+                node = tree[node, 0]
+        return n_steps
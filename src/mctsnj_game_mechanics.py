@@ -0,0 +1,662 @@
+"""
+Sets of five ``numba.njit``-compiled functions defining the mechanics of certain games (Connect 4, Gomoku, Ultimate Tic Tac Toe)
+required by the class ``MCTSNJ`` from :doc:`mctsnj` (callable by its compiled search loop).
+The functions mirror the CUDA device functions from :doc:`mctsnc_game_mechanics` and have the same arguments and meaning:
+``is_action_legal``, ``take_action``, ``legal_actions_playout``, ``take_action_playout``, ``compute_outcome``.
+Contrarily to the CUDA module, the functions for all games are available at the same time - for each game they are gathered in a tuple,
+accessible from dictionary ``GAME_MECHANICS`` under the name of the class of states representing the game (e.g. ``"C4"``).
+To define a new custom game or a search problem the user should provide his implementations of the five functions and register them in ``GAME_MECHANICS`` (and optionally his playout policies in ``PLAYOUT_POLICIES``).
+
+Function ``is_action_legal`` is called by ``MCTSNJ`` at its expansion stage for each action index;
+function ``take_action`` is called at the expansion stage for each legal action;
+functions ``legal_actions_playout`` and ``take_action_playout`` are called interchangeably at the playout stage;
+function ``compute_outcome`` is called at the expansion and playout stages.
+The playout stage itself is carried out by the function ``playout`` (shared by all games, parameterized by the game-specific functions);
+functions ``playout_c4``, ``playout_gomoku``, ``playout_uttt`` are its game-specific (cacheable) counterparts, used by ``State`` subclasses for their allocation-free playouts 
+(see method ``playout`` in :doc:`mcts`), and functions ``playouts_c4``, ``playouts_gomoku``, ``playouts_uttt`` carry out batches of such playouts within a single call (see method ``playouts`` in :doc:`mcts`).
+
+Playout policies are pluggable via a sixth function ``choose_action_playout``, called at the playout stage after an action has been picked on random: it returns the ordinal index
+of the action to be actually taken. Policy ``"uniform"`` (function ``choose_action_playout_uniform``) keeps the random action. Policy ``"heavy"`` (functions ``choose_action_playout_heavy_c4``, 
+``choose_action_playout_heavy_gomoku``, ``choose_action_playout_heavy_uttt``) plays an immediate win if there is one, otherwise blocks an immediate win of the opponent, otherwise keeps the random action.
+For Connect 4 and Ultimate Tic Tac Toe (few legal actions) all legal actions are checked at each call; for Gomoku the cells of immediate wins (threats) are found by one scan of the board 
+at the first call of a playout and then updated along the four lines through each stone placed (see ``update_threats_gomoku``).
+For each game the policies are accessible from dictionary ``PLAYOUT_POLICIES`` (under the name of the class of states and then the name of policy).
+
+Random actions within playouts are drawn from a ``numpy`` generator (``np.random.Generator``) passed by the caller as argument ``rng``, 
+so that each searching instance (and each of its threads) has its own random stream - independent of other instances in the same process.
+
+The following arguments are common for all the functions:
+
+    m (int):
+        number of rows in board.
+    n (int):
+        number of columns in board.
+    board (array[int8, ndim=2]):
+        two-dimensional array of bytes representing the board of a state.
+    extra_info (array[int8, ndim=1]):
+        one-dimensional array with any additional information associated with a state (not implied by the contents of the board itself).
+    turn {-1, 1}:
+        indicator of the player, minimizing or maximizing, to act now.
+
+The following arguments are function-specific:
+
+    legal_actions (array[boolean]):
+        one-dimensional array of boolean flags indicating legal actions; becomes populated by multiple calls of ``is_action_legal``.
+    action (int16):
+        index of action to be taken
+    legal_actions_with_count (array[int16]):
+        array storing legal actions with their count to be applied within a playout;
+        its last entry contains the count of legal actions, its leftmost entries (in the number equal to that count) contain indexes of legal actions (possibly unordered);
+        becomes established within calls of ``legal_actions_playout`` or just the first such a call;
+        can be updated (but does not have to) within calls of ``take_action_playout`` to avoid future costs of legal moves regeneration during ``legal_actions_playout``.
+    action_ord (int16):
+        ordinal index of entry in array ``legal_actions_with_count``, picked on random within a playout;
+        this entry defines the index of action to be currently taken during a playout, i.e., ``legal_actions_with_count[action_ord] == action``.
+    last_action (int16):
+        index of the last action taken (by the opponent of the player to act now), ``-1`` if none.
+    threats (array[int16, ndim=2]):
+        array storing, for each player (row ``(token + 1) // 2``), cells (action indexes) where his piece would win at once, with their count in the last entry of the row 
+        (at most ``THREATS_CAPACITY`` cells per player, further ones not memorized); ``threats[0, -1]`` equal to ``-1`` means that threats are not established yet - 
+        it should be set so by the caller at the start of each playout; becomes established and then updated within calls of ``choose_action_playout`` (if the policy requires threats).
+
+Link to project repository
+--------------------------
+`https://github.com/pklesk/mcts_numba_cuda <https://github.com/pklesk/mcts_numba_cuda>`_
+"""
+
+from numba import njit
+
+__version__ = "1.0.1"
+__author__ = "Przemysław Klęsk"
+__email__ = "pklesk@zut.edu.pl"
+
+THREATS_CAPACITY = 16 # maximum number of threats memorized per player (row length of arrays ``threats`` is ``THREATS_CAPACITY + 1``)
+
+@njit(cache=True)
+def is_action_legal_c4(m, n, board, extra_info, turn, action, legal_actions):
+    """Functionality of function ``is_action_legal`` for the game of Connect 4."""
+    legal_actions[action] = True if extra_info[action] < m else False
+
+@njit(cache=True)
+def take_action_c4(m, n, board, extra_info, turn, action):
+    """Functionality of function ``take_action`` for the game of Connect 4."""
+    extra_info[action] += 1
+    row = m - extra_info[action]
+    board[row, action] = turn
+
+@njit(cache=True)
+def legal_actions_playout_c4(m, n, board, extra_info, turn, legal_actions_with_count):
+    """Functionality of function ``legal_actions_playout`` for the game of Connect 4."""
+    count = 0
+    for j in range(n):
+        if extra_info[j] < m:
+            legal_actions_with_count[count] = j
+            count += 1
+    legal_actions_with_count[-1] = count
+
+@njit(cache=True)
+def take_action_playout_c4(m, n, board, extra_info, turn, action, action_ord, legal_actions_with_count):
+    """Functionality of function ``take_action_playout`` for the game of Connect 4."""
+    extra_info[action] += 1
+    row = m - extra_info[action]
+    board[row, action] = turn
+
+@njit(cache=True)
+def compute_outcome_c4(m, n, board, extra_info, turn, last_action):
+    """Functionality of function ``compute_outcome`` for the game of Connect 4."""
+    last_token = -turn
+    j = last_action
+    i = m - extra_info[j]
+    # N-S
+    total = 0
+    for k in range(1, 4):
+        if i -  k < 0 or board[i - k, j] != last_token:
+            break
+        total += 1
+    for k in range(1, 4):
+        if i + k >= m or board[i + k, j] != last_token:
+            break
+        total += 1
+    if total >= 3:
+        return last_token
+    # E-W
+    total = 0
+    for k in range(1, 4):
+        if j + k >= n or board[i, j + k] != last_token:
+            break
+        total += 1
+    for k in range(1, 4):
+        if j - k < 0 or board[i, j - k] != last_token:
+            break
+        total += 1
+    if total >= 3:
+        return last_token
+    # NE-SW
+    total = 0
+    for k in range(1, 4):
+        if i - k < 0 or j + k >= n or board[i - k, j + k] != last_token:
+            break
+        total += 1
+    for k in range(1, 4):
+        if i + k >= m or j - k < 0 or board[i + k, j - k] != last_token:
+            break
+        total += 1
+    if total >= 3:
+        return last_token
+    # NW-SE
+    total = 0
+    for k in range(1, 4):
+        if i - k < 0 or j - k < 0 or board[i - k, j - k] != last_token:
+            break
+        total += 1
+    for k in range(1, 4):
+        if i + k >= m or j + k >= n or board[i + k, j + k] != last_token:
+            break
+        total += 1
+    if total >= 3:
+        return last_token
+    draw = True
+    for j in range(n):
+        if extra_info[j] < m:
+            draw = False
+            break
+    if draw:
+        return 0
+    return 2 # anything other than {-1, 0, 1} implies 'game ongoing'
+
+@njit(cache=True)
+def is_action_legal_gomoku(m, n, board, extra_info, turn, action, legal_actions):
+    """Functionality of function ``is_action_legal`` for the game of Gomoku."""
+    i = action // n
+    j = action % n
+    legal_actions[action] = (board[i, j] == 0)
+
+@njit(cache=True)
+def take_action_gomoku(m, n, board, extra_info, turn, action):
+    """Functionality of function ``take_action`` for the game of Gomoku."""
+    i = action // n
+    j = action % n
+    board[i, j] = turn
+
+@njit(cache=True)
+def legal_actions_playout_gomoku(m, n, board, extra_info, turn, legal_actions_with_count):
+    """Functionality of function ``legal_actions_playout`` for the game of Gomoku."""
+    if legal_actions_with_count[-1] == 0: # time-consuming board scan only if legal actions not established yet
+        count = 0
+        k = 0
+        for i in range(m):
+            for j in range(n):
+                if board[i, j] == 0:
+                    legal_actions_with_count[count] = k
+                    count += 1
+                k += 1
+        legal_actions_with_count[-1] = count
+
+@njit(cache=True)
+def take_action_playout_gomoku(m, n, board, extra_info, turn, action, action_ord, legal_actions_with_count):
+    """Functionality of function ``take_action_playout`` for the game of Gomoku."""
+    i = action // n
+    j = action % n
+    board[i, j] = turn
+    last_legal_action = legal_actions_with_count[legal_actions_with_count[-1] - 1]
+    legal_actions_with_count[action_ord] = last_legal_action
+    legal_actions_with_count[-1] -= 1
+
+@njit(cache=True)
+def compute_outcome_gomoku(m, n, board, extra_info, turn, last_action):
+    """Functionality of function ``compute_outcome`` for the game of Gomoku."""
+    last_token = -turn
+    i = last_action // n
+    j = last_action % n
+    # N-S
+    total = 0
+    for k in range(1, 6):
+        if i -  k < 0 or board[i - k, j] != last_token:
+            break
+        total += 1
+    for k in range(1, 6):
+        if i + k >= m or board[i + k, j] != last_token:
+            break
+        total += 1
+    if total == 4:
+        return last_token
+    # E-W
+    total = 0
+    for k in range(1, 6):
+        if j + k >= n or board[i, j + k] != last_token:
+            break
+        total += 1
+    for k in range(1, 6):
+        if j - k < 0 or board[i, j - k] != last_token:
+            break
+        total += 1
+    if total == 4:
+        return last_token
+    # NE-SW
+    total = 0
+    for k in range(1, 6):
+        if i - k < 0 or j + k >= n or board[i - k, j + k] != last_token:
+            break
+        total += 1
+    for k in range(1, 6):
+        if i + k >= m or j - k < 0 or board[i + k, j - k] != last_token:
+            break
+        total += 1
+    if total == 4:
+        return last_token
+    # NW-SE
+    total = 0
+    for k in range(1, 6):
+        if i - k < 0 or j - k < 0 or board[i - k, j - k] != last_token:
+            break
+        total += 1
+    for k in range(1, 6):
+        if i + k >= m or j + k >= n or board[i + k, j + k] != last_token:
+            break
+        total += 1
+    if total == 4:
+        return last_token
+    draw = True
+    for i in range(m):
+        for j in range(n):
+            if board[i, j] == 0:
+                draw = False
+                break
+    if draw:
+        return 0
+    return 2 # anything other than {-1, 0, 1} implies 'game ongoing'
+
+@njit(cache=True)
+def is_action_legal_uttt(m, n, board, extra_info, turn, action, legal_actions):
+    """Functionality of function ``is_action_legal`` for the game of Ultimate Tic Tac Toe."""
+    i = action // n
+    j = action % n
+    legal = board[i, j] == 0
+    if legal and extra_info[9] != -1: # sub-board imposed by the previous move
+        legal = i // 3 == extra_info[9] and j // 3 == extra_info[10]
+    legal_actions[action] = legal
+
+@njit(cache=True)
+def take_action_uttt(m, n, board, extra_info, turn, action):
+    """Functionality of function ``take_action`` for the game of Ultimate Tic Tac Toe."""
+    i = action // n
+    j = action % n
+    board[i, j] = turn
+    si = (i // 3) * 3
+    sj = (j // 3) * 3
+    sub_index = (i // 3) * 3 + j // 3
+    won = 0
+    for r in range(3):
+        if board[si + r, sj] != 0 and board[si + r, sj] == board[si + r, sj + 1] and board[si + r, sj + 1] == board[si + r, sj + 2]:
+            won = board[si + r, sj]
+    for c in range(3):
+        if board[si, sj + c] != 0 and board[si, sj + c] == board[si + 1, sj + c] and board[si + 1, sj + c] == board[si + 2, sj + c]:
+            won = board[si, sj + c]
+    if board[si, sj] != 0 and board[si, sj] == board[si + 1, sj + 1] and board[si + 1, sj + 1] == board[si + 2, sj + 2]:
+        won = board[si, sj]
+    if board[si, sj + 2] != 0 and board[si, sj + 2] == board[si + 1, sj + 1] and board[si + 1, sj + 1] == board[si + 2, sj]:
+        won = board[si, sj + 2]
+    if won != 0:
+        extra_info[sub_index] = won
+        for r in range(3):
+            for c in range(3):
+                board[si + r, sj + c] = won
+    else:
+        full = True
+        for r in range(3):
+            for c in range(3):
+                if board[si + r, sj + c] == 0:
+                    full = False
+        extra_info[sub_index] = 0 if full else 2 # 0 - tie on sub-board, 2 - sub-board ongoing
+    next_sub_index = (i % 3) * 3 + j % 3
+    if extra_info[next_sub_index] == -2 or extra_info[next_sub_index] == 2:
+        extra_info[9] = i % 3
+        extra_info[10] = j % 3
+    else:
+        extra_info[9] = -1
+        extra_info[10] = -1
+
+@njit(cache=True)
+def legal_actions_playout_uttt(m, n, board, extra_info, turn, legal_actions_with_count):
+    """Functionality of function ``legal_actions_playout`` for the game of Ultimate Tic Tac Toe."""
+    count = 0
+    for i in range(m):
+        for j in range(n):
+            if board[i, j] == 0 and (extra_info[9] == -1 or (i // 3 == extra_info[9] and j // 3 == extra_info[10])):
+                legal_actions_with_count[count] = i * n + j
+                count += 1
+    legal_actions_with_count[-1] = count
+
+@njit(cache=True)
+def take_action_playout_uttt(m, n, board, extra_info, turn, action, action_ord, legal_actions_with_count):
+    """Functionality of function ``take_action_playout`` for the game of Ultimate Tic Tac Toe."""
+    take_action_uttt(m, n, board, extra_info, turn, action)
+
+@njit(cache=True)
+def compute_outcome_uttt(m, n, board, extra_info, turn, last_action):
+    """Functionality of function ``compute_outcome`` for the game of Ultimate Tic Tac Toe (based on states of sub-boards kept in ``extra_info``)."""
+    for a, b, c in ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)):
+        if extra_info[a] == extra_info[b] and extra_info[b] == extra_info[c] and (extra_info[a] == 1 or extra_info[a] == -1):
+            return extra_info[a]
+    for s in range(9):
+        if extra_info[s] == -2 or extra_info[s] == 2:
+            return 2 # anything other than {-1, 0, 1} implies 'game ongoing'
+    return 0
+
+@njit(cache=True)
+def count_in_line(m, n, board, i, j, di, dj, token, max_k):
+    """Returns the number of consecutive pieces ``token`` adjacent to cell ``(i, j)`` along the line of direction ``(di, dj)`` (both ways, at most ``max_k - 1`` each way, the cell itself not counted)."""
+    total = 0
+    for k in range(1, max_k):
+        ii = i + k * di
+        jj = j + k * dj
+        if ii < 0 or ii >= m or jj < 0 or jj >= n or board[ii, jj] != token:
+            break
+        total += 1
+    for k in range(1, max_k):
+        ii = i - k * di
+        jj = j - k * dj
+        if ii < 0 or ii >= m or jj < 0 or jj >= n or board[ii, jj] != token:
+            break
+        total += 1
+    return total
+
+@njit(cache=True)
+def is_winning_action_c4(m, n, board, extra_info, action, token):
+    """Checks whether the (legal) action would win the game of Connect 4 for the player with pieces ``token``."""
+    i = m - 1 - extra_info[action]
+    j = action
+    return (count_in_line(m, n, board, i, j, 1, 0, token, 4) >= 3 or count_in_line(m, n, board, i, j, 0, 1, token, 4) >= 3 or
+            count_in_line(m, n, board, i, j, 1, 1, token, 4) >= 3 or count_in_line(m, n, board, i, j, 1, -1, token, 4) >= 3)
+
+@njit(cache=True)
+def is_winning_action_uttt(m, n, board, extra_info, action, token):
+    """Checks whether the (legal) action would win the game of Ultimate Tic Tac Toe for the player with pieces ``token``: the sub-board of the action gets won and completes a line of sub-boards."""
+    i = action // n
+    j = action % n
+    si = (i // 3) * 3
+    sj = (j // 3) * 3
+    r = i - si
+    c = j - sj
+    won = (board[si + r, sj + (c + 1) % 3] == token and board[si + r, sj + (c + 2) % 3] == token) or (board[si + (r + 1) % 3, sj + c] == token and board[si + (r + 2) % 3, sj + c] == token)
+    if not won and r == c:
+        won = board[si + (r + 1) % 3, sj + (c + 1) % 3] == token and board[si + (r + 2) % 3, sj + (c + 2) % 3] == token
+    if not won and r + c == 2:
+        won = board[si + (r + 1) % 3, sj + (c + 2) % 3] == token and board[si + (r + 2) % 3, sj + (c + 1) % 3] == token
+    if not won:
+        return False
+    sub_index = (i // 3) * 3 + j // 3
+    R = sub_index // 3
+    C = sub_index % 3
+    if extra_info[R * 3 + (C + 1) % 3] == token and extra_info[R * 3 + (C + 2) % 3] == token:
+        return True
+    if extra_info[((R + 1) % 3) * 3 + C] == token and extra_info[((R + 2) % 3) * 3 + C] == token:
+        return True
+    if R == C and extra_info[((R + 1) % 3) * 3 + (C + 1) % 3] == token and extra_info[((R + 2) % 3) * 3 + (C + 2) % 3] == token:
+        return True
+    if R + C == 2 and extra_info[((R + 1) % 3) * 3 + (C + 2) % 3] == token and extra_info[((R + 2) % 3) * 3 + (C + 1) % 3] == token:
+        return True
+    return False
+
+@njit(cache=True)
+def choose_action_playout_uniform(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats):
+    """Functionality of function ``choose_action_playout`` for policy ``"uniform"`` (any game): keeps the action picked on random."""
+    return action_ord
+
+@njit(cache=True)
+def choose_action_playout_heavy_c4(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats):
+    """Functionality of function ``choose_action_playout`` for policy ``"heavy"`` and the game of Connect 4 (all legal actions checked)."""
+    count = legal_actions_with_count[-1]
+    for p in range(2):
+        token = turn if p == 0 else -turn # own wins first, then blocks
+        for o in range(count):
+            if is_winning_action_c4(m, n, board, extra_info, legal_actions_with_count[o], token):
+                return o
+    return action_ord
+
+@njit(cache=True)
+def is_winning_action_gomoku(m, n, board, extra_info, action, token):
+    """Checks whether the (legal) action would win the game of Gomoku for the player with pieces ``token`` (exactly five in a line, as in ``compute_outcome``)."""
+    i = action // n
+    j = action % n
+    return (count_in_line(m, n, board, i, j, 1, 0, token, 6) == 4 or count_in_line(m, n, board, i, j, 0, 1, token, 6) == 4 or
+            count_in_line(m, n, board, i, j, 1, 1, token, 6) == 4 or count_in_line(m, n, board, i, j, 1, -1, token, 6) == 4)
+
+@njit(cache=True)
+def add_threat(threats, token, action):
+    """Adds the action to threats of the player with pieces ``token`` (unless already present or no room left)."""
+    p = (token + 1) // 2
+    count = threats[p, -1]
+    for t in range(count):
+        if threats[p, t] == action:
+            return
+    if count < threats.shape[1] - 1:
+        threats[p, count] = action
+        threats[p, -1] = count + 1
+
+@njit(cache=True)
+def scan_threats_gomoku(m, n, board, extra_info, threats):
+    """Establishes threats of both players in the game of Gomoku by one scan of the board (called once per playout): for each run of stones along each of the four directions, 
+    the empty cells just beyond both its ends are checked (a cell completing a five is adjacent to a run along the line concerned)."""
+    threats[0, -1] = 0
+    threats[1, -1] = 0
+    for si in range(m):
+        for sj in range(n):
+            token = board[si, sj]
+            if token == 0:
+                continue
+            for d in range(4):
+                di = 0 if d == 1 else 1
+                dj = 0 if d == 0 else (-1 if d == 3 else 1)
+                i = si - di
+                j = sj - dj
+                if i >= 0 and i < m and j >= 0 and j < n and board[i, j] == token:
+                    continue # not the start of a run
+                if i >= 0 and i < m and j >= 0 and j < n and board[i, j] == 0 and count_in_line(m, n, board, i, j, di, dj, token, 6) == 4:
+                    add_threat(threats, token, i * n + j)
+                i = si + di
+                j = sj + dj
+                while i >= 0 and i < m and j >= 0 and j < n and board[i, j] == token:
+                    i += di
+                    j += dj
+                if i >= 0 and i < m and j >= 0 and j < n and board[i, j] == 0 and count_in_line(m, n, board, i, j, di, dj, token, 6) == 4:
+                    add_threat(threats, token, i * n + j)
+
+@njit(cache=True)
+def update_threats_gomoku(m, n, board, extra_info, last_action, threats):
+    """
+    Updates threats of both players in the game of Gomoku after a stone has been placed at ``last_action``. Threats no longer valid (cell taken, or no exact five any more) are removed.
+    New threats may appear only for the owner of the stone and only along the four lines through it - at the first empty cells beyond the run of his stones through it 
+    (a cell further away is separated from the stone by an empty one), hence only those (at most eight) cells are checked, along the line concerned.
+    """
+    for p in range(2):
+        token = 2 * p - 1
+        count = threats[p, -1]
+        t = 0
+        while t < count:
+            action = threats[p, t]
+            if board[action // n, action % n] != 0 or not is_winning_action_gomoku(m, n, board, extra_info, action, token):
+                count -= 1
+                threats[p, t] = threats[p, count]
+            else:
+                t += 1
+        threats[p, -1] = count
+    si = last_action // n
+    sj = last_action % n
+    token = board[si, sj]
+    for d in range(4):
+        di = 0 if d == 1 else 1
+        dj = 0 if d == 0 else (-1 if d == 3 else 1)
+        for s in range(2): # both ways along the line, up to the first cell beyond the run of stones through the last one
+            sign = 1 - 2 * s
+            i = si + sign * di
+            j = sj + sign * dj
+            while i >= 0 and i < m and j >= 0 and j < n and board[i, j] == token:
+                i += sign * di
+                j += sign * dj
+            if i >= 0 and i < m and j >= 0 and j < n and board[i, j] == 0 and count_in_line(m, n, board, i, j, di, dj, token, 6) == 4:
+                add_threat(threats, token, i * n + j)
+
+@njit(cache=True)
+def choose_action_playout_heavy_gomoku(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats):
+    """Functionality of function ``choose_action_playout`` for policy ``"heavy"`` and the game of Gomoku (threats established by one scan of the board, then updated along lines through the last action; own wins first, then blocks)."""
+    if threats[0, -1] < 0:
+        scan_threats_gomoku(m, n, board, extra_info, threats)
+    else:
+        update_threats_gomoku(m, n, board, extra_info, last_action, threats)
+    count = legal_actions_with_count[-1]
+    for q in range(2):
+        p = (turn + 1) // 2 if q == 0 else (1 - turn) // 2 # own wins first, then blocks
+        if threats[p, -1] > 0:
+            action = threats[p, 0]
+            for o in range(count):
+                if legal_actions_with_count[o] == action:
+                    return o
+    return action_ord
+
+@njit(cache=True)
+def choose_action_playout_heavy_uttt(m, n, board, extra_info, turn, legal_actions_with_count, action_ord, last_action, threats):
+    """Functionality of function ``choose_action_playout`` for policy ``"heavy"`` and the game of Ultimate Tic Tac Toe (all legal actions checked; blocks refer to cells available now)."""
+    count = legal_actions_with_count[-1]
+    for p in range(2):
+        token = turn if p == 0 else -turn # own wins first, then blocks
+        for o in range(count):
+            if is_winning_action_uttt(m, n, board, extra_info, legal_actions_with_count[o], token):
+                return o
+    return action_ord
+
+@njit
+def playout(m, n, board, extra_info, turn, playout_board, playout_extra_info, legal_actions_with_count, threats, legal_actions_playout, take_action_playout, compute_outcome, choose_action_playout, rng):
+    """
+    Carries out a playout from the given (non-terminal) state and returns its outcome.
+    The playout takes place in place on the given scratch arrays ``playout_board``, ``playout_extra_info``, ``legal_actions_with_count``, ``threats`` (no allocations),
+    the game mechanics is defined by the three given functions (e.g., ``legal_actions_playout_c4``, ``take_action_playout_c4``, ``compute_outcome_c4``),
+    the playout policy by the fourth one (e.g., ``choose_action_playout_uniform``) and random actions are drawn from the given generator ``rng``.
+    """
+    playout_board[:, :] = board
+    playout_extra_info[:extra_info.size] = extra_info
+    legal_actions_with_count[-1] = 0
+    threats[0, -1] = -1 # threats not established yet
+    last_action = -1
+    while True:
+        legal_actions_playout(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count)
+        action_ord = rng.integers(0, legal_actions_with_count[-1])
+        action_ord = choose_action_playout(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count, action_ord, last_action, threats)
+        action = legal_actions_with_count[action_ord]
+        take_action_playout(m, n, playout_board, playout_extra_info, turn, action, action_ord, legal_actions_with_count)
+        turn = -turn
+        last_action = action
+        outcome = compute_outcome(m, n, playout_board, playout_extra_info, turn, action)
+        if outcome == -1 or outcome == 0 or outcome == 1:
+            return outcome
+
+@njit(cache=True)
+def playout_c4(m, n, board, extra_info, turn, playout_board, playout_extra_info, legal_actions_with_count, threats, heavy, actions, rng):
+    """Functionality of function ``playout`` for the game of Connect 4 (game-specific functions called directly, hence cacheable); policy ``"heavy"`` if ``heavy`` is ``True``, ``"uniform"`` otherwise.
+    Actions taken and turns of players taking them are recorded in rows of ``actions`` (their count in the last entry of the first row), random actions are drawn from the given generator ``rng``."""
+    playout_board[:, :] = board
+    playout_extra_info[:extra_info.size] = extra_info
+    legal_actions_with_count[-1] = 0
+    threats[0, -1] = -1 # threats not established yet
+    actions[0, -1] = 0
+    last_action = -1
+    while True:
+        legal_actions_playout_c4(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count)
+        action_ord = rng.integers(0, legal_actions_with_count[-1])
+        if heavy:
+            action_ord = choose_action_playout_heavy_c4(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count, action_ord, last_action, threats)
+        action = legal_actions_with_count[action_ord]
+        take_action_playout_c4(m, n, playout_board, playout_extra_info, turn, action, action_ord, legal_actions_with_count)
+        actions[0, actions[0, -1]] = action
+        actions[1, actions[0, -1]] = turn
+        actions[0, -1] += 1
+        turn = -turn
+        last_action = action
+        outcome = compute_outcome_c4(m, n, playout_board, playout_extra_info, turn, action)
+        if outcome == -1 or outcome == 0 or outcome == 1:
+            return outcome
+
+@njit(cache=True)
+def playouts_c4(m, n, board, extra_info, turn, n_playouts, playout_board, playout_extra_info, legal_actions_with_count, threats, outcomes_counts, heavy, actions, rng):
+    """Carries out a batch of ``n_playouts`` playouts (via ``playout_c4``) from the given (non-terminal) state and adds their outcomes to counts in ``outcomes_counts`` (indexed by ``outcome + 1``)."""
+    for _ in range(n_playouts):
+        outcome = playout_c4(m, n, board, extra_info, turn, playout_board, playout_extra_info, legal_actions_with_count, threats, heavy, actions, rng)
+        outcomes_counts[outcome + 1] += 1
+
+@njit(cache=True)
+def playout_gomoku(m, n, board, extra_info, turn, playout_board, playout_extra_info, legal_actions_with_count, threats, heavy, actions, rng):
+    """Functionality of function ``playout`` for the game of Gomoku (game-specific functions called directly, hence cacheable); policy ``"heavy"`` if ``heavy`` is ``True``, ``"uniform"`` otherwise.
+    Actions taken and turns of players taking them are recorded in rows of ``actions`` (their count in the last entry of the first row), random actions are drawn from the given generator ``rng``."""
+    playout_board[:, :] = board
+    playout_extra_info[:extra_info.size] = extra_info
+    legal_actions_with_count[-1] = 0
+    threats[0, -1] = -1 # threats not established yet
+    actions[0, -1] = 0
+    last_action = -1
+    while True:
+        legal_actions_playout_gomoku(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count)
+        action_ord = rng.integers(0, legal_actions_with_count[-1])
+        if heavy:
+            action_ord = choose_action_playout_heavy_gomoku(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count, action_ord, last_action, threats)
+        action = legal_actions_with_count[action_ord]
+        take_action_playout_gomoku(m, n, playout_board, playout_extra_info, turn, action, action_ord, legal_actions_with_count)
+        actions[0, actions[0, -1]] = action
+        actions[1, actions[0, -1]] = turn
+        actions[0, -1] += 1
+        turn = -turn
+        last_action = action
+        outcome = compute_outcome_gomoku(m, n, playout_board, playout_extra_info, turn, action)
+        if outcome == -1 or outcome == 0 or outcome == 1:
+            return outcome
+
+@njit(cache=True)
+def playouts_gomoku(m, n, board, extra_info, turn, n_playouts, playout_board, playout_extra_info, legal_actions_with_count, threats, outcomes_counts, heavy, actions, rng):
+    """Carries out a batch of ``n_playouts`` playouts (via ``playout_gomoku``) from the given (non-terminal) state and adds their outcomes to counts in ``outcomes_counts`` (indexed by ``outcome + 1``)."""
+    for _ in range(n_playouts):
+        outcome = playout_gomoku(m, n, board, extra_info, turn, playout_board, playout_extra_info, legal_actions_with_count, threats, heavy, actions, rng)
+        outcomes_counts[outcome + 1] += 1
+
+@njit(cache=True)
+def playout_uttt(m, n, board, extra_info, turn, playout_board, playout_extra_info, legal_actions_with_count, threats, heavy, actions, rng):
+    """Functionality of function ``playout`` for the game of Ultimate Tic Tac Toe (game-specific functions called directly, hence cacheable); policy ``"heavy"`` if ``heavy`` is ``True``, ``"uniform"`` otherwise.
+    Actions taken and turns of players taking them are recorded in rows of ``actions`` (their count in the last entry of the first row), random actions are drawn from the given generator ``rng``."""
+    playout_board[:, :] = board
+    playout_extra_info[:extra_info.size] = extra_info
+    legal_actions_with_count[-1] = 0
+    threats[0, -1] = -1 # threats not established yet
+    actions[0, -1] = 0
+    last_action = -1
+    while True:
+        legal_actions_playout_uttt(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count)
+        action_ord = rng.integers(0, legal_actions_with_count[-1])
+        if heavy:
+            action_ord = choose_action_playout_heavy_uttt(m, n, playout_board, playout_extra_info, turn, legal_actions_with_count, action_ord, last_action, threats)
+        action = legal_actions_with_count[action_ord]
+        take_action_playout_uttt(m, n, playout_board, playout_extra_info, turn, action, action_ord, legal_actions_with_count)
+        actions[0, actions[0, -1]] = action
+        actions[1, actions[0, -1]] = turn
+        actions[0, -1] += 1
+        turn = -turn
+        last_action = action
+        outcome = compute_outcome_uttt(m, n, playout_board, playout_extra_info, turn, action)
+        if outcome == -1 or outcome == 0 or outcome == 1:
+            return outcome
+
+@njit(cache=True)
+def playouts_uttt(m, n, board, extra_info, turn, n_playouts, playout_board, playout_extra_info, legal_actions_with_count, threats, outcomes_counts, heavy, actions, rng):
+    """Carries out a batch of ``n_playouts`` playouts (via ``playout_uttt``) from the given (non-terminal) state and adds their outcomes to counts in ``outcomes_counts`` (indexed by ``outcome + 1``)."""
+    for _ in range(n_playouts):
+        outcome = playout_uttt(m, n, board, extra_info, turn, playout_board, playout_extra_info, legal_actions_with_count, threats, heavy, actions, rng)
+        outcomes_counts[outcome + 1] += 1
+
+GAME_MECHANICS = {
+    "C4": (is_action_legal_c4, take_action_c4, legal_actions_playout_c4, take_action_playout_c4, compute_outcome_c4),
+    "Gomoku": (is_action_legal_gomoku, take_action_gomoku, legal_actions_playout_gomoku, take_action_playout_gomoku, compute_outcome_gomoku),
+    "UTTT": (is_action_legal_uttt, take_action_uttt, legal_actions_playout_uttt, take_action_playout_uttt, compute_outcome_uttt)
+    }
+
+PLAYOUT_POLICIES = {
+    "C4": {"uniform": choose_action_playout_uniform, "heavy": choose_action_playout_heavy_c4},
+    "Gomoku": {"uniform": choose_action_playout_uniform, "heavy": choose_action_playout_heavy_gomoku},
+    "UTTT": {"uniform": choose_action_playout_uniform, "heavy": choose_action_playout_heavy_uttt}
+    }
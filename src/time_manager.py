@@ -0,0 +1,198 @@
+"""
+Auxiliary module with a game-level time control for AIs (instances of ``MCTS``, ``MCTSNJ`` or ``MCTSNC``): a total budget of time per game plus an increment per move (Fischer clock),
+from which the ``search_time_limit`` of each search is allocated (in place of a fixed per-move limit).
+The module contains:
+
+- ``TimeManager``: class keeping the clock of one player and allocating time for consecutive moves.
+
+Link to project repository
+--------------------------
+`https://github.com/pklesk/mcts_numba_cuda <https://github.com/pklesk/mcts_numba_cuda>`_
+
+Notes
+-----
+Private functions of ``TimeManager`` class are named with a single leading underscore.
+For public methods full docstrings are provided (with arguments and returns described). For private functions short docstrings are provided.
+"""
+
+import numpy as np
+
+__author__ = "Przemysław Klęsk"
+__email__ = "pklesk@zut.edu.pl"
+
+
+class TimeManager:
+    """
+    Clock of one player in a game with a total time budget and an increment (added after each move), allocating time for consecutive searches.
+    The base allocation is the remaining time divided by an estimate of the number of own moves still to come (implied by the fill of the board
+    and the expected length of the game - a per-game parameter, see ``EXPECTED_FILLS``). The base is then scaled:
+
+    - by the root branching factor: a forced reply (one legal action) gets only ``MIN_TIME``, positions with few legal actions (relative to the maximum for the game) get less time;
+
+    - by how settled the root statistics of the timed AI are (its own statistics, available for a search reusing its tree, e.g., ``MCTS`` with ``vanilla=False``, see ``apply``): 
+      the larger the share of visits of the best action, the less time.
+
+    An allocation never exceeds ``MAX_FRACTION`` of the remaining time (less ``SAFETY_MARGIN``).
+    Time saved on one move (e.g., by a search stopped early) returns to the pool available for later moves.
+
+    Attributes:
+        MIN_TIME (float):
+            minimal allocation in seconds, defaults to ``0.01``.
+        MIN_MOVES_TO_GO (int):
+            lower bound on the estimated number of own moves still to come, defaults to ``5``.
+        EXPECTED_FILLS (dict):
+            expected fractions of board cells filled at the end of a game (estimates of its length) per game (name of class of states), 
+            defaults to ``{"C4": 0.8, "Gomoku": 0.3, "UTTT": 0.6}``.
+        EXPECTED_FILL (float):
+            expected fraction of board cells filled at the end of a game for games not in ``EXPECTED_FILLS``, defaults to ``0.5``.
+        MAX_FRACTION (float):
+            maximal fraction of the remaining time allocated to one move, defaults to ``0.25``.
+        SAFETY_MARGIN (float):
+            time in seconds kept in reserve (overheads of searches beyond their time limits), defaults to ``0.05``.
+        BRANCHING_WEIGHT (float):
+            weight of the branching factor in scaling (the allocation shrinks linearly with the logarithm of the number of legal actions, from the base for the maximal number 
+            down to ``1 - BRANCHING_WEIGHT`` of the base for a single action), defaults to ``0.5``.
+        SETTLED_WEIGHT (float):
+            weight of the settledness of root statistics in scaling (the allocation for a root with all visits in one action is ``1 - SETTLED_WEIGHT`` of the base), defaults to ``0.5``.
+        SETTLED_MIN_VISITS (int):
+            minimal number of visits of root for its statistics to be taken into account, defaults to ``100``.
+    """
+
+    MIN_TIME = 0.01 # [s]
+    MIN_MOVES_TO_GO = 5
+    EXPECTED_FILLS = {"C4": 0.8, "Gomoku": 0.3, "UTTT": 0.6}
+    EXPECTED_FILL = 0.5
+    MAX_FRACTION = 0.25
+    SAFETY_MARGIN = 0.05 # [s]
+    BRANCHING_WEIGHT = 0.5
+    SETTLED_WEIGHT = 0.5
+    SETTLED_MIN_VISITS = 100
+
+    def __init__(self, total_time, increment=0.0, expected_fill=None):
+        """
+        Constructor of ``TimeManager`` instances.
+
+        Args:
+            total_time (float):
+                total budget of time for a game in seconds.
+            increment (float):
+                time in seconds added to the clock after each move, defaults to ``0.0``.
+            expected_fill (float or None):
+                expected fraction of board cells filled at the end of a game, defaults to ``None`` (taken from ``EXPECTED_FILLS`` for the game being played).
+        """
+        self.total_time = total_time
+        self.increment = increment
+        self.expected_fill = expected_fill
+        self.reset()
+
+    def __str__(self):
+        """
+        Returns a string representation of this ``TimeManager`` instance.
+
+        Returns:
+            str: string representation of this ``TimeManager`` instance.
+        """
+        return f"TimeManager(total_time={self.total_time}, increment={self.increment}, expected_fill={self.expected_fill})"
+
+    def __repr__(self):
+        """
+        Returns a string representation of this ``TimeManager`` instance (equivalent to ``__str__`` method).
+
+        Returns:
+            str: string representation of this ``TimeManager`` instance.
+        """
+        return self.__str__()
+
+    def reset(self):
+        """
+        Resets the clock (prior to a new game).
+        """
+        self.time_left = self.total_time
+        self.moves = 0
+        self.time_used = 0.0
+        self.last_allocation = None
+
+    def _moves_to_go(self, state):
+        """Returns an estimate of the number of own moves still to come in the game, implied by the fill of the board and the expected fill for the game."""
+        board = state.get_board()
+        n_cells = board.size
+        n_filled = np.count_nonzero(board)
+        expected_fill = self.expected_fill if self.expected_fill is not None else self.EXPECTED_FILLS.get(type(state).__name__, self.EXPECTED_FILL)
+        return max(self.MIN_MOVES_TO_GO, 0.5 * (expected_fill * n_cells - n_filled))
+
+    def _branching_factor(self, n_actions, max_actions):
+        """Returns the scaling factor implied by the number of legal actions (relative to the maximal number of actions for the game)."""
+        if max_actions <= 1:
+            return 1.0
+        return 1.0 - self.BRANCHING_WEIGHT * (1.0 - np.log(n_actions) / np.log(max_actions))
+
+    def _settled_factor(self, ns):
+        """Returns the scaling factor implied by the share of visits of the best root action (normalized so that uniform visits give ``1.0``)."""
+        if ns is None or ns.size < 2:
+            return 1.0
+        n_root = np.sum(ns)
+        if n_root < self.SETTLED_MIN_VISITS:
+            return 1.0
+        uniform = 1.0 / ns.size
+        settledness = max(np.max(ns) / n_root - uniform, 0.0) / (1.0 - uniform)
+        return 1.0 - self.SETTLED_WEIGHT * settledness
+
+    def allocate(self, state, ns=None):
+        """
+        Allocates time for the search from the given state (to be set as ``search_time_limit`` of an AI, see ``apply``).
+
+        Args:
+            state (State):
+                state from which the search is to be carried out.
+            ns (ndarray or None):
+                counts of visits of root actions gathered for the state by the AI to be timed (its own root statistics), defaults to ``None`` (no statistics).
+        Returns:
+            allocation (float):
+                time allocated for the search in seconds.
+        """
+        n_actions = state.legal_actions().size
+        available = max(self.time_left - self.SAFETY_MARGIN, 0.0)
+        if n_actions <= 1:
+            allocation = self.MIN_TIME
+        else:
+            allocation = available / self._moves_to_go(state)
+            allocation *= self._branching_factor(n_actions, type(state).get_max_actions())
+            allocation *= self._settled_factor(ns)
+            allocation = min(allocation, self.MAX_FRACTION * available)
+        allocation = float(max(allocation, self.MIN_TIME))
+        self.last_allocation = allocation
+        return allocation
+
+    def apply(self, ai, state):
+        """
+        Allocates time for the search from the given state (see ``allocate``) and sets it as ``search_time_limit`` of the AI.
+        Root statistics are taken from the AI itself (its method ``root_statistics``, if present), never from the state, which may hold statistics of another AI sharing it.
+
+        Args:
+            ai (object):
+                reference to AI instance (of class ``MCTS``, ``MCTSNJ`` or ``MCTSNC``).
+            state (State):
+                state from which the search is to be carried out.
+        Returns:
+            allocation (float):
+                time allocated for the search in seconds.
+        """
+        ns = ai.root_statistics(state) if hasattr(ai, "root_statistics") else None
+        ai.search_time_limit = self.allocate(state, ns)
+        return ai.search_time_limit
+
+    def update(self, elapsed):
+        """
+        Charges the clock with the time of a move and adds the increment.
+
+        Args:
+            elapsed (float):
+                time in seconds taken by the move.
+        Returns:
+            time_info (dict):
+                information on the move: time allocated and used, time left (after the increment) and the number of moves so far.
+        """
+        self.moves += 1
+        self.time_used += elapsed
+        self.time_left += self.increment - elapsed
+        return {"allocated_[s]": self.last_allocation, "used_[s]": elapsed, "left_[s]": self.time_left, "moves": self.moves}
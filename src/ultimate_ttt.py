@@ -1,5 +1,6 @@
 import numpy as np
 from mcts import State
+from mctsnj_game_mechanics import playout_uttt, playouts_uttt, is_winning_action_uttt, THREATS_CAPACITY
 from numba import jit, njit
 from numba import int8
 
@@ -16,6 +17,20 @@ class UTTT(State):
     N = 9
     E = 11
     SYMBOLS = ["O", ".", "X"]  # or: ["O", ".", "X"]
+    _PLAYOUT_BOARD = np.empty((M, N), dtype=np.int8) # scratch arrays for in-place playouts
+    _PLAYOUT_EXTRA_INFO = np.zeros(E, dtype=np.int8)
+    _PLAYOUT_LEGAL_ACTIONS_WITH_COUNT = np.empty(M * N + 1, dtype=np.int16)
+    _PLAYOUT_THREATS = np.empty((2, THREATS_CAPACITY + 1), dtype=np.int16)
+    _PLAYOUT_ACTIONS = np.empty((2, M * N + 1), dtype=np.int16)
+    _ZOBRIST_KEYS = np.random.default_rng(0).integers(0, 2**64, size=(2, M, N), dtype=np.uint64).tolist() # random keys for hashing: [player][row][column], player 0: min, 1: max
+    _ZOBRIST_TURN_KEY = int(np.random.default_rng(1).integers(0, 2**64, dtype=np.uint64)) # key XOR-ed at each change of turn
+    _ZOBRIST_SUBBOARD_KEYS = np.random.default_rng(2).integers(0, 2**64, size=10, dtype=np.uint64).tolist() # keys for sub-board designated for next move: [0] - any, [1 + I * 3 + J] - sub-board (I, J)
+    _ZOBRIST_KEYS_ARRAY = np.array(_ZOBRIST_KEYS, dtype=np.uint64).reshape(2, M * N)
+    _ZOBRIST_SUBBOARD_KEYS_ARRAY = np.array(_ZOBRIST_SUBBOARD_KEYS, dtype=np.uint64)
+    _CELLS_TRANSFORMS = State._dihedral_cells_transforms(M, N) # symmetries: 8 dihedral transforms of the whole board (mapping sub-boards onto sub-boards)
+    _SUBBOARDS_TRANSFORMS = State._dihedral_cells_transforms(3, 3)
+    _ACTIONS_TRANSFORMS = _CELLS_TRANSFORMS
+    __slots__ = ("board", "extra_info")
 
     def __init__(self, parent=None):
         """
@@ -27,14 +42,82 @@ class UTTT(State):
         """
         super().__init__(parent)
         if self.parent:
-            self.board = np.copy(self.parent.board)
-            self.extra_info = np.copy(self.parent.extra_info)
+            self.board = self.parent.board # shared with parent until mutated (copy-on-write)
+            self.extra_info = self.parent.extra_info
+            self.board_shared = True
         else:
             self.board = np.zeros((UTTT.M, UTTT.N), dtype=np.int8)
             self.extra_info = np.zeros(UTTT.E, dtype=np.int8)
             self.extra_info[:9] = -2
             self.extra_info[9] = -1
             self.extra_info[10] = -1
+            self.zobrist_hash = UTTT._ZOBRIST_SUBBOARD_KEYS[0] # empty board, any sub-board, maximizing player to act
+
+    def _copy_board(self):
+        """Replaces arrays shared with the parent (copy-on-write) by copies."""
+        self.board = np.copy(self.board)
+        self.extra_info = np.copy(self.extra_info)
+
+    def _canonical_hashes(self):
+        """Returns Zobrist hashes of all symmetric variants of this position, including the (transformed) sub-board designated for the next move."""
+        hashes = super()._canonical_hashes()
+        I = self.extra_info[9]
+        if I == -1:
+            hashes ^= UTTT._ZOBRIST_SUBBOARD_KEYS_ARRAY[0]
+        else:
+            hashes ^= UTTT._ZOBRIST_SUBBOARD_KEYS_ARRAY[1 + UTTT._SUBBOARDS_TRANSFORMS[:, I * 3 + self.extra_info[10]]]
+        return hashes
+
+    def _child_subboards(self, action_index):
+        """Returns indexes (``I * 3 + J``, ``-1`` - any) of sub-boards designated for the next move in this state and in the child reached by given legal action, 
+        or ``None`` if the action completes (wins or fills) its sub-board - then cells of the sub-board are overwritten (hashes of the child not updated locally)."""
+        i = action_index // 9
+        j = action_index % 9
+        I = i // 3
+        J = j // 3
+        si = i % 3
+        sj = j % 3
+        sub_board = self.board[I * 3:(I + 1) * 3, J * 3:(J + 1) * 3].tolist()
+        two = 2 * self.turn # sum of a line with the empty cell (si, sj) won by the action
+        if (sum(sub_board[si]) == two or sub_board[0][sj] + sub_board[1][sj] + sub_board[2][sj] == two 
+            or (si == sj and sub_board[0][0] + sub_board[1][1] + sub_board[2][2] == two) or (si + sj == 2 and sub_board[0][2] + sub_board[1][1] + sub_board[2][0] == two)
+            or sum(cell != 0 for row in sub_board for cell in row) == 8):
+            return None
+        now = -1 if self.extra_info[9] == -1 else int(self.extra_info[9] * 3 + self.extra_info[10])
+        next_state = 2 if si == I and sj == J else self.extra_info[si * 3 + sj] # sub-board of the action ongoing after it
+        return now, (si * 3 + sj if next_state in (-2, 2) else -1)
+
+    def child_hash(self, action_index):
+        """
+        Returns the Zobrist hash of the child reached by given legal action (updated from ``zobrist_hash`` of this state, without taking the action), 
+        or ``None`` if the action completes (wins or fills) its sub-board.
+
+        Args:
+            action_index (int):
+                index of a legal action.
+
+        Returns:
+            child_hash (int or ``None``):
+                Zobrist hash of the child.
+        """
+        subboards = self._child_subboards(action_index)
+        if subboards is None:
+            return None
+        now, child = subboards
+        subboard_keys = UTTT._ZOBRIST_SUBBOARD_KEYS
+        return (self.zobrist_hash ^ UTTT._ZOBRIST_KEYS[(self.turn + 1) // 2][action_index // 9][action_index % 9] 
+                ^ subboard_keys[0 if now == -1 else 1 + now] ^ subboard_keys[0 if child == -1 else 1 + child] ^ UTTT._ZOBRIST_TURN_KEY)
+
+    def _child_canonical_hashes(self, hashes, action_index):
+        """Returns hashes of symmetric variants of the child reached by given legal action, updated from ``hashes`` of variants of this position (including transformed sub-boards designated for the next move), 
+        or ``None`` if the action completes (wins or fills) its sub-board."""
+        subboards = self._child_subboards(action_index)
+        if subboards is None:
+            return None
+        hashes = hashes ^ UTTT._ZOBRIST_KEYS_ARRAY[(self.turn + 1) // 2, UTTT._CELLS_TRANSFORMS[:, action_index]] ^ np.uint64(UTTT._ZOBRIST_TURN_KEY)
+        for subboard in subboards:
+            hashes ^= UTTT._ZOBRIST_SUBBOARD_KEYS_ARRAY[0] if subboard == -1 else UTTT._ZOBRIST_SUBBOARD_KEYS_ARRAY[1 + UTTT._SUBBOARDS_TRANSFORMS[:, subboard]]
+        return hashes
 
     @staticmethod
     def class_repr():
@@ -154,13 +237,23 @@ class UTTT(State):
                     return False
 
         # Wykonujemy ruch
+        self._own_board()
         self.board[i, j] = self.turn
+        keys = UTTT._ZOBRIST_KEYS
+        self.zobrist_hash ^= keys[(self.turn + 1) // 2][i][j]
 
         # Sprawdzamy zwycięzcę podtablicy
         sub_board = self.board[I * 3:(I + 1) * 3, J * 3:(J + 1) * 3]
         won = self._check_subboard_winner(sub_board)
 
         if won != 0:
+            for si in range(I * 3, (I + 1) * 3): # hash of cells overwritten by the winner's symbol
+                for sj in range(J * 3, (J + 1) * 3):
+                    value = self.board[si, sj]
+                    if value != won:
+                        if value != 0:
+                            self.zobrist_hash ^= keys[(value + 1) // 2][si][sj]
+                        self.zobrist_hash ^= keys[(won + 1) // 2][si][sj]
             self.extra_info[I * 3 + J] = won
             self.board[I * 3:(I + 1) * 3, J * 3:(J + 1) * 3] = won
             winner = "KRZYŻYK" if won == 1 else "KÓŁKO"
@@ -181,13 +274,26 @@ class UTTT(State):
             self.extra_info[9] = -1
             self.extra_info[10] = -1
 
+        # Aktualizujemy hash (wyznaczona podtablica, gracz)
+        subboard_keys = UTTT._ZOBRIST_SUBBOARD_KEYS
+        self.zobrist_hash ^= subboard_keys[0 if I_now == -1 else 1 + I_now * 3 + J_now] ^ subboard_keys[0 if self.extra_info[9] == -1 else 1 + self.extra_info[9] * 3 + self.extra_info[10]] ^ UTTT._ZOBRIST_TURN_KEY
+
         # Zmieniamy gracza
         self.turn = -self.turn
 
         return True
 
-    def compute_outcome(self):
+    def compute_outcome_job(self):
+        """
+        Computes and returns the game outcome for this state in compliance with rules of Ultimate Tic Tac Toe:
+        {-1, 1} denoting a win for the minimizing or maximizing player, respectively, if he won three sub-boards in a line;
+        0 denoting a tie, when no sub-board is playable any more and no such line exists;
+        ``None`` when the game is ongoing.
 
+        Returns:
+            outcome ({-1, 0, 1} or ``None``)
+                game outcome for this state.
+        """
         # M przechowuje stany wszystkich podtablic.
         M = self.extra_info[:9]
 
@@ -252,42 +358,86 @@ class UTTT(State):
 
         return 2
 
-    def take_random_action_playout(self):
-        child = UTTT(parent=self)  # kopiujemy obecny stan
-
-        I_now = child.extra_info[9]
-        J_now = child.extra_info[10]
-
-        # Lista wszystkich możliwych ruchów
-        possible_moves = []
-
-        if I_now == -1 and J_now == -1:
-            # Dowolna podtablica aktywna
-            for I in range(3):
-                for J in range(3):
-                    sub_index = I * 3 + J
-                    if child.extra_info[sub_index] in (-2, 2):  # podtablica aktywna
-                        sub_board = child.board[I * 3:(I + 1) * 3, J * 3:(J + 1) * 3]
-                        free_positions = np.argwhere(sub_board == 0)
-                        for pos in free_positions:
-                            i, j = pos
-                            possible_moves.append((i + I * 3, j + J * 3))
-        else:
-            # Tylko wskazana podtablica
-            sub_board = child.board[I_now * 3:(I_now + 1) * 3, J_now * 3:(J_now + 1) * 3]
-            free_positions = np.argwhere(sub_board == 0)
-            for pos in free_positions:
-                i, j = pos
-                possible_moves.append((i + I_now * 3, j + J_now * 3))
-
-        if not possible_moves:
-            return None  # brak dostępnych ruchów
-
-        # losowy wybór ruchu
-        i, j = possible_moves[np.random.randint(len(possible_moves))]
-        action_index = i * 9 + j
-        child = self.take_action(action_index)
-        return child
+    def legal_actions(self):
+        """
+        Returns indexes of legal actions in this state, i.e., indexes of empty cells within the designated sub-board
+        (or within any sub-board if none is designated; cells of won sub-boards are filled with the winner's symbol and never empty).
+
+        Returns:
+            legal_actions (ndarray[np.int64, ndim=1]):
+                one-dimensional array with indexes of legal actions (in ascending order).
+        """
+        I_now = self.extra_info[9]
+        J_now = self.extra_info[10]
+        if I_now == -1:
+            return np.flatnonzero(self.board.ravel() == 0)
+        sub_board = self.board[I_now * 3:(I_now + 1) * 3, J_now * 3:(J_now + 1) * 3]
+        sub_i, sub_j = np.nonzero(sub_board == 0)
+        return (sub_i + I_now * 3) * UTTT.N + sub_j + J_now * 3
+
+    def is_winning_action(self, action_index, token):
+        """
+        Checks (directly on the board, without creating any states) whether the given legal action, if played in this state by the player with pieces ``token``, would win the game.
+        
+        Args:
+            action_index (int):
+                index of a legal action.
+            token ({-1, 1}):
+                indicator of the player taking the action.
+        Returns:
+            winning (bool):
+                flag indicating whether the action would win the game for the player.
+        """
+        return bool(is_winning_action_uttt(UTTT.M, UTTT.N, self.board, self.extra_info, action_index, token))
+
+    def playout(self, policy="uniform", actions=None, rng=None):
+        """
+        Carries out a playout from this state in place and returns its outcome.
+        No states are created along the way - the game is played on reusable scratch arrays (attributes of class ``UTTT``)
+        by compiled function ``playout_uttt`` from :doc:`mctsnj_game_mechanics`.
+        
+        Args:
+            policy (str):
+                playout policy, ``"uniform"`` (uniformly random actions) or ``"heavy"`` (immediate wins played, immediate losses blocked), defaults to ``"uniform"``.
+            actions (ndarray[np.int16, ndim=2]):
+                optional array (two rows) in which the actions taken within the playout (first row) and the turns of players taking them (second row) are recorded 
+                (their count in the last entry of the first row), e.g., for AMAF statistics, defaults to ``None``.
+            rng (np.random.Generator):
+                generator of random numbers (each search passes its own), defaults to ``None`` (a generator shared by states).
+        Returns:
+            outcome ({-1, 0, 1}): 
+                outcome of the playout: -1 (win for minimizing player), 0 (draw), 1 (win for maximizing player).
+        """
+        outcome = self.compute_outcome()
+        if outcome is not None:
+            if actions is not None:
+                actions[0, -1] = 0
+            return outcome
+        return int(playout_uttt(UTTT.M, UTTT.N, self.board, self.extra_info, self.turn, UTTT._PLAYOUT_BOARD, UTTT._PLAYOUT_EXTRA_INFO, UTTT._PLAYOUT_LEGAL_ACTIONS_WITH_COUNT, UTTT._PLAYOUT_THREATS, policy == "heavy", UTTT._PLAYOUT_ACTIONS if actions is None else actions, State._DEFAULT_RNG if rng is None else rng))
+
+    def playouts(self, n_playouts, policy="uniform", rng=None):
+        """
+        Carries out a batch of playouts from this state in place (within a single call of compiled function ``playouts_uttt`` from :doc:`mctsnj_game_mechanics`) 
+        and returns counts of their outcomes.
+        
+        Args:
+            n_playouts (int):
+                number of playouts.
+            policy (str):
+                playout policy, ``"uniform"`` or ``"heavy"`` (see ``playout``), defaults to ``"uniform"``.
+            rng (np.random.Generator):
+                generator of random numbers (see ``playout``), defaults to ``None``.
+        Returns:
+            outcomes_counts (ndarray[np.int64, ndim=1]):
+                counts of outcomes -1, 0, 1 (at indexes 0, 1, 2, respectively).
+        """
+        outcomes_counts = np.zeros(3, dtype=np.int64)
+        outcome = self.compute_outcome()
+        if outcome is not None:
+            outcomes_counts[outcome + 1] = n_playouts
+            return outcomes_counts
+        playouts_uttt(UTTT.M, UTTT.N, self.board, self.extra_info, self.turn, n_playouts, UTTT._PLAYOUT_BOARD, UTTT._PLAYOUT_EXTRA_INFO, UTTT._PLAYOUT_LEGAL_ACTIONS_WITH_COUNT, UTTT._PLAYOUT_THREATS, outcomes_counts, policy == "heavy", UTTT._PLAYOUT_ACTIONS, State._DEFAULT_RNG if rng is None else rng)
+        return outcomes_counts
 
     def get_board(self):
         """
@@ -352,14 +502,14 @@ class UTTT(State):
     @staticmethod
     def get_extra_info_memory():
         """
-        Returns amount of memory (in bytes) needed to memorize additional information associated with Connect 4 states, i.e., the memory for fills of columns.
-        That number is equal to the number of columns.
+        Returns amount of memory (in bytes) needed to memorize additional information associated with Ultimate Tic Tac Toe states, i.e., the memory for states of sub-boards,
+        index of the designated sub-board and index of the last action. That number is equal to ``UTTT.E``.
 
         Returns:
             extra_info_memory (int):
-                number of bytes required to memorize fills of columns.
+                number of bytes required to memorize additional information.
         """
-        return UTTT.N
+        return UTTT.E
 
     @staticmethod
     def get_max_actions():
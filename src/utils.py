@@ -6,6 +6,7 @@ Link to project repository
 `https://github.com/pklesk/mcts_numba_cuda <https://github.com/pklesk/mcts_numba_cuda>`_ 
 """
 
+import numpy as np
 import cpuinfo
 import platform
 import psutil
@@ -29,6 +30,40 @@ def dict_to_str(d, indent=0):
     dict_str += "\n" + indent_str + "}"
     return dict_str
 
+def remaining_playouts(n_root, steps, elapsed, search_time_limit, search_steps_limit):
+    """Returns an estimate of the number of playouts (visits of root) still to come in a search, given the numbers of playouts and steps so far, the elapsed time and the computational budget."""
+    remaining = np.inf
+    if search_time_limit < np.inf:
+        remaining = min(remaining, n_root / max(elapsed, 1e-9) * max(search_time_limit - elapsed, 0.0))
+    if search_steps_limit < np.inf:
+        remaining = min(remaining, n_root / max(steps, 1) * max(search_steps_limit - steps, 0))
+    return remaining
+
+STOP_RULES = ["settled", "confident"]
+PLAYOUT_POLICIES = ["uniform", "heavy"]
+STOP_CONFIDENT_FACTOR = 2.0
+
+def stop_reason(win_flags, ns, n_remaining, stop_rule):
+    """
+    Returns the reason for which a search may be stopped early, given statistics of root actions (win flags and counts of visits) and the estimated number of remaining playouts, or ``None`` if the search should go on.
+    Possible reasons: ``"win"`` - some action has its win flag set (decisive for the final decision), ``"single_action"`` - only one action available, 
+    ``"settled"`` - the runner-up cannot overtake the best action even if it received all remaining playouts,
+    ``"confident"`` (only for ``stop_rule="confident"``) - the runner-up cannot overtake the best action receiving ``STOP_CONFIDENT_FACTOR`` times its share of playouts so far.
+    """
+    if ns.size == 0:
+        return None
+    if np.any(win_flags):
+        return "win"
+    if ns.size == 1:
+        return "single_action"
+    second, best = np.partition(ns, -2)[-2:]
+    lead = int(best) - int(second)
+    if lead > n_remaining:
+        return "settled"
+    if stop_rule == "confident" and lead > STOP_CONFIDENT_FACTOR * n_remaining * second / max(np.sum(ns), 1):
+        return "confident"
+    return None
+
 def list_to_str(l, indent=0):
     """Returns a vertically formatted string representation of a list."""
     indent_str = indent * " "
@@ -79,9 +114,12 @@ def cpu_and_system_props():
     return props    
 
 def gpu_props():
-    """Returns a dictionary with properties of GPU device."""
-    gpu = cuda.get_current_device()
+    """Returns a dictionary with properties of GPU device (only its name, equal to ``"none"``, if CUDA is not available)."""
     props = {}
+    if not cuda.is_available():
+        props["name"] = "none"
+        return props
+    gpu = cuda.get_current_device()
     props["name"] = gpu.name.decode("ASCII")
     props["max_threads_per_block"] = gpu.MAX_THREADS_PER_BLOCK
     props["max_block_dim_x"] = gpu.MAX_BLOCK_DIM_X
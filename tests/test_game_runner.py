@@ -0,0 +1,43 @@
+import numpy as np
+from mcts import MCTS
+from mctsnc import MCTSNC
+from ultimate_ttt import UTTT
+from game_runner import GameRunner
+
+
+def _mctsnc_cpu(**kwargs):
+    ai = MCTSNC(UTTT.get_board_shape(), UTTT.get_extra_info_memory(), UTTT.get_max_actions(), n_trees=2, n_playouts=32, variant="ocp_thrifty", 
+                backend="cpu", game_name=UTTT.__name__, **kwargs)
+    ai.init_device_side_arrays()
+    return ai
+
+
+def _black_performance_infos(game_info):
+    return [moves_round_info["black_performance_info"] for moves_round_info in game_info["moves_rounds"].values() if "black_performance_info" in moves_round_info]
+
+
+def test_mctsnc_plays_a_game():
+    black_ai = _mctsnc_cpu(search_time_limit=np.inf, search_steps_limit=8)
+    white_ai = MCTS(search_time_limit=np.inf, search_steps_limit=50, vanilla=True)
+    outcome, game_info = GameRunner(UTTT, black_ai, white_ai, 1, 1).run()
+    assert outcome in (-1, 0, 1)
+    assert all(performance_info["steps"] == 8 for performance_info in _black_performance_infos(game_info))
+
+
+def test_mctsnc_ponders_during_opponents_turns():
+    black_ai = _mctsnc_cpu(search_time_limit=0.1, search_steps_limit=np.inf, ponder=True)
+    white_ai = MCTS(search_time_limit=0.1, search_steps_limit=np.inf, vanilla=True)
+    outcome, game_info = GameRunner(UTTT, black_ai, white_ai, 1, 1, ponder=True).run()
+    ponder_infos = [performance_info["ponder"] for performance_info in _black_performance_infos(game_info)]
+    assert ponder_infos[0]["steps"] == 0 # no pondering before the first move
+    assert any(ponder_info["steps"] > 0 and ponder_info["carried_visits"] > 0 for ponder_info in ponder_infos[1:])
+    assert black_ai.ponder_thread is None # stopped at the end of game
+
+
+def test_mctsnc_under_time_control():
+    black_ai = _mctsnc_cpu(search_time_limit=5.0, search_steps_limit=np.inf)
+    white_ai = MCTS(search_time_limit=np.inf, search_steps_limit=50, vanilla=True)
+    outcome, game_info = GameRunner(UTTT, black_ai, white_ai, 1, 1, time_control=(6.0, 0.1)).run()
+    time_infos = [moves_round_info["black_time_info"] for moves_round_info in game_info["moves_rounds"].values() if "black_time_info" in moves_round_info]
+    assert len(time_infos) == len(_black_performance_infos(game_info)) > 0
+    assert black_ai.search_time_limit < 5.0 # allocated by the time manager